@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+"""Headless batch conversion and staple export of cadnano designs.
+
+run with:
+
+    cadnano-batch -o out/ --format json --staples designs/*.json
+
+Each input file is decoded with `nnodecode.decodeFile` in a pool of worker
+processes, saved with `nnoencode.encodeToFile` and/or has the staples of its
+active part written with `NucleicAcidPart.getSequences`.  A failure only
+affects its own file, and a throughput report is printed at the end.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import traceback
+from collections import defaultdict, deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+INPUT_EXTENSIONS = ('.json', '.c25', '.cn5')
+
+FileResult = namedtuple('FileResult', ['path', 'ok', 'seconds', 'size', 'outputs', 'error'])
+"""Outcome of converting one file.  `size` is the input size in bytes and
+`outputs` the list of written paths"""
+
+
+def collectInputs(paths):
+    """Expand directories into the design files they contain
+
+    Args:
+        paths (list): of :obj:`str` files or directories
+
+    Returns:
+        list: of :obj:`tuple` (path, stem) where stem is the output name
+        without extension, relative to the input directory it was found in
+    """
+    inputs = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for filename in sorted(files):
+                    if os.path.splitext(filename)[1].lower() in INPUT_EXTENSIONS:
+                        file_path = os.path.join(root, filename)
+                        stem = os.path.splitext(os.path.relpath(file_path, path))[0]
+                        inputs.append((file_path, stem))
+        else:
+            inputs.append((path, os.path.splitext(os.path.basename(path))[0]))
+    return inputs
+# end def
+
+
+def convertFile(path, stem, out_dir, out_format=None, staples=False):
+    """Decode one design and write the requested outputs.  Runs in a worker
+    process, so every error is caught and returned rather than raised
+
+    Args:
+        path (str): input design file
+        stem (str): output file name without extension, relative to `out_dir`
+        out_dir (str): output directory
+        out_format (str): optional, extension to convert to ('json' or 'cn5')
+        staples (bool): optional, write the staple CSV of the active part
+
+    Returns:
+        FileResult:
+    """
+    from cadnano.fileio.nnodecode import decodeFile
+    from cadnano.fileio.nnoencode import encodeToFile
+
+    t0 = time.perf_counter()
+    outputs = []
+    log = io.StringIO()
+    try:
+        size = os.path.getsize(path)
+        out_base = os.path.join(out_dir, stem)
+        os.makedirs(os.path.dirname(out_base) or '.', exist_ok=True)
+        # the decoders print diagnostics, keep them out of the report
+        with contextlib.redirect_stdout(log):
+            document = decodeFile(path)
+            if out_format is not None:
+                out_path = out_base + '.' + out_format
+                if os.path.abspath(out_path) == os.path.abspath(path):
+                    raise ValueError("output {} would overwrite the input".format(out_path))
+                encodeToFile(out_path, document)
+                outputs.append(out_path)
+            if staples:
+                part = document.activePart()
+                if part is None:
+                    raise ValueError("{} has no part to export staples from".format(path))
+                out_path = out_base + '.csv'
+                with io.open(out_path, 'w', encoding='utf-8') as fd:
+                    fd.write(part.getSequences())
+                outputs.append(out_path)
+    except Exception:
+        error = traceback.format_exc()
+        if log.getvalue():
+            error = log.getvalue() + error
+        return FileResult(path, False, time.perf_counter() - t0,
+                          os.path.getsize(path) if os.path.isfile(path) else 0,
+                          outputs, error)
+    return FileResult(path, True, time.perf_counter() - t0, size, outputs, None)
+# end def
+
+
+def _convertInPool(inputs, jobs, convert_args, record):
+    """Convert `inputs` in a pool of `jobs` worker processes, submitting at
+    most `jobs` files at a time so that a worker dying can only be blamed on
+    the files being converted
+
+    Args:
+        inputs (list): of :obj:`tuple` (path, stem)
+        jobs (int): number of worker processes
+        convert_args (tuple): `convertFile` arguments after the stem
+        record (callable): called with each :class:`FileResult`
+
+    Returns:
+        tuple: :obj:`list` of the inputs being converted when the pool broke
+        and :obj:`list` of those not submitted yet, both empty if it didn't
+    """
+    todo = deque(inputs)
+    futures = {}
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        while todo or futures:
+            while todo and len(futures) < jobs:
+                path, stem = item = todo.popleft()
+                futures[executor.submit(convertFile, path, stem, *convert_args)] = item
+            done, not_done = wait(futures, return_when=FIRST_COMPLETED)
+            broken = []
+            for future in done:
+                item = futures.pop(future)
+                try:
+                    record(future.result())
+                except BrokenProcessPool:
+                    broken.append(item)
+            if broken:
+                # the other files in the pool fail the same way, unless done
+                for future, item in futures.items():
+                    try:
+                        record(future.result())
+                    except BrokenProcessPool:
+                        broken.append(item)
+                return broken, list(todo)
+    return [], []
+# end def
+
+
+def runBatch(inputs, out_dir, out_format=None, staples=False, jobs=None, report=None):
+    """Convert `inputs` across a process pool
+
+    Args:
+        inputs (list): of :obj:`tuple` (path, stem) from `collectInputs`
+        out_dir (str): output directory
+        out_format (str): optional, extension to convert to
+        staples (bool): optional, write staple CSVs
+        jobs (int): optional, number of worker processes.  Defaults to the
+            number of CPUs.  1 converts in this process
+        report (callable): optional, called with each :class:`FileResult` as
+            it completes
+
+    Returns:
+        list: of :class:`FileResult` in completion order
+    """
+    results = []
+
+    def record(result):
+        results.append(result)
+        if report is not None:
+            report(result)
+
+    if jobs == 1:
+        for path, stem in inputs:
+            record(convertFile(path, stem, out_dir, out_format, staples))
+        return results
+    # a worker dying, e.g. killed for running out of memory, breaks the pool
+    # and fails every file in it.  The files that were being converted are
+    # suspects and go to a fresh pool with the rest, a file that was a
+    # suspect twice is converted in a pool of its own
+    convert_args = (out_dir, out_format, staples)
+    jobs = jobs or os.cpu_count() or 1
+    suspected = defaultdict(int)
+    pending = list(inputs)
+    while pending:
+        isolated = [item for item in pending if suspected[item] > 1]
+        shared = [item for item in pending if suspected[item] <= 1]
+        pending = []
+        for path, stem in isolated:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                future = executor.submit(convertFile, path, stem, *convert_args)
+                try:
+                    record(future.result())
+                except BrokenProcessPool:
+                    record(FileResult(path, False, 0., 0, [], "worker process terminated abruptly"))
+        if shared:
+            suspects, unsubmitted = _convertInPool(shared, jobs, convert_args, record)
+            for item in suspects:
+                suspected[item] += 1
+            pending = suspects + unsubmitted
+    return results
+# end def
+
+
+def parseArgs(argv=None):
+    parser = argparse.ArgumentParser(prog='cadnano-batch',
+                                     description="Convert cadnano designs and export staple "
+                                                 "sequences without the GUI.")
+    parser.add_argument("inputs", nargs='+', metavar="PATH",
+                        help="design files, or directories searched for %s files" %
+                             ", ".join(INPUT_EXTENSIONS))
+    parser.add_argument("--output-dir", "-o", default='.',
+                        help="directory to write outputs to (default: current directory)")
+    parser.add_argument("--format", "-f", choices=('json', 'cn5'), dest='out_format',
+                        help="convert each design to this format")
+    parser.add_argument("--staples", "-s", action="store_true",
+                        help="write the staple sequences of each design to a .csv file")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="number of worker processes (default: number of CPUs)")
+    parser.add_argument("--quiet", "-q", action="store_true",
+                        help="only print failures and the summary")
+    argns = parser.parse_args(argv)
+    if argns.out_format is None and not argns.staples:
+        parser.error("nothing to do, pass --format and/or --staples")
+    if argns.jobs is not None and argns.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return argns
+# end def
+
+
+def main(argv=None):
+    argns = parseArgs(argv)
+    inputs = collectInputs(argns.inputs)
+    num_files = len(inputs)
+    done = [0]
+
+    def report(result):
+        done[0] += 1
+        if not result.ok:
+            print("[%d/%d] FAILED %s (%.1f ms)\n%s" %
+                  (done[0], num_files, result.path, result.seconds*1e3, result.error))
+        elif not argns.quiet:
+            print("[%d/%d] ok     %s (%.1f ms)" %
+                  (done[0], num_files, result.path, result.seconds*1e3))
+        sys.stdout.flush()
+
+    t0 = time.perf_counter()
+    results = runBatch(inputs, argns.output_dir, argns.out_format, argns.staples,
+                       argns.jobs, report)
+    elapsed = time.perf_counter() - t0
+    failures = [result for result in results if not result.ok]
+    megabytes = sum(result.size for result in results) / float(1 << 20)
+    rate = 1. / elapsed if elapsed > 0 else 0.
+    print("%d files, %d failed, %.2f MB in %.2f s: %.1f files/s, %.2f MB/s" %
+          (num_files, len(failures), megabytes, elapsed, num_files*rate, megabytes*rate))
+    return 1 if failures else 0
+# end def
+
+
+if __name__ == '__main__':
+    # allow running from a source checkout as `python cadnano/bin/batch.py`
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))))
+    sys.exit(main())
@@ -1,12 +1,22 @@
 # -*- coding: utf-8 -*-
-from cadnano.cnproxy import BaseObject
+from cadnano.cnproxy import BaseObject, batchSignals
 
 
 class CNObject(BaseObject):
+    __slots__ = ()
+
     def __init__(self, parent):
         super(CNObject, self).__init__(parent)
 
     def undoStack(self):
         return self._document.undoStack()
     # end def
+
+    def batchSignals(self):
+        """Context manager queueing signal emissions until it exits, see
+        :func:`cadnano.cnproxy.batchSignals`.  Headless only, the Qt signals
+        of the GUI are not batched
+        """
+        return batchSignals()
+    # end def
 # end class
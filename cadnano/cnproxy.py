@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+from collections import defaultdict
+from contextlib import contextmanager
 
 from cadnano import undostack
 from cadnano import undocommand
@@ -9,7 +11,7 @@ class ProxyObject(object):
 
     def __init__(self, parent):
         self._parent = parent
-        self._signals = {}
+        self._signals = None    # created on the first connect
     # end def
 
     def parent(self):
@@ -23,6 +25,8 @@ class ProxyObject(object):
     def connect(self, sender, bsignal, method):
         f = lambda x, y: method(x, *y)
         bsignal.connect(method, sender=sender)
+        if self._signals is None:
+            self._signals = {}
         self._signals[(sender, bsignal, method)] = f
 
     def disconnect(self, sender, bsignal, method):
@@ -31,7 +35,7 @@ class ProxyObject(object):
         del self._signals[(sender, bsignal, method)]
 
     def signals(self):
-        return self._signals
+        return {} if self._signals is None else self._signals
     # end def
 
     def deleteLater(self):
@@ -56,10 +60,139 @@ class DummySignal(object):
         self.targets.remove(target)
 
     def emit(self, *args):
+        if _signal_batch is not None:
+            _signal_batch.queue(self, args)
+            return
         for t in self.targets:
             t(*args)
 # end class
 
+
+# signals that ask receivers to refresh from the model rather than report an
+# event, and the number of leading arguments naming what to refresh.  In a
+# batch a later emission with the same leading arguments replaces an
+# earlier one, as the receivers will see the final model state either way
+COALESCED_SIGNALS = {
+    'strandUpdateSignal': 1,
+    'strandHasNewOligoSignal': 1,
+    'strandResizedSignal': 1,
+    'strandSelectedChangedSignal': 1,
+    'oligoPropertyChangedSignal': 2,
+    'oligoSequenceAddedSignal': 1,
+    'oligoSequenceClearedSignal': 1,
+    'partStrandChangedSignal': 2,
+    'partZDimensionsChangedSignal': 1,
+    'partActiveBaseInfoSignal': 1,
+    'partActiveVirtualHelixChangedSignal': 1,
+    'documentClearSelectionsSignal': 1,
+}
+
+
+class SignalBatch(object):
+    """Emissions of :class:`DummySignal` queued by `batchSignals`.
+
+    Emissions are delivered in the order they were made, except that one of
+    `COALESCED_SIGNALS` replaces any earlier emission with the same key and
+    is delivered in place of the last one.
+
+    Attributes:
+        emitted (dict): signal name: number of emissions made
+        delivered (dict): signal name: number of emissions delivered
+    """
+    def __init__(self):
+        self._queue = {}    # key: (signal, args), ordered by last emission
+        self._count = 0     # unique keys of emissions that are not coalesced
+        self.emitted = defaultdict(int)
+        self.delivered = defaultdict(int)
+    # end def
+
+    def queue(self, signal, args):
+        name = signal.name
+        self.emitted[name] += 1
+        queue = self._queue
+        num_key_args = COALESCED_SIGNALS.get(name)
+        key = None
+        if num_key_args is not None:
+            key = (signal, args[:num_key_args])
+            try:
+                queue.pop(key, None)
+            except TypeError:   # unhashable arguments are never coalesced
+                key = None
+        if key is None:
+            key = self._count
+            self._count += 1
+        queue[key] = (signal, args)
+    # end def
+
+    def flush(self):
+        """Deliver the queued emissions and empty the queue
+        """
+        queue = self._queue
+        self._queue = {}
+        delivered = self.delivered
+        for signal, args in queue.values():
+            delivered[signal.name] += 1
+            for t in list(signal.targets):
+                t(*args)
+    # end def
+
+    def saved(self):
+        """
+        Returns:
+            dict: signal name: number of emissions coalesced away, for the
+            signals that had any
+        """
+        delivered = self.delivered
+        return {name: count - delivered[name] for name, count in self.emitted.items()
+                if count > delivered[name]}
+    # end def
+# end class
+
+_signal_batch = None
+
+
+@contextmanager
+def batchSignals():
+    """Queue the emissions of every :class:`DummySignal` until the
+    outermost `batchSignals` exits, then deliver them, see
+    :class:`SignalBatch`.
+
+    Batching is headless only.  Signals of other types, such as the
+    pyqtSignal used by the GUI, are delivered immediately as before, as a
+    bound pyqtSignal can't be intercepted and `QObject.blockSignals` would
+    drop, not defer, every signal of an object.  In the GUI the context is
+    a no-op that yields an empty :class:`SignalBatch`
+
+    Yields:
+        SignalBatch: of the outermost `batchSignals`
+    """
+    global _signal_batch
+    if _signal_batch is not None:
+        yield _signal_batch
+        return
+    batch = _signal_batch = SignalBatch()
+    try:
+        yield batch
+    finally:
+        _signal_batch = None
+        batch.flush()
+# end def
+
+
+def hasReceivers(signal):
+    """Whether emitting `signal` can reach a slot.  Only a
+    :class:`DummySignal` can tell, other signal types always return True
+
+    Args:
+        signal: a class level signal
+
+    Returns:
+        bool:
+    """
+    targets = getattr(signal, 'targets', None)
+    return targets is None or len(targets) > 0
+# end def
+
 ProxySignal = DummySignal
 BaseObject = ProxyObject
 UndoCommand = undocommand.UndoCommand
@@ -18,7 +18,12 @@ from cadnano.part.nucleicacidpart import NucleicAcidPart
 from cadnano.strand import Strand
 from cadnano import setBatch
 from cadnano.fileio.nnodecode import decodeFile
-from cadnano.fileio.nnoencode import encodeToFile
+from cadnano.fileio.nnoencode import encodeToFile, IncrementalEncoder
+
+UNDO_BYTE_LIMIT = 256*(1 << 20)
+"""Estimated bytes of undo history a Document keeps without Qt, see
+:meth:`cadnano.undostack.UndoStack.setByteLimit`.  The GUI's QUndoStack
+keeps a count limit instead"""
 
 class Document(CNObject):
     """
@@ -37,7 +42,15 @@ class Document(CNObject):
         super(Document, self).__init__(parent)
 
         self._undostack = us = UndoStack()  # notice NO parent, what does this mean?
-        us.setUndoLimit(30)
+        if hasattr(us, 'setByteLimit'):
+            # limit the history by its size rather than its length
+            us.setUndoLimit(0)
+            us.setByteLimit(UNDO_BYTE_LIMIT)
+        else:
+            # QUndoStack can't drop its oldest commands once it has any, as
+            # setUndoLimit only applies to an empty stack, so the GUI has no
+            # byte budget or spilling and keeps a command count limit
+            us.setUndoLimit(30)
         self._children = set()     # for storing a reference to Parts (and Assemblies)
         self._instances = set()    # for storing instances of Parts (and Assemblies)
         self._controller = None
@@ -45,8 +58,11 @@ class Document(CNObject):
         # the dictionary maintains what is selected
         self._selection_dict = {}
         self._active_part = None
+        self._lazy_parts = []      # undecoded parts of a file read with `lazy`
+        self._is_decoding_lazy_part = False
 
         self._filename = None
+        self._file_encoder = IncrementalEncoder()  # reused between saves
 
         # the added list is what was recently selected or deselected
         self._strand_selected_changed_dict = {}
@@ -117,6 +133,7 @@ class Document(CNObject):
     def removeAllChildren(self):
         """Used to reset the document. Not undoable."""
         self.documentClearSelectionsSignal.emit(self)
+        self._lazy_parts = []
         for child in list(self._children):
             child.remove(use_undostack=True)
         self.undoStack().clear()
@@ -152,6 +169,15 @@ class Document(CNObject):
     # end def
 
     def activePart(self):
+        """The active Part.  If there is none yet and the document was read
+        with `lazy`, the first undecoded part is decoded to become active
+
+        Returns:
+            Part or None:
+        """
+        if (self._active_part is None and self._lazy_parts and
+                not self._is_decoding_lazy_part):
+            self.decodeLazyPart(self._lazy_parts[0])
         return self._active_part
     # end def
 
@@ -175,22 +201,67 @@ class Document(CNObject):
 
     def writeToFile(self, filename):
         """ Convenience wrapper for `encodeToFile` to set the `document`
-        argument to `self`
+        argument to `self`.  Repeated saves only re-encode the virtual
+        helices and oligos changed since the previous save
 
         Args:
             filename (str): full path file name
         """
-        encodeToFile(filename, self)
+        encodeToFile(filename, self, encoder=self._file_encoder)
     # end def
 
-    def readFile(self, filename):
+    def readFile(self, filename, lazy=False):
         """ Convenience wrapper for `decodeFile` to always emit_signals and
         set the `document` argument to `self`
 
         Args:
             filename (str): full path file name
+            lazy (bool): optional, see `decodeFile`
         """
-        return decodeFile(filename, document=self, emit_signals=True)
+        return decodeFile(filename, document=self, emit_signals=True, lazy=lazy)
+    # end def
+
+    def lazyParts(self):
+        """Get the parts of a file read with `lazy` that have not been
+        decoded yet, in file order
+
+        Returns:
+            list: of :class:`cadnano.fileio.lazypart.LazyPart`
+        """
+        return list(self._lazy_parts)
+    # end def
+
+    def addLazyPart(self, lazy_part):
+        """Hold an undecoded part of a file until `decodeLazyPart`
+
+        Args:
+            lazy_part (LazyPart):
+        """
+        self._lazy_parts.append(lazy_part)
+    # end def
+
+    def decodeLazyPart(self, lazy_part):
+        """Decode a part held by `addLazyPart` into a Part of this document,
+        with the modification instances on it.  The part becomes the active
+        Part
+
+        Args:
+            lazy_part (LazyPart):
+
+        Returns:
+            Part: the decoded Part
+        """
+        self._lazy_parts.remove(lazy_part)
+        self._is_decoding_lazy_part = True
+        try:
+            with self.batchSignals():
+                part = lazy_part.decode(self)
+                for key, mid in lazy_part.modLocations():
+                    _, strand, idx = self.getModStrandIdx(key)
+                    part.addModStrandInstance(strand, idx, mid)
+        finally:
+            self._is_decoding_lazy_part = False
+        return part
     # end def
 
     # def assemblies(self):
@@ -504,8 +575,15 @@ class Document(CNObject):
         on xoverlist as part of its own macroed command for isoluation
         purposes. Finally, calls removeStrand on all strands that were
         fully selected (low and high), or had at least one non-xover
-        endpoint selected.
+        endpoint selected.  The signals of the deletions are batched when
+        running headless, see :meth:`CNObject.batchSignals`
         """
+        # no effect in the GUI, whose Qt signals are delivered at once
+        with self.batchSignals():
+            self._deleteStrandSelection(use_undostack)
+    # end def
+
+    def _deleteStrandSelection(self, use_undostack):
         xoList = []
         strand_dict = {}
         for strandset_dict in self._selection_dict.values():
@@ -670,24 +748,40 @@ class Document(CNObject):
     # end def
 
     # PUBLIC METHODS FOR EDITING THE MODEL #
-    def createNucleicAcidPart(self, use_undostack=True):
+    def createNucleicAcidPart(self, use_undostack=True, uuid=None):
         """ Create and store a new DnaPart and instance, and return the instance.
 
         Args:
             use_undostack (bool): optional, defaults to True
+            uuid (str): optional, uuid of a part read from a file, a new one
+                by default or if a Part of the document already has it
         """
-        dnapart = NucleicAcidPart(document=self)
+        if uuid is not None and any(isinstance(item, Part) and item.uuid == uuid
+                                    for item in self._children):
+            uuid = None
+        if uuid is None:
+            dnapart = NucleicAcidPart(document=self)
+        else:
+            dnapart = NucleicAcidPart(document=self, uuid=uuid)
         self._addPart(dnapart, use_undostack=use_undostack)
         return dnapart
     # end def
 
 
-    def getParts(self):
+    def getParts(self, decode_lazy=True):
         """Get all child `Part` in the document
 
+        Args:
+            decode_lazy (bool): optional, first decode the parts of a file
+                read with `lazy` that are not decoded yet.  Encoders pass
+                False and write those with `lazyParts`.  Default True
+
         Yields:
             Part: the next Part in the the list of children
         """
+        if decode_lazy:
+            for lazy_part in self.lazyParts():
+                self.decodeLazyPart(lazy_part)
         for item in self._children:
             if isinstance(item, Part):
                 yield item
@@ -705,6 +799,9 @@ class Document(CNObject):
         for item in self._children:
             if isinstance(item, Part) and item.uuid == uuid:
                 return item
+        for lazy_part in self._lazy_parts:
+            if lazy_part.uuid == uuid:
+                return self.decodeLazyPart(lazy_part)
     # end def
 
     # PUBLIC SUPPORT METHODS #
@@ -891,6 +988,25 @@ class Document(CNObject):
         return res
     # end def
 
+    def addModLocation(self, mid, key):
+        """Add an external instance of a modification read from a file.  If
+        the part of it is not decoded yet, see `lazyParts`, the location is
+        only recorded and the instance is added when the part is decoded
+
+        Args:
+            mid (str): modification id string
+            key (str): Mod key, see `getModStrandIdx`
+        """
+        part_uuid = key.split(',')[0]
+        for lazy_part in self._lazy_parts:
+            if lazy_part.uuid == part_uuid:
+                lazy_part.addModLocation(key, mid)
+                self.getModLocationsSet(mid, False).add(key)
+                return
+        part, strand, idx = self.getModStrandIdx(key)
+        part.addModStrandInstance(strand, idx, mid)
+    # end def
+
     def getModStrandIdx(self, key):
         """ Convert a key of a mod instance relative to a part
         to a part, a strand and an index
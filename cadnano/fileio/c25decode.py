@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 from collections import defaultdict
+
+import numpy as np
+
 from cadnano.cnenum import StrandType, LatticeType
 from cadnano.part.refresholigoscmd import RefreshOligosCommand
 
@@ -9,6 +12,7 @@ from cadnano.color import intToColorHex
 from cadnano.part.nucleicacidpart import DEFAULT_RADIUS
 
 from .lattice import HoneycombDnaPart, SquareDnaPart
+from .legacystrands import THREE_VH, THREE_IDX, baseArray, readStrands, readInsertions
 
 # hard code these for version changes
 PATH_BASE_WIDTH = 10
@@ -24,17 +28,31 @@ def decode(document, obj, emit_signals=True):
     """
     Parses a dictionary (obj) created from reading a json file and uses it
     to populate the given document with model data.
+
+    `obj['vstrands']` is only iterated, twice, and never indexed, so it can be
+    a :class:`cadnano.fileio.jsonstream.StreamedArray` that decodes one helix
+    at a time
     """
-    num_bases = len(obj['vstrands'][0]['fwd_ss'])
+    encoded_keys = ['eulerZ', 'repeats', 'bases_per_repeat',
+                    'turns_per_repeat', 'z']
+    model_keys = ['eulerZ', 'repeat_hint', 'bases_per_repeat',
+                    'turns_per_repeat', 'z']
+    vstrands = obj['vstrands']
+    # only the lattice position and properties of each helix are kept
+    # between passes
+    helix_headers = [(helix['num'], helix['row'], helix['col'], len(helix['fwd_ss']),
+                      [helix[key] for key in encoded_keys])
+                     for helix in vstrands]
+    num_bases = helix_headers[0][3]
 
     lattice_type = LatticeType.HONEYCOMB
 
     part = None
     # DETERMINE MAX ROW,COL
     max_row_json = max_col_json = 0
-    for helix in obj['vstrands']:
-        max_row_json = max(max_row_json, int(helix['row']) + 1)
-        max_col_json = max(max_col_json, int(helix['col']) + 1)
+    for vh_num, row, col, _, _ in helix_headers:
+        max_row_json = max(max_row_json, int(row) + 1)
+        max_col_json = max(max_col_json, int(col) + 1)
 
     # CREATE PART ACCORDING TO LATTICE TYPE
     if lattice_type == LatticeType.HONEYCOMB:
@@ -57,13 +75,11 @@ def decode(document, obj, emit_signals=True):
     min_col, max_col = 10000, -10000
 
     # find row, column limits
-    for helix in obj['vstrands']:
-        row = helix['row']
+    for vh_num, row, col, _, _ in helix_headers:
         if row < min_row:
             min_row = row
         if row > max_row:
             max_row = row
-        col = helix['col']
         if col < min_col:
             min_col = col
         if col > max_col:
@@ -81,34 +97,29 @@ def decode(document, obj, emit_signals=True):
     # print("\trows(%d, %d): avg: %d" % (min_row, max_row, delta_row))
     # print("\tcolumns(%d, %d): avg: %d" % (min_col, max_col, delta_column))
 
-    encoded_keys = ['eulerZ', 'repeats', 'bases_per_repeat',
-                    'turns_per_repeat', 'z']
-    model_keys = ['eulerZ', 'repeat_hint', 'bases_per_repeat',
-                    'turns_per_repeat', 'z']
-    for helix in obj['vstrands']:
-        vh_num = helix['num']
-        row = helix['row']
-        col = helix['col']
+    for vh_num, row, col, _, props in helix_headers:
         # align row and columns to the center 0, 0
         coord = (row -  delta_row, col - delta_column)
         vh_num_to_coord[vh_num] = coord
         ordered_id_list.append(vh_num)
-        property_dict[vh_num] = [helix[key] for key in encoded_keys]
+        property_dict[vh_num] = props
     # end for
 
     radius = DEFAULT_RADIUS
-    for vh_num in sorted(vh_num_to_coord.keys()):
-        row, col = vh_num_to_coord[vh_num]
-        x, y = doLattice(radius, row, col)
+    vh_nums = sorted(vh_num_to_coord.keys())
+    vh_origins = []
+    for vh_num in vh_nums:
+        x, y = doLattice(radius, *vh_num_to_coord[vh_num])
         props = property_dict[vh_num]
         z = convertToModelZ(props[-1])
         props[-1] = z
-        # print("%d:" % vh_num, x, y, z)
-        # print({k:v for k, v in zip(encoded_keys, props)})
-        part.createVirtualHelix(x, y, z, num_bases,
-                                id_num=vh_num,
-                                properties=(model_keys, props),
-                                use_undostack=False)
+        vh_origins.append((x, y, z))
+    properties = {key: [property_dict[vh_num][i] for vh_num in vh_nums]
+                  for i, key in enumerate(model_keys)}
+    part.createVirtualHelices(vh_origins, sizes=num_bases,
+                              id_nums=vh_nums,
+                              properties=properties,
+                              use_undostack=False)
     if not getReopen():
         setBatch(False)
     part.setImportedVHelixOrder(ordered_id_list)
@@ -119,12 +130,13 @@ def decode(document, obj, emit_signals=True):
     setBatch(False)
 
     # INSTALL STRANDS AND COLLECT XOVER LOCATIONS
-    fwd_ss_seg = defaultdict(list)
     fwd_ss_xo = defaultdict(list)
-    rev_ss_seg = defaultdict(list)
     rev_ss_xo = defaultdict(list)
+    # sparse per helix data applied once the oligos are complete
+    insert_deletions = defaultdict(list)
+    colors = {}
     try:
-        for helix in obj['vstrands']:
+        for helix in vstrands:
             vh_num = helix['num']
             row, col = vh_num_to_coord[vh_num]
             insertions = helix['insertions']
@@ -146,47 +158,21 @@ def decode(document, obj, emit_signals=True):
                     len(fwd_ss) == len(insertions) and
                     len(insertions) == len(deletions) )
 
-            # read fwd_strandset segments and xovers
-            for i in range(len(fwd_ss)):
-                five_vh, five_strand, five_idx, three_vh, three_strand, three_idx = fwd_ss[i]
-
-                if five_vh == -1 and three_vh == -1:
-                    continue  # null base
-                if isSegmentStartOrEnd(StrandType.SCAFFOLD, vh_num, i,
-                                        five_vh, five_idx, three_vh, three_idx):
-                    fwd_ss_seg[vh_num].append(i)
-                if five_vh != vh_num and three_vh != vh_num:  # special case
-                    fwd_ss_seg[vh_num].append(i)  # end segment on a double crossover
-                if is3primeXover(StrandType.SCAFFOLD, vh_num, i, three_vh, three_idx):
-                    fwd_ss_xo[vh_num].append((i, three_vh, three_strand, three_idx))
-            assert (len(fwd_ss_seg[vh_num]) % 2 == 0)
-
-            # install fwd_strandset segments
-            for i in range(0, len(fwd_ss_seg[vh_num]), 2):
-                low_idx = fwd_ss_seg[vh_num][i]
-                high_idx = fwd_ss_seg[vh_num][i + 1]
-                fwd_strandset.createStrand(low_idx, high_idx, use_undostack=False)
-
-            # read rev_strandset segments and xovers
-            for i in range(len(rev_ss)):
-                five_vh, five_strand, five_idx, three_vh, three_strand, three_idx = rev_ss[i]
-                if five_vh == -1 and three_vh == -1:
-                    continue  # null base
-                if isSegmentStartOrEnd(StrandType.STAPLE, vh_num, i,
-                                        five_vh, five_idx, three_vh, three_idx):
-                    rev_ss_seg[vh_num].append(i)
-                if five_vh != vh_num and three_vh != vh_num:  # special case
-                    rev_ss_seg[vh_num].append(i)  # end segment on a double crossover
-                if is3primeXover(StrandType.STAPLE, vh_num, i, three_vh, three_idx):
-                    rev_ss_xo[vh_num].append((i, three_vh, three_strand, three_idx))
-            assert (len(rev_ss_seg[vh_num]) % 2 == 0)
-
-            # install rev_strandset segments
-            for i in range(0, len(rev_ss_seg[vh_num]), 2):
-                low_idx = rev_ss_seg[vh_num][i]
-                high_idx = rev_ss_seg[vh_num][i + 1]
-                rev_strandset.createStrand(low_idx, high_idx, use_undostack=False)
+            for strand_type, records, strandset, strand_xo in (
+                    (StrandType.SCAFFOLD, fwd_ss, fwd_strandset, fwd_ss_xo),
+                    (StrandType.STAPLE, rev_ss, rev_strandset, rev_ss_xo)):
+                records = np.array(records, dtype=np.int64)
+                bases = baseArray(records, columns=(0, 2, 3, 5))
+                segments, xover_idxs = readStrands(bases, vh_num, strand_type)
+                strand_xo[vh_num] = list(zip(xover_idxs.tolist(),
+                                             bases[xover_idxs, THREE_VH].tolist(),
+                                             records[xover_idxs, 4].tolist(),
+                                             bases[xover_idxs, THREE_IDX].tolist()))
+                strandset.loadStrands(segments.tolist())
             part.refreshSegments(vh_num)
+
+            insert_deletions[vh_num] = readInsertions(insertions, deletions)
+            colors[vh_num] = helix['colors']
         # end for
     except AssertionError:
         print("Unrecognized file format.")
@@ -196,8 +182,7 @@ def decode(document, obj, emit_signals=True):
     parity matters for the from idx but is already encoded in
     the `to_strand3p` parameter of the tuple in `fwd_ss_xo` and `rev_ss_xo`
     """
-    for helix in obj['vstrands']:
-        vh_num = helix['num']
+    for vh_num, _, _, _, _ in helix_headers:
         row, col = vh_num_to_coord[vh_num]
         if isEven(row, col):
             fwd_strandset, rev_strandset = part.getStrandSets(vh_num)
@@ -238,30 +223,23 @@ def decode(document, obj, emit_signals=True):
     # need to heal all oligo connections into a continuous
     # oligo for the next steps
     RefreshOligosCommand(part).redo()
+    for oligo in part.oligos():     # loadStrands adds them silently
+        part.partOligoAddedSignal.emit(part, oligo)
 
     # COLORS, INSERTIONS, deletions
-    for helix in obj['vstrands']:
-        vh_num = helix['num']
-        row, col = vh_num_to_coord[vh_num]
-        fwd_ss = helix['fwd_ss']
-        rev_ss = helix['rev_ss']
-        insertions = helix['insertions']
-        deletions = helix['deletions']
-
+    for vh_num, _, _, _, _ in helix_headers:
         fwd_strandset, rev_strandset = part.getStrandSets(vh_num)
 
         # install insertions and deletions
-        for base_idx in range(len(rev_ss)):
-            sum_of_insert_deletion = insertions[base_idx] + deletions[base_idx]
-            if sum_of_insert_deletion != 0:
-                strand = fwd_strandset.getStrand(base_idx)
-                strand.addInsertion(base_idx,
-                                    sum_of_insert_deletion,
-                                    use_undostack=False)
+        for base_idx, sum_of_insert_deletion in insert_deletions[vh_num]:
+            strand = fwd_strandset.getStrand(base_idx)
+            strand.addInsertion(base_idx,
+                                sum_of_insert_deletion,
+                                use_undostack=False)
         # end for
 
         # populate colors
-        for strand_type, base_idx, color in helix['colors']:
+        for strand_type, base_idx, color in colors[vh_num]:
             strandset = fwd_strandset if strand_type == 0 else rev_strandset
             strand = strandset.getStrand(base_idx)
             strand.oligo().applyColor(color, use_undostack=False)
@@ -298,59 +276,3 @@ def decode(document, obj, emit_signals=True):
                 print(strand, idx)
                 raise
 # end def
-
-def isSegmentStartOrEnd(strandtype, vh_num, base_idx,
-                        five_vh, five_idx,
-                        three_vh, three_idx):
-    """
-    Returns:
-        bool: True if the base is a breakpoint or crossover.
-    """
-    if strandtype == StrandType.SCAFFOLD:
-        offset = 1
-    else:
-        offset = -1
-    if five_vh == vh_num and three_vh != vh_num:
-        return True
-    if five_vh != vh_num and three_vh == vh_num:
-        return True
-    if (vh_num % 2 == 0 and five_vh == vh_num and
-        five_idx != base_idx - offset):
-        return True
-    if (vh_num % 2 == 0 and three_vh == vh_num and
-        three_idx != base_idx + offset):
-        return True
-    if (vh_num % 2 == 1 and five_vh == vh_num and
-        five_idx != base_idx + offset):
-        return True
-    if (vh_num % 2 == 1 and three_vh == vh_num and
-        three_idx != base_idx - offset):
-        return True
-    if five_vh == -1 and three_vh != -1:
-        return True
-    if five_vh != -1 and three_vh == -1:
-        return True
-    return False
-# end def
-
-def is3primeXover(strandtype, vh_num, base_idx, three_vh, three_idx):
-    """
-    Returns:
-        bool: True of the three_vh doesn't match vh_num, or three_idx
-                is not a natural neighbor of base_idx.
-    """
-    if three_vh == -1:
-        return False
-    if vh_num != three_vh:
-        return True
-    if strandtype == StrandType.SCAFFOLD:
-        offset = 1
-    else:
-        offset = -1
-    if (vh_num % 2 == 0 and three_vh == vh_num and
-        three_idx != base_idx + offset):
-        return True
-    if (vh_num % 2 == 1 and three_vh == vh_num and
-        three_idx != base_idx - offset):
-        return True
-# end def
\ No newline at end of file
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""Reading of the binary (.cn5) native file format, see
+:mod:`cadnano.fileio.cn5encode` for the layout
+"""
+import io
+import json
+from collections import defaultdict
+
+import numpy as np
+
+from cadnano.cnenum import PointType
+from cadnano.part.refresholigoscmd import RefreshOligosCommand
+from cadnano.part.vhpropertystore import NEIGHBORS_KEY
+from .cn5encode import MAGIC, FORMAT_VERSION, PREAMBLE
+from .lazypart import CN5LazyPart
+
+
+def dtypeFromJSON(spec):
+    """Inverse of :func:`cadnano.fileio.cn5encode.dtypeToJSON`
+
+    Returns:
+        numpy.dtype:
+    """
+    if isinstance(spec, dict):
+        return np.dtype({'names': spec['names'], 'formats': spec['formats']})
+    return np.dtype(spec)
+# end def
+
+
+class CN5File(object):
+    """A .cn5 file opened with `numpy.memmap`.  Sections are read only array
+    views into the mapping, so opening a file and reading a few sections does
+    not read the rest of it
+
+    Args:
+        filename (str): full path file name
+
+    Attributes:
+        header (dict): the decoded JSON header
+
+    Raises:
+        IOError: not a .cn5 file or an unsupported version
+    """
+    def __init__(self, filename):
+        with io.open(filename, 'rb') as fd:
+            preamble = fd.read(PREAMBLE.size)
+            if len(preamble) != PREAMBLE.size:
+                raise IOError("{} is not a cn5 file".format(filename))
+            magic, version, header_offset, header_size = PREAMBLE.unpack(preamble)
+            if magic != MAGIC:
+                raise IOError("{} is not a cn5 file".format(filename))
+            if version > FORMAT_VERSION:
+                raise IOError("cn5 version {} of {} is not supported".format(version, filename))
+            fd.seek(header_offset)
+            self.header = json.loads(fd.read(header_size).decode('utf-8'))
+        self._data = np.memmap(filename, dtype=np.uint8, mode='r')
+    # end def
+
+    def partCount(self):
+        """
+        Returns:
+            int: number of parts in the file
+        """
+        return len(self.header['parts'])
+    # end def
+
+    def partHeader(self, part_index):
+        """
+        Returns:
+            dict: JSON properties of the part
+        """
+        return self.header['parts'][part_index]
+    # end def
+
+    def hasSection(self, part_index, name):
+        return name in self.header['parts'][part_index]['sections']
+    # end def
+
+    def section(self, part_index, name):
+        """
+        Args:
+            part_index (int): index of the part in the file
+            name (str): section name
+
+        Returns:
+            ndarray: read only view of the section
+
+        Raises:
+            KeyError:
+        """
+        info = self.header['parts'][part_index]['sections'][name]
+        dtype = dtypeFromJSON(info['dtype'])
+        shape = tuple(info['shape'])
+        offset = info['offset']
+        count = int(np.prod(shape, dtype=np.int64))
+        buffer = self._data[offset:offset + count*dtype.itemsize]
+        return buffer.view(dtype).reshape(shape)
+    # end def
+
+    def textSection(self, part_index, name):
+        """Decode a section stored as `<name>.offsets` and `<name>.data` of
+        utf-8 text
+
+        Returns:
+            list: of :obj:`str`
+        """
+        offsets = self.section(part_index, name + '.offsets').tolist()
+        data = self.section(part_index, name + '.data').tobytes()
+        return [data[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+    # end def
+
+    def raggedSection(self, part_index, name):
+        """Split a section stored as `<name>.offsets` and `<name>.data`
+
+        Returns:
+            list: of :obj:`ndarray`
+        """
+        offsets = self.section(part_index, name + '.offsets')
+        data = self.section(part_index, name + '.data')
+        return np.split(data, offsets[1:-1])
+    # end def
+# end class
+
+
+def decodeFile(filename, document=None, emit_signals=False, lazy=False):
+    """Decode a .cn5 file into a Document
+
+    Args:
+        filename (str): full path file name
+        document (Document): optional, Document to decode into
+        emit_signals (bool): optional, whether to emit signals while decoding
+        lazy (bool): optional, hold the parts undecoded in `document`, see
+            :mod:`cadnano.fileio.lazypart`
+
+    Returns:
+        Document:
+    """
+    if document is None:
+        from cadnano.document import Document
+        document = Document()
+    cn5_file = CN5File(filename)
+    for part_index in range(cn5_file.partCount()):
+        if lazy:
+            document.addLazyPart(CN5LazyPart(cn5_file, part_index, emit_signals=emit_signals))
+        else:
+            decodePart(document, cn5_file, part_index, emit_signals=emit_signals)
+
+    modifications = cn5_file.header['modifications']
+    for mod_id, item in modifications.items():
+        document.createMod(item['props'], mod_id)
+        ext_locations = item['ext_locations']
+        for key in ext_locations:
+            document.addModLocation(mod_id, key)
+    return document
+# end def
+
+
+def decodePart(document, cn5_file, part_index, emit_signals=False):
+    """Decode one part of a :class:`CN5File`.  Mirrors
+    :func:`cadnano.fileio.v3decode.decodePart`, but reads typed sections
+    instead of lists and restores the stored `eulerZ` of each helix
+
+    Args:
+        document (Document):
+        cn5_file (CN5File):
+        part_index (int): index of the part in the file
+        emit_signals (bool): optional, whether to emit signals while decoding
+    """
+    part_header = cn5_file.partHeader(part_index)
+    section = lambda name: cn5_file.section(part_index, name)
+    part = document.createNucleicAcidPart(use_undostack=False, uuid=part_header.get('uuid'))
+    part.setActive(True)
+
+    id_nums = section('vh_ids').tolist()
+    sizes = section('vh_sizes').tolist()
+    if part_header.get('point_type') == PointType.ARBITRARY:
+        # TODO add code to deserialize parts
+        pass
+    elif id_nums:
+        text_keys = part_header['text_property_keys']
+        properties = {}
+        for key in part_header['property_keys']:
+            name = 'prop.' + key
+            if key == NEIGHBORS_KEY:
+                properties[key] = cn5_file.raggedSection(part_index, name)
+            elif key in text_keys:
+                properties[key] = cn5_file.textSection(part_index, name)
+            else:
+                properties[key] = section(name)
+        vh_origins = np.empty((len(id_nums), 3))
+        vh_origins[:, :2] = section('origins')
+        vh_origins[:, 2] = properties['z']
+        part.createVirtualHelices(vh_origins, sizes=sizes,
+                                  id_nums=id_nums,
+                                  properties=properties,
+                                  safe=False,
+                                  use_undostack=False)
+        # zoom to fit
+        if emit_signals:
+            part.partZDimensionsChangedSignal.emit(part, *part.zBoundsIds(), True)
+
+    colors = part_header['colors']
+    strands = section('strands')
+    fwd_strandsets = part.fwd_strandsets
+    rev_strandsets = part.rev_strandsets
+    # gather the strands of each strandset for one loadStrands call
+    strandset_idxs = defaultdict(list)
+    strandset_colors = defaultdict(list)
+    for id_num, is_fwd, low_idx, high_idx, color in zip(strands['id_num'].tolist(),
+                                                        strands['is_fwd'].tolist(),
+                                                        strands['low_idx'].tolist(),
+                                                        strands['high_idx'].tolist(),
+                                                        strands['color'].tolist()):
+        strandset = fwd_strandsets[id_num] if is_fwd else rev_strandsets[id_num]
+        strandset_idxs[strandset].append((low_idx, high_idx))
+        strandset_colors[strandset].append(colors[color])
+    for strandset, idxs in strandset_idxs.items():
+        strandset.loadStrands(idxs, strandset_colors[strandset])
+    for id_num in id_nums:
+        part.refreshSegments(id_num)   # update segments
+
+    xovers = section('xovers')
+    for from_id, from_is_fwd, from_idx, to_id, to_is_fwd, to_idx in xovers.tolist():
+        from_strand = part.getStrand(from_is_fwd, from_id, from_idx)
+        to_strand = part.getStrand(to_is_fwd, to_id, to_idx)
+        part.createXover(   from_strand, from_idx,
+                            to_strand, to_idx,
+                            update_oligo=False,
+                            use_undostack=False)
+
+    RefreshOligosCommand(part).redo()
+    for oligo in part.oligos():     # loadStrands adds them silently
+        part.partOligoAddedSignal.emit(part, oligo)
+    # insertions first, so sequences are applied to the final oligo lengths
+    for id_num, idx, length in section('insertions').tolist():
+        strand = part.getStrand(True, id_num, idx)
+        if strand is None:
+            strand = part.getStrand(False, id_num, idx)
+        strand.addInsertion(idx, length, use_undostack=False)
+
+    oligos = section('oligos')
+    has_sequence = oligos['seq_length'] >= 0
+    if has_sequence.any():
+        sequences = section('sequences').tobytes()
+        # longest first, so staple sequences that are just the complement of
+        # an applied scaffold are left as they are instead of being padded
+        records = np.sort(oligos[has_sequence], order='seq_length')[::-1]
+        for id_num, idx, is_fwd, start, length in records[
+                ['id_num', 'idx5p', 'is_5p_fwd', 'seq_start', 'seq_length']].tolist():
+            oligo = part.getStrand(is_fwd, id_num, idx).oligo()
+            sequence = sequences[start:start + length].decode('utf-8')
+            if oligo.sequence() != sequence:
+                oligo.applySequence(sequence, use_undostack=False)
+
+    vh_order = part_header['virtual_helix_order']
+    if vh_order:
+        part.setImportedVHelixOrder(vh_order)
+    return part
+# end def
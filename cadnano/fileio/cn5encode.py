@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""Binary (.cn5) native file format.
+
+A .cn5 file holds the same model as the v3 JSON format, but every bulk
+table is stored as a fixed width, little endian NumPy array section that can
+be memory mapped on open.  Layout::
+
+    PREAMBLE    MAGIC, uint32 version, uint64 header offset, uint64 header size
+    SECTIONS    raw array data, each section aligned to SECTION_ALIGNMENT
+    HEADER      utf-8 JSON: document and part level properties plus, per
+                part, a table of {section name: {dtype, shape, offset}}
+
+Per part sections:
+
+    vh_ids, vh_sizes        (n,) int32
+    origins                 (n, 2) float64
+    prop.<key>              (n,) typed column of a virtual helix property
+    prop.<key>.offsets      (n + 1,) int64 into prop.<key>.data for text and
+    prop.<key>.data         `neighbors` properties (utf-8 bytes / int32)
+    strands                 STRAND_DTYPE records, colors index `colors`
+    xovers                  XOVER_DTYPE records
+    insertions              INSERTION_DTYPE records
+    oligos                  OLIGO_DTYPE records, sequences are slices of
+    sequences               uint8 utf-8 text
+"""
+import io
+import json
+import os
+import struct
+from datetime import datetime
+
+import numpy as np
+
+from cadnano.cnenum import PointType
+from cadnano.part.vhpropertystore import NEIGHBORS_KEY
+
+MAGIC = b'CN5\x00'
+FORMAT_VERSION = 1
+PREAMBLE = struct.Struct('<4sIQQ')
+SECTION_ALIGNMENT = 64
+_EMPTY_INT32 = np.zeros(0, dtype='<i4')
+
+STRAND_DTYPE = np.dtype([('id_num', '<i4'), ('is_fwd', 'u1'),
+                         ('low_idx', '<i4'), ('high_idx', '<i4'),
+                         ('color', '<u4')])
+XOVER_DTYPE = np.dtype([('from_id', '<i4'), ('from_is_fwd', 'u1'), ('from_idx', '<i4'),
+                        ('to_id', '<i4'), ('to_is_fwd', 'u1'), ('to_idx', '<i4')])
+INSERTION_DTYPE = np.dtype([('id_num', '<i4'), ('idx', '<i4'), ('length', '<i4')])
+OLIGO_DTYPE = np.dtype([('id_num', '<i4'), ('idx5p', '<i4'), ('is_5p_fwd', 'u1'),
+                        ('is_loop', 'u1'), ('is_visible', 'u1'), ('color', '<u4'),
+                        ('seq_start', '<i8'), ('seq_length', '<i8')])
+"""`seq_length` is -1 for an oligo without a sequence"""
+
+# part properties stored as sections rather than in the JSON header
+SECTION_PROPERTIES = ('virtual_helices', 'origins', 'vh_list', 'strands',
+                      'insertions', 'xovers', 'oligos')
+
+
+def dtypeToJSON(dtype):
+    """
+    Args:
+        dtype (numpy.dtype):
+
+    Returns:
+        object: :obj:`str` or :obj:`dict` of names and formats for records
+    """
+    if dtype.names is None:
+        return dtype.str
+    return {'names': list(dtype.names),
+            'formats': [dtype.fields[name][0].str for name in dtype.names]}
+# end def
+
+
+def textColumn(values):
+    """Pack :obj:`str` values into offsets and utf-8 data arrays
+
+    Returns:
+        tuple: (:obj:`ndarray` of int64 offsets, :obj:`ndarray` of uint8)
+    """
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype='<i8')
+    np.cumsum([len(x) for x in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8)
+# end def
+
+
+def _jsonDefault(obj):
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    raise TypeError("{} is not JSON serializable".format(type(obj)))
+# end def
+
+
+class _SectionWriter(object):
+    """Append aligned array sections to a binary file, recording their
+    location for the header
+    """
+    def __init__(self, fd):
+        self._fd = fd
+        self.sections = {}
+    # end def
+
+    def add(self, name, array, dtype=None):
+        array = np.ascontiguousarray(array, dtype=dtype)
+        fd = self._fd
+        offset = fd.tell()
+        padding = -offset % SECTION_ALIGNMENT
+        fd.write(b'\x00'*padding)
+        offset += padding
+        fd.write(array.tobytes())
+        self.sections[name] = {'dtype': dtypeToJSON(array.dtype),
+                               'shape': list(array.shape),
+                               'offset': offset}
+    # end def
+# end class
+
+
+def encodeToFile(filename, document):
+    """Write `document` to `filename` in the .cn5 format
+
+    Args:
+        filename (str): full path file name
+        document (Document):
+    """
+    # parts never decoded, see `Document.lazyParts`, may be read from a
+    # memory map of `filename`, which stays valid when it is replaced
+    tmp_filename = filename + '.tmp'
+    with io.open(tmp_filename, 'wb') as fd:
+        fd.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, 0, 0))
+        header = {'format': FORMAT_VERSION,
+                  'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                  'name': "",
+                  'parts': [],
+                  'modifications': document.modifications()}
+        for part in document.getParts(decode_lazy=False):
+            writer = _SectionWriter(fd)
+            part_header = encodePart(part, writer)
+            part_header['sections'] = writer.sections
+            header['parts'].append(part_header)
+        for lazy_part in document.lazyParts():
+            writer = _SectionWriter(fd)
+            part_header = lazy_part.writeSections(writer)
+            if part_header is None:     # e.g. from a v3 file
+                writer = _SectionWriter(fd)
+                part_header = encodePart(document.decodeLazyPart(lazy_part), writer)
+            part_header['sections'] = writer.sections
+            header['parts'].append(part_header)
+        header_offset = fd.tell()
+        header_bytes = json.dumps(header, separators=(',', ':'),
+                                  default=_jsonDefault).encode('utf-8')
+        fd.write(header_bytes)
+        fd.seek(0)
+        fd.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, header_offset, len(header_bytes)))
+    os.replace(tmp_filename, filename)
+# end def
+
+
+def encodePart(part, writer):
+    """Write the sections of a Part
+
+    Args:
+        part (Part):
+        writer (_SectionWriter):
+
+    Returns:
+        dict: JSON header of the part
+    """
+    part_header = {key: value for key, value in part.getModelProperties().items()
+                   if key not in SECTION_PROPERTIES}
+    part_header['instance_properties'] = list(part.instanceProperties())
+    part_header['uuid'] = part.uuid
+
+    id_nums = sorted(part.getIdNums())
+    sizes = [part.getOffsetAndSize(id_num)[1] for id_num in id_nums]
+    writer.add('vh_ids', id_nums, dtype='<i4')
+    writer.add('vh_sizes', sizes, dtype='<i4')
+
+    if part_header.get('point_type') != PointType.ARBITRARY:
+        vh_props, origins = part.helixPropertiesAndOrigins(id_nums)
+        writer.add('origins', origins.reshape(-1, 2), dtype='<f8')
+        store = part.vh_properties
+        text_keys = []
+        for key in vh_props:
+            name = 'prop.' + key
+            if key == NEIGHBORS_KEY:
+                neighbors = [store.getNeighbors(id_num) for id_num in id_nums]
+                offsets = np.zeros(len(neighbors) + 1, dtype='<i8')
+                np.cumsum([len(x) for x in neighbors], out=offsets[1:])
+                writer.add(name + '.offsets', offsets)
+                writer.add(name + '.data', np.concatenate([_EMPTY_INT32] + neighbors), dtype='<i4')
+            else:
+                column = store.column(key)[id_nums]
+                if column.dtype == object:
+                    offsets, data = textColumn(column)
+                    writer.add(name + '.offsets', offsets)
+                    writer.add(name + '.data', data)
+                    text_keys.append(key)
+                else:
+                    writer.add(name, column, dtype=column.dtype.newbyteorder('<'))
+        part_header['property_keys'] = list(vh_props.keys())
+        part_header['text_property_keys'] = text_keys
+
+    # strands and xovers
+    color_table = {}
+    xover_list = []
+    strand_records = []
+    for id_num in id_nums:
+        fwd_ss, rev_ss = part.getStrandSets(id_num)
+        for is_fwd, strandset in ((1, fwd_ss), (0, rev_ss)):
+            idxs, colors = strandset.dump(xover_list)
+            for (low_idx, high_idx), color in zip(idxs, colors):
+                color_index = color_table.setdefault(color, len(color_table))
+                strand_records.append((id_num, is_fwd, low_idx, high_idx, color_index))
+    writer.add('strands', np.array(strand_records, dtype=STRAND_DTYPE))
+    writer.add('xovers', np.array(xover_list, dtype=XOVER_DTYPE))
+    writer.add('insertions', np.array(list(part.dumpInsertions()), dtype=INSERTION_DTYPE))
+
+    # oligos
+    oligo_records = []
+    sequences = []
+    seq_start = 0
+    for oligo in part.oligos():
+        oligo_dict = oligo.dump()
+        sequence = oligo_dict['sequence']
+        if sequence is None:
+            seq_length = -1
+        else:
+            encoded = sequence.encode('utf-8')
+            sequences.append(encoded)
+            seq_length = len(encoded)
+        color_index = color_table.setdefault(oligo_dict['color'], len(color_table))
+        oligo_records.append((oligo_dict['id_num'], oligo_dict['idx5p'], oligo_dict['is_5p_fwd'],
+                              oligo_dict['is_loop'], oligo_dict['is_visible'], color_index,
+                              seq_start, seq_length))
+        seq_start += max(seq_length, 0)
+    writer.add('oligos', np.array(oligo_records, dtype=OLIGO_DTYPE))
+    writer.add('sequences', np.frombuffer(b''.join(sequences), dtype=np.uint8))
+
+    part_header['colors'] = sorted(color_table, key=color_table.get)
+    return part_header
+# end def
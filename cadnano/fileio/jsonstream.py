@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""Incremental reading of large JSON design files.
+
+`loadObject` parses the top level object of a file like `json.load` does,
+except that the arrays stored under `lazy_keys` are returned as
+:class:`StreamedArray` objects.  Iterating a :class:`StreamedArray` re-reads
+the file and decodes one element at a time, so only a single element, e.g.
+one entry of the 'vstrands' list of a cadnano 2 file, is in memory at once.
+Decoders can iterate it several times, one pass per decoding stage.
+"""
+import io
+import json
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # characters
+_WHITESPACE = ' \t\n\r'
+_MAX_NUMBER_TAIL = 32  # characters a number may still need from the next chunk
+
+
+class JSONStreamReader(object):
+    """Pull parser over a text stream that decodes one JSON value at a time
+    with `json.JSONDecoder.raw_decode`, keeping only the undecoded part of
+    the current chunk in memory
+
+    Args:
+        fd (file): text mode file object
+        chunk_size (int): optional, number of characters to read at a time
+    """
+    def __init__(self, fd, chunk_size=DEFAULT_CHUNK_SIZE):
+        self._fd = fd
+        self._chunk_size = chunk_size
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+    # end def
+
+    def _fill(self, min_chars):
+        """Read at least `min_chars` more characters unless at the end of the
+        file, dropping the consumed part of the buffer
+
+        Returns:
+            bool: True if anything was read
+        """
+        if self._eof:
+            return False
+        chunk = self._fd.read(max(min_chars, self._chunk_size))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+    # end def
+
+    def peek(self):
+        """Skip whitespace and return the next character
+
+        Returns:
+            str: next character or '' at the end of the stream
+        """
+        while True:
+            buf = self._buffer
+            pos = self._pos
+            end = len(buf)
+            while pos < end and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < end:
+                return buf[pos]
+            if not self._fill(1):
+                return ''
+    # end def
+
+    def expect(self, char):
+        """Consume `char` as the next non whitespace character
+
+        Raises:
+            ValueError:
+        """
+        found = self.peek()
+        if found != char:
+            raise ValueError("expected '{}' but found '{}' in JSON stream".format(char, found))
+        self._pos += 1
+    # end def
+
+    def readValue(self):
+        """Decode the next complete JSON value
+
+        Returns:
+            object: the decoded value
+
+        Raises:
+            ValueError:
+        """
+        self.peek()
+        need = self._chunk_size
+        while True:
+            buf = self._buffer
+            try:
+                value, end = self._decoder.raw_decode(buf, self._pos)
+            except ValueError:
+                # incomplete value, read more.  Grow geometrically so a value
+                # spanning many chunks is not re-parsed too often
+                if not self._fill(need):
+                    raise
+                need *= 2
+                continue
+            if (not self._eof and isinstance(value, (int, float)) and
+                    len(buf) - end < _MAX_NUMBER_TAIL):
+                # a number could continue in the next chunk
+                if self._fill(need):
+                    continue
+            self._pos = end
+            return value
+    # end def
+
+    def iterObjectKeys(self):
+        """Walk the members of the object starting at the current position.
+        After each key is yielded the caller must consume its value with
+        `readValue`, `iterArray` or `skipValue` before resuming iteration
+
+        Yields:
+            str: member key
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self.readValue()
+            self.expect(':')
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == '}':
+                return
+            elif char != ',':
+                raise ValueError("expected ',' or '}}' but found '{}' in JSON stream".format(char))
+    # end def
+
+    def iterArray(self):
+        """Decode the elements of the array starting at the current position
+        one at a time
+
+        Yields:
+            object: decoded element
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self.readValue()
+            char = self.peek()
+            self._pos += 1
+            if char == ']':
+                return
+            elif char != ',':
+                raise ValueError("expected ',' or ']' but found '{}' in JSON stream".format(char))
+    # end def
+
+    def skipValue(self):
+        """Consume the next value.  Arrays are skipped one element at a time"""
+        if self.peek() == '[':
+            for item in self.iterArray():
+                pass
+        else:
+            self.readValue()
+    # end def
+# end class
+
+
+class StreamedArray(object):
+    """Re-iterable view of an array stored under a top level key of a JSON
+    file.  Each iteration re-reads the file and decodes one element at a time
+
+    Args:
+        filename (str): full path file name
+        key (str): top level key of the array
+        chunk_size (int): optional, number of characters to read at a time
+    """
+    def __init__(self, filename, key, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.filename = filename
+        self.key = key
+        self.chunk_size = chunk_size
+    # end def
+
+    def __iter__(self):
+        with io.open(self.filename, 'r', encoding='utf-8') as fd:
+            reader = JSONStreamReader(fd, self.chunk_size)
+            for key in reader.iterObjectKeys():
+                if key == self.key:
+                    for item in reader.iterArray():
+                        yield item
+                    return
+                reader.skipValue()
+        raise KeyError(self.key)
+    # end def
+
+    def __repr__(self):
+        return "<StreamedArray %s[%r]>" % (self.filename, self.key)
+    # end def
+# end class
+
+
+def loadObject(filename, lazy_keys=(), chunk_size=DEFAULT_CHUNK_SIZE):
+    """Read the top level object of a JSON file, replacing the arrays stored
+    under `lazy_keys` with :class:`StreamedArray` objects
+
+    Args:
+        filename (str): full path file name
+        lazy_keys (iterable): of :obj:`str` top level keys to stream
+        chunk_size (int): optional, number of characters to read at a time
+
+    Returns:
+        dict:
+    """
+    lazy_keys = set(lazy_keys)
+    out = {}
+    with io.open(filename, 'r', encoding='utf-8') as fd:
+        reader = JSONStreamReader(fd, chunk_size)
+        for key in reader.iterObjectKeys():
+            if key in lazy_keys and reader.peek() == '[':
+                reader.skipValue()
+                out[key] = StreamedArray(filename, key, chunk_size)
+            else:
+                out[key] = reader.readValue()
+    return out
+# end def
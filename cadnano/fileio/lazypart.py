@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""Parts of a design file that are decoded on demand.
+
+Reading a multi-part file with `lazy=True`, see
+:func:`cadnano.fileio.nnodecode.decodeFile`, decodes no part up front.  The
+:class:`Document` holds a :class:`LazyPart` per part instead, with what is
+needed to decode it later: the part record of a v3 JSON file or the part
+index of a memory mapped .cn5 file.  A part is decoded the first time it is
+activated or accessed with `Document.activePart`, `Document.getParts` or
+`Document.getPartUUID`.
+
+Saving a document writes the parts that were never decoded from their
+record, without building the model: the record as is to a v3 file and the
+array sections as is to a .cn5 file of the same format, so they round-trip
+exactly.
+"""
+from .cn5encode import FORMAT_VERSION as CN5_FORMAT_VERSION
+
+
+class LazyPart(object):
+    """An undecoded part
+
+    Args:
+        uuid (str): uuid of the part in the file
+        name (str): name of the part in the file
+        emit_signals (bool): whether to emit signals while decoding
+
+    Attributes:
+        uuid (str):
+        name (str):
+    """
+    def __init__(self, uuid, name, emit_signals=False):
+        self.uuid = uuid
+        self.name = name
+        self._emit_signals = emit_signals
+        self._mod_locations = []
+    # end def
+
+    def __repr__(self):
+        return "<%s %s>" % (self.__class__.__name__, self.name)
+    # end def
+
+    def addModLocation(self, key, mid):
+        """Record an external modification instance on this part to add
+        when it is decoded, see `Document.addModLocation`
+
+        Args:
+            key (str): document level Mod key
+            mid (str): modification id string
+        """
+        self._mod_locations.append((key, mid))
+    # end def
+
+    def modLocations(self):
+        """
+        Returns:
+            list: of (key, mod id) :obj:`tuple`
+        """
+        return self._mod_locations
+    # end def
+
+    def decode(self, document):
+        """Decode the part into `document`.  Use `Document.decodeLazyPart`
+
+        Returns:
+            Part:
+        """
+        raise NotImplementedError
+    # end def
+
+    def partDict(self):
+        """
+        Returns:
+            dict or None: the v3 encoding of the part if it is at hand
+            without decoding the part
+        """
+        return None
+    # end def
+
+    def writeSections(self, writer):
+        """Write the .cn5 sections of the part if that doesn't need decoding
+        the part
+
+        Args:
+            writer (_SectionWriter):
+
+        Returns:
+            dict or None: JSON header of the part, None if nothing was written
+        """
+        return None
+    # end def
+# end class
+
+
+class V3LazyPart(LazyPart):
+    """A part record of a v3 JSON file
+
+    Args:
+        part_dict (dict): deserialized dictionary describing the Part
+        emit_signals (bool): optional, see `LazyPart`
+    """
+    def __init__(self, part_dict, emit_signals=False):
+        super(V3LazyPart, self).__init__(part_dict.get('uuid'), part_dict.get('name'),
+                                         emit_signals)
+        self._part_dict = part_dict
+    # end def
+
+    def decode(self, document):
+        from cadnano.fileio.v3decode import decodePart
+        return decodePart(document, self._part_dict, emit_signals=self._emit_signals)
+    # end def
+
+    def partDict(self):
+        return self._part_dict
+    # end def
+# end class
+
+
+class CN5LazyPart(LazyPart):
+    """A part of a .cn5 file
+
+    Args:
+        cn5_file (CN5File):
+        part_index (int): index of the part in the file
+        emit_signals (bool): optional, see `LazyPart`
+    """
+    def __init__(self, cn5_file, part_index, emit_signals=False):
+        part_header = cn5_file.partHeader(part_index)
+        super(CN5LazyPart, self).__init__(part_header.get('uuid'), part_header.get('name'),
+                                          emit_signals)
+        self._cn5_file = cn5_file
+        self._part_index = part_index
+    # end def
+
+    def decode(self, document):
+        from cadnano.fileio.cn5decode import decodePart
+        return decodePart(document, self._cn5_file, self._part_index,
+                          emit_signals=self._emit_signals)
+    # end def
+
+    def writeSections(self, writer):
+        cn5_file = self._cn5_file
+        if cn5_file.header['format'] != CN5_FORMAT_VERSION:
+            return None
+        part_index = self._part_index
+        part_header = dict(cn5_file.partHeader(part_index))
+        for name in part_header.pop('sections'):
+            writer.add(name, cn5_file.section(part_index, name))
+        return part_header
+    # end def
+# end class
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""Vectorized reading of the per base strand arrays of legacy designs.
+
+cadnano 2 (v2) and 2.5 (c25) files describe each strand type of a helix as
+one record per base holding the helix and index of the base 5' and 3' of it,
+-1 for none.  Instead of testing the bases one at a time, the records of a
+helix are converted to an array once and the ends of the strands, the 3'
+crossovers and the insertions are found with masks over all of its bases.
+"""
+import numpy as np
+
+from cadnano.cnenum import StrandType
+
+FIVE_VH, FIVE_IDX, THREE_VH, THREE_IDX = range(4)
+
+
+def baseArray(bases, columns=(0, 1, 2, 3)):
+    """
+    Args:
+        bases (list): of per base records of a strand type of a helix
+        columns (tuple): optional, positions of the 5' helix, 5' index, 3'
+            helix and 3' index in a record
+
+    Returns:
+        ndarray: (number of bases, 4) `int64` rows of (5' helix, 5' index,
+        3' helix, 3' index)
+    """
+    bases = np.array(bases, dtype=np.int64)
+    if bases.size == 0:
+        return np.empty((0, 4), dtype=np.int64)
+    return bases[:, list(columns)]
+# end def
+
+
+def readStrands(bases, vh_num, strand_type):
+    """Find the strands and 3' crossovers of a strand type of a helix.
+
+    A base starts or ends a strand segment if its 5' or 3' neighbor is on
+    another helix, missing, or not the next base in the direction the strand
+    type runs on a helix of this parity.  A base with both neighbors on other
+    helices is a whole segment, so it is listed as both ends
+
+    Args:
+        bases (ndarray): see :func:`baseArray`
+        vh_num (int): virtual helix ID number
+        strand_type (StrandType): SCAFFOLD runs 5' to 3' with increasing
+            index on even helices, STAPLE the other way
+
+    Returns:
+        tuple: (`ndarray` (number of strands, 2) of low and high indices,
+        `ndarray` of the indices of the bases with a 3' crossover)
+
+    Raises:
+        AssertionError: the ends of the segments do not pair up
+    """
+    five_vh = bases[:, FIVE_VH]
+    five_idx = bases[:, FIVE_IDX]
+    three_vh = bases[:, THREE_VH]
+    three_idx = bases[:, THREE_IDX]
+    idxs = np.arange(len(bases))
+    step = 1 if strand_type == StrandType.SCAFFOLD else -1
+    if vh_num % 2 == 1:
+        step = -step
+
+    five_here = five_vh == vh_num
+    three_here = three_vh == vh_num
+    five_none = five_vh == -1
+    three_none = three_vh == -1
+    is_end = ((five_here != three_here) |
+              (five_here & (five_idx != idxs - step)) |
+              (three_here & (three_idx != idxs + step)) |
+              (five_none != three_none))
+    is_double = ~five_here & ~three_here    # end segment on a double crossover
+    counts = np.where(five_none & three_none, 0, is_end.astype(np.intp) + is_double)
+    ends = np.repeat(idxs, counts)
+    assert len(ends) % 2 == 0
+
+    is_xover = ~three_none & (~three_here | (three_idx != idxs + step))
+    return ends.reshape(-1, 2), np.flatnonzero(is_xover)
+# end def
+
+
+def readInsertions(insertions, skips):
+    """
+    Args:
+        insertions (list): of insertion length per base
+        skips (list): of -1 per skipped base, 0 otherwise
+
+    Returns:
+        list: of (base index, summed length) of the bases where it is not 0
+    """
+    lengths = np.add(insertions, skips, dtype=np.int64)
+    idxs = np.flatnonzero(lengths)
+    return list(zip(idxs.tolist(), lengths[idxs].tolist()))
+# end def
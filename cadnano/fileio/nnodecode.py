@@ -6,20 +6,55 @@ import os.path
 import cadnano.fileio.v2decode as v2decode
 import cadnano.fileio.c25decode as c25decode
 import cadnano.fileio.v3decode as v3decode
+import cadnano.fileio.cn5decode as cn5decode
+from cadnano.fileio.jsonstream import loadObject
 
-def decodeFile(filename, document=None, emit_signals=False):
-    with io.open(filename, 'r', encoding='utf-8') as fd:
-        nno_dict = json.load(fd)
+# per helix (legacy) and per part (v3) records that streaming decodes one
+# at a time
+STREAMED_KEYS = ('vstrands', 'parts')
+
+def decodeFile(filename, document=None, emit_signals=False, streaming=False, lazy=False):
+    """Decode a design file into a Document
+
+    Args:
+        filename (str): full path file name
+        document (Document): optional, Document to decode into
+        emit_signals (bool): optional, whether to emit signals while decoding
+        streaming (bool): optional, if True the 'vstrands' or 'parts' records
+            are parsed one at a time while the model is built instead of
+            loading the whole file first.  Peak memory is then bounded by the
+            largest record rather than by the file size, at the cost of
+            reading the file once per decoding pass
+        lazy (bool): optional, if True the parts of v3 and .cn5 files are
+            only decoded when they are first activated or accessed, see
+            :mod:`cadnano.fileio.lazypart`.  Single part legacy files are
+            always decoded
+
+    Returns:
+        Document:
+
+    The signals emitted while decoding are batched when running headless,
+    see :meth:`CNObject.batchSignals`
+    """
     if document is None:
         from cadnano.document import Document
         document = Document()
-    if 'format' not in nno_dict:
-        if os.path.splitext(filename)[1] == '.c25':
-            c25decode.decode(document, nno_dict, emit_signals=emit_signals)
+    with document.batchSignals():
+        if os.path.splitext(filename)[1] == '.cn5':
+            return cn5decode.decodeFile(filename, document=document,
+                                        emit_signals=emit_signals, lazy=lazy)
+        if streaming:
+            nno_dict = loadObject(filename, lazy_keys=STREAMED_KEYS)
+        else:
+            with io.open(filename, 'r', encoding='utf-8') as fd:
+                nno_dict = json.load(fd)
+        if 'format' not in nno_dict:
+            if os.path.splitext(filename)[1] == '.c25':
+                c25decode.decode(document, nno_dict, emit_signals=emit_signals)
+            else:
+                v2decode.decode(document, nno_dict, emit_signals=emit_signals)
         else:
-            v2decode.decode(document, nno_dict, emit_signals=emit_signals)
-    else:
-        v3decode.decode(document, nno_dict, emit_signals=emit_signals)
+            v3decode.decode(document, nno_dict, emit_signals=emit_signals, lazy=lazy)
     return document
 # end def
 
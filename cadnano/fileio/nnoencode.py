@@ -1,4 +1,4 @@
-from os.path import basename
+from os.path import basename, splitext
 import numpy as np
 
 from cadnano.cnenum import StrandType
@@ -8,9 +8,24 @@ import io
 # from cadnano.document import Document
 
 import cadnano.fileio.v3encode as v3encode
+import cadnano.fileio.cn5encode as cn5encode
 
-def encodeToFile(filename, document):
-    json_string = encode(document)
+def encodeToFile(filename, document, encoder=None):
+    """
+    Args:
+        filename (str): full path file name
+        document (Document):
+        encoder (IncrementalEncoder): optional, reuse the output of previous
+            saves of `document` for the parts of it that did not change.
+            Not used for .cn5 files
+    """
+    if splitext(filename)[1] == '.cn5':
+        cn5encode.encodeToFile(filename, document)
+        return
+    if encoder is None:
+        json_string = encode(document)
+    else:
+        json_string = encoder.encode(document)
     with io.open(filename, 'w', encoding='utf-8') as fd:
         fd.write(json_string)
 # end def
@@ -39,4 +54,115 @@ class EncoderforPandas(json.JSONEncoder):
             except:
                 print(type(obj))
                 raise
-# end class
\ No newline at end of file
+# end class
+
+_dumps = EncoderforPandas(separators=(',', ':')).encode
+
+
+class IncrementalEncoder(object):
+    """Encode a Document to the same string as `encode`, but keep the JSON of
+    the strands and crossovers of each virtual helix and of each oligo between
+    calls.  Only the fragments of the virtual helices and oligos whose
+    modification stamp changed since the previous call are encoded again, see
+    :meth:`NucleicAcidPart.setVirtualHelixModified` and
+    :meth:`Oligo.modification`.  The strands of a virtual helix are also
+    encoded again when :meth:`Oligo.strandsModification` of one of the oligos
+    they belonged to changed, e.g. its color.  The remaining part
+    properties, virtual helix properties, insertions and modifications are
+    cheap and are always encoded in full.
+
+    Use one encoder per Document, e.g. the one kept by `Document.writeToFile`
+    """
+    def __init__(self):
+        self._part_caches = {}
+    # end def
+
+    def encode(self, document):
+        """
+        Args:
+            document (Document):
+
+        Returns:
+            str: identical to `encode(document)`
+        """
+        doc_dict = v3encode.encodeDocument(document, encode_strands=False)
+        old_caches = self._part_caches
+        self._part_caches = part_caches = {}
+        parts_json = []
+        for part, part_dict in zip(document.getParts(decode_lazy=False), doc_dict['parts']):
+            vh_cache, oligo_cache = old_caches.get(part, ({}, {}))
+            vh_cache, strands_json, xovers_json = self._encodeStrands(part, vh_cache)
+            oligo_cache, oligos_json = self._encodeOligos(part, oligo_cache)
+            part_caches[part] = (vh_cache, oligo_cache)
+            raw = {'strands': strands_json, 'xovers': xovers_json, 'oligos': oligos_json}
+            parts_json.append(_joinObject((key, raw[key] if key in raw else _dumps(value))
+                                          for key, value in part_dict.items()))
+        # the parts never decoded, see `Document.lazyParts`
+        parts_json += [_dumps(part_dict) for part_dict in doc_dict['parts'][len(parts_json):]]
+        return _joinObject((key, '[' + ','.join(parts_json) + ']' if key == 'parts' else _dumps(value))
+                           for key, value in doc_dict.items())
+    # end def
+
+    def _encodeStrands(self, part, vh_cache):
+        """
+        Returns:
+            tuple: (new cache, JSON of 'strands', JSON of 'xovers')
+        """
+        new_cache = {}
+        indices, properties, xovers = [], [], []
+        for id_num in range(part.getIdNumMax() + 1):
+            if part.getOffsetAndSize(id_num) is None:
+                indices.append('null')
+                properties.append('null')
+                continue
+            stamp = part.virtualHelixModification(id_num)
+            entry = vh_cache.get(id_num)
+            if (entry is None or entry[0] != stamp or
+                    any(oligo.strandsModification() != oligo_stamp
+                        for oligo, oligo_stamp in entry[1])):
+                xover_list = []
+                idxs, colors = v3encode.encodeStrandSets(part, id_num, xover_list)
+                oligos = set(strand.oligo() for strandset in part.getStrandSets(id_num)
+                             for strand in strandset.strand_heap)
+                entry = (stamp, [(oligo, oligo.strandsModification()) for oligo in oligos],
+                         _dumps(idxs), _dumps(colors),
+                         ','.join(_dumps(xover) for xover in xover_list))
+            new_cache[id_num] = entry
+            indices.append(entry[2])
+            properties.append(entry[3])
+            if entry[4]:
+                xovers.append(entry[4])
+        strands_json = '{"indices":[%s],"properties":[%s]}' % (','.join(indices),
+                                                              ','.join(properties))
+        return new_cache, strands_json, '[' + ','.join(xovers) + ']'
+    # end def
+
+    def _encodeOligos(self, part, oligo_cache):
+        """
+        Returns:
+            tuple: (new cache, JSON of 'oligos')
+        """
+        new_cache = {}
+        oligos = []
+        for oligo in part.oligos():
+            stamp = oligo.modification()
+            entry = oligo_cache.get(oligo)
+            if entry is None or entry[0] != stamp:
+                entry = (stamp, _dumps(oligo.dump()))
+            new_cache[oligo] = entry
+            oligos.append(entry[1])
+        return new_cache, '[' + ','.join(oligos) + ']'
+    # end def
+# end class
+
+
+def _joinObject(items):
+    """
+    Args:
+        items (iterable): of :obj:`tuple` (key, JSON encoded value)
+
+    Returns:
+        str: compact JSON object
+    """
+    return '{' + ','.join(_dumps(key) + ':' + value for key, value in items) + '}'
+# end def
@@ -9,12 +9,22 @@ from cadnano.color import intToColorHex
 from cadnano.part.nucleicacidpart import DEFAULT_RADIUS
 
 from .lattice import HoneycombDnaPart, SquareDnaPart
+from .legacystrands import THREE_VH, THREE_IDX, baseArray, readStrands, readInsertions
 
 def decode(document, obj, emit_signals=False):
     """Parses a dictionary (obj) created from reading a json file and uses it
     to populate the given document with model data.
+
+    `obj['vstrands']` is only iterated, twice, and never indexed, so it can be
+    a :class:`cadnano.fileio.jsonstream.StreamedArray` that decodes one helix
+    at a time.  The per base lists of a helix are read with array operations,
+    see :mod:`cadnano.fileio.legacystrands`
     """
-    num_bases = len(obj['vstrands'][0]['scaf'])
+    vstrands = obj['vstrands']
+    # only the lattice position of each helix is kept between passes
+    helix_headers = [(helix['num'], helix['row'], helix['col'], len(helix['scaf']))
+                     for helix in vstrands]
+    num_bases = helix_headers[0][3]
     if num_bases % 32 == 0:
         lattice_type = LatticeType.SQUARE
     elif num_bases % 21 == 0:
@@ -25,9 +35,9 @@ def decode(document, obj, emit_signals=False):
     part = None
     # DETERMINE MAX ROW,COL
     max_row_json = max_col_json = 0
-    for helix in obj['vstrands']:
-        max_row_json = max(max_row_json, int(helix['row'])+1)
-        max_col_json = max(max_col_json, int(helix['col'])+1)
+    for vh_num, row, col, _ in helix_headers:
+        max_row_json = max(max_row_json, int(row)+1)
+        max_col_json = max(max_col_json, int(col)+1)
 
     # CREATE PART ACCORDING TO LATTICE TYPE
     if lattice_type == LatticeType.HONEYCOMB:
@@ -49,13 +59,11 @@ def decode(document, obj, emit_signals=False):
     min_col, max_col = 10000, -10000
 
     # find row, column limits
-    for helix in obj['vstrands']:
-        row = helix['row']
+    for vh_num, row, col, _ in helix_headers:
         if row < min_row:
             min_row = row
         if row > max_row:
             max_row = row
-        col = helix['col']
         if col < min_col:
             min_col = col
         if col > max_col:
@@ -74,11 +82,7 @@ def decode(document, obj, emit_signals=False):
     # print("\trows(%d, %d): avg: %d" % (min_row, max_row, delta_row))
     # print("\tcolumns(%d, %d): avg: %d" % (min_col, max_col, delta_column))
 
-    for helix in obj['vstrands']:
-        vh_num = helix['num']
-        row = helix['row']
-        col = helix['col']
-        scaf= helix['scaf']
+    for vh_num, row, col, _ in helix_headers:
         # align row and columns to the center 0, 0
         coord = (row -  delta_row, col - delta_column)
         vh_num_to_coord[vh_num] = coord
@@ -87,12 +91,10 @@ def decode(document, obj, emit_signals=False):
 
     # make sure we retain the original order
     radius = DEFAULT_RADIUS
-    for vh_num in sorted(vh_num_to_coord.keys()):
-        row, col = vh_num_to_coord[vh_num]
-        x, y = doLattice(radius, row, col)
-        # print("%d:" % vh_num, x, y)
-        part.createVirtualHelix(x, y, 0., num_bases,
-                                id_num=vh_num, use_undostack=False)
+    vh_nums = sorted(vh_num_to_coord.keys())
+    vh_origins = [doLattice(radius, *vh_num_to_coord[vh_num]) for vh_num in vh_nums]
+    part.createVirtualHelices(vh_origins, sizes=num_bases,
+                              id_nums=vh_nums, use_undostack=False)
     # zoom to fit
     if emit_signals:
         part.partZDimensionsChangedSignal.emit(part, *part.zBoundsIds(), True)
@@ -103,12 +105,13 @@ def decode(document, obj, emit_signals=False):
     setBatch(False)
 
     # INSTALL STRANDS AND COLLECT XOVER LOCATIONS
-    scaf_seg = defaultdict(list)
     scaf_xo = defaultdict(list)
-    stap_seg = defaultdict(list)
     stap_xo = defaultdict(list)
+    # sparse per helix data applied once the oligos are complete
+    insert_skips = defaultdict(list)
+    stap_colors = {}
     try:
-        for helix in obj['vstrands']:
+        for helix in vstrands:
             vh_num = helix['num']
             row, col = vh_num_to_coord[vh_num]
             scaf = helix['scaf']
@@ -126,54 +129,27 @@ def decode(document, obj, emit_signals=False):
                     len(scaf) == len(insertions) and
                     len(insertions) == len(skips) )
 
-            # read scaffold segments and xovers
-            for i in range(len(scaf)):
-                five_vh, five_idx, three_vh, three_idx = scaf[i]
-                if five_vh == -1 and three_vh == -1:
-                    continue  # null base
-                if isSegmentStartOrEnd(StrandType.SCAFFOLD, vh_num, i, five_vh,\
-                                       five_idx, three_vh, three_idx):
-                    scaf_seg[vh_num].append(i)
-                if five_vh != vh_num and three_vh != vh_num:  # special case
-                    scaf_seg[vh_num].append(i)  # end segment on a double crossover
-                if is3primeXover(StrandType.SCAFFOLD, vh_num, i, three_vh, three_idx):
-                    scaf_xo[vh_num].append((i, three_vh, three_idx))
-            assert (len(scaf_seg[vh_num]) % 2 == 0)
-
-            # install scaffold segments
-            for i in range(0, len(scaf_seg[vh_num]), 2):
-                low_idx = scaf_seg[vh_num][i]
-                high_idx = scaf_seg[vh_num][i + 1]
-                scaf_strand_set.createStrand(low_idx, high_idx, use_undostack=False)
-
-            # read staple segments and xovers
-            for i in range(len(stap)):
-                five_vh, five_idx, three_vh, three_idx = stap[i]
-                if five_vh == -1 and three_vh == -1:
-                    continue  # null base
-                if isSegmentStartOrEnd(StrandType.STAPLE, vh_num, i, five_vh,\
-                                       five_idx, three_vh, three_idx):
-                    stap_seg[vh_num].append(i)
-                if five_vh != vh_num and three_vh != vh_num:  # special case
-                    stap_seg[vh_num].append(i)  # end segment on a double crossover
-                if is3primeXover(StrandType.STAPLE, vh_num, i, three_vh, three_idx):
-                    stap_xo[vh_num].append((i, three_vh, three_idx))
-            assert (len(stap_seg[vh_num]) % 2 == 0)
-
-            # install staple segments
-            for i in range(0, len(stap_seg[vh_num]), 2):
-                low_idx = stap_seg[vh_num][i]
-                high_idx = stap_seg[vh_num][i + 1]
-                stap_strand_set.createStrand(low_idx, high_idx, use_undostack=False)
+            # read scaffold and staple segments and xovers
+            for strand_type, bases, strand_set, strand_xo in (
+                    (StrandType.SCAFFOLD, scaf, scaf_strand_set, scaf_xo),
+                    (StrandType.STAPLE, stap, stap_strand_set, stap_xo)):
+                bases = baseArray(bases)
+                segments, xover_idxs = readStrands(bases, vh_num, strand_type)
+                strand_xo[vh_num] = list(zip(xover_idxs.tolist(),
+                                             bases[xover_idxs, THREE_VH].tolist(),
+                                             bases[xover_idxs, THREE_IDX].tolist()))
+                strand_set.loadStrands(segments.tolist())
             part.refreshSegments(vh_num)
+
+            insert_skips[vh_num] = readInsertions(insertions, skips)
+            stap_colors[vh_num] = helix['stap_colors']
         # end for
     except AssertionError:
         print("Unrecognized file format.")
         raise
 
     # INSTALL XOVERS
-    for helix in obj['vstrands']:
-        vh_num = helix['num']
+    for vh_num, _, _, _ in helix_headers:
         row, col = vh_num_to_coord[vh_num]
 
         if isEven(row, col):
@@ -220,15 +196,12 @@ def decode(document, obj, emit_signals=False):
     # need to heal all oligo connections into a continuous
     # oligo for the next steps
     RefreshOligosCommand(part).redo()
+    for oligo in part.oligos():     # loadStrands adds them silently
+        part.partOligoAddedSignal.emit(part, oligo)
 
     # COLORS, INSERTIONS, SKIPS
-    for helix in obj['vstrands']:
-        vh_num = helix['num']
+    for vh_num, _, _, _ in helix_headers:
         row, col = vh_num_to_coord[vh_num]
-        scaf = helix['scaf']
-        stap = helix['stap']
-        insertions = helix['loop']
-        skips = helix['skip']
 
         if isEven(row, col):
             scaf_strand_set, stap_strand_set = part.getStrandSets(vh_num)
@@ -236,16 +209,14 @@ def decode(document, obj, emit_signals=False):
             stap_strand_set, scaf_strand_set = part.getStrandSets(vh_num)
 
         # install insertions and skips
-        for base_idx in range(len(stap)):
-            sum_of_insert_skip = insertions[base_idx] + skips[base_idx]
-            if sum_of_insert_skip != 0:
-                strand = scaf_strand_set.getStrand(base_idx)
-                strand.addInsertion(base_idx,
-                                    sum_of_insert_skip,
-                                    use_undostack=False)
+        for base_idx, sum_of_insert_skip in insert_skips[vh_num]:
+            strand = scaf_strand_set.getStrand(base_idx)
+            strand.addInsertion(base_idx,
+                                sum_of_insert_skip,
+                                use_undostack=False)
         # end for
         # populate colors
-        for base_idx, color_number in helix['stap_colors']:
+        for base_idx, color_number in stap_colors[vh_num]:
             color = intToColorHex(color_number)
             strand = stap_strand_set.getStrand(base_idx)
             strand.oligo().applyColor(color, use_undostack=False)
@@ -285,59 +256,3 @@ def decode(document, obj, emit_signals=False):
                 print(strand, idx)
                 raise
 # end def
-
-def isSegmentStartOrEnd(strandtype, vh_num, base_idx,
-                        five_vh, five_idx,
-                        three_vh, three_idx):
-    """
-    Returns:
-        bool: True if the base is a breakpoint or crossover.
-    """
-    if strandtype == StrandType.SCAFFOLD:
-        offset = 1
-    else:
-        offset = -1
-    if five_vh == vh_num and three_vh != vh_num:
-        return True
-    if five_vh != vh_num and three_vh == vh_num:
-        return True
-    if (vh_num % 2 == 0 and five_vh == vh_num and
-        five_idx != base_idx - offset):
-        return True
-    if (vh_num % 2 == 0 and three_vh == vh_num and
-        three_idx != base_idx + offset):
-        return True
-    if (vh_num % 2 == 1 and five_vh == vh_num and
-        five_idx != base_idx + offset):
-        return True
-    if (vh_num % 2 == 1 and three_vh == vh_num and
-        three_idx != base_idx - offset):
-        return True
-    if five_vh == -1 and three_vh != -1:
-        return True
-    if five_vh != -1 and three_vh == -1:
-        return True
-    return False
-# end def
-
-def is3primeXover(strandtype, vh_num, base_idx, three_vh, three_idx):
-    """
-    Returns:
-        bool: True of the three_vh doesn't match vh_num, or three_idx
-                is not a natural neighbor of base_idx.
-    """
-    if three_vh == -1:
-        return False
-    if vh_num != three_vh:
-        return True
-    if strandtype == StrandType.SCAFFOLD:
-        offset = 1
-    else:
-        offset = -1
-    if (vh_num % 2 == 0 and three_vh == vh_num and
-        three_idx != base_idx + offset):
-        return True
-    if (vh_num % 2 == 1 and three_vh == vh_num and
-        three_idx != base_idx - offset):
-        return True
-# end def
\ No newline at end of file
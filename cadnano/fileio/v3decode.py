@@ -3,25 +3,30 @@ from cadnano.part.refresholigoscmd import RefreshOligosCommand
 from cadnano import preferences as prefs
 from cadnano import setBatch, getReopen, setReopen
 from cadnano.cnenum import PointType
+from .lazypart import V3LazyPart
 
-def decode(document, obj, emit_signals=False):
+def decode(document, obj, emit_signals=False, lazy=False):
     """ Decode a a deserialized Document dictionary
 
     Args:
         document (Document):
         obj (dict): deserialized file object
+        lazy (bool): optional, hold the parts undecoded in `document`, see
+            :mod:`cadnano.fileio.lazypart`
     """
     name = obj['name']
     for part_dict in obj['parts']:
-        part_dict = decodePart(document, part_dict, emit_signals=emit_signals)
+        if lazy:
+            document.addLazyPart(V3LazyPart(part_dict, emit_signals=emit_signals))
+        else:
+            decodePart(document, part_dict, emit_signals=emit_signals)
 
     modifications = obj['modifications']
     for mod_id, item in modifications.items():
         document.createMod(item['props'], mod_id)
         ext_locations = item['ext_locations']
         for key in ext_locations:
-            part, strand, idx = document.getModStrandIdx(key)
-            part.addModStrandInstance(strand, idx, mod_id)
+            document.addModLocation(mod_id, key)
     return
 # end def
 
@@ -31,10 +36,13 @@ def decodePart(document, part_dict, emit_signals=False):
     Args:
         document (Document):
         part_dict (dict): deserialized dictionary describing the Part
+
+    Returns:
+        Part: the new Part
     """
     name = part_dict['name']
     dc = document._controller
-    part = document.createNucleicAcidPart(use_undostack=False)
+    part = document.createNucleicAcidPart(use_undostack=False, uuid=part_dict.get('uuid'))
     part.setActive(True)
 
     vh_id_list = part_dict['vh_list']
@@ -46,17 +54,19 @@ def decodePart(document, part_dict, emit_signals=False):
         # TODO add code to deserialize parts
         pass
     else:
-        for id_num, size in vh_id_list:
-            x, y = origins[id_num]
-            z = vh_props['z'][id_num]
+        id_nums = [id_num for id_num, size in vh_id_list]
+        sizes = [size for id_num, size in vh_id_list]
+        for id_num in id_nums:
             vh_props['eulerZ'][id_num] = 0.5*(360./10.5)
-            vals = [vh_props[k][id_num] for k in keys]
-            part.createVirtualHelix(x, y, z, size,
-                                    id_num=id_num,
-                                    properties=(keys, vals),
-                                    safe=False,
-                                    use_undostack=False)
-        # end for
+        z_vals = vh_props['z']
+        vh_origins = [(origins[id_num][0], origins[id_num][1], z_vals[id_num])
+                      for id_num in id_nums]
+        properties = {k: [vh_props[k][id_num] for id_num in id_nums] for k in keys}
+        part.createVirtualHelices(vh_origins, sizes=sizes,
+                                  id_nums=id_nums,
+                                  properties=properties,
+                                  safe=False,
+                                  use_undostack=False)
         # zoom to fit
         if emit_signals:
             part.partZDimensionsChangedSignal.emit(part, *part.zBoundsIds(), True)
@@ -69,15 +79,9 @@ def decodePart(document, part_dict, emit_signals=False):
             fwd_strand_set, rev_strand_set = part.getStrandSets(id_num)
             fwd_idxs, rev_idxs = idx_set
             fwd_colors, rev_colors = color_list[id_num]
-            for idxs, color in zip(fwd_idxs, fwd_colors):
-                low_idx, high_idx = idxs
-                fwd_strand_set.createDeserializedStrand(low_idx, high_idx, color,
-                                                        use_undostack=False)
-            for idxs, color in zip(rev_idxs, rev_colors):
-                low_idx, high_idx = idxs
-                rev_strand_set.createDeserializedStrand(low_idx, high_idx, color,
-                                                        use_undostack=False)
-        part.refreshSegments(id_num)   # update segments
+            fwd_strand_set.loadStrands(fwd_idxs, fwd_colors)
+            rev_strand_set.loadStrands(rev_idxs, rev_colors)
+            part.refreshSegments(id_num)   # update segments
     # end def
 
     xovers = part_dict['xovers']
@@ -90,6 +94,8 @@ def decodePart(document, part_dict, emit_signals=False):
                             use_undostack=False)
 
     RefreshOligosCommand(part).redo()
+    for oligo in part.oligos():     # loadStrands adds them silently
+        part.partOligoAddedSignal.emit(part, oligo)
     for oligo in part_dict['oligos']:
         id_num = oligo['id_num']
         idx = oligo['idx5p']
@@ -105,6 +111,8 @@ def decodePart(document, part_dict, emit_signals=False):
     # INSERTIONS, SKIPS
     for id_num, idx, length in part_dict['insertions']:
         strand = part.getStrand(True, id_num, idx)
+        if strand is None:
+            strand = part.getStrand(False, id_num, idx)
         strand.addInsertion(idx, length, use_undostack=False)
 
     # TODO fix this to set position
@@ -114,6 +122,7 @@ def decodePart(document, part_dict, emit_signals=False):
     if vh_order:
         # print("import order", vh_order)
         part.setImportedVHelixOrder(vh_order)
+    return part
 # end def
 
 def importToPart(part_instance, copy_dict, use_undostack=True):
@@ -127,7 +136,6 @@ def importToPart(part_instance, copy_dict, use_undostack=True):
     """
     part = part_instance.reference()
     id_num_offset = part.getIdNumMax() + 1
-    print("Starting from", id_num_offset)
     vh_id_list = copy_dict['vh_list']
     origins = copy_dict['origins']
     vh_props = copy_dict['virtual_helices']
@@ -139,7 +147,7 @@ def importToPart(part_instance, copy_dict, use_undostack=True):
     for i, pair in enumerate(vh_id_list):
         id_num, size = pair
         x, y = origins[i]
-        z = vh_props['z'][id_num]
+        z = vh_props['z'][i]
         vals = [vh_props[k][i] for k in keys]
         new_id_num = i + id_num_offset
         vals[name_index] += (name_suffix % new_id_num)
@@ -153,21 +161,19 @@ def importToPart(part_instance, copy_dict, use_undostack=True):
     strands = copy_dict['strands']
     strand_index_list = strands['indices']
     color_list = strands['properties']
+    new_strands = []
     for id_num, idx_set in enumerate(strand_index_list):
         if idx_set is not None:
             fwd_strand_set, rev_strand_set = part.getStrandSets(
                                                         id_num + id_num_offset)
             fwd_idxs, rev_idxs = idx_set
             fwd_colors, rev_colors = color_list[id_num]
-            for idxs, color in zip(fwd_idxs, fwd_colors):
-                low_idx, high_idx = idxs
-                fwd_strand_set.createDeserializedStrand(low_idx, high_idx, color,
-                                                    use_undostack=use_undostack)
-
-            for idxs, color in zip(rev_idxs, rev_colors):
-                low_idx, high_idx = idxs
-                rev_strand_set.createDeserializedStrand(low_idx, high_idx, color,
-                                                    use_undostack=use_undostack)
+            new_strands += fwd_strand_set.loadStrands(fwd_idxs, fwd_colors,
+                                                      use_undostack=use_undostack)
+            new_strands += rev_strand_set.loadStrands(rev_idxs, rev_colors,
+                                                      use_undostack=use_undostack)
+            if not use_undostack:
+                part.refreshSegments(id_num + id_num_offset)
     # end def
 
     xovers = copy_dict['xovers']
@@ -180,10 +186,15 @@ def importToPart(part_instance, copy_dict, use_undostack=True):
                             use_undostack=use_undostack)
     if not use_undostack:
         RefreshOligosCommand(part).redo()
+        # loadStrands adds them silently
+        for oligo in set(strand.oligo() for strand in new_strands):
+            part.partOligoAddedSignal.emit(part, oligo)
 
     # INSERTIONS, SKIPS
     for id_num, idx, length in copy_dict['insertions']:
         strand = part.getStrand(True, id_num + id_num_offset, idx)
+        if strand is None:
+            strand = part.getStrand(False, id_num + id_num_offset, idx)
         strand.addInsertion(idx, length, use_undostack=use_undostack)
 
 
@@ -4,11 +4,12 @@ from cadnano.cnenum import PointType
 
 FORMAT_VERSION = "3.0"
 
-def encodeDocument(document):
+def encodeDocument(document, encode_strands=True):
     """ Encode a Document to a dictionary to enable serialization
 
     Args:
         document (Document):
+        encode_strands (bool): optional, see `encodePart`
 
     Returns:
         dict:
@@ -20,16 +21,25 @@ def encodeDocument(document):
         'modifications': document.modifications()
     }
     parts_list = doc_dict['parts']
-    for part in document.getParts():
-        part_dict = encodePart(part)
+    for lazy_part in document.lazyParts():
+        if lazy_part.partDict() is None:    # e.g. from a .cn5 file
+            document.decodeLazyPart(lazy_part)
+    for part in document.getParts(decode_lazy=False):
+        part_dict = encodePart(part, encode_strands)
         parts_list.append(part_dict)
+    # parts never decoded are written as they were read
+    parts_list.extend(lazy_part.partDict() for lazy_part in document.lazyParts())
     return doc_dict
 # end def
 
-def encodePart(part):
+def encodePart(part, encode_strands=True):
     """
     Args:
         part (Part):
+        encode_strands (bool): optional, if False the 'strands', 'xovers' and
+            'oligos' entries are left as None placeholders, in their usual
+            place, for the caller to fill in.  Used by
+            :class:`cadnano.fileio.nnoencode.IncrementalEncoder`
 
     Returns:
         dict:
@@ -60,19 +70,22 @@ def encodePart(part):
         else:
             offset, size = offset_and_size
             vh_list.append((id_num, size))
-            fwd_ss, rev_ss = part.getStrandSets(id_num)
-            fwd_idxs, fwd_colors  = fwd_ss.dump(xover_list)
-            rev_idxs, rev_colors  = rev_ss.dump(xover_list)
-            strand_list.append((fwd_idxs, rev_idxs))
-            prop_list.append((fwd_colors, rev_colors))
+            if encode_strands:
+                idxs, colors = encodeStrandSets(part, id_num, xover_list)
+                strand_list.append(idxs)
+                prop_list.append(colors)
     # end for
     group_props['vh_list'] = vh_list
-    group_props['strands'] = {  'indices': strand_list,
-                                'properties': prop_list
-                            }
+    if encode_strands:
+        group_props['strands'] = {  'indices': strand_list,
+                                    'properties': prop_list
+                                }
+    else:
+        group_props['strands'] = None
+        xover_list = None
     group_props['insertions'] = list(part.dumpInsertions())
     group_props['xovers'] = xover_list
-    group_props['oligos'] = [o.dump() for o in part.oligos()]
+    group_props['oligos'] = [o.dump() for o in part.oligos()] if encode_strands else None
 
     instance_props = list(part.instanceProperties())
     group_props['instance_properties'] = instance_props
@@ -81,6 +94,26 @@ def encodePart(part):
     return group_props
 # end def
 
+def encodeStrandSets(part, id_num, xover_list):
+    """ Encode the strands of one virtual helix
+
+    Args:
+        part (Part):
+        id_num (int): virtual helix ID number
+        xover_list (list): the xovers with a 3 prime end on the virtual helix
+            are appended to this
+
+    Returns:
+        tuple: of the form::
+
+            ((fwd_idxs, rev_idxs), (fwd_colors, rev_colors))
+    """
+    fwd_ss, rev_ss = part.getStrandSets(id_num)
+    fwd_idxs, fwd_colors = fwd_ss.dump(xover_list)
+    rev_idxs, rev_colors = rev_ss.dump(xover_list)
+    return (fwd_idxs, rev_idxs), (fwd_colors, rev_colors)
+# end def
+
 def encodePartList(part_instance, vh_group_list):
     """ Used for copying and pasting
     TODO: unify encodePart and encodePartList
@@ -126,11 +159,9 @@ def encodePartList(part_instance, vh_group_list):
         else:
             offset, size = offset_and_size
             vh_list.append((id_num, size))
-            fwd_ss, rev_ss = part.getStrandSets(id_num)
-            fwd_idxs, fwd_colors = fwd_ss.dump(xover_list)
-            rev_idxs, rev_colors = rev_ss.dump(xover_list)
-            strand_list.append((fwd_idxs, rev_idxs))
-            prop_list.append((fwd_colors, rev_colors))
+            idxs, colors = encodeStrandSets(part, id_num, xover_list)
+            strand_list.append(idxs)
+            prop_list.append(colors)
     # end for
 
     remap = {x: y for x, y in zip(   vh_group_list,
@@ -548,7 +548,7 @@ class DocumentController():
             fname = QFileDialog.getSaveFileName(self.win,
                                                 "%s - Save As" % QApplication.applicationName(),
                                                 directory,
-                                                "%s (*.json)" % QApplication.applicationName())
+                                                "%s (*.json *.cn5)" % QApplication.applicationName())
             if isinstance(fname, (list, tuple)):
                 fname = fname[0]
             self.writeDocumentToFile(fname)
@@ -556,7 +556,7 @@ class DocumentController():
             fdialog = QFileDialog(self.win,
                                   "%s - Save As" % QApplication.applicationName(),
                                   directory,
-                                  "%s (*.json)" % QApplication.applicationName())
+                                  "%s (*.json *.cn5)" % QApplication.applicationName())
             fdialog.setAcceptMode(QFileDialog.AcceptSave)
             fdialog.setWindowFlags(Qt.Sheet)
             fdialog.setWindowModality(Qt.WindowModal)
@@ -682,7 +682,7 @@ class DocumentController():
             fname = selected
         if fname is None or os.path.isdir(fname):
             return False
-        if not fname.lower().endswith(".json"):
+        if not fname.lower().endswith((".json", ".cn5")):
             fname += ".json"
         if self.filesavedialog is not None:
             self.filesavedialog.filesSelected.disconnect(self.saveFileDialogCallback)
@@ -731,14 +731,14 @@ class DocumentController():
         if util.isWindows():  # required for native looking file window#"/",
             fname = QFileDialog.getOpenFileName(None,
                                                 "Open Document", path,
-                                                "cadnano1 / cadnano2 Files (*.nno *.json *.c25)")
+                                                "cadnano1 / cadnano2 Files (*.nno *.json *.c25 *.cn5)")
             self.filesavedialog = None
             self.openAfterMaybeSaveCallback(fname)
         else:  # access through non-blocking callback
             fdialog = QFileDialog(self.win,
                                   "Open Document",
                                   path,
-                                  "cadnano1 / cadnano2 Files (*.nno *.json *.c25)")
+                                  "cadnano1 / cadnano2 Files (*.nno *.json *.c25 *.cn5)")
             fdialog.setAcceptMode(QFileDialog.AcceptOpen)
             fdialog.setWindowFlags(Qt.Sheet)
             fdialog.setWindowModality(Qt.WindowModal)
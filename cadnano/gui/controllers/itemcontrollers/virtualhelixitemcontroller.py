@@ -24,7 +24,8 @@ class VirtualHelixItemController(object):
     ]
 
     strand_connections = [
-        ('strandsetStrandAddedSignal', 'strandAddedSlot')
+        ('strandsetStrandAddedSignal', 'strandAddedSlot'),
+        ('strandsetStrandsAddedSignal', 'strandsAddedSlot')
     ]
 
     def connectSignals(self):
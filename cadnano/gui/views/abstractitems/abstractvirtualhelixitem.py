@@ -26,6 +26,11 @@ class AbstractVirtualHelixItem(object):
     def strandAddedSlot(self, sender, strand):
         pass
 
+    def strandsAddedSlot(self, sender, strands):
+        for strand in strands:
+            self.strandAddedSlot(sender, strand)
+    # end def
+
     def cnModel(self):
         return self._model_vh
     # end def
@@ -13,6 +13,7 @@ from cadnano.gui.views.grabcorneritem import GrabCornerItem
 
 from . import pathstyles as styles
 from .prexovermanager import PreXoverManager
+from .strand.stranditem import StrandItem
 from .strand.xoveritem import XoverNode3
 from .virtualhelixitem import PathVirtualHelixItem
 
@@ -353,6 +354,28 @@ class PathNucleicAcidPartItem(QAbstractPartItem):
             vh_i.virtualHelixPropertyChangedSlot(keys, values)
     # end def
 
+    def partOligosRebuiltSlot(self, sender, strands):
+        """Update the color and connectivity of the items of `strands` in
+        one pass, instead of a strandHasNewOligoSlot and a strandUpdateSlot
+        call per strand item
+
+        Args:
+            sender (obj): Model object that emitted the signal.
+            strands (list): of :class:`Strand` of the rebuilt chains
+        """
+        strands = set(strands)
+        vhi_hash = self._virtual_helix_item_hash
+        for id_num in set(strand.idNum() for strand in strands):
+            vhi = vhi_hash.get(id_num)
+            if vhi is None:
+                continue
+            for item in vhi.childItems():
+                if isinstance(item, StrandItem) and item.strand() in strands:
+                    model_strand = item.strand()
+                    item.strandHasNewOligoSlot(model_strand)
+                    item.strandUpdateSlot(model_strand)
+    # end def
+
     def partVirtualHelicesSelectedSlot(self, sender, vh_set, is_adding):
         """is_adding (bool): adding (True) virtual helices to a selection
         or removing (False)
@@ -306,6 +306,26 @@ class SliceNucleicAcidPartItem(QAbstractPartItem):
         self.enlargeRectToFit()
     # end def
 
+    def partVirtualHelicesAddedSlot(self, sender, id_nums):
+        """Create every item first so the gizmos of each new item and of
+        its old neighbors are only refreshed once
+
+        Args:
+            sender (obj): Model object that emitted the signal.
+            id_nums (list): of :obj:`int` VirtualHelix ID numbers
+        """
+        vhi_hash = self._virtual_helix_item_hash
+        to_refresh = set(id_nums)
+        for id_num in id_nums:
+            vhi_hash[id_num] = SliceVirtualHelixItem(sender.getVirtualHelix(id_num), self)
+            to_refresh.update(sender.getVirtualHelixNeighbors(id_num))
+        for id_num in sorted(to_refresh):
+            vhi = vhi_hash.get(id_num, False)
+            if vhi:
+                self._refreshVirtualHelixItemGizmos(id_num, vhi)
+        self.enlargeRectToFit()
+    # end def
+
     def partVirtualHelixRemovingSlot(self, sender, id_num, virtual_helix, neighbors):
         """Summary
 
@@ -6,7 +6,6 @@ from PyQt5.QtWidgets import (QGraphicsItemGroup, QGraphicsRectItem,
                              QGraphicsItem, QMenu, QAction)
 from cadnano.gui.views.sliceview.virtualhelixitem import SliceVirtualHelixItem
 from cadnano.gui.palette import getPenObj
-from cadnano.fileio import v3encode, v3decode
 from cadnano.gui.views.sliceview import slicestyles as styles
 from .abstractslicetool import AbstractSliceTool
 
@@ -336,9 +335,8 @@ class SelectSliceTool(AbstractSliceTool):
         Returns:
             TYPE: Description
         """
-        part_instance = self.part_item.partInstance()
-        copy_dict = v3encode.encodePartList(part_instance, list(self.selection_set))
-        self.clip_board = copy_dict
+        part = self.part_item.part()
+        self.clip_board = part.copyVirtualHelices(self.selection_set)
     # end def
 
     def pasteClipboard(self):
@@ -349,10 +347,7 @@ class SelectSliceTool(AbstractSliceTool):
         """
         doc = self.manager.document
         part = self.part_item.part()
-        part_instance = self.part_item.partInstance()
-        doc.undoStack().beginMacro("Paste VirtualHelices")
-        new_vh_set = v3decode.importToPart(part_instance, self.clip_board)
-        doc.undoStack().endMacro()
+        new_vh_set = set(part.pasteVirtualHelices(self.clip_board))
         self.modelClear()
         doc.addVirtualHelicesToSelection(part, new_vh_set)
     # end def
@@ -1,7 +1,17 @@
+import numpy as np
+
 from cadnano.cnproxy import UndoCommand
-from cadnano import util
+from cadnano.strand.sequencebuffer import BLANK, encodeSequence
 
 class ApplySequenceCommand(UndoCommand):
+    """Apply a sequence to an oligo and the complement of it to the strands
+    paired with its strands.
+
+    The sequence is encoded to `uint8` bases once and each strand takes a
+    slice of it, then the complement strands copy the complement of the
+    bases they pair with from the :class:`SequenceBuffer` of the strand, see
+    :meth:`Strand.setComplementBases`.
+    """
     def __init__(self, oligo, sequence):
         super(ApplySequenceCommand, self).__init__("apply sequence")
         self._oligo = oligo
@@ -10,43 +20,34 @@ class ApplySequenceCommand(UndoCommand):
     # end def
 
     def redo(self):
-        olg = self._oligo
-        n_s = ''.join(self._new_sequence) if self._new_sequence else None
-        n_s_original = self._new_sequence
-        oligo_list = [olg]
-        for strand in olg.strand5p().generator3pStrand():
-            used_seq, n_s = strand.setSequence(n_s)
-            # get the compliment ahead of time
-            used_seq = util.comp(used_seq) if used_seq else None
-            for comp_strand in strand.getComplementStrands():
-                sub_used_seq = comp_strand.setComplementSequence(used_seq, strand)
-                oligo_list.append(comp_strand.oligo())
-            # end for
-            # as long as the new Applied Sequence is not None
-            if n_s is None and n_s_original:
-                break
-        # end for
-        for oligo in oligo_list:
-            oligo.oligoSequenceAddedSignal.emit(oligo)
+        self._applySequence(self._new_sequence)
     # end def
 
     def undo(self):
-        olg = self._oligo
-        o_s = ''.join(self._old_sequence) if self._old_sequence else None
+        self._applySequence(self._old_sequence)
+    # end def
 
+    def _applySequence(self, sequence):
+        olg = self._oligo
+        bases = encodeSequence(''.join(sequence)) if sequence else None
+        offset = 0
         oligo_list = [olg]
-
         for strand in olg.strand5p().generator3pStrand():
-            used_seq, o_s = strand.setSequence(o_s)
-
-            # get the compliment ahead of time
-            used_seq = util.comp(used_seq) if used_seq else None
+            if bases is None:
+                strand_bases = None
+            else:
+                length = strand.totalLength()
+                strand_bases = bases[offset:offset + length]
+                offset += length
+                if len(strand_bases) < length:
+                    strand_bases = np.concatenate((strand_bases,
+                        np.full(length - len(strand_bases), BLANK, dtype=np.uint8)))
+            strand._setSequenceBases(strand_bases)
             for comp_strand in strand.getComplementStrands():
-                sub_used_seq = comp_strand.setComplementSequence(used_seq, strand)
+                comp_strand.setComplementBases(strand)
                 oligo_list.append(comp_strand.oligo())
             # end for
-        # for
-
+        # end for
         for oligo in oligo_list:
             oligo.oligoSequenceAddedSignal.emit(oligo)
     # end def
@@ -9,6 +9,7 @@ from cadnano.cnenum import ModType
 from cadnano.strand import Strand
 from .applycolorcmd import ApplyColorCommand
 from .applysequencecmd import ApplySequenceCommand
+from .oligonode import OligoNode
 from .removeoligocmd import RemoveOligoCommand
 from cadnano.setpropertycmd import SetPropertyCommand
 
@@ -17,6 +18,8 @@ OLIGO_LEN_ABOVE_WHICH_HIGHLIGHT = 50
 
 PROPERTY_KEYS = ['name', 'color', 'length', 'is_visible']
 ALL_KEYS = ['id_num', 'idx5p', 'is_loop'] + PROPERTY_KEYS
+# slot storing each property
+PROPERTY_SLOTS = {key: '_' + key for key in PROPERTY_KEYS}
 
 
 class Oligo(CNObject):
@@ -26,24 +29,32 @@ class Oligo(CNObject):
     such as its color.
 
     Commands that affect Strands (e.g. create, remove, merge, split) are also
-    responsible for updating the affected Oligos.
+    responsible for updating the affected Oligos.  Which Oligo a Strand
+    belongs to is kept in a disjoint set forest, see
+    :mod:`cadnano.oligo.oligonode`.
 
     Args:
         part (Part): the model :class:`Part`
         color (str): optional, color property of the :class:`Oligo`
     """
     editable_properties = ['name', 'color']
+    __slots__ = ('_part', '_strand5p', '_is_loop',
+                 '_name', '_color', '_length', '_is_visible',
+                 '_node', '_modification', '_strands_modification')
 
     def __init__(self, part, color=None, length=0):
         super(Oligo, self).__init__(part)
         self._part = part
         self._strand5p = None
         self._is_loop = False
-        self._props = {'name': "oligo%s" % str(id(self))[-4:],
-                       'color': "#cc0000" if color is None else color,
-                       'length': 0,
-                       'is_visible': True
-                       }
+        self._name = None   # generated by getName until set
+        self._color = "#cc0000" if color is None else color
+        self._length = length
+        self._is_visible = True
+        self._node = OligoNode(self)
+        self._modification = 0
+        self._strands_modification = 0
+        self._setModified()
     # end def
 
     def __repr__(self):
@@ -61,7 +72,8 @@ class Oligo(CNObject):
         olg = Oligo(self._part)
         olg._strand5p = self._strand5p
         olg._is_loop = self._is_loop
-        olg._props = self._props.copy()
+        for slot in PROPERTY_SLOTS.values():
+            setattr(olg, slot, getattr(self, slot))
         return olg
     # end def
 
@@ -79,7 +91,7 @@ class Oligo(CNObject):
                'is_5p_fwd': s5p.isForward(),
                'is_loop': self._is_loop,
                'sequence': self.sequence()}
-        key.update(self._props)
+        key.update(self.getModelProperties())
         return key
     # end def
 
@@ -100,7 +112,9 @@ class Oligo(CNObject):
 
     ### ACCESSORS ###
     def getProperty(self, key):
-        return self._props[key]
+        if key == 'name':
+            return self.getName()
+        return getattr(self, PROPERTY_SLOTS[key])
     # end def
 
     def getOutlineProperties(self):
@@ -109,17 +123,16 @@ class Oligo(CNObject):
         Returns:
             tuple: (<name>, <color>, <is_visible>)
         """
-        props = self._props
-        return props['name'], props['color'], props['is_visible']
+        return self.getName(), self._color, self._is_visible
     # end def
 
     def getModelProperties(self):
-        """Return a reference to the property dictionary
+        """Return a new dictionary of the properties
 
         Returns:
             dict:
         """
-        return self._props
+        return {key: self.getProperty(key) for key in PROPERTY_KEYS}
     # end def
 
     def setProperty(self, key, value, use_undostack=True):
@@ -131,20 +144,27 @@ class Oligo(CNObject):
     # end def
 
     def _setProperty(self, key, value, emit_signals=False):
-        self._props[key] = value
+        setattr(self, PROPERTY_SLOTS[key], value)
+        if key == 'color':
+            self._setStrandsModified()
+        else:
+            self._setModified()
         if emit_signals:
             self.oligoPropertyChangedSignal.emit(self, key, value)
     # end def
 
     def getName(self):
-        return self._props['name']
+        name = self._name
+        if name is None:
+            name = self._name = "oligo%s" % str(id(self))[-4:]
+        return name
     # end def
 
     def getColor(self):
-        color = self._props['color']
+        color = self._color
         try:
             if color is None:
-                print(self._props)
+                print(self.getModelProperties())
                 raise ValueError("Whhat Got None???")
         except:
             exc_type, exc_value, exc_traceback = sys.exc_info()
@@ -162,13 +182,15 @@ class Oligo(CNObject):
         """
         if color is None:
             raise ValueError("Whhat None???")
-        self._props['color'] = color
+        self._color = color
+        self._setStrandsModified()
     # end def
 
     def _setLength(self, length, emit_signals):
         before = self.shouldHighlight()
         key = 'length'
-        self._props[key] = length
+        self._length = length
+        self._setModified()
         if emit_signals and before != self.shouldHighlight():
             self.oligoSequenceClearedSignal.emit(self)
             self.oligoPropertyChangedSignal.emit(self, key, length)
@@ -199,6 +221,40 @@ class Oligo(CNObject):
 
     def setStrand5p(self, strand):
         self._strand5p = strand
+        self._setModified()
+    # end def
+
+    def modification(self):
+        """
+        Returns:
+            int: stamp of the last change to this oligo, see
+            :meth:`NucleicAcidPart.nextModification`
+        """
+        return self._modification
+    # end def
+
+    def _setModified(self):
+        part = self._part
+        if part is not None:
+            self._modification = part.nextModification()
+    # end def
+
+    def strandsModification(self):
+        """
+        Returns:
+            int: stamp of the last change to this oligo that shows in the
+            encoding of its strands, i.e. its color or which strands resolve
+            to it through :meth:`Strand.oligo`
+        """
+        return self._strands_modification
+    # end def
+
+    def _setStrandsModified(self):
+        """Stamp this oligo as changed for its strands too, for changes
+        such as the color that are stored per strand
+        """
+        self._setModified()
+        self._strands_modification = self._modification
     # end def
 
     def undoStack(self):
@@ -211,7 +267,7 @@ class Oligo(CNObject):
     # end def
 
     def length(self):
-        return self._props['length']
+        return self._length
     # end def
 
     def sequence(self):
@@ -295,14 +351,6 @@ class Oligo(CNObject):
         util.doCmd(self, c, use_undostack=use_undostack)
     # end def
 
-    def applyAbstractSequences(self):
-        temp = self.strand5p()
-        if not temp:
-            return
-        for strand in temp.generator3pStrand():
-            strand.applyAbstractSequence()
-    # end def
-
     def clearAbstractSequences(self):
         temp = self.strand5p()
         if not temp:
@@ -337,18 +385,21 @@ class Oligo(CNObject):
 
     def _setLoop(self, bool):
         self._is_loop = bool
+        self._setModified()
     # end def
 
     ### PUBLIC SUPPORT METHODS ###
     def addToPart(self, part, emit_signals=False):
         self._part = part
         self.setParent(part)
+        self._setModified()
         part._addOligoToSet(self, emit_signals)
     # end def
 
     def setPart(self, part):
         self._part = part
         self.setParent(part)
+        self._setModified()
     # end def
 
     def destroy(self):
@@ -397,6 +448,7 @@ class Oligo(CNObject):
         """This method sets the isLoop status of the oligo and the oligo's
         5' strand.
         """
+        self._setModified()
         # check loop status
         if old_strand_low.oligo() == old_strand_high.oligo():
             self._is_loop = True
@@ -426,6 +478,7 @@ class Oligo(CNObject):
         """
         # if you split it can't be a loop
         self._is_loop = False
+        self._setModified()
         if old_merged_strand.oligo().isLoop():
             self._strand5p = new_strand3p
             return
@@ -435,6 +488,7 @@ class Oligo(CNObject):
             else:
                 self._strand5p = old_merged_strand.oligo()._strand5p
             oligo3p._strand5p = new_strand3p
+            oligo3p._setModified()
         # end else
     # end def
 
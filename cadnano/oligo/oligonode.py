@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Disjoint set forest of oligo membership.
+
+Every :class:`Oligo` owns an :class:`OligoNode` and a :class:`Strand` belongs
+to the oligo stored at the root of the tree of its own oligo's node, see
+:meth:`Strand.oligo`.  Joining the strands of two oligos, as creating a
+crossover or merging two strands does, is then a `linkOligos` of their trees
+instead of a `Strand.setOligo` on every strand of one of them.
+
+Trees are linked by rank and never path compressed, so lookups cost
+O(log n) and a link can be undone exactly by `unlinkOligos`, as long as
+links are undone in the reverse order they were made, which the undo stack
+guarantees.
+"""
+
+
+class OligoNode(object):
+    """Node of the oligo membership forest
+
+    Args:
+        oligo (Oligo): the oligo owning this node
+
+    Attributes:
+        parent (OligoNode): None for a root
+        rank (int): upper bound of the height of the tree below a root
+        oligo (Oligo): the oligo of the strands of the tree, only valid
+            for a root
+    """
+    __slots__ = 'parent', 'rank', 'oligo'
+
+    def __init__(self, oligo):
+        self.parent = None
+        self.rank = 0
+        self.oligo = oligo
+    # end def
+
+    def root(self):
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return node
+    # end def
+# end class
+
+
+def linkOligos(oligo, other):
+    """Make the strands of `other` belong to `oligo`, or if they already
+    share a tree, make all of its strands belong to `oligo`
+
+    Args:
+        oligo (Oligo): the oligo the strands of both trees belong to after
+        other (Oligo):
+
+    Returns:
+        tuple: record to pass to `unlinkOligos`
+    """
+    root = oligo._node.root()
+    other_root = other._node.root()
+    displaced = [root.oligo, other_root.oligo]
+    if root is other_root:
+        record = (None, root, root.oligo, root.rank)
+    else:
+        if root.rank < other_root.rank:
+            root, other_root = other_root, root
+        record = (other_root, root, root.oligo, root.rank)
+        other_root.parent = root
+        if root.rank == other_root.rank:
+            root.rank += 1
+    root.oligo = oligo
+    for olg in displaced:
+        olg._setStrandsModified()
+    oligo._setStrandsModified()
+    return record
+# end def
+
+
+def unlinkOligos(record):
+    """Undo the `linkOligos` that returned `record`.  Every link made after
+    it must have been undone first
+
+    Args:
+        record (tuple): from `linkOligos`
+    """
+    child, root, oligo, rank = record
+    root.oligo._setStrandsModified()
+    if child is not None:
+        child.parent = None
+        child.oligo._setStrandsModified()
+    root.oligo = oligo
+    root.rank = rank
+    oligo._setStrandsModified()
+# end def
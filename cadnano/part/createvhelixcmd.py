@@ -1,6 +1,7 @@
-from ast import literal_eval
-import bisect
+import numpy as np
+
 from cadnano.cnproxy import UndoCommand
+from .vhpropertystore import neighborsFromValue
 
 
 class CreateVirtualHelixCommand(UndoCommand):
@@ -32,7 +33,8 @@ class CreateVirtualHelixCommand(UndoCommand):
         if safe:
             self.neighbors = []
         else:
-            self.neighbors = literal_eval(self.values[self.keys.index('neighbors')])
+            neighbors = self.values[self.keys.index('neighbors')]
+            self.neighbors = neighborsFromValue(neighbors).tolist()
 
         self.threshold = 2.1*part.radius()
         self.safe = safe
@@ -50,13 +52,10 @@ class CreateVirtualHelixCommand(UndoCommand):
                 self.neighbors = part._getVirtualHelixOriginNeighbors(id_num, self.threshold)
 
             neighbors = self.neighbors
-            part.vh_properties.loc[id_num, 'neighbors'] = str(list(neighbors))
+            vh_properties = part.vh_properties
+            vh_properties.setNeighbors(id_num, neighbors)
             for neighbor_id in neighbors:
-                nneighbors = literal_eval(
-                    part.getVirtualHelixProperties(neighbor_id, 'neighbors')
-                )
-                bisect.insort_left(nneighbors, id_num)
-                part.vh_properties.loc[neighbor_id, 'neighbors'] = str(list(nneighbors))
+                vh_properties.addNeighbor(neighbor_id, id_num)
         else:
             neighbors = self.neighbors
         if self.keys is not None:
@@ -71,12 +70,9 @@ class CreateVirtualHelixCommand(UndoCommand):
         part = self.part
         id_num = self.id_num
         # since we're hashing on the object in the views do this first
+        vh_properties = part.vh_properties
         for neighbor_id in self.neighbors:
-            nneighbors = literal_eval(
-                            part.getVirtualHelixProperties(neighbor_id, 'neighbors')
-                        )
-            nneighbors.remove(id_num)
-            part.vh_properties.loc[neighbor_id, 'neighbors'] = str(list(nneighbors))
+            vh_properties.removeNeighbor(neighbor_id, id_num)
 
         # signaling the view is two parts to clean up signals properly
         # and then allow the views to refresh
@@ -87,3 +83,94 @@ class CreateVirtualHelixCommand(UndoCommand):
         part.partVirtualHelixRemovedSignal.emit(part, id_num)
     # end def
 # end class
+
+
+class CreateVirtualHelicesCommand(UndoCommand):
+    def __init__(self, part, origins, directions, sizes,
+                 id_nums=None, properties=None,
+                 safe=True):
+        """Bulk version of CreateVirtualHelixCommand
+
+        Args:
+            origins (array-like): (n, 2) or (n, 3) of :obj:`float`
+            directions (array-like): (n, 3) of :obj:`float`, a single
+                direction or None for (0, 0, 1)
+            sizes (object): :obj:`int` or :obj:`list` of :obj:`int`
+            id_nums (list): optional, of :obj:`int`
+            properties (dict): optional, of :obj:`list` of values per key
+            safe (bool): safe must be True to update neighbors
+            otherwise, neighbors need to be in `properties`
+        """
+        super(CreateVirtualHelicesCommand, self).__init__("create virtual helices")
+        self.part = part
+        origins = np.array(origins, dtype=float).reshape(-1, np.shape(origins)[-1])
+        num_helices = len(origins)
+        if origins.shape[1] == 2:
+            origins = np.column_stack((origins, np.zeros(num_helices)))
+        self.origins = origins
+        if directions is None:
+            directions = (0, 0, 1)
+        self.directions = np.array(np.broadcast_to(directions, (num_helices, 3)), dtype=float)
+        self.sizes = [int(x) for x in np.broadcast_to(sizes, (num_helices,))]
+        if id_nums is None:
+            id_nums = []
+            for i in range(num_helices):
+                id_num = part._getNewIdNum()
+                part._reserveIdNum(id_num)
+                id_nums.append(id_num)
+        else:
+            if len(id_nums) != num_helices:
+                raise ValueError("{} id_nums for {} origins".format(len(id_nums), num_helices))
+            for id_num in id_nums:
+                part._reserveIdNum(id_num)
+        self.id_nums = list(id_nums)
+        self.color = part.getColor()
+        self.properties = dict(properties) if properties is not None else {}
+        if safe:
+            self.properties.pop('neighbors', None)
+            self.neighbors = None
+        else:
+            self.neighbors = dict(zip(self.id_nums, (neighborsFromValue(x).tolist()
+                                                     for x in self.properties['neighbors'])))
+        self.threshold = 2.1*part.radius()
+        self.safe = safe
+    # end def
+
+    def redo(self):
+        part = self.part
+        id_nums = self.id_nums
+        part._createHelices(id_nums, self.origins, self.directions, self.sizes,
+                            self.color, self.properties)
+        if self.safe:   # update all neighbors
+            if self.neighbors is None:
+                self.neighbors = part._getVirtualHelicesOriginNeighbors(id_nums, self.threshold)
+            vh_properties = part.vh_properties
+            new_id_set = set(id_nums)
+            for id_num in id_nums:
+                neighbors = self.neighbors[id_num]
+                vh_properties.setNeighbors(id_num, neighbors)
+                for neighbor_id in neighbors:
+                    if neighbor_id not in new_id_set:
+                        vh_properties.addNeighbor(neighbor_id, id_num)
+        part.partVirtualHelicesAddedSignal.emit(part, list(id_nums))
+    # end def
+
+    def undo(self):
+        part = self.part
+        id_nums = self.id_nums
+        if self.safe:
+            new_id_set = set(id_nums)
+            vh_properties = part.vh_properties
+            for id_num in id_nums:
+                for neighbor_id in self.neighbors[id_num]:
+                    if neighbor_id not in new_id_set:
+                        vh_properties.removeNeighbor(neighbor_id, id_num)
+        for id_num in reversed(id_nums):
+            # signaling the view is two parts to clean up signals properly
+            # and then allow the views to refresh
+            part.partVirtualHelixRemovingSignal.emit(
+                part, id_num, part.getVirtualHelix(id_num), self.neighbors[id_num])
+            part._removeHelix(id_num)
+            part.partVirtualHelixRemovedSignal.emit(part, id_num)
+    # end def
+# end class
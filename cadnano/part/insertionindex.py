@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""Indexed storage of the insertions and skips of a virtual helix.
+
+:class:`InsertionIndex` keeps the :class:`Insertion` objects of one helix in
+a list sorted by base index for range enumeration, plus a Fenwick (binary
+indexed) tree over base indices holding their lengths, so the summed length
+of the insertions between two indices costs O(log n) instead of a scan of
+every insertion on the helix.
+"""
+from bisect import bisect_left, bisect_right
+
+
+class InsertionIndex(object):
+    """Insertions of one virtual helix.  Reads like a :obj:`dict` of
+    {base index: :class:`Insertion`} iterated in index order, and is modified
+    with `add`, `remove` and `setLength` by the insertion commands
+    """
+    def __init__(self):
+        self._idxs = []         # sorted base indices of the insertions
+        self._insertions = {}   # base index: Insertion
+        self._tree = [0]        # 1 based Fenwick tree of lengths, position idx + 1
+    # end def
+
+    def __len__(self):
+        return len(self._idxs)
+    # end def
+
+    def __contains__(self, idx):
+        return idx in self._insertions
+    # end def
+
+    def __getitem__(self, idx):
+        return self._insertions[idx]
+    # end def
+
+    def __iter__(self):
+        return iter(self._idxs)
+    # end def
+
+    def get(self, idx, default=None):
+        return self._insertions.get(idx, default)
+    # end def
+
+    def keys(self):
+        return list(self._idxs)
+    # end def
+
+    def values(self):
+        insertions = self._insertions
+        return [insertions[idx] for idx in self._idxs]
+    # end def
+
+    def items(self):
+        insertions = self._insertions
+        return [(idx, insertions[idx]) for idx in self._idxs]
+    # end def
+
+    def add(self, insertion):
+        """Add an insertion, replacing any insertion at its index
+
+        Args:
+            insertion (Insertion):
+        """
+        idx = insertion.idx()
+        old = self._insertions.get(idx)
+        if old is None:
+            idxs = self._idxs
+            idxs.insert(bisect_left(idxs, idx), idx)
+            delta = insertion.length()
+        else:
+            delta = insertion.length() - old.length()
+        self._insertions[idx] = insertion
+        self._addToTree(idx, delta)
+    # end def
+
+    def remove(self, idx):
+        """Remove the insertion at a base index
+
+        Args:
+            idx (int): base index
+
+        Returns:
+            Insertion: the removed insertion
+
+        Raises:
+            KeyError: no insertion at `idx`
+        """
+        insertion = self._insertions.pop(idx)
+        idxs = self._idxs
+        del idxs[bisect_left(idxs, idx)]
+        self._addToTree(idx, -insertion.length())
+        return insertion
+    # end def
+
+    def setLength(self, idx, length):
+        """Change the length of the insertion at a base index
+
+        Args:
+            idx (int): base index
+            length (int): new length
+
+        Raises:
+            KeyError: no insertion at `idx`
+        """
+        insertion = self._insertions[idx]
+        delta = length - insertion.length()
+        insertion.setLength(length)
+        self._addToTree(idx, delta)
+    # end def
+
+    def between(self, idx_low, idx_high):
+        """
+        Args:
+            idx_low (int): low base index, inclusive
+            idx_high (int): high base index, inclusive
+
+        Returns:
+            list: of :class:`Insertion` in the range sorted by index
+        """
+        idxs = self._idxs
+        insertions = self._insertions
+        return [insertions[idx] for idx in
+                idxs[bisect_left(idxs, idx_low):bisect_right(idxs, idx_high)]]
+    # end def
+
+    def lengthBetween(self, idx_low, idx_high):
+        """
+        Args:
+            idx_low (int): low base index, inclusive
+            idx_high (int): high base index, inclusive
+
+        Returns:
+            int: summed length of the insertions and skips in the range
+        """
+        if idx_high < idx_low or not self._idxs:
+            return 0
+        return self.prefixLength(idx_high) - self.prefixLength(idx_low - 1)
+    # end def
+
+    def prefixLength(self, idx):
+        """
+        Args:
+            idx (int): base index, inclusive
+
+        Returns:
+            int: summed length of the insertions and skips at base indices
+            <= `idx`
+        """
+        tree = self._tree
+        i = min(idx + 1, len(tree) - 1)
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i &= i - 1
+        return total
+    # end def
+
+    def _addToTree(self, idx, delta):
+        tree = self._tree
+        size = len(tree) - 1
+        if idx >= size:
+            self._rebuildTree(max(2*size, idx + 1, 64))
+            return
+        i = idx + 1
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+    # end def
+
+    def _rebuildTree(self, size):
+        """Build the Fenwick tree for base indices [0, size) in linear time
+        from the current insertions
+        """
+        tree = [0]*(size + 1)
+        for idx, insertion in self._insertions.items():
+            tree[idx + 1] += insertion.length()
+        for i in range(1, size + 1):
+            j = i + (i & -i)
+            if j <= size:
+                tree[j] += tree[i]
+        self._tree = tree
+    # end def
+# end class
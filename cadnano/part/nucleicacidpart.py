@@ -1,10 +1,9 @@
 # -*- coding: utf-8 -*-
 import math
-from ast import literal_eval
 from bisect import bisect_left
 from collections import defaultdict, deque
+from contextlib import contextmanager
 from heapq import heapify, heappush, nsmallest
-from itertools import count as icount
 
 import numpy as np
 import pandas as pd
@@ -18,10 +17,17 @@ from cadnano.oligo import RemoveOligoCommand
 from cadnano.part.part import Part
 from cadnano.strandset import StrandSet
 from cadnano.strandset import SplitCommand
-from .createvhelixcmd import CreateVirtualHelixCommand
+from .createvhelixcmd import CreateVirtualHelixCommand, CreateVirtualHelicesCommand
 from .removevhelixcmd import RemoveVirtualHelixCommand
 from .resizevirtualhelixcmd import ResizeVirtualHelixCommand
+from .insertionindex import InsertionIndex
+from .pastevhelixcmd import PasteVirtualHelicesCommand
+from .segmentindex import SegmentEndpoints
+from .spatialindex import OriginGridIndex, PointGridIndex
+from .transaction import PartTransaction
+from .vhpropertystore import VirtualHelixPropertyStore
 from .translatevhelixcmd import TranslateVirtualHelicesCommand
+from .vhclipboard import VirtualHelixClipboard
 from .xovercmds import CreateXoverCommand, RemoveXoverCommand
 from cadnano.setpropertycmd import SetVHPropertyCommand
 from cadnano.addinstancecmd import AddInstanceCommand
@@ -34,6 +40,7 @@ equivalent to np.sum(a*a, axis=1) but faster
 from numpy.core.umath_tests import inner1d
 
 DEFAULT_CACHE_SIZE = 20
+QUERY_CHUNK_ELEMENTS = 2**16  # bound on pairwise distances computed at once
 
 
 def _defaultProperties(id_num):
@@ -56,20 +63,20 @@ def _defaultProperties(id_num):
     return tuple(zip(*props))
 # end def
 VH_PROPERTY_KEYS = set([x for x in _defaultProperties(0)[0]])
+XOVER_PROPERTY_KEYS = set(['eulerZ', 'bases_per_repeat', 'turns_per_repeat',
+                           'helical_pitch', 'minor_groove_angle', 'z'])
+"""Virtual helix properties that change the potential crossover map"""
 
 
-Z_PROP_INDEX = -1  # index for Dataframe.iloc calls
-
-
-def _defaultDataFrame(size):
+def _defaultPropertyStore(size):
     dummy_id_num = 999
-    columns, row = _defaultProperties(dummy_id_num)
-    df = pd.DataFrame([row for i in range(size)], columns=columns)
-    return df
+    keys, row = _defaultProperties(dummy_id_num)
+    return VirtualHelixPropertyStore(keys, row, size)
 # end def
 DEFAULT_SIZE = 256
 DEFAULT_FULL_SIZE = DEFAULT_SIZE * 48
 DEFAULT_RADIUS = 1.125  # nm
+SLAB_PADDING = 64  # free points kept at each end of a new virtual helix slab
 
 
 class NucleicAcidPart(Part):
@@ -114,7 +121,7 @@ class NucleicAcidPart(Part):
             return
 
         self._radius = DEFAULT_RADIUS     # probably a property???
-        self._insertions = defaultdict(dict)  # dict of insertions per virtualhelix
+        self._insertions = defaultdict(InsertionIndex)  # InsertionIndex per virtualhelix
         self._mods = {'int_instances': {},
                       'ext_instances': {}}
         self._oligos = set()
@@ -126,9 +133,6 @@ class NucleicAcidPart(Part):
         self._selected = False
         self.is_active = False
 
-        self._abstract_segment_id = None
-        self._current_base_count = None
-
         # Properties (NucleicAcidPart-specific)
         gps = self._group_properties
         gps["name"] = "NaPart%d" % self._count()
@@ -145,7 +149,7 @@ class NucleicAcidPart(Part):
         ############################
 
         # 1. per virtual base pair allocations
-        self.total_points = 0
+        self.total_points = 0  # number of points in use by virtual helices
         self.axis_pts = np.full((DEFAULT_FULL_SIZE, 3), np.inf, dtype=float)
         # self.axis_pts[:, 2] = 0.0
         self.fwd_pts = np.full((DEFAULT_FULL_SIZE, 3), np.inf, dtype=float)
@@ -169,15 +173,24 @@ class NucleicAcidPart(Part):
         """Bookkeeping for fast lookup of indices for insertions and deletions
         and coordinate points. The length of this is the max id_num used.
         """
+        self._slabs = {}
+        """id_num: (slab_start, capacity) of the region of the per point
+        arrays owned by each virtual helix.  A helix's points live somewhere
+        inside its slab so it can grow at either end without moving other
+        helices.  See `_addCoordinates` and `compact`
+        """
+        self._arena_end = 0     # end of the last slab in the per point arrays
+        self._slab_points = 0   # sum of slab capacities, the rest are gaps
         self._virtual_helices_set = {}
 
         self.reserved_ids = set()
 
-        self.vh_properties = _defaultDataFrame(DEFAULT_SIZE)
+        self.vh_properties = _defaultPropertyStore(DEFAULT_SIZE)
 
         self.fwd_strandsets = [None] * DEFAULT_SIZE
         self.rev_strandsets = [None] * DEFAULT_SIZE
-        self.segment_dict = {}  # for tracking strand segments
+        self._segment_endpoints = {}  # id_num: SegmentEndpoints
+        self._transaction = None    # PartTransaction while one is open
 
         # Cache Stuff
         self._point_cache = None
@@ -186,13 +199,24 @@ class NucleicAcidPart(Part):
         self._origin_cache = None
         self._origin_cache_keys = None
         self._resetOriginCache()
+        self._xover_cache = None
+        self._xover_cache_keys = None
+        self._resetXoverCache()
+
+        # Change stamps for incremental saving, see `setVirtualHelixModified`
+        self._modification_count = 0
+        self._vh_modifications = {}
+
+        # Spatial indices for radius queries, see `_queryBasePoint` and
+        # `_queryVirtualHelixOrigin`
+        self._point_index = PointGridIndex(2*DEFAULT_RADIUS, self._axisPoints)
+        self._origin_index = OriginGridIndex(2*DEFAULT_RADIUS)
 
         # scratch allocations for vector calculations
         self.m3_scratch0 = np.zeros((3, 3), dtype=float)
         self.m3_scratch1 = np.zeros((3, 3), dtype=float)
         self.m3_scratch2 = np.zeros((3, 3), dtype=float)
         self.eye3_scratch = np.eye(3, 3, dtype=float)    # don't change this
-        self.delta2D_scratch = np.empty((1,), dtype=float)
         self.delta3D_scratch = np.empty((1,), dtype=float)
 
         # ID assignment
@@ -210,6 +234,9 @@ class NucleicAcidPart(Part):
     partVirtualHelixAddedSignal = ProxySignal(object, int, object, object, name='partVirtualHelixAddedSignal')
     """self, virtual_helix id_num, virtual_helix, neighbor list"""
 
+    partVirtualHelicesAddedSignal = ProxySignal(object, object, name='partVirtualHelicesAddedSignal')
+    """self, list of virtual_helix id_nums.  Sent once by `createVirtualHelices`"""
+
     partVirtualHelixRemovingSignal = ProxySignal(object, int, object, object, name='partVirtualHelixRemovingSignal')
     """self, virtual_helix id_num, virtual_helix, neighbor list"""
 
@@ -233,6 +260,12 @@ class NucleicAcidPart(Part):
     # C. Oligo
     partOligoAddedSignal = ProxySignal(CNObject, object, name='partOligoAddedSignal')
     """self, oligo"""
+
+    partOligosRebuiltSignal = ProxySignal(object, object, name='partOligosRebuiltSignal')
+    """self, list of the strands of the rebuilt chains of connected strands,
+    whose oligo or xovers may have changed.  Sent once by
+    `RefreshOligosCommand` instead of a `strandHasNewOligoSignal` and
+    `strandUpdateSignal` per strand"""
     # D. Strand
     partStrandChangedSignal = ProxySignal(object, int, name='partStrandChangedSignal')
     """self, virtual_helix"""
@@ -251,6 +284,36 @@ class NucleicAcidPart(Part):
         self._point_cache_keys = deque([None] * DEFAULT_CACHE_SIZE)
     # end def
 
+    def _resetXoverCache(self):
+        """Clear the full length crossover candidate hits cached per
+        (id_num, neighbor_id) pair by `potentialCrossoverMap`
+        """
+        self._xover_cache = {}
+        self._xover_cache_keys = defaultdict(set)
+    # end def
+
+    def _invalidateXoverCache(self, id_nums):
+        """Drop the cached crossover candidates of every pair involving one of
+        `id_nums`.  Call whenever the coordinates or twist related properties
+        of a virtual helix change
+
+        Args:
+            id_nums (iterable): of :obj:`int` virtual helix ID numbers
+        """
+        xover_cache = self._xover_cache
+        xover_cache_keys = self._xover_cache_keys
+        for id_num in id_nums:
+            keys = xover_cache_keys.pop(id_num, None)
+            if keys is None:
+                continue
+            for key in keys:
+                if xover_cache.pop(key, None) is not None:
+                    other_id_num = key[1] if key[0] == id_num else key[0]
+                    other_keys = xover_cache_keys.get(other_id_num)
+                    if other_keys is not None:
+                        other_keys.discard(key)
+    # end def
+
     def copy(self, document, new_object=None):
         """Copy all arrays and counters and create new StrandSets
 
@@ -280,19 +343,68 @@ class NucleicAcidPart(Part):
         new_vhg.origin_limits = self.origin_limits
         new_vhg.directions = self.directions
 
-        new_vhg.offset_and_size = self._offset_and_size.copy()
+        new_vhg._offset_and_size = self._offset_and_size.copy()
+        new_vhg._slabs = self._slabs.copy()
+        new_vhg._arena_end = self._arena_end
+        new_vhg._slab_points = self._slab_points
         new_vhg.reserved_ids = self.reserved_ids.copy()
 
-        new_vhg.vh_properties = _defaultDataFrame(DEFAULT_SIZE)
+        new_vhg.vh_properties = self.vh_properties.copy()
 
         new_vhg.fwd_strandsets = [x.simpleCopy(new_vhg) for x in self.fwd_strandsets]
         new_vhg.rev_strandsets = [x.simpleCopy(new_vhg) for x in self.rev_strandsets]
+        new_vhg._segment_endpoints = {}
 
         new_vhg.recycle_bin = self.recycle_bin
         new_vhg._highest_id_num_used = self._highest_id_num_used
+        new_vhg._rebuildSpatialIndices()
+        new_vhg._resetXoverCache()
+        new_vhg._modification_count = self._modification_count
+        new_vhg._vh_modifications = self._vh_modifications.copy()
         return new_vhg
     # end def
 
+    def _rebuildSpatialIndices(self):
+        """Reindex the axis points and origins of every virtual helix from
+        scratch.  Normally the indices are maintained incrementally by the
+        methods that change coordinates.
+        """
+        self._point_index = point_index = PointGridIndex(2*DEFAULT_RADIUS, self._axisPoints)
+        self._origin_index = origin_index = OriginGridIndex(2*DEFAULT_RADIUS)
+        for id_num, offset_and_size_tuple in enumerate(self._offset_and_size):
+            if offset_and_size_tuple is None:
+                continue
+            offset, size = offset_and_size_tuple
+            point_index.insertHelix(id_num, self.axis_pts[offset:offset + size])
+            origin_index.insert(id_num, self._origin_pts[id_num])
+    # end def
+
+    def _axisPoints(self, id_num):
+        """Point source for `_point_index`
+
+        Args:
+            id_num (int): virtual helix ID number
+
+        Returns:
+            ndarray: view of the axis points of `id_num`
+        """
+        offset, size = self._offset_and_size[id_num]
+        return self.axis_pts[offset:offset + size]
+    # end def
+
+    def _reindexHelixPoints(self, id_num):
+        """Replace the point index entries of a virtual helix with its
+        current axis points
+
+        Args:
+            id_num (int): virtual helix ID number
+        """
+        point_index = self._point_index
+        point_index.removeHelix(id_num)
+        offset, size = self._offset_and_size[id_num]
+        point_index.insertHelix(id_num, self.axis_pts[offset:offset + size])
+    # end def
+
     def stepSize(self):
         return self._STEP_SIZE
     # end def
@@ -384,6 +496,7 @@ class NucleicAcidPart(Part):
         if self._highest_id_num_used < num:
             self._highest_id_num_used = num
         self.reserved_ids.add(num)
+        self.setVirtualHelixModified(num)
     # end def
 
     def _recycleIdNum(self, id_num):
@@ -396,6 +509,41 @@ class NucleicAcidPart(Part):
         """
         heappush(self.recycle_bin, id_num)
         self.reserved_ids.remove(id_num)
+        self.setVirtualHelixModified(id_num)
+    # end def
+
+    def nextModification(self):
+        """Advance the change counter of the part.  Virtual helices and
+        :class:`Oligo` objects are stamped with it when they change so that
+        :class:`cadnano.fileio.nnoencode.IncrementalEncoder` can tell which of
+        its cached fragments are stale
+
+        Returns:
+            int: the new counter value
+        """
+        self._modification_count += 1
+        return self._modification_count
+    # end def
+
+    def setVirtualHelixModified(self, id_num):
+        """Record that the strands, crossovers or strand colors of a
+        virtual helix changed
+
+        Args:
+            id_num (int): virtual helix ID number
+        """
+        self._vh_modifications[id_num] = self.nextModification()
+    # end def
+
+    def virtualHelixModification(self, id_num):
+        """
+        Args:
+            id_num (int): virtual helix ID number
+
+        Returns:
+            int: stamp of the last change to `id_num`, 0 if it never changed
+        """
+        return self._vh_modifications.get(id_num, 0)
     # end def
 
     def getCoordinates(self, id_num):
@@ -536,7 +684,9 @@ class NucleicAcidPart(Part):
     # end def
 
     def refreshSegments(self, id_num):
-        """Partition strandsets into overlapping segments
+        """Partition strandsets into overlapping segments, recomputing the
+        segments of every strand on the virtual helix.  See `updateSegments`
+        for the incremental version
 
         Returns:
             tuple: of segments for the forward and reverse strand of form::
@@ -549,10 +699,126 @@ class NucleicAcidPart(Part):
         fwd_ss = self.fwd_strandsets[id_num]
         rev_ss = self.rev_strandsets[id_num]
 
-        self.segment_dict[id_num] = {}
+        endpoints = SegmentEndpoints()
+        for strandset in (fwd_ss, rev_ss):
+            for strand in strandset.strand_heap:
+                endpoints.add(*strand.idxs())
+        endpoints.popChanged()
+        self._segment_endpoints[id_num] = endpoints
+
         return self._refreshSegments(fwd_ss, rev_ss)
     # end def
 
+    def segmentEndpoints(self, id_num):
+        """The :class:`SegmentEndpoints` of a virtual helix.  StrandSets
+        update it as strands are added, removed and resized
+
+        Args:
+            id_num (int): virtual helix ID number
+
+        Returns:
+            SegmentEndpoints:
+        """
+        endpoints = self._segment_endpoints.get(id_num)
+        if endpoints is None:
+            # e.g. a `copy` of the part, whose StrandSets start out empty
+            self._segment_endpoints[id_num] = endpoints = SegmentEndpoints()
+        return endpoints
+    # end def
+
+    def updateSegments(self, id_num):
+        """Recompute the segments of only the strands next to the segment
+        end points changed since the last update, giving the same segments
+        as `refreshSegments`.  Deferred to the commit of an open `transaction`
+
+        Args:
+            id_num (int): virtual helix ID number
+        """
+        if self._transaction is not None:
+            return
+        endpoints = self.segmentEndpoints(id_num)
+        changed = endpoints.popChanged()
+        if not changed:
+            return
+        strands = {}
+        for strandset in (self.fwd_strandsets[id_num], self.rev_strandsets[id_num]):
+            for point in changed:
+                for strand in strandset.getOverlappingStrands(point, point):
+                    strands[id(strand)] = strand
+        for strand in strands.values():
+            strand.segments = endpoints.segments(*strand.idxs())
+    # end def
+
+    @contextmanager
+    def transaction(self, undo=False):
+        """Apply many edits with the derived data recomputed once at the end,
+        e.g. to generate a design from a script::
+
+            with part.transaction():
+                strand = part.getStrandSets(0)[0].createStrand(0, 41)
+                strand.addInsertion(20, -1)
+
+        Edits of this part made through its undo stack, i.e. with the
+        default `use_undostack=True`, run at once but are journaled instead
+        of pushed, see :class:`PartTransaction`.  Edits of other parts go to
+        the undo stack of the document as usual.  Strand segments and the
+        sequences invalidated by insertions are updated once on exit and
+        signals are batched.  If the block raises, the journaled edits are
+        undone and the exception propagates.  Nested transactions join the
+        outermost one
+
+        The model applies every edit through an UndoCommand, also with
+        `use_undostack=False`, so commands are built either way.  They are
+        journaled even when `undo` is False as the journal is what rolls the
+        block back, and are dropped once it commits
+
+        Args:
+            undo (bool): optional, push the whole transaction onto the undo
+                stack as one command.  Default is False, i.e. not undoable
+
+        Yields:
+            PartTransaction:
+        """
+        if self._transaction is not None:
+            yield self._transaction
+            return
+        transaction = self._transaction = PartTransaction(self, undo)
+        with self.batchSignals():
+            try:
+                yield transaction
+            except BaseException:
+                transaction.rollback()
+                raise
+            else:
+                transaction.commit(self._document.undoStack())
+            finally:
+                self._transaction = None
+                segment_endpoints = self._segment_endpoints
+                for id_num in self.getIdNums():
+                    if id_num in segment_endpoints:
+                        self.updateSegments(id_num)
+    # end def
+
+    def undoStack(self):
+        """
+        Returns:
+            UndoStack: the :class:`PartTransaction` of the open `transaction`
+            or else the undo stack of the document
+        """
+        transaction = self._transaction
+        if transaction is not None:
+            return transaction
+        return self._document.undoStack()
+    # end def
+
+    def activeTransaction(self):
+        """
+        Returns:
+            PartTransaction: of the open `transaction`, or None
+        """
+        return self._transaction
+    # end def
+
     def _refreshSegments(self, fwd_ss, rev_ss):
         """Testable private version
 
@@ -686,6 +952,7 @@ class NucleicAcidPart(Part):
         """
         self._resetOriginCache()
         self._resetPointCache()
+        self._invalidateXoverCache(id_nums)
         origin_pts = self._origin_pts
         delta_origin = delta[:2]  # x, y only
         for id_num in id_nums:
@@ -696,11 +963,9 @@ class NucleicAcidPart(Part):
             # print("old origin", self.locationQt(id_num, 15./self.radius()))
             origin_pts[id_num, :] += delta_origin
             # print("new origin", self.locationQt(id_num, 15./self.radius()))
-        try:
-            self.vh_properties.iloc[list(id_nums), Z_PROP_INDEX] += delta[2]
-        except:
-            print(list(id_nums), Z_PROP_INDEX)
-            raise
+            self._origin_index.insert(id_num, origin_pts[id_num])
+            self._reindexHelixPoints(id_num)
+        self.vh_properties.column('z')[list(id_nums)] += delta[2]
         self._setVirtualHelixOriginLimits()
     # end def
 
@@ -743,8 +1008,8 @@ class NucleicAcidPart(Part):
             raise KeyError("id_num {} not in NucleicAcidPart".format(id_num))
 
         coord = self.getCoordinate(id_num, idx)
-        neighbors, indices = self.queryBasePoint(radius, *coord)
-        non_id_num_idxs, _ = np.where(neighbors != id_num)
+        neighbors, indices = self.queryBasePoint(radius, tuple(coord))
+        non_id_num_idxs, = np.where(neighbors != id_num)
         return list(zip(np.take(neighbors, non_id_num_idxs),
                         np.take(indices, non_id_num_idxs)
                         )
@@ -769,11 +1034,36 @@ class NucleicAcidPart(Part):
         return neighbor_candidates
     # end def
 
+    def _getVirtualHelicesOriginNeighbors(self, id_nums, radius):
+        """Neighbors of many virtual helices in one pass over the origin
+        index, e.g. after a bulk create.  Each origin query only visits the
+        grid cells around that origin
+
+        Args:
+            id_nums (iterable): of :obj:`int` virtual helix ID numbers
+            radius (float): radial distance within which a neighbors origin exists
+
+        Returns:
+            dict: of sorted :obj:`list` of neighbor ID numbers per ID number
+        """
+        origin_pts = self._origin_pts
+        query = self._queryVirtualHelixOrigin
+        out = {}
+        for id_num in id_nums:
+            neighbors = query(radius, origin_pts[id_num])
+            out[id_num] = sorted(x for x in neighbors.tolist() if x != id_num)
+        return out
+    # end def
+
     def _addCoordinates(self, id_num, points, is_right):
         """Points will only be added on the ends of a virtual helix
         not internally.  NO GAPS!
         handles reindex the points in self.indices
 
+        The points are written into the free space of the helix's slab when
+        there is room, otherwise the helix is moved to a new slab with room
+        to grow, so the cost only depends on the size of this helix.
+
         Args:
             id_num (int): virtual helix ID number
             points (array-like): n x 3 shaped numpy ndarray of floats or
@@ -787,77 +1077,192 @@ class NucleicAcidPart(Part):
         if offset_and_size_tuple is None:
             raise IndexError("id_num {} does not exists".format(id_num))
 
-        offset_and_size = self._offset_and_size
-        len_axis_pts = len(self.axis_pts)
-
         new_axis_pts, new_fwd_pts, new_rev_pts = points
         num_points = len(new_axis_pts)  # number of points being added
 
         self._resetPointCache()
+        self._invalidateXoverCache((id_num,))
 
-        # 1. existing id_num
+        # 2. Make room in the slab, moving the helix if required
         offset, size = offset_and_size_tuple
-        lo_idx_limit, hi_idx_limit = offset, offset + size
+        new_size = size + num_points
+        slab_start, capacity = self._slabs[id_num]
         if is_right:
-            insert_idx = hi_idx_limit
+            fits = offset + new_size <= slab_start + capacity
+        else:
+            fits = offset - num_points >= slab_start
+        if not fits:
+            offset = self._relocateHelix(id_num, new_size, is_right)
+
+        if is_right:
+            insert_idx = offset + size
+            new_offset = offset
         else:  # prepend
-            insert_idx = offset
-
-        # new_lims = (hi_idx_limit, hi_idx_limit + num_points)
-        # print("{} settting offset {} and size {}".format(id_num, offset, size + num_points))
-        # print("length before {}".format(len_axis_pts))
-        offset_and_size[id_num] = (offset, size + num_points)
-        # increment the offset for every higher index
-        for i, o_and_s in enumerate(offset_and_size[id_num + 1:], start=id_num + 1):
-            if o_and_s is not None:
-                offset_and_size[i] = (o_and_s[0] + num_points, o_and_s[1])
-
-        # 2. Did exceed allocation???
-        total_points = self.total_points
-        if total_points + num_points > len_axis_pts:
-            diff = self.total_points + num_points - len_axis_pts
-            number_of_new_elements = math.ceil(diff / DEFAULT_FULL_SIZE) * DEFAULT_FULL_SIZE
-            total_rows = len_axis_pts + number_of_new_elements
-            # resize per virtual base allocations
-            self.axis_pts.resize((total_rows, 3))
-            self.axis_pts[len_axis_pts:] = [np.inf, np.inf, np.inf]
-
-            self.fwd_pts.resize((total_rows, 3))
-            self.fwd_pts[len_axis_pts:] = np.inf
-
-            self.rev_pts.resize((total_rows, 3))
-            self.rev_pts[len_axis_pts:] = np.inf
-
-            self.id_nums.resize((total_rows,))
-            self.id_nums[len_axis_pts:] = -1
-
-            self.indices.resize((total_rows,))
-            self.indices[len_axis_pts:] = 0
-        # end if exceeded allocation
-        axis_pts = self.axis_pts
-        fwd_pts = self.fwd_pts
-        rev_pts = self.rev_pts
-        id_nums = self.id_nums
-        indices = self.indices
-
-        # 3. Move Existing data
-        move_idx_start = insert_idx + num_points
-        move_idx_end = total_points + num_points
-
-        axis_pts[move_idx_start:move_idx_end] = axis_pts[insert_idx:total_points]
-        axis_pts[insert_idx:move_idx_start] = new_axis_pts
-        fwd_pts[move_idx_start:move_idx_end] = fwd_pts[insert_idx:total_points]
-        fwd_pts[insert_idx:move_idx_start] = new_fwd_pts
-        rev_pts[move_idx_start:move_idx_end] = rev_pts[insert_idx:total_points]
-        rev_pts[insert_idx:move_idx_start] = new_rev_pts
-
-        # just overwrite everything for indices and id_nums no need to move
-        id_nums[move_idx_start:move_idx_end] = id_nums[insert_idx:total_points]
-        id_nums[insert_idx:move_idx_start] = id_num
-        indices[move_idx_start:move_idx_end] = indices[insert_idx:total_points]
-        indices[lo_idx_limit:lo_idx_limit + num_points + size] = list(range(num_points + size))
+            insert_idx = new_offset = offset - num_points
+        insert_stop = insert_idx + num_points
+
+        # 3. Write the new points
+        self.axis_pts[insert_idx:insert_stop] = new_axis_pts
+        self.fwd_pts[insert_idx:insert_stop] = new_fwd_pts
+        self.rev_pts[insert_idx:insert_stop] = new_rev_pts
+        self.id_nums[insert_idx:insert_stop] = id_num
+        if is_right:
+            self.indices[insert_idx:insert_stop] = np.arange(size, new_size)
+        else:
+            self.indices[new_offset:new_offset + new_size] = np.arange(new_size)
 
+        self._offset_and_size[id_num] = (new_offset, new_size)
         self.total_points += num_points
+
+        # 4. Update the point index.  Prepending renumbers the existing bases
+        point_index = self._point_index
+        if is_right:
+            point_index.insertHelix(id_num, new_axis_pts, idx_start=size)
+        else:
+            point_index.shiftHelix(id_num, num_points)
+            point_index.insertHelix(id_num, new_axis_pts, idx_start=0)
+    # end def
+
+    def _allocateSlab(self, capacity):
+        """Reserve `capacity` points at the end of the point arrays for a
+        virtual helix slab, compacting or growing the arrays as required.
+        The caller registers the slab in `_slabs`
+
+        Args:
+            capacity (int): number of points in the slab
+
+        Returns:
+            int: start index of the slab
+        """
+        if self._arena_end + capacity > len(self.axis_pts):
+            free_points = self._arena_end - self._slab_points
+            if free_points >= capacity and free_points >= self.total_points:
+                # at least half of the used space are gaps so compact instead
+                # of growing
+                self.compact()
+        if self._arena_end + capacity > len(self.axis_pts):
+            self._resizeArrays(self._arena_end + capacity)
+        slab_start = self._arena_end
+        self._arena_end += capacity
+        self._slab_points += capacity
+        return slab_start
+    # end def
+
+    def _freeSlab(self, id_num):
+        """Release the slab of a virtual helix.  The caller is responsible for
+        clearing the points in it
+
+        Args:
+            id_num (int): virtual helix ID number
+        """
+        slab_start, capacity = self._slabs.pop(id_num)
+        self._slab_points -= capacity
+        if slab_start + capacity == self._arena_end:
+            self._arena_end = slab_start
+    # end def
+
+    def _clearPoints(self, lo, hi):
+        """Reset a range of the per point arrays to unused values
+
+        Args:
+            lo (int): start index
+            hi (int): stop index
+        """
+        self.axis_pts[lo:hi] = np.inf
+        self.fwd_pts[lo:hi] = np.inf
+        self.rev_pts[lo:hi] = np.inf
+        self.id_nums[lo:hi] = -1
+        self.indices[lo:hi] = 0
+    # end def
+
+    def _resizeArrays(self, min_rows):
+        """Reallocate the per point arrays to hold at least `min_rows` points,
+        rounded up to a multiple of `DEFAULT_FULL_SIZE`.  Arrays are copied
+        rather than resized in place so outstanding views remain valid
+
+        Args:
+            min_rows (int): minimum number of points
+        """
+        len_axis_pts = len(self.axis_pts)
+        total_rows = max(math.ceil(min_rows / DEFAULT_FULL_SIZE), 1)*DEFAULT_FULL_SIZE
+        if total_rows > len_axis_pts:
+            # grow at least geometrically
+            total_rows = max(total_rows, 2*len_axis_pts)
+        keep = min(len_axis_pts, total_rows)
+        for name, fill in (('axis_pts', np.inf), ('fwd_pts', np.inf), ('rev_pts', np.inf),
+                           ('id_nums', -1), ('indices', 0)):
+            old = getattr(self, name)
+            new = np.full((total_rows,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:keep] = old[:keep]
+            setattr(self, name, new)
+    # end def
+
+    def _relocateHelix(self, id_num, new_size, is_right):
+        """Move the points of a virtual helix into a new, larger slab at the
+        end of the point arrays.  Capacity grows geometrically so repeated
+        resizes are amortized O(delta)
+
+        Args:
+            id_num (int): virtual helix ID number
+            new_size (int): size the helix is about to grow to
+            is_right (bool): whether the helix grows at the high index end
+
+        Returns:
+            int: the new offset of the existing points of the helix
+        """
+        capacity = max(2*new_size, new_size + 2*SLAB_PADDING)
+        # allocating may compact, which moves this helix, so look it up after
+        new_slab_start = self._allocateSlab(capacity)
+        offset, size = self._offset_and_size[id_num]
+        lead = (capacity - new_size) // 2
+        new_offset = new_slab_start + lead
+        if not is_right:
+            new_offset += new_size - size
+        lo, hi = offset, offset + size
+        new_hi = new_offset + size
+        self.axis_pts[new_offset:new_hi] = self.axis_pts[lo:hi]
+        self.fwd_pts[new_offset:new_hi] = self.fwd_pts[lo:hi]
+        self.rev_pts[new_offset:new_hi] = self.rev_pts[lo:hi]
+        self.id_nums[new_offset:new_hi] = self.id_nums[lo:hi]
+        self.indices[new_offset:new_hi] = self.indices[lo:hi]
+        self._clearPoints(lo, hi)
+        self._freeSlab(id_num)
+        self._slabs[id_num] = (new_slab_start, capacity)
+        self._offset_and_size[id_num] = (new_offset, size)
+        return new_offset
+    # end def
+
+    def compact(self):
+        """Pack the points of every virtual helix contiguously in ID number
+        order, dropping the gaps left behind by moved or removed helices and
+        the free space at the ends of each slab.  Offsets change but
+        `getCoordinates` views taken afterwards are still zero copy.
+        """
+        offset_and_size = self._offset_and_size
+        id_nums = [i for i, o_and_s in enumerate(offset_and_size) if o_and_s is not None]
+        sources = []
+        new_offset = 0
+        slabs = {}
+        for id_num in id_nums:
+            offset, size = offset_and_size[id_num]
+            sources.append(np.arange(offset, offset + size))
+            offset_and_size[id_num] = (new_offset, size)
+            slabs[id_num] = (new_offset, size)
+            new_offset += size
+        total_points = new_offset
+        source_idxs = np.concatenate(sources) if sources else np.empty((0,), dtype=int)
+
+        total_rows = max(math.ceil(total_points / DEFAULT_FULL_SIZE), 1)*DEFAULT_FULL_SIZE
+        for name, fill in (('axis_pts', np.inf), ('fwd_pts', np.inf), ('rev_pts', np.inf),
+                           ('id_nums', -1), ('indices', 0)):
+            old = getattr(self, name)
+            new = np.full((total_rows,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:total_points] = old[source_idxs]
+            setattr(self, name, new)
+        self._slabs = slabs
+        self._slab_points = total_points
+        self._arena_end = total_points
+        self.total_points = total_points
     # end def
 
     def getDirections(self, id_nums):
@@ -992,21 +1397,16 @@ class NucleicAcidPart(Part):
             offset_and_size += [None]*number_of_new_elements
             self.fwd_strandsets += [None]*number_of_new_elements
             self.rev_strandsets += [None]*number_of_new_elements
-        # find the next highest insertion offset
-        next_o = self.total_points
-        for next_o_and_s in offset_and_size[id_num + 1:]:
-            if next_o_and_s:
-                next_o, next_s = next_o_and_s
-                break
-        # this_offset = num_points
-        # print("total points", self.total_points, next_o, id_num)
-        offset_and_size[id_num] = (next_o, 0)
-        # the other offsets will be adjusted later
+        # give the new helix a slab with room to grow at both ends
+        capacity = num_points + 2*SLAB_PADDING
+        slab_start = self._allocateSlab(capacity)
+        self._slabs[id_num] = (slab_start, capacity)
+        offset_and_size[id_num] = (slab_start + SLAB_PADDING, 0)
 
         # 2. Assign origin on creation, resizing as needed
         len_origin_pts = len(self._origin_pts)
         if id_num >= len_origin_pts:
-            diff = id_num - len_origin_pts
+            diff = id_num - len_origin_pts + 1
             number_of_new_elements = math.ceil(diff / DEFAULT_SIZE)*DEFAULT_SIZE
             total_rows = len_origin_pts + number_of_new_elements
             # resize adding zeros
@@ -1016,10 +1416,10 @@ class NucleicAcidPart(Part):
             self.directions.resize((total_rows, 3))
             self.directions[len_origin_pts:] = 0  # unnecessary as resize fills with zeros
 
-            self.vh_properties = self.vh_properties.append(_defaultDataFrame(number_of_new_elements),
-                                                           ignore_index=True)
+            self.vh_properties.resize(total_rows)
 
         self._origin_pts[id_num] = origin[:2]
+        self._origin_index.insert(id_num, origin[:2])
         new_x, new_y = origin[:2]
         xLL, yLL, xUR, yUR = self.origin_limits
         if new_x < xLL:
@@ -1032,7 +1432,7 @@ class NucleicAcidPart(Part):
             yUR = new_y
         self.origin_limits = (xLL, yLL, xUR, yUR)
         self.directions[id_num] = direction
-        self.vh_properties.loc[id_num, ['name', 'color', 'length']] = "vh%d" % (id_num), color, num_points
+        self.vh_properties.set(id_num, ('name', 'color', 'length'), ("vh%d" % (id_num), color, num_points))
 
         if self.fwd_strandsets[id_num] is None:
             self.fwd_strandsets[id_num] = StrandSet(True, id_num, self, num_points)
@@ -1040,12 +1440,13 @@ class NucleicAcidPart(Part):
         else:
             self.fwd_strandsets[id_num]._reset(num_points)
             self.rev_strandsets[id_num]._reset(num_points)
+        self._segment_endpoints[id_num] = SegmentEndpoints()
 
         self.total_id_nums += 1
 
         # 3. Create points
         points = self._pointsFromDirection(id_num, origin, direction, num_points, 0)
-        self._addCoordinates(id_num, points, is_right=False)
+        self._addCoordinates(id_num, points, is_right=True)
         self._group_properties['virtual_helix_order'].append(id_num)
         self._virtual_helices_set[id_num] = vh = VirtualHelix(id_num, self)
         return vh
@@ -1069,12 +1470,12 @@ class NucleicAcidPart(Part):
         """
         rad = self._radius
         BW = self._BASE_WIDTH
-        hp, bpr, tpr, eulerZ, mgroove = self.vh_properties.loc[id_num,
-                                                               ['helical_pitch',
+        hp, bpr, tpr, eulerZ, mgroove = self.vh_properties.get(id_num,
+                                                               ('helical_pitch',
                                                                 'bases_per_repeat',
                                                                 'turns_per_repeat',
                                                                 'eulerZ',
-                                                                'minor_groove_angle']]
+                                                                'minor_groove_angle'))
         twist_per_base = tpr*360./bpr
         """
         + angle is CCW
@@ -1120,8 +1521,193 @@ class NucleicAcidPart(Part):
         np.add(np.dot(m, coord_pts.T, out=scratch).T, origin, out=coord_pts)
 
         if index < 0:
-            self.vh_properties.loc[id_num, 'eulerZ'] = math.degrees(eulerZ_new)
+            self.vh_properties.set(id_num, 'eulerZ', math.degrees(eulerZ_new))
+
+        return (coord_pts, fwd_pts, rev_pts)
+    # end def
 
+    def _createHelices(self, id_nums, origins, directions, sizes, color, properties=None):
+        """Bulk version of `_createHelix`.  Storage for all of the new virtual
+        helices is allocated once and their points are generated in a single
+        vectorized pass with `properties` already applied, so no
+        `resetCoordinates` is needed afterwards
+
+        Args:
+            id_nums (list): of :obj:`int` unused virtual helix ID numbers
+            origins (ndarray): (n, 3) of :obj:`float` origin per helix.
+                The origins should be referenced from an index of 0.
+            directions (ndarray): (n, 3) of :obj:`float` direction per helix
+            sizes (list): of :obj:`int` number of bases per helix
+            color (str): hexadecimal color code in the form: `#RRGGBB`
+            properties (dict): optional, of :obj:`list` of values per property
+                key, in the order of `id_nums`
+
+        Returns:
+            list: of :obj:`VirtualHelix`
+
+        Raises:
+            IndexError:
+            ValueError:
+        """
+        num_helices = len(id_nums)
+        if len(set(id_nums)) != num_helices:
+            raise ValueError("duplicate id_nums in {}".format(id_nums))
+        for id_num in id_nums:
+            offset_and_size_tuple = self.getOffsetAndSize(id_num)
+            if offset_and_size_tuple is not None:
+                raise IndexError("id_num {} already exists".format(id_num))
+        if num_helices == 0:
+            return []
+        for id_num in id_nums:
+            self._reserveIdNum(id_num)
+        self._resetOriginCache()
+
+        # 1. expand the per ID containers once for the highest new ID number
+        max_id_num = max(id_nums)
+        offset_and_size = self._offset_and_size
+        number_of_new_elements = max_id_num - len(offset_and_size) + 1
+        if number_of_new_elements > 0:
+            offset_and_size += [None]*number_of_new_elements
+            self.fwd_strandsets += [None]*number_of_new_elements
+            self.rev_strandsets += [None]*number_of_new_elements
+        len_origin_pts = len(self._origin_pts)
+        if max_id_num >= len_origin_pts:
+            diff = max_id_num - len_origin_pts + 1
+            number_of_new_elements = math.ceil(diff / DEFAULT_SIZE)*DEFAULT_SIZE
+            total_rows = len_origin_pts + number_of_new_elements
+            origin_pts = np.full((total_rows, 2), np.inf)
+            origin_pts[:len_origin_pts] = self._origin_pts
+            self._origin_pts = origin_pts
+            all_directions = np.zeros((total_rows, 3))
+            all_directions[:len_origin_pts] = self.directions
+            self.directions = all_directions
+            self.vh_properties.resize(total_rows)
+
+        # 2. origins, directions and properties
+        id_num_array = np.array(id_nums, dtype=int)
+        self._origin_pts[id_num_array] = origins[:, :2]
+        self.directions[id_num_array] = directions
+        origin_index = self._origin_index
+        for id_num, origin in zip(id_nums, origins[:, :2]):
+            origin_index.insert(id_num, origin)
+        xLL, yLL, xUR, yUR = self.origin_limits
+        xLL = min(xLL, origins[:, 0].min())
+        xUR = max(xUR, origins[:, 0].max())
+        yLL = min(yLL, origins[:, 1].min())
+        yUR = max(yUR, origins[:, 1].max())
+        self.origin_limits = (xLL, yLL, xUR, yUR)
+
+        vh_properties = self.vh_properties
+        vh_properties.setRows(id_num_array, 'name', ["vh%d" % (id_num) for id_num in id_nums])
+        vh_properties.setRows(id_num_array, 'color', [color]*num_helices)
+        vh_properties.setRows(id_num_array, 'length', sizes)
+        if properties is not None:
+            for key, values in properties.items():
+                vh_properties.setRows(id_num_array, key, values)
+
+        # 3. one block of slabs, each with room to grow at both ends
+        capacities = np.asarray(sizes, dtype=int) + 2*SLAB_PADDING
+        slab_starts = self._allocateSlab(int(capacities.sum())) + np.cumsum(capacities) - capacities
+        offsets = slab_starts + SLAB_PADDING
+        for id_num, slab_start, capacity, offset, size in zip(id_nums, slab_starts.tolist(),
+                                                              capacities.tolist(), offsets.tolist(),
+                                                              sizes):
+            self._slabs[id_num] = (slab_start, capacity)
+            offset_and_size[id_num] = (offset, size)
+
+        # 4. write every point at once
+        axis_pts, fwd_pts, rev_pts = self._pointsFromDirections(id_num_array, origins,
+                                                                 directions, sizes)
+        total_new = len(axis_pts)
+        helix_starts = np.cumsum(sizes) - sizes
+        idxs = np.arange(total_new) - np.repeat(helix_starts, sizes)
+        dest = np.repeat(offsets, sizes) + idxs
+        self.axis_pts[dest] = axis_pts
+        self.fwd_pts[dest] = fwd_pts
+        self.rev_pts[dest] = rev_pts
+        self.id_nums[dest] = np.repeat(id_num_array, sizes)
+        self.indices[dest] = idxs
+        self.total_points += total_new
+        self._resetPointCache()
+        self._invalidateXoverCache(id_nums)
+        point_index = self._point_index
+        for id_num in id_nums:
+            point_index.deferHelix(id_num)
+
+        # 5. per helix model objects
+        self.total_id_nums += num_helices
+        vh_list = []
+        for id_num, size in zip(id_nums, sizes):
+            if self.fwd_strandsets[id_num] is None:
+                self.fwd_strandsets[id_num] = StrandSet(True, id_num, self, size)
+                self.rev_strandsets[id_num] = StrandSet(False, id_num, self, size)
+            else:
+                self.fwd_strandsets[id_num]._reset(size)
+                self.rev_strandsets[id_num]._reset(size)
+            self._segment_endpoints[id_num] = SegmentEndpoints()
+            self._virtual_helices_set[id_num] = vh = VirtualHelix(id_num, self)
+            vh_list.append(vh)
+        self._group_properties['virtual_helix_order'].extend(id_nums)
+        return vh_list
+    # end def
+
+    def _pointsFromDirections(self, id_nums, origins, directions, sizes):
+        """Vectorized `_pointsFromDirection` for many new virtual helices
+        starting at index 0.  The points of all helices are concatenated in
+        the order of `id_nums`
+
+        Args:
+            id_nums (ndarray): of :obj:`int` virtual helix ID numbers
+            origins (ndarray): (n, 3) of :obj:`float` origin per helix
+            directions (ndarray): (n, 3) of :obj:`float` direction per helix
+            sizes (list): of :obj:`int` number of bases per helix
+
+        Returns:
+            tuple: (coord_pts, fwd_pts, rev_pts)
+        """
+        rad = self._radius
+        BW = self._BASE_WIDTH
+        vh_properties = self.vh_properties
+        bpr = vh_properties.column('bases_per_repeat')[id_nums]
+        tpr = vh_properties.column('turns_per_repeat')[id_nums]
+        eulerZ = np.radians(vh_properties.column('eulerZ')[id_nums])
+        mgroove = np.radians(vh_properties.column('minor_groove_angle')[id_nums])
+        twist_per_base = np.radians(tpr*360./bpr)
+
+        total = int(np.sum(sizes))
+        helix_of_point = np.repeat(np.arange(len(id_nums)), sizes)
+        idxs = np.arange(total) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+
+        # same conventions as _pointsFromDirection
+        fwd_angles = -idxs*twist_per_base[helix_of_point] + eulerZ[helix_of_point]
+        rev_angles = fwd_angles + mgroove[helix_of_point]
+        z_pts = BW*idxs
+
+        fwd_pts = rad*np.column_stack((np.cos(fwd_angles),
+                                       np.sin(fwd_angles),
+                                       np.zeros(total)))
+        fwd_pts[:, 2] = z_pts
+        rev_pts = rad*np.column_stack((np.cos(rev_angles),
+                                       np.sin(rev_angles),
+                                       np.zeros(total)))
+        rev_pts[:, 2] = z_pts
+        coord_pts = np.zeros((total, 3))
+        coord_pts[:, 2] = z_pts
+
+        # rotate each group of helices sharing a direction, then translate
+        unique_directions, direction_of_helix = np.unique(directions, axis=0, return_inverse=True)
+        direction_of_point = direction_of_helix.reshape(-1)[helix_of_point]
+        for i, direction in enumerate(unique_directions):
+            if np.all(direction == (0, 0, 1)):
+                continue
+            m = self.makeRotation((0, 0, 1), direction)
+            selected = direction_of_point == i
+            for pts in (fwd_pts, rev_pts, coord_pts):
+                pts[selected] = np.dot(m, pts[selected].T).T
+        point_origins = origins[helix_of_point]
+        fwd_pts += point_origins
+        rev_pts += point_origins
+        coord_pts += point_origins
         return (coord_pts, fwd_pts, rev_pts)
     # end def
 
@@ -1141,13 +1727,27 @@ class NucleicAcidPart(Part):
             # 1. Find insert indices
             if offset_and_size_tuple is None:
                 raise IndexError("id_num {} does not exists".format(id_num))
-        props = self.vh_properties.loc[id_num, keys]
-        if isinstance(props, pd.Series):
-            return [v.item() if isinstance(v, (np.float64, np.int64, np.bool_)) else v for v in props]
-        else:
-            return props.item() if isinstance(props, (np.float64, np.int64, np.bool_)) else props
+        return self.vh_properties.get(id_num, keys)
     # end
 
+    def getVirtualHelixNeighbors(self, id_num, safe=True):
+        """Integer form of the 'neighbors' property, which
+        `getVirtualHelixProperties` returns as a string
+
+        Args:
+            id_num (int): virtual helix ID number
+            safe (:obj:`bool`): optional, default to True
+
+        Returns:
+            list: of :obj:`int` neighbor ID numbers
+        """
+        if safe:
+            offset_and_size_tuple = self.getOffsetAndSize(id_num)
+            if offset_and_size_tuple is None:
+                raise IndexError("id_num {} does not exists".format(id_num))
+        return self.vh_properties.getNeighbors(id_num).tolist()
+    # end def
+
     def helixPropertiesAndOrigins(self, id_num_list=None):
         """
         Args:
@@ -1165,14 +1765,12 @@ class NucleicAcidPart(Part):
         """
         if id_num_list is None:
             lim = self._highest_id_num_used + 1
-            props = self.vh_properties.iloc[:lim]
-            props = props.to_dict(orient='list')
+            props = self.vh_properties.toDict(lim)
             origins = self._origin_pts[:lim]
             return props, origins
         elif isinstance(id_num_list, list):
             # select by list of indices
-            props = self.vh_properties.iloc[id_num_list].reset_index(drop=True)
-            props = props.to_dict(orient='list')
+            props = self.vh_properties.toDict(id_num_list)
             origins = self._origin_pts[id_num_list]
             return props, origins
         else:
@@ -1200,11 +1798,9 @@ class NucleicAcidPart(Part):
             # 1. Find insert indices
             if offset_and_size_tuple is None:
                 raise IndexError("id_num {} does not exists".format(id_num))
-        series = self.vh_properties.loc[id_num]
-        # to_dict doesn't promote to python native types needed by QVariant
-        # leaves as numpy integers and floats
-        out = dict((k, v.item()) if isinstance(v, (np.float64, np.int64, np.bool_))
-                   else (k, v) for k, v in zip(series.index, series.tolist()))
+        vh_properties = self.vh_properties
+        keys = vh_properties.keys()
+        out = dict(zip(keys, vh_properties.get(id_num, keys)))
         if inject_extras:
             bpr = out['bases_per_repeat']
             tpr = out['turns_per_repeat']
@@ -1258,10 +1854,12 @@ class NucleicAcidPart(Part):
             # 1. Find insert indices
             if offset_and_size_tuple is None:
                 raise IndexError("id_num {} does not exists".format(id_num))
-        self.vh_properties.loc[id_num, keys] = values
+        self.vh_properties.set(id_num, keys, values)
 
         if not isinstance(values, (tuple, list)):
             keys, values = (keys,), (values,)
+        if not XOVER_PROPERTY_KEYS.isdisjoint(keys):
+            self._invalidateXoverCache((id_num,))
         if emit_signals:
             self.partVirtualHelixPropertyChangedSignal.emit(
                 self, id_num, self.getVirtualHelix(id_num), keys, values)
@@ -1304,6 +1902,7 @@ class NucleicAcidPart(Part):
             raise IndexError("id_num {} does not exist")
 
         offset, size = offset_and_size_tuple
+        self.setVirtualHelixModified(id_num)
         # len_axis_pts = len(self.axis_pts)
         direction = self.directions[id_num]
 
@@ -1342,10 +1941,7 @@ class NucleicAcidPart(Part):
             return
         _, final_size = self.getOffsetAndSize(id_num)
         # print("final_size", final_size)
-        self.vh_properties.loc[id_num, 'length'] = final_size
-        # print("New max:", self.vh_properties['length'].idxmax(),
-        #         self.vh_properties['length'].max())
-        # return 0, self.vh_properties['length'].idxmax()
+        self.vh_properties.set(id_num, 'length', final_size)
         return self.zBoundsIds()
     # end def
 
@@ -1439,6 +2035,9 @@ class NucleicAcidPart(Part):
         self.axis_pts[lo:hi] = new_axis_pts
         self.fwd_pts[lo:hi] = new_fwd_pts
         self.rev_pts[lo:hi] = new_rev_pts
+        self._resetPointCache()
+        self._invalidateXoverCache((id_num,))
+        self._reindexHelixPoints(id_num)
     # end def
 
     def _removeCoordinates(self, id_num, length, is_right):
@@ -1472,54 +2071,24 @@ class NucleicAcidPart(Part):
             idx_start, idx_stop = lo, lo + length
 
         self._resetPointCache()
+        self._invalidateXoverCache((id_num,))
         offset_and_size = self._offset_and_size
         current_offset_and_size_length = len(offset_and_size)
 
-        # 1. Move the good data
-        total_points = self.total_points
-        relocate_idx_end = total_points - length
+        # 1. Clear the points, the rest of the helix stays where it is
+        self._point_index.removeRange(id_num, self.axis_pts[idx_start:idx_stop],
+                                      idx_start - offset)
+        self._clearPoints(idx_start, idx_stop)
 
-        axis_pts = self.axis_pts
-        try:
-            axis_pts[idx_start:relocate_idx_end] = axis_pts[idx_stop:total_points]
-        except:
-            err = "idx_start {}, relocate_idx_end {}, idx_stop {}, total_points {}, length {}"
-            print(err.format(idx_start, relocate_idx_end, idx_stop, total_points, length))
-            raise
-        axis_pts[relocate_idx_end:total_points] = np.inf
-
-        fwd_pts = self.fwd_pts
-        fwd_pts[idx_start:relocate_idx_end] = fwd_pts[idx_stop:total_points]
-        fwd_pts[relocate_idx_end:total_points] = np.inf
-
-        rev_pts = self.rev_pts
-        rev_pts[idx_start:relocate_idx_end] = rev_pts[idx_stop:total_points]
-        rev_pts[relocate_idx_end:total_points] = np.inf
-
-        id_nums = self.id_nums
-        id_nums[idx_start:relocate_idx_end] = id_nums[idx_stop:total_points]
-        id_nums[relocate_idx_end:total_points] = -1
-
-        indices = self.indices
-        indices[idx_start:relocate_idx_end] = indices[idx_stop:total_points]
-        indices[relocate_idx_end:total_points] = 0
-        if not is_right:
-            # We need to adjust the base index
-            # lo offset index should not change for a given id_num
-            indices[lo:lo + length] -= length
-
-        # 2. Adjust the offsets of id_nums greater than id_num
-        for i, item in enumerate(offset_and_size[id_num + 1:], start=1):
-            if item is not None:
-                offset_other, size_other = item
-                offset_and_size[i + id_num] = (offset_other - length, size_other)
-
-        # 3. Check if we need to remove Virtual Helix
+        # 2. Check if we need to remove Virtual Helix
         if size == length:
             self.total_id_nums -= 1
             self._resetOriginCache()
             offset_and_size[id_num] = None
             self._origin_pts[id_num, :] = (np.inf, np.inf)  # set off to infinity
+            self._origin_index.remove(id_num)
+            self._point_index.removeHelix(id_num)
+            self._freeSlab(id_num)
             # trim the unused id_nums at the end
             remove_count = 0
             for i in range(current_offset_and_size_length - 1, id_num - 1, -1):
@@ -1531,7 +2100,15 @@ class NucleicAcidPart(Part):
             did_remove = True
         else:
             # print("Did remove", size, length)
-            offset_and_size[id_num] = (offset, size - length)
+            if is_right:
+                offset_and_size[id_num] = (offset, size - length)
+            else:
+                # the remaining points stay in place in the slab, so the
+                # helix now starts past the removed ones and its base
+                # indices shift down by `length`
+                offset_and_size[id_num] = (idx_stop, size - length)
+                self.indices[idx_stop:hi] -= length
+                self._point_index.shiftHelix(id_num, -length)
             did_remove = False
         self.total_points -= length
         return did_remove
@@ -1565,6 +2142,9 @@ class NucleicAcidPart(Part):
     def _queryBasePoint(self, radius, point):
         """ return the indices of all virtual helices closer than radius
 
+        Only the axis points in the grid cells of `_point_index` near `point`
+        are tested
+
         Args:
             radius (float): distance to consider
             point (array-like): of :obj:`float` of length 3
@@ -1572,17 +2152,19 @@ class NucleicAcidPart(Part):
         Returns:
             tuple: of :obj:`ndarray`
         """
-        difference = self.axis_pts - point
-        ldiff = len(difference)
-        delta = self.delta3D_scratch
-        if ldiff != len(delta):
-            self.delta3D_scratch = delta = np.empty((ldiff,), dtype=float)
-
-        # compute square of distance to point
-        delta = inner1d(difference, difference, out=delta)
-        close_points, = np.where(delta < radius*radius)
-        # return list(zip(    np.take(self.id_nums, close_points),
-        #                     np.take(self.indices, close_points) ))
+        offset_and_size = self._offset_and_size
+        candidate_idxs = []
+        for id_num, lo, hi in self._point_index.candidates(point, radius):
+            offset = offset_and_size[id_num][0]
+            candidate_idxs.append(np.arange(offset + lo, offset + hi))
+        if candidate_idxs:
+            # sort to keep the same order as a scan over the whole array
+            candidate_idxs = np.sort(np.concatenate(candidate_idxs))
+        else:
+            candidate_idxs = np.empty((0,), dtype=int)
+        difference = self.axis_pts[candidate_idxs] - point
+        delta = inner1d(difference, difference)
+        close_points = candidate_idxs[delta < radius*radius]
         return (np.take(self.id_nums, close_points),
                 np.take(self.indices, close_points))
     # end def
@@ -1624,6 +2206,9 @@ class NucleicAcidPart(Part):
         """Return the indices of all id_nums closer
         than radius, sorted by distance
 
+        Only the origins in the grid cells of `_origin_index` near `point`
+        are tested
+
         Args:
             radius (float): distance to consider
             point (array-like): of :obj:`float` of length 3
@@ -1631,18 +2216,15 @@ class NucleicAcidPart(Part):
         Returns:
             ndarray: close origin points to `point`
         """
-        difference = self._origin_pts - point
-        ldiff = len(difference)
-        delta = self.delta2D_scratch
-        if ldiff != len(delta):
-            self.delta2D_scratch = delta = np.empty((ldiff,), dtype=float)
-
-        # compute square of distance to point
-        inner1d(difference, difference, out=delta)
-        close_points, = np.where(delta <= radius*radius)
-        # take then sort the indices of the points in range
-        sorted_idxs = np.argsort(np.take(delta, close_points))
-
+        candidates = self._origin_index.candidates(point, radius)
+        candidates.sort()
+        candidates = np.array(candidates, dtype=int)
+        difference = self._origin_pts[candidates] - point[:2]
+        delta = inner1d(difference, difference)
+        is_close = delta <= radius*radius
+        close_points = candidates[is_close]
+        # sort by distance, ties stay in ID number order
+        sorted_idxs = np.argsort(delta[is_close], kind='mergesort')
         return close_points[sorted_idxs]
     # end def
 
@@ -1755,7 +2337,7 @@ class NucleicAcidPart(Part):
                 (start index, bases per repeat)
         """
         offset, size = self.getOffsetAndSize(id_num)
-        bpr = self.vh_properties.loc[id_num, 'bases_per_repeat']
+        bpr = self.vh_properties.get(id_num, 'bases_per_repeat')
         half_period = bpr // 2
         if size - index < bpr:
             start = size - bpr
@@ -1786,8 +2368,8 @@ class NucleicAcidPart(Part):
 
         """
         offset, size = self.getOffsetAndSize(id_num)
-        bpr, tpr = self.vh_properties.loc[id_num,
-                                          ['bases_per_repeat', 'turns_per_repeat']]
+        bpr, tpr = self.vh_properties.get(id_num,
+                                          ('bases_per_repeat', 'turns_per_repeat'))
         bases_per_turn = bpr / tpr
         if index is None:
             start, length = 0, size
@@ -1822,7 +2404,7 @@ class NucleicAcidPart(Part):
         key_prop_list = ['eulerZ', 'bases_per_repeat',
                          'turns_per_repeat', 'minor_groove_angle']
         for neighbor_id in neighbors:
-            eulerZ, bpr, tpr, mgroove = self.vh_properties.loc[neighbor_id, key_prop_list]
+            eulerZ, bpr, tpr, mgroove = self.vh_properties.get(neighbor_id, key_prop_list)
             twist_per_base = tpr*360./bpr
             half_period = math.floor(bpr / 2)
             tpb = math.radians(twist_per_base)
@@ -1926,6 +2508,15 @@ class NucleicAcidPart(Part):
         """Get indices of all virtual helices phosphates within a bond
         length of each phosphate for the id_num Virtual Helix.
 
+        The distances from every phosphate of `id_num` to the phosphates of a
+        neighbor are computed in chunked, broadcasted array operations.  Every
+        crossover criterion requires the two phosphates to be within about one
+        base width along Z, so when a neighbor's Z values increase with index
+        (always the case for straight helices) only the band of neighbor
+        indices within that Z range of each phosphate is tested.  Results are
+        identical to checking every phosphate pair in a loop, see
+        `testQueryIdNumNeighborRegression`.
+
         Args:
             id_num (int): virtual helix ID number
             neighbors (array-like): neighbors of id_num
@@ -1949,9 +2540,8 @@ class NucleicAcidPart(Part):
             raise ValueError("offset_and_size is None for {}".format(id_num))
         else:
             offset, size = offset_and_size
-        bpr, tpr = self.vh_properties.loc[id_num,
-                                          ['bases_per_repeat', 'turns_per_repeat']]
-        bases_per_turn = bpr / tpr
+        bpr, tpr = self.vh_properties.get(id_num,
+                                          ('bases_per_repeat', 'turns_per_repeat'))
         if index is None:
             start, length = 0, size
         else:
@@ -1960,37 +2550,211 @@ class NucleicAcidPart(Part):
                 start, length = size - bpr, bpr
             else:
                 start, length = max(index - half_period, 0), bpr
-        # norm = np.linalg.norm
-        # cross = np.cross
-        # dot = np.dot
-        # normalize = self.normalize
-        PI = math.pi
-        # TWOPI = 2*PI
-        RADIUS = self._radius
-        BW = self._BASE_WIDTH
 
-        # theta, radius = self.radiusForAngle(alpha, RADIUS, bases_per_turn, BW)
-        # convert to a list since we can't speed this loop up without cython or something
-        # axis_pts = self.axis_pts
+        (rsquared_ap_min, rsquared_ap_max,
+         rsquared_p_min, rsquared_p_max, r2_axial) = self._xoverRSquaredLimits(bpr, tpr)
+        zdelta_min = 0.3*r2_axial
+        zdelta_max = 1.1*r2_axial
+        # anything outside of this Z band can't pass any of the tests
+        z_band = 1.001*math.sqrt(zdelta_max)
+
         fwd_pts = self.fwd_pts
         rev_pts = self.rev_pts
-        # this_axis_pts = axis_pts[offset + start:offset + start + length].tolist()
-        this_fwd_pts = fwd_pts[offset + start:offset + start + length].tolist()
-        this_rev_pts = rev_pts[offset + start:offset + start + length].tolist()
+        this_fwd_pts = fwd_pts[offset + start:offset + start + length]
+        this_rev_pts = rev_pts[offset + start:offset + start + length]
+
+        per_neighbor_hits = {}
 
-        """TODO: decide how we want to handle maintaining bond length
-        ideal adjacent ANTI-PARALLEL xover strands project to a plane normal
-        to the helical axis and point in the SAME direction
+        fwd_axis_pairs = {}
+        rev_axis_pairs = {}
 
-        ideal adjacent PARALLEL xover strands  project to a plane normal
-        to the helical axis and point in the OPPOSITE directions
+        for neighbor_id in neighbors:
+            offset, size = self.getOffsetAndSize(neighbor_id)
+            nfwd_pts = fwd_pts[offset:offset + size]
+            nrev_pts = rev_pts[offset:offset + size]
 
-        NOTE:
-        For now we use zdelta to get the right results for this 2.5 release
-        for PARALLEL and ANTI-PARALLEL.
+            # 1. Parallel hits with the same strand type, anti-parallel hits
+            # with the other.  Lists of (index into this slice, neighbor_idxs)
+            fwd_f_hits = self._queryPointsNeighborBand(this_fwd_pts, nfwd_pts, z_band,
+                                                       rsquared_p_min, rsquared_p_max,
+                                                       zdelta_min, zdelta_max)
+            fwd_r_hits = self._queryPointsNeighborBand(this_fwd_pts, nrev_pts, z_band,
+                                                       rsquared_ap_min, rsquared_ap_max,
+                                                       None, zdelta_min)
+            rev_f_hits = self._queryPointsNeighborBand(this_rev_pts, nfwd_pts, z_band,
+                                                       rsquared_ap_min, rsquared_ap_max,
+                                                       None, zdelta_min)
+            rev_r_hits = self._queryPointsNeighborBand(this_rev_pts, nrev_pts, z_band,
+                                                       rsquared_p_min, rsquared_p_max,
+                                                       zdelta_min, zdelta_max)
+            fwd_axis_hits = self._mergeNeighborHits(start, fwd_f_hits, fwd_r_hits)
+            rev_axis_hits = self._mergeNeighborHits(start, rev_f_hits, rev_r_hits)
+
+            # 2. Scan for pairs of bases in AP xovers
+            fwd_axis_pairs = {}
+            self._scanXoverPairs(id_num, neighbor_id, fwd_axis_hits, rev_axis_hits,
+                                 fwd_axis_pairs, rev_axis_pairs)
+
+            per_neighbor_hits[neighbor_id] = (fwd_axis_hits, rev_axis_hits)
+        # end for
+        return per_neighbor_hits, (fwd_axis_pairs, rev_axis_pairs)
+    # end def
+
+    def _scanXoverPairs(self, id_num, neighbor_id, fwd_axis_hits, rev_axis_hits,
+                        fwd_axis_pairs, rev_axis_pairs):
+        """Scan the hits on a neighbor for pairs of bases in AP xovers and the
+        5' / 3' sense of parallel xovers.  Z values are compared directly
+        rather than through `isAGreaterThanB_Z`
+
+        Args:
+            id_num (int): virtual helix ID number
+            neighbor_id (int): neighbor virtual helix ID number
+            fwd_axis_hits (list): forward hits of `queryIdNumNeighbor`
+            rev_axis_hits (list): reverse hits of `queryIdNumNeighbor`
+            fwd_axis_pairs (dict): updated in place with forward pairs
+            rev_axis_pairs (dict): updated in place with reverse pairs
+        """
+        axis_z = self.axis_pts[:, 2]
+        this_offset, _ = self.getOffsetAndSize(id_num)
+        offset, size = self.getOffsetAndSize(neighbor_id)
+        naxis_z = axis_z[offset:offset + size]
+
+        idx_last = -2
+        for i, f_idxs, r_idxs in fwd_axis_hits:
+            if r_idxs:
+                if idx_last + 1 == i:
+                    fwd_axis_pairs[idx_last] = (True, neighbor_id)  # 5 prime  most strand
+                    fwd_axis_pairs[i] = (False, neighbor_id)        # 3 prime most strand
+                idx_last = i
+            if f_idxs:
+                z = axis_z[this_offset + i]
+                for idxB in f_idxs:
+                    if z > naxis_z[idxB]:
+                        fwd_axis_pairs[i] = (False, neighbor_id)
+                    else:
+                        fwd_axis_pairs[i] = (True, neighbor_id)
+
+        idx_last = -2
+        for i, f_idxs, r_idxs in rev_axis_hits:
+            if f_idxs:
+                if idx_last + 1 == i:
+                    rev_axis_pairs[idx_last] = (False, neighbor_id)    # 3 prime  most strand
+                    rev_axis_pairs[i] = (True, neighbor_id)            # 5 prime most strand
+                idx_last = i
+            if r_idxs:
+                z = axis_z[this_offset + i]
+                for idxB in r_idxs:
+                    if z > naxis_z[idxB]:
+                        rev_axis_pairs[i] = (True, neighbor_id)
+                    else:
+                        rev_axis_pairs[i] = (False, neighbor_id)
+    # end def
+
+    @staticmethod
+    def _queryPointsNeighborBand(points, npoints, z_band,
+                                 rsquared_min, rsquared_max,
+                                 zdelta_min, zdelta_max):
+        """Find the points in `npoints` whose squared distance to each point in
+        `points` is in `(rsquared_min, rsquared_max)` and whose squared Z
+        distance is in `(zdelta_min, zdelta_max)`
+
+        Args:
+            points (ndarray): (n, 3) query points
+            npoints (ndarray): (m, 3) neighbor points
+            z_band (float): Z distance outside of which no point can pass
+            rsquared_min (float): exclusive lower bound of squared distance
+            rsquared_max (float): exclusive upper bound of squared distance
+            zdelta_min (float): exclusive lower bound of squared Z distance or
+                :obj:`None` for no lower bound
+            zdelta_max (float): exclusive upper bound of squared Z distance
+
+        Returns:
+            list: of :obj:`tuple` of form::
+
+                (index into points, list of indices into npoints)
+
+            for every point with at least one hit, in index order
+        """
+        num_points = len(points)
+        num_npoints = len(npoints)
+        if num_points == 0 or num_npoints == 0:
+            return []
+        nz = npoints[:, 2]
+        if num_npoints == 1 or np.all(nz[1:] > nz[:-1]):
+            # sorted along Z so just look at a band around each point
+            z = points[:, 2]
+            band_lo = np.searchsorted(nz, z - z_band, side='left')
+            band_hi = np.searchsorted(nz, z + z_band, side='right')
+        else:
+            band_lo = np.zeros((num_points,), dtype=int)
+            band_hi = np.full((num_points,), num_npoints, dtype=int)
+        width = int(np.max(band_hi - band_lo))
+        if width <= 0:
+            return []
+        band = np.arange(width)
+        last = num_npoints - 1
+        chunk_size = max(QUERY_CHUNK_ELEMENTS // width, 1)
+        hits = []
+        for chunk_start in range(0, num_points, chunk_size):
+            chunk = slice(chunk_start, chunk_start + chunk_size)
+            lo = band_lo[chunk]
+            candidates = lo[:, None] + band
+            in_band = candidates < band_hi[chunk, None]
+            np.minimum(candidates, last, out=candidates)
+            difference = npoints[candidates] - points[chunk, None, :]
+            # same operation order as inner1d
+            dx, dy, dz = difference[..., 0], difference[..., 1], difference[..., 2]
+            zdelta = dz*dz
+            delta = dx*dx + dy*dy + zdelta
+            mask = in_band & (delta > rsquared_min) & (delta < rsquared_max) & (zdelta < zdelta_max)
+            if zdelta_min is not None:
+                mask &= zdelta > zdelta_min
+            rows, = np.nonzero(np.any(mask, axis=1))
+            for row in rows.tolist():
+                hits.append((chunk_start + row, candidates[row][mask[row]].tolist()))
+        return hits
+    # end def
+
+    @staticmethod
+    def _mergeNeighborHits(start, f_hits, r_hits):
+        """Merge the forward and reverse hit lists of
+        `_queryPointsNeighborBand` into one list ordered by index
+
+        Args:
+            start (int): index of the first query point in the virtual helix
+            f_hits (list): hits on the forward phosphates of a neighbor
+            r_hits (list): hits on the reverse phosphates of a neighbor
+
+        Returns:
+            list: of :obj:`tuple` of form::
+
+                (id_num_index, forward_neighbor_idxs, reverse_neighbor_idxs)
         """
-        # 1. compute generallized r squared values for an ideal crossover of
-        # both types
+        f_lookup = dict(f_hits)
+        r_lookup = dict(r_hits)
+        rows = sorted(set(f_lookup).union(r_lookup))
+        return [(start + row, f_lookup.get(row, []), r_lookup.get(row, [])) for row in rows]
+    # end def
+
+    def _xoverRSquaredLimits(self, bpr, tpr):
+        """Squared distance limits between phosphates of an ideal crossover of
+        both types
+
+        Args:
+            bpr (int): bases per repeat
+            tpr (int): turns per repeat
+
+        Returns:
+            tuple: of :obj:`float` of form::
+
+                (rsquared_ap_min, rsquared_ap_max,
+                 rsquared_p_min, rsquared_p_max, r2_axial)
+        """
+        PI = math.pi
+        RADIUS = self._radius
+        BW = self._BASE_WIDTH
+        bases_per_turn = bpr / tpr
+
         half_twist_per_base = PI/bases_per_turn
         # r2_radial = (2.*RADIUS*(1. - math.cos(half_twist_per_base)))**2
         # r2_tangent = (2.*RADIUS*math.sin(half_twist_per_base))**2
@@ -2005,7 +2769,6 @@ class NucleicAcidPart(Part):
                               math.sin(ma_f*half_twist_per_base)))**2
         r2_axial = BW*BW
 
-        # print("r2:", r2_radial, r2_tangent, r2_axial)
         # 2. ANTI-PARALLEL
         rsquared_ap = r2_tangent + r2_radial
         rsquared_ap_min = 0
@@ -2015,106 +2778,7 @@ class NucleicAcidPart(Part):
         rsquared_p = r2_tangent + r2_radial + r2_axial
         rsquared_p_min = r2_axial
         rsquared_p_max = rsquared_p + 0.25*r2_axial
-        per_neighbor_hits = {}
-
-        fwd_axis_pairs = {}
-        rev_axis_pairs = {}
-
-        for neighbor_id in neighbors:
-            offset, size = self.getOffsetAndSize(neighbor_id)
-
-            # 1. Finds points that point at neighbors axis point
-            nfwd_pts = fwd_pts[offset:offset + size]
-            nrev_pts = rev_pts[offset:offset + size]
-
-            # direction = self.directions[neighbor_id]
-            len_neighbor_pts = len(nfwd_pts)
-            delta = self.delta3D_scratch
-            if len_neighbor_pts != len(delta):
-                self.delta3D_scratch = delta = np.empty((len_neighbor_pts,), dtype=float)
-
-            fwd_axis_hits = []
-            for i, point in enumerate(this_fwd_pts):
-                difference = nfwd_pts - point
-                inner1d(difference, difference, out=delta)
-                zdelta = np.square(difference[:, 2])
-                # assume there is only one possible index of intersection with the neighbor
-                f_idxs = np.where((delta > rsquared_p_min) &
-                                  (delta < rsquared_p_max) &
-                                  (zdelta > 0.3*r2_axial) &
-                                  (zdelta < 1.1*r2_axial)
-                                  )[0].tolist()
-                difference = nrev_pts - point
-                inner1d(difference, difference, out=delta)
-                zdelta = np.square(difference[:, 2])
-                # assume there is only one possible index of intersection with the neighbor
-                r_idxs = np.where((delta > rsquared_ap_min) &
-                                  (delta < rsquared_ap_max) &
-                                  (zdelta < 0.3*r2_axial))[0].tolist()
-                if f_idxs or r_idxs:
-                    fwd_axis_hits.append((start + i, f_idxs, r_idxs))
-            # end for
-
-            # Scan for pairs of bases in AP xovers
-            idx_last = -2
-            fwd_axis_pairs = {}
-            isAGreaterThanB_Z = self.isAGreaterThanB_Z
-            for i, f_idxs, r_idxs in fwd_axis_hits:
-                if r_idxs:
-                    if idx_last + 1 == i:
-                        # print("pair", idx_last, i)
-                        fwd_axis_pairs[idx_last] = (True, neighbor_id)  # 5 prime  most strand
-                        fwd_axis_pairs[i] = (False, neighbor_id)        # 3 prime most strand
-                    idx_last = i
-                if f_idxs:
-                    for idxB in f_idxs:
-                        if isAGreaterThanB_Z(id_num, i, neighbor_id, idxB):
-                            fwd_axis_pairs[i] = (False, neighbor_id)
-                        else:
-                            fwd_axis_pairs[i] = (True, neighbor_id)
-
-            rev_axis_hits = []
-            for i, point in enumerate(this_rev_pts):
-                difference = nfwd_pts - point
-                inner1d(difference, difference, out=delta)
-                zdelta = np.square(difference[:, 2])
-                # assume there is only one possible index of intersection with the neighbor
-                f_idxs = np.where((delta > rsquared_ap_min) &
-                                  (delta < rsquared_ap_max) &
-                                  (zdelta < 0.3*r2_axial))[0].tolist()
-
-                difference = nrev_pts - point
-                inner1d(difference, difference, out=delta)
-                zdelta = np.square(difference[:, 2])
-                # assume there is only one possible index of intersection with the neighbor
-                r_idxs = np.where((delta > rsquared_p_min) &
-                                  (delta < rsquared_p_max) &
-                                  (zdelta > 0.3*r2_axial) &
-                                  (zdelta < 1.1*r2_axial)
-                                  )[0].tolist()
-                if f_idxs or r_idxs:
-                    rev_axis_hits.append((start + i, f_idxs, r_idxs))
-            # end for
-
-            # Scan for pairs of bases in AP xovers
-            idx_last = -2
-            for i, f_idxs, r_idxs in rev_axis_hits:
-                if f_idxs:
-                    if idx_last + 1 == i:
-                        # print("pair", idx_last, i)
-                        rev_axis_pairs[idx_last] = (False, neighbor_id)    # 3 prime  most strand
-                        rev_axis_pairs[i] = (True, neighbor_id)            # 5 prime most strand
-                    idx_last = i
-                if r_idxs:
-                    for idxB in r_idxs:
-                        if isAGreaterThanB_Z(id_num, i, neighbor_id, idxB):
-                            rev_axis_pairs[i] = (True, neighbor_id)
-                        else:
-                            rev_axis_pairs[i] = (False, neighbor_id)
-
-            per_neighbor_hits[neighbor_id] = (fwd_axis_hits, rev_axis_hits)
-        # end for
-        return per_neighbor_hits, (fwd_axis_pairs, rev_axis_pairs)
+        return rsquared_ap_min, rsquared_ap_max, rsquared_p_min, rsquared_p_max, r2_axial
     # end def
 
     @staticmethod
@@ -2297,16 +2961,81 @@ class NucleicAcidPart(Part):
 
 
         """
-        neighbors = literal_eval(self.vh_properties.loc[id_num, 'neighbors'])
+        neighbors = self.vh_properties.getNeighbors(id_num).tolist()
         # alpha = self.getProperty('crossover_span_angle')
 
         # idx = None # FORCE this for now to prevent animation GC crashes
 
         # per_neighbor_hits = self._queryIdNumRangeNeighbor(id_num, neighbors,
         #                                                 alpha, index=idx)
-        per_neighbor_hits = self.queryIdNumNeighbor(id_num, neighbors, index=idx)
-        return per_neighbor_hits
+        if idx is None:
+            start, stop = 0, self.getOffsetAndSize(id_num)[1]
+        else:
+            start, length = self.normalizedRange(id_num, idx)
+            start = max(start, 0)
+            stop = start + length
+
+        per_neighbor_hits = {}
+        fwd_axis_pairs = {}
+        rev_axis_pairs = {}
+        for neighbor_id in neighbors:
+            fwd_axis_hits, rev_axis_hits = self._cachedNeighborHits(id_num, neighbor_id,
+                                                                    start, stop)
+            # NOTE: forward pairs are only kept for the last neighbor to match
+            # queryIdNumNeighbor
+            fwd_axis_pairs = {}
+            self._scanXoverPairs(id_num, neighbor_id, fwd_axis_hits, rev_axis_hits,
+                                 fwd_axis_pairs, rev_axis_pairs)
+            per_neighbor_hits[neighbor_id] = (fwd_axis_hits, rev_axis_hits)
+        return per_neighbor_hits, (fwd_axis_pairs, rev_axis_pairs)
+    # end def
+
+    def _cachedNeighborHits(self, id_num, neighbor_id, start, stop):
+        """Get the crossover candidate hits of `id_num` on `neighbor_id` for
+        the indices in `[start, stop)`.  The hits for the whole helix are
+        computed once and cached until `_invalidateXoverCache` is called for
+        either ID number.
+
+        Args:
+            id_num (int): virtual helix ID number
+            neighbor_id (int): neighbor virtual helix ID number
+            start (int): first index into `id_num`
+            stop (int): index into `id_num` to stop before
+
+        Returns:
+            tuple: of :obj:`list`, (fwd_axis_hits, rev_axis_hits) in the
+            format of `queryIdNumNeighbor`
+        """
+        key = (id_num, neighbor_id)
+        entry = self._xover_cache.get(key)
+        if entry is None:
+            per_neighbor_hits, _ = self.queryIdNumNeighbor(id_num, [neighbor_id])
+            fwd_axis_hits, rev_axis_hits = per_neighbor_hits[neighbor_id]
+            entry = (fwd_axis_hits, [hit[0] for hit in fwd_axis_hits],
+                     rev_axis_hits, [hit[0] for hit in rev_axis_hits])
+            self._xover_cache[key] = entry
+            self._xover_cache_keys[id_num].add(key)
+            self._xover_cache_keys[neighbor_id].add(key)
+        fwd_axis_hits, fwd_idxs, rev_axis_hits, rev_idxs = entry
+        return (fwd_axis_hits[bisect_left(fwd_idxs, start):bisect_left(fwd_idxs, stop)],
+                rev_axis_hits[bisect_left(rev_idxs, start):bisect_left(rev_idxs, stop)])
+    # end def
+
+    def precomputeCrossoverMap(self, id_nums=None):
+        """Fill the crossover candidate cache used by `potentialCrossoverMap`
+        ahead of time, for instance right after loading a file or from an idle
+        timer in a view
 
+        Args:
+            id_nums (iterable): optional, of :obj:`int` virtual helix ID
+                numbers. Defaults to all IDs
+        """
+        if id_nums is None:
+            id_nums = list(self.reserved_ids)
+        for id_num in id_nums:
+            _, size = self.getOffsetAndSize(id_num)
+            for neighbor_id in self.vh_properties.getNeighbors(id_num).tolist():
+                self._cachedNeighborHits(id_num, neighbor_id, 0, size)
     # end def
     def boundDimensions(self, scale_factor=1.0):
         """Returns a tuple of rectangle definining the XY limits of a part"""
@@ -2469,6 +3198,78 @@ class NucleicAcidPart(Part):
         util.doCmd(self, c, use_undostack=use_undostack)
     # end def
 
+    def createVirtualHelices(self, origins, directions=None, sizes=42, properties=None,
+                             id_nums=None, safe=True, use_undostack=True):
+        """Create many VirtualHelix at once by calling
+        CreateVirtualHelicesCommand.  Much faster than repeated calls to
+        `createVirtualHelix` for file import and scripting.
+
+        emits a single `partVirtualHelicesAddedSignal`
+
+        Args:
+            origins (array-like): (n, 2) or (n, 3) of :obj:`float` x, y and
+                optionally z per helix
+            directions (array-like): optional, (n, 3) of :obj:`float` or a
+                single direction for every helix. Default (0, 0, 1)
+            sizes (object): :obj:`int` or :obj:`list` of :obj:`int`, size of
+                each VirtualHelix
+            properties (dict): optional, of :obj:`list` of values per
+                property key, one value per helix
+            id_nums (list): optional, of :obj:`int` ID numbers to use. By
+                default the lowest available ID numbers are used
+            safe (bool): Update neighbors otherwise, neighbors need to be
+                passed in `properties`
+            use_undostack (bool): Set to False to disable undostack for bulk
+                operations such as file import.
+
+        Returns:
+            list: of :obj:`int` ID numbers of the new virtual helices
+        """
+        c = CreateVirtualHelicesCommand(self, origins, directions, sizes,
+                                        id_nums=id_nums, properties=properties, safe=safe)
+        util.doCmd(self, c, use_undostack=use_undostack)
+        return list(c.id_nums)
+    # end def
+
+    def copyVirtualHelices(self, id_nums):
+        """Copy virtual helices with their strands, and the crossovers and
+        insertions on them, for `pasteVirtualHelices`
+
+        Args:
+            id_nums (iterable): of :obj:`int` virtual helix ID numbers
+
+        Returns:
+            VirtualHelixClipboard:
+
+        Raises:
+            IndexError:
+        """
+        return VirtualHelixClipboard(self, id_nums)
+    # end def
+
+    def pasteVirtualHelices(self, clipboard, use_undostack=True):
+        """Add copies of the virtual helices of a clipboard from
+        `copyVirtualHelices` of this or another part, at the same origins,
+        by calling PasteVirtualHelicesCommand.  Like
+        :func:`cadnano.fileio.v3decode.importToPart` the new ID numbers
+        follow `getIdNumMax` and the copied names get the new ID number as
+        a suffix
+
+        Args:
+            clipboard (VirtualHelixClipboard):
+            use_undostack (bool): optional, default True
+
+        Returns:
+            list: of :obj:`int` new ID number per virtual helix of the
+            clipboard, in the order of `clipboard.id_nums`
+        """
+        first_id_num = self.getIdNumMax() + 1
+        id_nums = list(range(first_id_num, first_id_num + len(clipboard)))
+        c = PasteVirtualHelicesCommand(self, clipboard, id_nums)
+        util.doCmd(self, c, use_undostack=use_undostack)
+        return id_nums
+    # end def
+
     def removeVirtualHelix(self, id_num, use_undostack=True):
         """Removes a VirtualHelix from the model. Accepts a reference to the
         VirtualHelix, or a (row,col) lattice coordinate to perform a lookup.
@@ -2712,7 +3513,7 @@ class NucleicAcidPart(Part):
     # end def
 
     def setVirtualHelixSize(self, id_num, new_size, use_undostack=True):
-        old_size = self.vh_properties.loc[id_num, 'length']
+        old_size = self.vh_properties.get(id_num, 'length')
         delta = new_size - old_size
         if delta > 0:
             c = ResizeVirtualHelixCommand(self, id_num, True, delta)
@@ -2842,31 +3643,65 @@ class NucleicAcidPart(Part):
         return self._oligos
     # end def
 
-    def getNewAbstractSegmentId(self, segment):
-        low_idx, high_idx = segment
-        seg_id = next(self._abstract_segment_id)
-        offset = self._current_base_count
-        segment_length = (high_idx - low_idx + 1)
-        self._current_base_count = offset + segment_length
-        return seg_id, offset, segment_length
-    # end def
-
-    def initializeAbstractSegmentId(self):
-        self._abstract_segment_id = icount(0)
-        self._current_base_count = 0
-    # end def
-
     def setAbstractSequences(self, emit_signals=False):
-        """Reset, assign, and display abstract sequence numbers."""
+        """Reset, assign, and display abstract sequence numbers.
+
+        Each segment of a virtual helix, see `refreshSegments`, gets
+        consecutive numbers for its bases, shared by the strands of both
+        StrandSets spanning it.  Segments are numbered in the order the
+        strands of the oligos reach them 5' to 3'.  One pass collects the
+        segments of the strands, then the numbers of all strands are
+        computed at once into one integer array, a run of numbers per
+        segment of a strand, and every strand gets a view of its part of the
+        array, see :meth:`Strand.setAbstractSequence`
+        """
         # reset all sequence numbers
         print("setting abstract sequence")
         for oligo in self._oligos:
             oligo.clearAbstractSequences()
 
-        self.initializeAbstractSegmentId()
-
+        segment_ids = {}    # (id_num, segment): index into lengths
+        lengths = []
+        run_ids = []        # segment index of every run of every strand
+        strands = []
+        run_counts = []
         for oligo in self._oligos:
-            oligo.applyAbstractSequences()
+            strand5p = oligo.strand5p()
+            if strand5p is None:
+                continue
+            for strand in strand5p.generator3pStrand():
+                id_num = strand.idNum()
+                # number from 5' to 3'
+                segments = strand.segments if strand.isForward() else strand.segments[::-1]
+                for segment in segments:
+                    key = (id_num, segment)
+                    seg_id = segment_ids.get(key)
+                    if seg_id is None:
+                        seg_id = segment_ids[key] = len(lengths)
+                        lengths.append(segment[1] - segment[0] + 1)
+                    run_ids.append(seg_id)
+                strands.append(strand)
+                run_counts.append(len(segments))
+        # end for
+
+        lengths = np.array(lengths, dtype=np.int32)
+        offsets = np.cumsum(lengths, dtype=np.int32) - lengths
+        run_ids = np.array(run_ids, dtype=np.intp)
+        run_lengths = lengths[run_ids]
+        run_ends = np.cumsum(run_lengths)
+        # runs ascend from the offset of their segment on forward strands and
+        # descend from its last number on reverse ones
+        run_is_fwd = np.repeat([strand.isForward() for strand in strands], run_counts)
+        run_firsts = np.where(run_is_fwd, offsets[run_ids], offsets[run_ids] + run_lengths - 1)
+        run_steps = np.where(run_is_fwd, 1, -1)
+        positions = np.arange(run_ends[-1] if len(run_ends) else 0, dtype=np.int32) - \
+            np.repeat(run_ends - run_lengths, run_lengths)
+        numbers = (np.repeat(run_firsts, run_lengths) +
+                   np.repeat(run_steps, run_lengths)*positions).astype(np.int32)
+
+        bounds = np.concatenate(([0], run_ends))[np.cumsum([0] + run_counts)].tolist()
+        for strand, low, high in zip(strands, bounds, bounds[1:]):
+            strand.setAbstractSequence(numbers[low:high])
 
         # display new sequence numbers
         for oligo in self._oligos:
@@ -2944,7 +3779,11 @@ class NucleicAcidPart(Part):
     # end def
 
     def insertions(self):
-        """Return dictionary of insertions."""
+        """Return dictionary of insertions.
+
+        Returns:
+            defaultdict: of {id_num: :class:`InsertionIndex`}
+        """
         return self._insertions
     # end def
 
@@ -2952,10 +3791,10 @@ class NucleicAcidPart(Part):
         """ Serialize insertions
 
         Yields:
-            tuple: (id_num, idx, length)
+            tuple: (id_num, idx, length) in index order per virtual helix
         """
-        for id_num, id_dict in self._insertions.items():
-            for idx, insertion in id_dict.items():
+        for id_num, insertion_index in self._insertions.items():
+            for idx, insertion in insertion_index.items():
                 yield (id_num, idx, insertion.length())
     # end def
 
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from cadnano.cnproxy import UndoCommand
+from cadnano.strand.insertioncmd import AddInsertionCommand
+from cadnano.strandset.loadstrandscmd import LoadStrandsCommand
+from .createvhelixcmd import CreateVirtualHelicesCommand
+from .vhclipboard import (FROM_ROW, FROM_IS_FWD, FROM_IDX, TO_ROW, TO_IS_FWD, TO_IDX,
+                          INSERTION_ROW, INSERTION_IDX, INSERTION_LENGTH)
+from .xovercmds import CreateXoverCommand
+
+class PasteVirtualHelicesCommand(UndoCommand):
+    """Paste the virtual helices of a :class:`VirtualHelixClipboard` into a
+    part as new virtual helices, with their strands, crossovers and
+    insertions, as one undoable step.
+
+    The helices are created in bulk by a `CreateVirtualHelicesCommand` and
+    the strands of each strandset by one `LoadStrandsCommand`.  The commands
+    for the crossovers and insertions can only be made once the strands
+    exist, so the first redo makes and runs them in order, later redos
+    replay them
+    """
+    def __init__(self, part, clipboard, id_nums):
+        """
+        Args:
+            part (NucleicAcidPart):
+            clipboard (VirtualHelixClipboard):
+            id_nums (list): of :obj:`int` unused ID number per clipboard row
+        """
+        super(PasteVirtualHelicesCommand, self).__init__("paste virtual helices")
+        self._part = part
+        self._clipboard = clipboard
+        self.id_nums = new_id_nums = np.array(id_nums, dtype=int)
+        # create in the copied virtual helix order so it is kept
+        rows = clipboard.order + sorted(set(range(len(clipboard))).difference(clipboard.order))
+        properties = {key: values[rows] for key, values in clipboard.properties.items()}
+        properties['name'] = ["%s.%d" % (name, id_num) for name, id_num in
+                              zip(properties['name'], new_id_nums[rows].tolist())]
+        self._create_cmd = CreateVirtualHelicesCommand(part, clipboard.origins[rows],
+                                                       clipboard.directions[rows],
+                                                       clipboard.sizes[rows],
+                                                       id_nums=new_id_nums[rows].tolist(),
+                                                       properties=properties)
+        self._commands = None
+    # end def
+
+    def redo(self):
+        part = self._part
+        with part.batchSignals():
+            if self._commands is None:
+                self._commands = self._runCommands()
+            else:
+                for command in self._commands:
+                    command.redo()
+    # end def
+
+    def undo(self):
+        part = self._part
+        with part.batchSignals():
+            for command in reversed(self._commands):
+                command.undo()
+    # end def
+
+    def _runCommands(self):
+        """Make and run the commands of the paste
+
+        Returns:
+            list: of the :class:`UndoCommand` run
+        """
+        part = self._part
+        clipboard = self._clipboard
+        new_id_nums = self.id_nums
+        commands = []
+
+        def run(command):
+            command.redo()
+            commands.append(command)
+
+        run(self._create_cmd)
+        for row, is_fwd, index_pairs, colors in clipboard.strandSets():
+            fwd_ss, rev_ss = part.getStrandSets(int(new_id_nums[row]))
+            run(LoadStrandsCommand(fwd_ss if is_fwd else rev_ss,
+                                   index_pairs.tolist(), colors))
+
+        xovers = clipboard.xovers.copy()
+        xovers[:, FROM_ROW] = new_id_nums[xovers[:, FROM_ROW]]
+        xovers[:, TO_ROW] = new_id_nums[xovers[:, TO_ROW]]
+        get_strand = part.getStrand
+        for xover in xovers.tolist():
+            from_idx, to_idx = xover[FROM_IDX], xover[TO_IDX]
+            strand5p = get_strand(bool(xover[FROM_IS_FWD]), xover[FROM_ROW], from_idx)
+            strand3p = get_strand(bool(xover[TO_IS_FWD]), xover[TO_ROW], to_idx)
+            run(CreateXoverCommand(part, strand5p, from_idx, strand3p, to_idx))
+
+        insertions = clipboard.insertions
+        insertion_id_nums = new_id_nums[insertions[:, INSERTION_ROW]].tolist()
+        for id_num, idx, length in zip(insertion_id_nums,
+                                       insertions[:, INSERTION_IDX].tolist(),
+                                       insertions[:, INSERTION_LENGTH].tolist()):
+            strand = get_strand(True, id_num, idx)
+            if strand is None:
+                strand = get_strand(False, id_num, idx)
+            if strand is not None:
+                run(AddInsertionCommand(strand, idx, length))
+        return commands
+    # end def
+# end class
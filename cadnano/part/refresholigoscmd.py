@@ -1,5 +1,4 @@
 from cadnano.cnproxy import UndoCommand
-from cadnano.strand import Strand
 
 class RefreshOligosCommand(UndoCommand):
     """
@@ -13,6 +12,14 @@ class RefreshOligosCommand(UndoCommand):
     Hence, we disable oligo assignment during the xover creation step,
     and then do it all in one pass at the end with this command.
 
+    Every strand is visited once: each chain of connected strands is walked
+    from the first of its strands found, 5' then 3', and all of its strands
+    are assigned the oligo of that strand.  Rather than per strand signals,
+    the part emits a single `partOligosRebuiltSignal` at the end with the
+    strands of every chain of more than one strand, including those that
+    kept their oligo, as the xovers created without oligo updates still
+    need to be drawn.
+
     This command is meant for non-undoable steps, like file-io.
     """
     def __init__(self, part):
@@ -21,51 +28,65 @@ class RefreshOligosCommand(UndoCommand):
     # end def
 
     def redo(self):
-        visited = {}
         part = self._part
+        strands = []
         for id_num in part.getIdNums():
             fwd_ss, rev_ss = part.getStrandSets(id_num)
-            for strand in rev_ss:
-                visited[strand] = False
-            for strand in fwd_ss:
-                visited[strand] = False
+            strands.extend(rev_ss)
+            strands.extend(fwd_ss)
 
-        fSetOligo = Strand.setOligo
-        for strand in list(visited.keys()):
-            if visited[strand]:
+        visited = set()
+        removed = set()
+        rebuilt = []
+        id_nums = set()
+        for strand in strands:
+            if strand in visited:
                 continue
-            visited[strand] = True
             start_oligo = strand.oligo()
 
-            strand5gen = strand.generator5pStrand()
-            # this gets the oligo and burns a strand in the generator
-            strand5 = next(strand5gen)
-            for strand5 in strand5gen:
-                oligo5 = strand5.oligo()
-                if oligo5 != start_oligo:
-                    oligo5.removeFromPart(emit_signals=True)
-                    fSetOligo(strand5, start_oligo, emit_signals=True)  # emits strandHasNewOligoSignal
-                visited[strand5] = True
-            # end for
+            # walk 5' to the first strand of the chain, or around the loop
+            chain = [strand]
+            strand5 = strand
+            node = strand._strand5p
+            while node is not None and node is not strand:
+                chain.append(node)
+                strand5 = node
+                node = node._strand5p
+            is_loop = node is strand
+            if not is_loop:
+                node = strand._strand3p
+                while node is not None:
+                    chain.append(node)
+                    node = node._strand3p
+            # end if
+
+            length = 0
+            for strand_x in chain:
+                oligo_x = strand_x.oligo()
+                if oligo_x is not start_oligo:
+                    if oligo_x not in removed:
+                        removed.add(oligo_x)
+                        oligo_x.removeFromPart(emit_signals=True)
+                    strand_x._oligo = start_oligo
+                id_nums.add(strand_x._id_num)
+                length += strand_x.totalLength()
+            visited.update(chain)
+            if len(chain) > 1:
+                # the xovers of a chain are drawn from its strands, whether
+                # or not their oligo changed
+                rebuilt.extend(chain)
+
             start_oligo.setStrand5p(strand5)
-            # is it a loop?
-            if strand.connection3p() == strand5:
+            if is_loop:
                 start_oligo._setLoop(True)
-            else:
-                strand3gen = strand.generator3pStrand()
-                strand3 = next(strand3gen)   # burn one
-                for strand3 in strand3gen:
-                    oligo3 = strand3.oligo()
-                    if oligo3 != start_oligo:
-                        oligo3.removeFromPart(emit_signals=True)
-                        fSetOligo(strand3, start_oligo, emit_signals=True)  # emits strandHasNewOligoSignal
-                    visited[strand3] = True
-                # end for
-            start_oligo.refreshLength(emit_signals=True)
+            start_oligo._setLength(length, emit_signals=True)
+            start_oligo._setStrandsModified()
         # end for
 
-        for strand in visited.keys():
-            strand.strandUpdateSignal.emit(strand)
+        set_modified = part.setVirtualHelixModified
+        for id_num in id_nums:
+            set_modified(id_num)
+        part.partOligosRebuiltSignal.emit(part, rebuilt)
     # end def
 
     def undo(self):
@@ -1,7 +1,7 @@
 from cadnano.cnproxy import UndoCommand
 
 class RefreshSegmentsCommand(UndoCommand):
-    """ Add an UndoCommand to the undostack calling Part.refreshSegments
+    """ Add an UndoCommand to the undostack calling Part.updateSegments
     """
     def __init__(self, part, id_nums):
         super(RefreshSegmentsCommand, self).__init__("refresh segments")
@@ -12,12 +12,12 @@ class RefreshSegmentsCommand(UndoCommand):
     def redo(self):
         part = self.part
         for id_num in self.id_nums:
-            part.refreshSegments(id_num)
+            part.updateSegments(id_num)
     # end def
 
     def undo(self):
         part = self.part
         for id_num in self.id_nums:
-            part.refreshSegments(id_num)
+            part.updateSegments(id_num)
     # end def
 # end class
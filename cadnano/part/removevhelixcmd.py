@@ -1,6 +1,3 @@
-from ast import literal_eval
-import bisect
-
 from cadnano.cnproxy import UndoCommand
 
 class RemoveVirtualHelixCommand(UndoCommand):
@@ -12,8 +9,7 @@ class RemoveVirtualHelixCommand(UndoCommand):
         _, self.length = part.getOffsetAndSize(id_num)
         x, y = part.getVirtualHelixOrigin(id_num)
         self.origin_pt = (x, y, 0.)
-        neighbors = part.getVirtualHelixProperties(id_num, 'neighbors')
-        self.neighbors = literal_eval(neighbors)
+        self.neighbors = part.getVirtualHelixNeighbors(id_num)
         self.color = part.getVirtualHelixProperties(id_num, 'color')
         self.props = part.getAllVirtualHelixProperties(id_num, inject_extras=False)
         self.old_active_base_info = part.active_base_info
@@ -25,12 +21,9 @@ class RemoveVirtualHelixCommand(UndoCommand):
         id_num = self.id_num
         # clear out part references
         part.clearActiveVirtualHelix()
+        vh_properties = part.vh_properties
         for neighbor_id in self.neighbors:
-            nneighbors = literal_eval(
-                            part.getVirtualHelixProperties(neighbor_id, 'neighbors')
-                        )
-            nneighbors.remove(id_num)
-            part.vh_properties.loc[neighbor_id, 'neighbors'] = str(list(nneighbors))
+            vh_properties.removeNeighbor(neighbor_id, id_num)
         # signaling the view is two parts to clean up signals properly
         # and then allow the views to refresh
         part.partVirtualHelixRemovingSignal.emit(
@@ -42,12 +35,9 @@ class RemoveVirtualHelixCommand(UndoCommand):
     def undo(self):
         part = self.part
         id_num = self.id_num
+        vh_properties = part.vh_properties
         for neighbor_id in self.neighbors:
-            nneighbors = literal_eval(
-                            part.getVirtualHelixProperties(neighbor_id, 'neighbors')
-                        )
-            bisect.insort_left(nneighbors, id_num)
-            part.vh_properties.loc[neighbor_id, 'neighbors'] = str(list(nneighbors))
+            vh_properties.addNeighbor(neighbor_id, id_num)
         vh = part._createHelix(id_num, self.origin_pt, (0, 0, 1), self.length, self.color)
         keys = list(self.props.keys())
         vals = list(self.props.values())
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Incremental bookkeeping of the strand segments of a virtual helix.
+
+The segments of a strand split its index range at every base where a strand
+of either :class:`StrandSet` of the helix ends (`high`) or the base before
+one starts (`low - 1`), see :meth:`NucleicAcidPart._refreshSegments`.
+:class:`SegmentEndpoints` keeps those end points as a sorted multiset that is
+updated as strands are added, removed and resized, and remembers where it
+changed so only the strands next to a change need new segments.
+"""
+from bisect import bisect_left
+
+
+class SegmentEndpoints(object):
+    """Sorted multiset of the segment end points of one virtual helix
+    """
+    def __init__(self):
+        self._points = []   # sorted distinct end points
+        self._counts = {}   # end point: number of strand ends using it
+        self._changed = set()   # end points added or removed since `popChanged`
+    # end def
+
+    def __len__(self):
+        return len(self._points)
+    # end def
+
+    def add(self, idx_low, idx_high):
+        """Add the end points of a strand
+
+        Args:
+            idx_low (int): low index of the strand
+            idx_high (int): high index of the strand
+        """
+        counts = self._counts
+        for point in (idx_low - 1, idx_high):
+            count = counts.get(point, 0)
+            if count == 0:
+                points = self._points
+                points.insert(bisect_left(points, point), point)
+            counts[point] = count + 1
+            self._changed.add(point)
+    # end def
+
+    def remove(self, idx_low, idx_high):
+        """Remove the end points of a strand
+
+        Args:
+            idx_low (int): low index of the strand
+            idx_high (int): high index of the strand
+
+        Raises:
+            KeyError: the end points were never added
+        """
+        counts = self._counts
+        for point in (idx_low - 1, idx_high):
+            count = counts[point] - 1
+            if count == 0:
+                del counts[point]
+                points = self._points
+                del points[bisect_left(points, point)]
+            else:
+                counts[point] = count
+            self._changed.add(point)
+    # end def
+
+    def popChanged(self):
+        """
+        Returns:
+            set: of :obj:`int` end points added or removed since the last
+            call.  Only strands overlapping one of them can have different
+            segments
+        """
+        changed = self._changed
+        self._changed = set()
+        return changed
+    # end def
+
+    def segments(self, idx_low, idx_high):
+        """Partition a strand's index range at the end points
+
+        Args:
+            idx_low (int): low index of the strand
+            idx_high (int): high index of the strand, must be an end point
+
+        Returns:
+            list: of :obj:`tuple` (start, end) of :obj:`int`
+        """
+        points = self._points
+        segments = []
+        start = idx_low
+        i = bisect_left(points, start)
+        while start <= idx_high:
+            end = points[i]
+            segments.append((start, end))
+            start = end + 1
+            i += 1
+        return segments
+    # end def
+# end class
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+"""Uniform grid hashes used by :class:`NucleicAcidPart` to answer radius
+queries on virtual helix axis points and origins without scanning every
+point in the part.
+
+Both indices only return *candidates*: everything stored in the grid cells
+overlapping the query's bounding box.  The caller is expected to do the
+exact distance test on the (small) candidate set against the part's
+coordinate arrays, which keeps the results identical to a brute force scan.
+"""
+import math
+
+import numpy as np
+
+
+def _cellRange(lo, hi, cell_size):
+    """Inclusive range of integer cell coordinates spanning `[lo, hi]`
+
+    Args:
+        lo (float): lower bound
+        hi (float): upper bound
+        cell_size (float): edge length of a grid cell
+
+    Returns:
+        range: of :obj:`int` cell coordinates
+    """
+    return range(math.floor(lo / cell_size), math.floor(hi / cell_size) + 1)
+# end def
+
+
+class OriginGridIndex(object):
+    """2D grid hash of virtual helix origins
+
+    Args:
+        cell_size (float): edge length of a grid cell.  Pick something close
+            to the typical query radius
+    """
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self._cells = {}    # (ix, iy): set of id_nums
+        self._id_cell = {}  # id_num: (ix, iy)
+    # end def
+
+    def __len__(self):
+        return len(self._id_cell)
+    # end def
+
+    def __contains__(self, id_num):
+        return id_num in self._id_cell
+    # end def
+
+    def _key(self, x, y):
+        cell_size = self.cell_size
+        return (math.floor(x / cell_size), math.floor(y / cell_size))
+    # end def
+
+    def insert(self, id_num, point):
+        """Add or move an origin
+
+        Args:
+            id_num (int): virtual helix ID number
+            point (array-like): of :obj:`float` x, y of the origin
+        """
+        if id_num in self._id_cell:
+            self.remove(id_num)
+        key = self._key(point[0], point[1])
+        self._id_cell[id_num] = key
+        cell = self._cells.get(key)
+        if cell is None:
+            self._cells[key] = cell = set()
+        cell.add(id_num)
+    # end def
+
+    def remove(self, id_num):
+        """Remove an origin if it is indexed
+
+        Args:
+            id_num (int): virtual helix ID number
+        """
+        key = self._id_cell.pop(id_num, None)
+        if key is None:
+            return
+        cell = self._cells[key]
+        cell.discard(id_num)
+        if not cell:
+            del self._cells[key]
+    # end def
+
+    def clear(self):
+        self._cells = {}
+        self._id_cell = {}
+    # end def
+
+    def candidates(self, point, radius):
+        """Get every ID number in a cell overlapping the box of half width
+        `radius` around `point`
+
+        Args:
+            point (array-like): of :obj:`float` x, y
+            radius (float): distance to consider
+
+        Returns:
+            list: of :obj:`int` unsorted candidate ID numbers
+        """
+        x, y = point[0], point[1]
+        cell_size = self.cell_size
+        x_range = _cellRange(x - radius, x + radius, cell_size)
+        y_range = _cellRange(y - radius, y + radius, cell_size)
+        cells = self._cells
+        out = []
+        if len(x_range)*len(y_range) > len(cells):
+            # a huge radius, cheaper to walk the occupied cells
+            for (ix, iy), cell in cells.items():
+                if ix in x_range and iy in y_range:
+                    out.extend(cell)
+        else:
+            for ix in x_range:
+                for iy in y_range:
+                    cell = cells.get((ix, iy))
+                    if cell is not None:
+                        out.extend(cell)
+        return out
+    # end def
+# end class
+
+
+class PointGridIndex(object):
+    """3D grid hash of virtual helix axis points.
+
+    Consecutive bases of a virtual helix mostly land in the same cell, so
+    each cell stores runs of base indices per helix rather than individual
+    points::
+
+        cell_key: {id_num: [(idx_lo, idx_hi), ...]}
+
+    where `idx_hi` is exclusive.  Indices are stored relative to a per helix
+    base so that prepending to or trimming the low end of a helix, which
+    renumbers every base, only needs `shiftHelix`.  They don't depend on the
+    helix's offset in the point arrays.
+
+    Helices added with `deferHelix` are only indexed right before the next
+    query, by reading their current points from `point_source`.  Until then
+    the other updates for them are ignored.  This keeps bulk creation and
+    file loading from paying for an index that may never be queried.
+
+    Args:
+        cell_size (float): edge length of a grid cell
+        point_source (callable): optional, maps an ID number to its (n, 3)
+            axis points.  Required to use `deferHelix`
+    """
+    def __init__(self, cell_size, point_source=None):
+        self.cell_size = cell_size
+        self.point_source = point_source
+        self._cells = {}
+        self._helix_cells = {}  # id_num: set of cell keys holding runs
+        self._helix_base = {}   # id_num: base index of stored index 0
+        self._pending = set()   # id_nums to index on the next query
+    # end def
+
+    def __contains__(self, id_num):
+        return id_num in self._helix_cells or id_num in self._pending
+    # end def
+
+    def deferHelix(self, id_num):
+        """(Re)index all the points of a helix lazily, right before the next
+        call to `candidates`
+
+        Args:
+            id_num (int): virtual helix ID number
+        """
+        self.removeHelix(id_num)
+        self._pending.add(id_num)
+    # end def
+
+    def _flushPending(self):
+        pending = self._pending
+        self._pending = set()
+        point_source = self.point_source
+        for id_num in sorted(pending):
+            self.insertHelix(id_num, point_source(id_num))
+    # end def
+
+    def insertHelix(self, id_num, points, idx_start=0):
+        """Index the axis points of a helix.  Can be called multiple times for
+        the same helix to add disjoint index ranges, e.g. when appending
+
+        Args:
+            id_num (int): virtual helix ID number
+            points (ndarray): (n, 3) axis points
+            idx_start (int): base index of `points[0]` in the helix
+        """
+        if id_num in self._pending:
+            return
+        num_points = len(points)
+        helix_cells = self._helix_cells.get(id_num)
+        if helix_cells is None:
+            self._helix_cells[id_num] = helix_cells = set()
+            self._helix_base[id_num] = 0
+        if num_points == 0:
+            return
+        idx_start -= self._helix_base[id_num]
+        keys = np.floor(np.asarray(points) / self.cell_size).astype(np.int64)
+        changes, = np.nonzero(np.any(keys[1:] != keys[:-1], axis=1))
+        starts = np.concatenate(([0], changes + 1))
+        stops = np.concatenate((changes + 1, [num_points]))
+        cells = self._cells
+        for lo, hi, key in zip(starts.tolist(), stops.tolist(),
+                               map(tuple, keys[starts].tolist())):
+            cell = cells.get(key)
+            if cell is None:
+                cells[key] = cell = {}
+            runs = cell.get(id_num)
+            if runs is None:
+                cell[id_num] = runs = []
+            runs.append((lo + idx_start, hi + idx_start))
+            helix_cells.add(key)
+    # end def
+
+    def removeHelix(self, id_num):
+        """Drop every run of a helix if it is indexed
+
+        Args:
+            id_num (int): virtual helix ID number
+        """
+        self._pending.discard(id_num)
+        helix_cells = self._helix_cells.pop(id_num, None)
+        if helix_cells is None:
+            return
+        del self._helix_base[id_num]
+        cells = self._cells
+        for key in helix_cells:
+            cell = cells[key]
+            del cell[id_num]
+            if not cell:
+                del cells[key]
+    # end def
+
+    def removeRange(self, id_num, points, idx_start):
+        """Drop the runs covering some of the points of a helix.  Only the
+        cells holding `points` are visited
+
+        Args:
+            id_num (int): virtual helix ID number
+            points (ndarray): (n, 3) axis points being removed
+            idx_start (int): base index of `points[0]` in the helix
+        """
+        num_points = len(points)
+        if num_points == 0 or id_num not in self._helix_cells:
+            return
+        rlo = idx_start - self._helix_base[id_num]
+        rhi = rlo + num_points
+        keys = np.floor(np.asarray(points) / self.cell_size).astype(np.int64)
+        keys = set(map(tuple, keys.tolist()))
+        cells = self._cells
+        helix_cells = self._helix_cells[id_num]
+        for key in keys:
+            cell = cells.get(key)
+            if cell is None or id_num not in cell:
+                continue
+            runs = []
+            for lo, hi in cell[id_num]:
+                if hi <= rlo or lo >= rhi:
+                    runs.append((lo, hi))
+                    continue
+                if lo < rlo:
+                    runs.append((lo, rlo))
+                if hi > rhi:
+                    runs.append((rhi, hi))
+            if runs:
+                cell[id_num] = runs
+            else:
+                del cell[id_num]
+                helix_cells.discard(key)
+                if not cell:
+                    del cells[key]
+    # end def
+
+    def shiftHelix(self, id_num, delta):
+        """Renumber every indexed base of a helix by `delta`, e.g. after
+        prepending `delta` bases or trimming `-delta` bases from the low end
+
+        Args:
+            id_num (int): virtual helix ID number
+            delta (int): change in base index
+        """
+        if id_num in self._helix_base:
+            self._helix_base[id_num] += delta
+    # end def
+
+    def clear(self):
+        self._cells = {}
+        self._helix_cells = {}
+        self._helix_base = {}
+        self._pending = set()
+    # end def
+
+    def candidates(self, point, radius):
+        """Get the runs in every cell overlapping the box of half width
+        `radius` around `point`
+
+        Args:
+            point (array-like): of :obj:`float` x, y, z
+            radius (float): distance to consider
+
+        Returns:
+            list: of :obj:`tuple` of form::
+
+                (id_num, idx_lo, idx_hi)
+        """
+        if self._pending:
+            self._flushPending()
+        x, y, z = point[0], point[1], point[2]
+        cell_size = self.cell_size
+        x_range = _cellRange(x - radius, x + radius, cell_size)
+        y_range = _cellRange(y - radius, y + radius, cell_size)
+        z_range = _cellRange(z - radius, z + radius, cell_size)
+        cells = self._cells
+        out = []
+        if len(x_range)*len(y_range)*len(z_range) > len(cells):
+            # a huge radius, cheaper to walk the occupied cells
+            selected = [cell for (ix, iy, iz), cell in cells.items()
+                        if ix in x_range and iy in y_range and iz in z_range]
+        else:
+            selected = []
+            for ix in x_range:
+                for iy in y_range:
+                    for iz in z_range:
+                        cell = cells.get((ix, iy, iz))
+                        if cell is not None:
+                            selected.append(cell)
+        helix_base = self._helix_base
+        for cell in selected:
+            for id_num, runs in cell.items():
+                base = helix_base[id_num]
+                for lo, hi in runs:
+                    out.append((id_num, lo + base, hi + base))
+        return out
+    # end def
+# end class
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Bulk edits of a part with deferred recomputation of derived data.
+
+While a :meth:`NucleicAcidPart.transaction` is open a :class:`PartTransaction`
+stands in for the undo stack of the part, its strandsets, strands and oligos,
+so edits of other parts of the document are not journaled.  Every command
+pushed to it is run at once and journaled, so edits behave as usual and can
+be rolled back, but the work that only keeps derived data current is deferred
+to the commit:
+
+* strand segments, see :meth:`NucleicAcidPart.updateSegments`, are updated
+  once per changed virtual helix
+* the sequences of the oligos changed by insertions and skips are blanked
+  once per oligo instead of once per edit
+* signals are batched, see :meth:`CNObject.batchSignals`
+"""
+from cadnano.oligo.applysequencecmd import ApplySequenceCommand
+from .transactioncmd import TransactionCommand
+
+
+class PartTransaction(object):
+    """Journal of the commands run in a transaction of a part.  Implements
+    the parts of the undo stack API the model uses
+
+    Args:
+        part (NucleicAcidPart):
+        undo (bool): push the transaction onto the undo stack as a single
+            command when it commits
+    """
+    def __init__(self, part, undo):
+        self._part = part
+        self._undo = undo
+        self._commands = []
+        self._blank_strands = {}    # strands whose oligos to blank, ordered
+    # end def
+
+    def push(self, command):
+        command.redo()
+        self._commands.append(command)
+    # end def
+
+    def beginMacro(self, message):
+        pass
+    # end def
+
+    def endMacro(self):
+        pass
+    # end def
+
+    def undo(self):
+        if self._commands:
+            self._commands.pop().undo()
+    # end def
+
+    def redo(self):
+        pass
+    # end def
+
+    def canUndo(self):
+        return len(self._commands) > 0
+    # end def
+
+    def canRedo(self):
+        return False
+    # end def
+
+    def blankSequences(self, strands):
+        """Blank the sequences of the oligos of `strands` when the transaction
+        commits
+
+        Args:
+            strands (list): of :class:`Strand`
+        """
+        blank_strands = self._blank_strands
+        for strand in strands:
+            blank_strands[strand] = None
+    # end def
+
+    def commit(self, undostack):
+        """Blank the recorded sequences and, for an undoable transaction,
+        push the journal onto `undostack`.  Segments are updated by the part
+        once the transaction is closed
+
+        Args:
+            undostack (UndoStack): of the document
+        """
+        blanked = set()
+        for strand in self._blank_strands:
+            if not strand.strandSet().isStrandInSet(strand):
+                continue
+            oligo = strand.oligo()
+            if oligo not in blanked:
+                blanked.add(oligo)
+                if oligo.sequence() is not None:
+                    self.push(ApplySequenceCommand(oligo, None))
+        self._blank_strands = {}
+        if self._undo and self._commands:
+            undostack.push(TransactionCommand(self._commands))
+        self._commands = []
+    # end def
+
+    def rollback(self):
+        """Undo every journaled command, last first
+        """
+        commands = self._commands
+        while commands:
+            commands.pop().undo()
+        self._blank_strands = {}
+    # end def
+# end class
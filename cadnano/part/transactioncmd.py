@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+from cadnano.cnproxy import UndoCommand
+
+class TransactionCommand(UndoCommand):
+    """The commands of a committed :class:`PartTransaction` as one undoable
+    step.  They already ran in the transaction, so the redo run by pushing
+    this command is skipped
+    """
+    def __init__(self, commands):
+        super(TransactionCommand, self).__init__("transaction")
+        self._commands = list(commands)
+        self._done = True
+    # end def
+
+    def redo(self):
+        if self._done:
+            self._done = False
+            return
+        for command in self._commands:
+            command.redo()
+    # end def
+
+    def undo(self):
+        for command in reversed(self._commands):
+            command.undo()
+    # end def
+# end class
@@ -1,9 +1,5 @@
 from cadnano.cnproxy import UndoCommand
 
-# prevent circular imports
-# from cadnano.part.nucleicacidpart import Z_PROP_INDEX
-Z_PROP_INDEX = -1  # index for Dataframe.iloc calls
-
 class TranslateVirtualHelicesCommand(UndoCommand):
     """ Move Virtual Helices around"""
     def __init__(self, part, virtual_helix_set, dx, dy, dz):
@@ -31,10 +27,8 @@ class TranslateVirtualHelicesCommand(UndoCommand):
 
     def doSignals(self, part, vh_set):
         vh_list = list(vh_set)
-        z_vals = part.vh_properties.iloc[vh_list, Z_PROP_INDEX]
+        z_vals = part.vh_properties.column('z')[vh_list].tolist()
         if self.delta[2] > 0:
-            if isinstance(z_vals, float):
-                z_vals = (z_vals, )
             for id_num, z_val in zip(vh_list, z_vals):
                 part.partVirtualHelixPropertyChangedSignal.emit(
                                         part, id_num, part.getVirtualHelix(id_num), ('z',), (z_val,))
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""In process clipboard for copying and pasting virtual helices.
+
+Unlike :func:`cadnano.fileio.v3encode.encodePartList`, which builds JSON
+ready lists for :func:`cadnano.fileio.v3decode.importToPart`, a
+:class:`VirtualHelixClipboard` keeps the copied virtual helices as arrays
+sliced from the part: their origins, directions, sizes and property columns,
+and tables of their strands, the crossovers between them and their
+insertions.  Virtual helices are referred to by their row in the clipboard,
+so pasting remaps every table to the new ID numbers with one array lookup.
+See `NucleicAcidPart.copyVirtualHelices` and
+`NucleicAcidPart.pasteVirtualHelices`
+"""
+import numpy as np
+
+# columns of `VirtualHelixClipboard.strands`
+STRAND_ROW, STRAND_IS_FWD, STRAND_LOW, STRAND_HIGH = range(4)
+# columns of `VirtualHelixClipboard.xovers`
+FROM_ROW, FROM_IS_FWD, FROM_IDX, TO_ROW, TO_IS_FWD, TO_IDX = range(6)
+# columns of `VirtualHelixClipboard.insertions`
+INSERTION_ROW, INSERTION_IDX, INSERTION_LENGTH = range(3)
+
+
+class VirtualHelixClipboard(object):
+    """Copy of some virtual helices of a part with their strands, and the
+    crossovers and insertions on them
+
+    Args:
+        part (NucleicAcidPart):
+        id_nums (iterable): of :obj:`int` virtual helix ID numbers to copy
+
+    Attributes:
+        id_nums (ndarray): of the copied :obj:`int` ID numbers, sorted.  The
+            row of a virtual helix in the other arrays
+        origins (ndarray): (n, 3) of :obj:`float` x, y and z per row
+        directions (ndarray): (n, 3) of :obj:`float` per row
+        sizes (ndarray): of :obj:`int` number of bases per row
+        properties (dict): of `ndarray` column per property key, other than
+            'neighbors', which are recomputed where pasted
+        strands (ndarray): (number of strands, 4) of row, is forward, low
+            and high index, grouped by row and strand type
+        colors (list): of :obj:`str` color per strand
+        xovers (ndarray): (number of xovers, 6) of the row, is forward and
+            index of the 3' end and of the 5' end of each crossover between
+            copied virtual helices
+        insertions (ndarray): (number of insertions, 3) of row, index and
+            length
+        order (list): of :obj:`int` rows in the virtual helix order of the
+            part
+    """
+    def __init__(self, part, id_nums):
+        id_nums = np.array(sorted(set(id_nums)), dtype=int)
+        for id_num in id_nums.tolist():
+            if part.getOffsetAndSize(id_num) is None:
+                raise IndexError("id_num {} does not exist".format(id_num))
+        self.id_nums = id_nums
+        num_rows = len(id_nums)
+        rows_of = np.full(part.getIdNumMax() + 1, -1, dtype=int)
+        rows_of[id_nums] = np.arange(num_rows)
+
+        vh_properties = part.vh_properties
+        self.properties = {key: vh_properties.column(key)[id_nums].copy()
+                           for key in vh_properties.keys() if key != 'neighbors'}
+        self.origins = np.column_stack((part._origin_pts[id_nums],
+                                        self.properties['z']))
+        self.directions = part.directions[id_nums].copy()
+        self.sizes = np.array([part.getOffsetAndSize(id_num)[1]
+                               for id_num in id_nums.tolist()], dtype=int)
+
+        strand_rows = []
+        self.colors = colors = []
+        xover_list = []
+        insertion_rows = []
+        all_insertions = part.insertions()
+        for row, id_num in enumerate(id_nums.tolist()):
+            for strandset in part.getStrandSets(id_num):
+                idxs, ss_colors = strandset.dump(xover_list)
+                is_fwd = int(strandset.isForward())
+                strand_rows += [(row, is_fwd, low_idx, high_idx) for low_idx, high_idx in idxs]
+                colors += ss_colors
+            if id_num in all_insertions:
+                insertion_rows += [(row, idx, insertion.length())
+                                   for idx, insertion in all_insertions[id_num].items()]
+        self.strands = np.array(strand_rows, dtype=int).reshape(-1, 4)
+        self.insertions = np.array(insertion_rows, dtype=int).reshape(-1, 3)
+
+        # keep only the crossovers between copied virtual helices
+        xovers = np.array(xover_list, dtype=int).reshape(-1, 6)
+        xovers[:, FROM_ROW] = rows_of[xovers[:, FROM_ROW]]
+        xovers[:, TO_ROW] = rows_of[xovers[:, TO_ROW]]
+        self.xovers = xovers[(xovers[:, FROM_ROW] >= 0) & (xovers[:, TO_ROW] >= 0)]
+
+        id_num_set = set(id_nums.tolist())
+        self.order = [int(rows_of[id_num])
+                      for id_num in part.getImportVirtualHelixOrder()
+                      if id_num in id_num_set]
+    # end def
+
+    def __len__(self):
+        return len(self.id_nums)
+    # end def
+
+    def strandSets(self):
+        """Split the strand table per strandset
+
+        Yields:
+            tuple: (row, is_fwd, `ndarray` (number of strands, 2) of low and
+            high indices, :obj:`list` of :obj:`str` colors)
+        """
+        strands = self.strands
+        keys = strands[:, STRAND_ROW]*2 + strands[:, STRAND_IS_FWD]
+        starts = np.flatnonzero(np.diff(keys, prepend=-1))
+        stops = np.append(starts[1:], len(strands))
+        colors = self.colors
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            yield (int(strands[start, STRAND_ROW]), bool(strands[start, STRAND_IS_FWD]),
+                   strands[start:stop, STRAND_LOW:], colors[start:stop])
+    # end def
+# end class
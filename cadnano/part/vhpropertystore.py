@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+"""Columnar storage for the per virtual helix properties of a
+:class:`NucleicAcidPart`.
+
+Every property is a typed NumPy array indexed by virtual helix ID number, so
+reading or writing a single value is a plain array access.  The `neighbors`
+property is kept as an integer array per ID number.  It is only turned into
+its string form, e.g. ``'[1, 4, 5]'``, at the API boundary (signals, file
+encoding) for compatibility with the views and the file format.
+"""
+from ast import literal_eval
+import bisect
+
+import numpy as np
+
+NEIGHBORS_KEY = 'neighbors'
+_EMPTY_NEIGHBORS = np.zeros(0, dtype=int)
+_EMPTY_NEIGHBORS.flags.writeable = False
+
+
+def neighborsFromValue(value):
+    """Normalize a `neighbors` property value
+
+    Args:
+        value (object): :obj:`str` such as ``'[1, 2]'`` or an iterable of
+            :obj:`int`
+
+    Returns:
+        ndarray: of :obj:`int` neighbor ID numbers
+    """
+    if isinstance(value, str):
+        value = literal_eval(value)
+    neighbors = np.fromiter(value, dtype=int)
+    neighbors.flags.writeable = False
+    return neighbors
+# end def
+
+
+class VirtualHelixPropertyStore(object):
+    """Typed column arrays of virtual helix properties, one row per ID number
+
+    Args:
+        keys (tuple): of :obj:`str` property names in column order
+        default_row (tuple): default value of each property.  The type of each
+            default picks the dtype of its column
+        size (int): initial number of rows
+    """
+    def __init__(self, keys, default_row, size):
+        self._keys = tuple(keys)
+        self._key_set = frozenset(keys)
+        self._defaults = dict(zip(keys, default_row))
+        self._columns = {}
+        self._size = 0
+        for key, default in self._defaults.items():
+            if key == NEIGHBORS_KEY:
+                continue
+            if isinstance(default, str):
+                dtype = object
+            elif isinstance(default, bool):
+                dtype = bool
+            elif isinstance(default, int):
+                dtype = np.int64
+            else:
+                dtype = float
+            self._columns[key] = np.empty(0, dtype=dtype)
+        self._neighbors = []
+        self.resize(size)
+    # end def
+
+    def __len__(self):
+        return self._size
+    # end def
+
+    def keys(self):
+        """
+        Returns:
+            tuple: of :obj:`str` property names in column order
+        """
+        return self._keys
+    # end def
+
+    def resize(self, size):
+        """Grow the store to `size` rows filling new rows with the defaults
+
+        Args:
+            size (int): new number of rows. Must not be smaller than the
+                current size
+        """
+        old_size = self._size
+        if size < old_size:
+            raise ValueError("can't shrink property store {} --> {}".format(old_size, size))
+        defaults = self._defaults
+        for key, column in self._columns.items():
+            new_column = np.empty(size, dtype=column.dtype)
+            new_column[:old_size] = column
+            new_column[old_size:] = defaults[key]
+            self._columns[key] = new_column
+        self._neighbors += [_EMPTY_NEIGHBORS]*(size - old_size)
+        self._size = size
+    # end def
+
+    def copy(self):
+        """
+        Returns:
+            VirtualHelixPropertyStore: independent copy of this store
+        """
+        new_store = VirtualHelixPropertyStore.__new__(VirtualHelixPropertyStore)
+        new_store._keys = self._keys
+        new_store._key_set = self._key_set
+        new_store._defaults = self._defaults
+        new_store._columns = {key: column.copy() for key, column in self._columns.items()}
+        # neighbor arrays are read only, so they can be shared
+        new_store._neighbors = list(self._neighbors)
+        new_store._size = self._size
+        return new_store
+    # end def
+
+    def resetRow(self, id_num):
+        """Restore the default value of every property of a row
+
+        Args:
+            id_num (int): virtual helix ID number
+        """
+        defaults = self._defaults
+        for key, column in self._columns.items():
+            column[id_num] = defaults[key]
+        self._neighbors[id_num] = _EMPTY_NEIGHBORS
+    # end def
+
+    def column(self, key):
+        """Direct access to the array of a property.  Writes to the returned
+        array go straight into the store
+
+        Args:
+            key (str): property name, other than 'neighbors'
+
+        Returns:
+            ndarray: of length `len(self)`
+
+        Raises:
+            KeyError:
+        """
+        return self._columns[key]
+    # end def
+
+    def _getValue(self, id_num, key):
+        if key == NEIGHBORS_KEY:
+            return str(self._neighbors[id_num].tolist())
+        value = self._columns[key][id_num]
+        # promote to python native types needed by QVariant and json
+        return value.item() if isinstance(value, np.generic) else value
+    # end def
+
+    def get(self, id_num, keys):
+        """
+        Args:
+            id_num (int): virtual helix ID number
+            keys (object): :obj:`str` or :obj:`list`/:obj:`tuple`
+
+        Returns:
+            object: python native value or :obj:`list` of values depending on
+            the type of `keys`
+
+        Raises:
+            KeyError:
+        """
+        if id_num < 0 or id_num >= self._size:
+            raise KeyError("id_num {} is not in the property store".format(id_num))
+        if isinstance(keys, str):
+            return self._getValue(id_num, keys)
+        return [self._getValue(id_num, key) for key in keys]
+    # end def
+
+    def _writableColumn(self, key, values):
+        """Get the column of `key` to write `values` to, upcast to float if
+        it is an integer column and `values` aren't all integral, rather than
+        truncating them
+
+        Args:
+            key (str): property name, other than 'neighbors'
+            values (object): value or :obj:`array-like` of values
+
+        Returns:
+            ndarray:
+        """
+        column = self._columns[key]
+        if column.dtype.kind in 'iu':
+            values = np.asarray(values)
+            if values.dtype.kind == 'f' and not np.all(np.mod(values, 1) == 0):
+                column = self._columns[key] = column.astype(float)
+        return column
+    # end def
+
+    def _setValue(self, id_num, key, value):
+        if key == NEIGHBORS_KEY:
+            self._neighbors[id_num] = neighborsFromValue(value)
+        else:
+            self._writableColumn(key, value)[id_num] = value
+    # end def
+
+    def set(self, id_num, keys, values):
+        """Keys and values can be :obj:`array-like` of equal length or
+        singular values
+
+        Args:
+            id_num (int): virtual helix ID number
+            keys (object): :obj:`str` or :obj:`list`/:obj:`tuple`
+            values (object): value or :obj:`list`/:obj:`tuple` of values
+                matching the key order
+
+        Raises:
+            KeyError:
+            ValueError:
+        """
+        if id_num < 0 or id_num >= self._size:
+            raise KeyError("id_num {} is not in the property store".format(id_num))
+        if isinstance(keys, str):
+            if keys not in self._key_set:
+                raise KeyError("unknown virtual helix property {}".format(keys))
+            self._setValue(id_num, keys, values)
+            return
+        if len(keys) != len(values):
+            raise ValueError("{} keys but {} values".format(len(keys), len(values)))
+        if not self._key_set.issuperset(keys):
+            raise KeyError("unknown virtual helix properties {}".format(
+                [key for key in keys if key not in self._key_set]))
+        for key, value in zip(keys, values):
+            self._setValue(id_num, key, value)
+    # end def
+
+    def setRows(self, id_nums, key, values):
+        """Set one property of many rows at once
+
+        Args:
+            id_nums (array-like): of :obj:`int` virtual helix ID numbers
+            key (str): property name
+            values (array-like): one value per ID number
+
+        Raises:
+            KeyError:
+            ValueError:
+        """
+        if key not in self._key_set:
+            raise KeyError("unknown virtual helix property {}".format(key))
+        if len(id_nums) != len(values):
+            raise ValueError("{} id_nums but {} values".format(len(id_nums), len(values)))
+        if key == NEIGHBORS_KEY:
+            neighbors = self._neighbors
+            for id_num, value in zip(id_nums, values):
+                neighbors[id_num] = neighborsFromValue(value)
+        else:
+            self._writableColumn(key, values)[id_nums] = values
+    # end def
+
+    def getNeighbors(self, id_num):
+        """
+        Args:
+            id_num (int): virtual helix ID number
+
+        Returns:
+            ndarray: read only array of :obj:`int` neighbor ID numbers
+        """
+        return self._neighbors[id_num]
+    # end def
+
+    def setNeighbors(self, id_num, neighbors):
+        """
+        Args:
+            id_num (int): virtual helix ID number
+            neighbors (object): iterable of :obj:`int` or :obj:`str` form
+        """
+        self._neighbors[id_num] = neighborsFromValue(neighbors)
+    # end def
+
+    def addNeighbor(self, id_num, neighbor_id):
+        """Insert `neighbor_id` into the neighbors of `id_num` with
+        `bisect.insort_left`
+
+        Args:
+            id_num (int): virtual helix ID number
+            neighbor_id (int): neighbor virtual helix ID number
+        """
+        neighbors = self._neighbors[id_num].tolist()
+        bisect.insort_left(neighbors, neighbor_id)
+        self._neighbors[id_num] = neighborsFromValue(neighbors)
+    # end def
+
+    def removeNeighbor(self, id_num, neighbor_id):
+        """
+        Args:
+            id_num (int): virtual helix ID number
+            neighbor_id (int): neighbor virtual helix ID number
+
+        Raises:
+            ValueError: `neighbor_id` is not a neighbor of `id_num`
+        """
+        neighbors = self._neighbors[id_num].tolist()
+        neighbors.remove(neighbor_id)
+        self._neighbors[id_num] = neighborsFromValue(neighbors)
+    # end def
+
+    def toDict(self, id_nums=None):
+        """Get the properties of several rows in column form.  `neighbors` are
+        returned in their string form
+
+        Args:
+            id_nums (object): optional, :obj:`int` number of leading rows or a
+                :obj:`list` of ID numbers.  Defaults to all rows
+
+        Returns:
+            dict: of :obj:`list` per property key, in row order
+        """
+        if id_nums is None:
+            rows = slice(0, self._size)
+            neighbors = self._neighbors
+        elif isinstance(id_nums, int):
+            rows = slice(0, id_nums)
+            neighbors = self._neighbors[:id_nums]
+        else:
+            rows = list(id_nums)
+            neighbors = [self._neighbors[id_num] for id_num in rows]
+        out = {}
+        for key in self._keys:
+            if key == NEIGHBORS_KEY:
+                out[key] = [str(x.tolist()) for x in neighbors]
+            else:
+                out[key] = self._columns[key][rows].tolist()
+        return out
+    # end def
+# end class
@@ -4,6 +4,7 @@ import random
 from cadnano import getBatch
 from cadnano import preferences as prefs
 from cadnano.cnproxy import UndoCommand
+from cadnano.oligo.oligonode import linkOligos, unlinkOligos
 from cadnano.strand import Strand
 
 class CreateXoverCommand(UndoCommand):
@@ -13,6 +14,9 @@ class CreateXoverCommand(UndoCommand):
     1. preserve the old oligo of strand3p
     2. install the crossover
     3. apply the strand5p oligo to the strand3p
+
+    The strand3p oligo is applied by linking the oligo membership trees, so
+    it costs O(log n) rather than a `Strand.setOligo` per 3' strand
     """
     def __init__(self, part, strand5p, strand5p_idx, strand3p, strand3p_idx, update_oligo=True):
         super(CreateXoverCommand, self).__init__("create xover")
@@ -23,6 +27,7 @@ class CreateXoverCommand(UndoCommand):
         self._strand3p_idx = strand3p_idx
         self._old_oligo3p = strand3p.oligo()
         self._update_oligo = update_oligo
+        self._link = None
     # end def
 
     def redo(self):
@@ -39,7 +44,6 @@ class CreateXoverCommand(UndoCommand):
         doc.removeStrandFromSelection(strand5p)
         doc.removeStrandFromSelection(strand3p)
 
-        fSetOligo = Strand.setOligo
         if self._update_oligo:
             # Test for Loopiness
             if olg5p == strand3p.oligo():
@@ -49,9 +53,8 @@ class CreateXoverCommand(UndoCommand):
                 olg5p._incrementLength(old_olg3p.length(), emit_signals=True)
                 # 2. Remove the old oligo and apply the 5' oligo to the 3' strand
                 old_olg3p.removeFromPart(emit_signals=True)
-                for strand in strand3p.generator3pStrand():
-                    # emits strandHasNewOligoSignal
-                    fSetOligo(strand, olg5p, emit_signals=True)
+                self._link = linkOligos(olg5p, old_olg3p)
+                strand3p.emitHasNewOligo()
 
         # 3. install the Xover
         strand5p.setConnection3p(strand3p)
@@ -96,9 +99,9 @@ class CreateXoverCommand(UndoCommand):
                 olg5p._decrementLength(old_olg3p.length(), emit_signals=True)
                 # 3. apply the old oligo to strand3p
                 old_olg3p.addToPart(part, emit_signals=True)
-                for strand in strand3p.generator3pStrand():
-                    # emits strandHasNewOligoSignal
-                    fSetOligo(strand, old_olg3p, emit_signals=True)
+                unlinkOligos(self._link)
+                self._link = None
+                strand3p.emitHasNewOligo()
 
         if self._update_oligo:
             strand5p.strandUpdateSignal.emit(strand5p)
@@ -114,6 +117,10 @@ class RemoveXoverCommand(UndoCommand):
     2. install the crossover
     3. update the oligo length
     4. apply the new strand3p oligo to the strand3p
+
+    Applying the new oligo walks the 3' strands, and undo gives each of them
+    back the oligo it was assigned before, which leaves the oligo membership
+    trees exactly as they were for undoing earlier crossover commands
     """
     def __init__(self, part, strand5p, strand3p):
         super(RemoveXoverCommand, self).__init__("remove xover")
@@ -126,13 +133,12 @@ class RemoveXoverCommand(UndoCommand):
 
         color_list = prefs.STAP_COLORS
         n_o3p._setColor(random.choice(color_list))
-        n_o3p._setLength(0, emit_signals=True)
-        for strand in strand3p.generator3pStrand():
-            n_o3p._incrementLength(strand.totalLength(), emit_signals=True)
-        # end def
+        n_o3p._setLength(sum(strand.totalLength() for strand in strand3p.generator3pStrand()),
+                         emit_signals=True)
         n_o3p.setStrand5p(strand3p)
 
         self._isLoop = strand3p.oligo().isLoop()
+        self._old_oligos = []
     # end def
 
     def redo(self):
@@ -163,7 +169,9 @@ class RemoveXoverCommand(UndoCommand):
             olg5p._decrementLength(new_olg3p.length(), emit_signals=True)
             # 3. apply the old oligo to strand3p
             new_olg3p.addToPart(part, emit_signals=True)
+            old_oligos = self._old_oligos = []
             for strand in strand3p.generator3pStrand():
+                old_oligos.append((strand, strand._oligo))
                 # emits strandHasNewOligoSignal
                 fSetOligo(strand, new_olg3p, emit_signals=True)
 
@@ -195,9 +203,11 @@ class RemoveXoverCommand(UndoCommand):
             olg5p._incrementLength(new_olg3p.length(), emit_signals=True)
             # 2. Remove the old oligo and apply the 5' oligo to the 3' strand
             new_olg3p.removeFromPart(emit_signals=True)
-            for strand in strand3p.generator3pStrand():
+            for strand, oligo in self._old_oligos:
                 # emits strandHasNewOligoSignal
-                fSetOligo(strand, olg5p, emit_signals=True)
+                fSetOligo(strand, oligo, emit_signals=True)
+            self._old_oligos = []
+            new_olg3p._setStrandsModified()
         # end else
 
         # 3. install the Xover
@@ -2,6 +2,17 @@
 from cadnano.cnproxy import UndoCommand
 from cadnano.decorators.insertion import Insertion
 
+
+def _resizeSequenceBase(strand, idx, old_length, new_length):
+    """Resize the base at `idx` in the :class:`SequenceBuffer` of both
+    StrandSets of the virtual helix of `strand` for an insertion changing
+    length.  Call before the insertions of the helix change
+    """
+    strandset = strand.strandSet()
+    for ss in (strandset, strandset.complementStrandSet()):
+        ss.sequenceBuffer().resizeBase(idx, old_length, new_length)
+# end def
+
 class AddInsertionCommand(UndoCommand):
     def __init__(self, strand, idx, length):
         super(AddInsertionCommand, self).__init__("add insertion")
@@ -19,7 +30,8 @@ class AddInsertionCommand(UndoCommand):
         strand = self._strand
         c_strand = self._comp_strand
         inst = self._insertion
-        self._insertions[self._idx] = inst
+        _resizeSequenceBase(strand, self._idx, 0, inst.length())
+        self._insertions.add(inst)
         strand.oligo()._incrementLength(inst.length(), emit_signals=True)
         strand.strandInsertionAddedSignal.emit(strand, inst)
         if c_strand:
@@ -35,7 +47,8 @@ class AddInsertionCommand(UndoCommand):
         if c_strand:
             c_strand.oligo()._decrementLength(inst.length(), emit_signals=True)
         idx = self._idx
-        del self._insertions[idx]
+        _resizeSequenceBase(strand, idx, inst.length(), 0)
+        self._insertions.remove(idx)
         strand.strandInsertionRemovedSignal.emit(strand, idx)
         if c_strand:
             c_strand.strandInsertionRemovedSignal.emit(c_strand, idx)
@@ -62,7 +75,8 @@ class RemoveInsertionCommand(UndoCommand):
         if c_strand:
             c_strand.oligo()._decrementLength(inst.length(), emit_signals=True)
         idx = self._idx
-        del self._insertions[idx]
+        _resizeSequenceBase(strand, idx, inst.length(), 0)
+        self._insertions.remove(idx)
         strand.strandInsertionRemovedSignal.emit(strand, idx)
         if c_strand:
             c_strand.strandInsertionRemovedSignal.emit(c_strand, idx)
@@ -73,7 +87,8 @@ class RemoveInsertionCommand(UndoCommand):
         c_strand = self._comp_strand
         inst = self._insertion
         strand.oligo()._incrementLength(inst.length(), emit_signals=True)
-        self._insertions[self._idx] = inst
+        _resizeSequenceBase(strand, self._idx, 0, inst.length())
+        self._insertions.add(inst)
         strand.strandInsertionAddedSignal.emit(strand, inst)
         if c_strand:
             c_strand.oligo()._incrementLength(inst.length(), emit_signals=True)
@@ -103,7 +118,8 @@ class ChangeInsertionCommand(UndoCommand):
         strand = self._strand
         c_strand = self._comp_strand
         inst = self._insertions[self._idx]
-        inst.setLength(self._new_length, emit_signals=True)
+        _resizeSequenceBase(strand, self._idx, self._old_length, self._new_length)
+        self._insertions.setLength(self._idx, self._new_length)
         strand.oligo()._incrementLength(self._new_length - self._old_length,
                                         emit_signals=True)
         strand.strandInsertionChangedSignal.emit(strand, inst)
@@ -118,7 +134,8 @@ class ChangeInsertionCommand(UndoCommand):
         strand = self._strand
         c_strand = self._comp_strand
         inst = self._insertions[self._idx]
-        inst.setLength(self._old_length)
+        _resizeSequenceBase(strand, self._idx, self._new_length, self._old_length)
+        self._insertions.setLength(self._idx, self._old_length)
         strand.oligo()._decrementLength(self._new_length - self._old_length,
                                         emit_signals=True)
         strand.strandInsertionChangedSignal.emit(strand, inst)
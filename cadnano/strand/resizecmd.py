@@ -10,17 +10,14 @@ class ResizeCommand(UndoCommand):
         # an increase in length leads to positive delta
         self.delta = (new_idxs[1] - new_idxs[0]) - (o_i[1] - o_i[0])
         # now handle insertion deltas
-        oldInsertions = strand.insertionsOnStrand(*o_i)
-        newInsertions = strand.insertionsOnStrand(*new_idxs)
-        o_l = 0
-        for i in oldInsertions:
-            o_l += i.length()
-        n_l = 0
-        for i in newInsertions:
-            n_l += i.length()
+        o_l = strand.insertionLengthBetweenIdxs(*o_i)
+        n_l = strand.insertionLengthBetweenIdxs(*new_idxs)
         self.delta += (n_l - o_l)
 
         self.update_segments = update_segments
+        # bases of the strand in its SequenceBuffer before the resize, as
+        # the resize blanks those it drops
+        self._old_bases = None
         # the strand sequence will need to be regenerated from scratch
         # as there are no guarantees about the entirety of the strand moving
         # thanks to multiple selections
@@ -34,10 +31,14 @@ class ResizeCommand(UndoCommand):
         part = strandset.part()
 
         std.oligo()._incrementLength(self.delta, emit_signals=True)
+        old_span = std.sequenceSpan()
+        old_bases = std._sequenceBases()
+        self._old_bases = None if old_bases is None else old_bases.copy()
         std.setIdxs(n_i)
         strandset._updateStrandIdxs(std, o_i, n_i)
+        std._blankResizedSequence(old_span)
         if self.update_segments:
-            part.refreshSegments(strandset.idNum())
+            part.updateSegments(strandset.idNum())
 
         std.strandResizedSignal.emit(std, n_i)
         # for updating the Slice View displayed helices
@@ -55,10 +56,14 @@ class ResizeCommand(UndoCommand):
         part = strandset.part()
 
         std.oligo()._decrementLength(self.delta, emit_signals=True)
+        new_span = std.sequenceSpan()
         std.setIdxs(o_i)
         strandset._updateStrandIdxs(std, n_i, o_i)
+        std._blankResizedSequence(new_span)
+        if self._old_bases is not None:
+            strandset.sequenceBuffer().set(std.sequenceSpan()[0], self._old_bases)
         if self.update_segments:
-            part.refreshSegments(strandset.idNum())
+            part.updateSegments(strandset.idNum())
 
         std.strandResizedSignal.emit(std, o_i)
         # for updating the Slice View displayed helices
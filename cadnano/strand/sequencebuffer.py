@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""Storage of the sequences of the strands of a :class:`StrandSet`.
+
+A :class:`SequenceBuffer` holds the bases of every strand of a StrandSet in
+one `uint8` array, one byte per base, laid out from low to high base index.
+Base `idx` starts at `idx` plus the summed length of the insertions and skips
+at lower indices of the virtual helix, so an insertion widens its base and a
+skip makes it empty, see :meth:`SequenceBuffer.span`.  Both StrandSets of a
+helix share that layout, so the complement of a stretch of one buffer is a
+:data:`COMPLEMENT` table lookup of the same slice of the other, with no
+reversal or string conversion.
+
+Bytes that no strand with a sequence covers are blanks (spaces).
+"""
+import numpy as np
+
+BLANK = ord(' ')
+
+COMPLEMENT = np.arange(256, dtype=np.uint8)
+"""uint8 translation table of :data:`cadnano.util.complement`"""
+COMPLEMENT[np.frombuffer(b'ACGTacgt', dtype=np.uint8)] = \
+    np.frombuffer(b'TGCATGCA', dtype=np.uint8)
+
+
+def encodeSequence(sequence):
+    """
+    Args:
+        sequence (str):
+
+    Returns:
+        ndarray: `uint8` bases of `sequence`, characters outside of latin-1
+        are replaced with '?'
+    """
+    return np.frombuffer(sequence.encode('latin-1', 'replace'), dtype=np.uint8)
+# end def
+
+
+def decodeSequence(bases):
+    """
+    Args:
+        bases (ndarray): `uint8` bases
+
+    Returns:
+        str:
+    """
+    return bases.tobytes().decode('latin-1')
+# end def
+
+
+class SequenceBuffer(object):
+    """Bases of the strands of one StrandSet
+
+    Args:
+        insertions (InsertionIndex): insertions and skips of the virtual helix
+    """
+    def __init__(self, insertions):
+        self._insertions = insertions
+        self._bases = np.empty(0, dtype=np.uint8)
+    # end def
+
+    def span(self, idx_low, idx_high):
+        """
+        Args:
+            idx_low (int): low base index, inclusive
+            idx_high (int): high base index, inclusive
+
+        Returns:
+            tuple: (start, end) of the bases of the range in the buffer
+        """
+        insertions = self._insertions
+        if not insertions:
+            return idx_low, idx_high + 1
+        return (idx_low + insertions.prefixLength(idx_low - 1),
+                idx_high + 1 + insertions.prefixLength(idx_high))
+    # end def
+
+    def get(self, start, end):
+        """
+        Args:
+            start (int): buffer position, inclusive
+            end (int): buffer position, exclusive
+
+        Returns:
+            ndarray: `uint8` bases of the span from low to high index, a view
+            into the buffer unless the span runs past the written bases
+        """
+        bases = self._bases
+        if end <= len(bases):
+            return bases[start:end]
+        out = np.full(end - start, BLANK, dtype=np.uint8)
+        if start < len(bases):
+            out[:len(bases) - start] = bases[start:]
+        return out
+    # end def
+
+    def set(self, start, bases):
+        """Write `uint8` bases, from low to high index, at `start`
+
+        Args:
+            start (int): buffer position
+            bases (ndarray):
+        """
+        end = start + len(bases)
+        if end > len(self._bases):
+            self._reserve(end)
+        self._bases[start:end] = bases
+    # end def
+
+    def fill(self, start, end):
+        """Blank the bases of a span
+
+        Args:
+            start (int): buffer position, inclusive
+            end (int): buffer position, exclusive
+        """
+        if end > len(self._bases):
+            self._reserve(end)
+        self._bases[start:end] = BLANK
+    # end def
+
+    def resizeBase(self, idx, old_length, new_length):
+        """Add or drop the bases of an insertion or skip at base index `idx`
+        changing length, shifting the bases at higher indices.  Added bases
+        are blanks.  Call before the insertions of the helix change
+
+        Args:
+            idx (int): base index
+            old_length (int): 0 for none, -1 for a skip
+            new_length (int): 0 for none, -1 for a skip
+        """
+        start = self.span(idx, idx)[0]
+        if start >= len(self._bases):
+            return
+        end = start + 1 + old_length
+        if end > len(self._bases):
+            self._reserve(end)
+        bases = self._bases
+        delta = new_length - old_length
+        if delta > 0:
+            self._bases = np.insert(bases, end, np.full(delta, BLANK, dtype=np.uint8))
+        elif delta < 0:
+            self._bases = np.delete(bases, np.s_[end + delta:end])
+    # end def
+
+    def _reserve(self, size):
+        bases = self._bases
+        new_bases = np.full(max(size, 2*len(bases), 64), BLANK, dtype=np.uint8)
+        new_bases[:len(bases)] = bases
+        self._bases = new_bases
+    # end def
+# end class
@@ -1,17 +1,19 @@
 # -*- coding: utf-8 -*-
-from array import array
 from operator import attrgetter
+
+import numpy as np
+
 from cadnano import util
 from cadnano.cnobject import CNObject
-from cadnano.cnproxy import ProxySignal
+from cadnano.cnproxy import ProxySignal, hasReceivers
 from .insertioncmd import AddInsertionCommand, RemoveInsertionCommand
 from .insertioncmd import ChangeInsertionCommand
 from .modscmd import AddModsCommand, RemoveModsCommand
 from .resizecmd import ResizeCommand
+from .sequencebuffer import BLANK, COMPLEMENT, encodeSequence, decodeSequence
 
-sixb = lambda x: x.encode('utf-8')
-ARRAY_TYPE = 'B'
-tostring = lambda x: x.tobytes().decode('utf-8')
+# `_sequence` of a strand whose bases are in the SequenceBuffer of its StrandSet
+IN_BUFFER = True
 
 class Strand(CNObject):
     """A Strand is a continuous stretch of bases that are all in the same
@@ -28,8 +30,10 @@ class Strand(CNObject):
     connected strands are named "_strand5p" and "_strand3p", which correspond
     to the 5' and 3' phosphate linkages in the physical DNA strand,
     respectively. Since Strands can point 5'-to-3' in either the low-to-high
-    or high-to-low directions, connection accessor methods (connectionLow and
-    connectionHigh) are bound during the init for convenience.
+    or high-to-low directions, a Strand is created as a :class:`ForwardStrand`
+    or a :class:`ReverseStrand` per the direction of its StrandSet, which map
+    the connection accessor methods (connectionLow and connectionHigh) and
+    the 5' and 3' indices to the low and high ones at the class level.
 
     Args:
         strandset (StrandSet):
@@ -38,15 +42,23 @@ class Strand(CNObject):
         oligo (cadnano.oligo.Oligo): optional, defaults to None.
 
     """
+    __slots__ = ('_document', '_strandset', '_id_num',
+                 '_base_idx_low', '_base_idx_high', '_oligo',
+                 '_strand5p', '_strand3p', '_sequence',
+                 'segments', '_abstract_seq')
+
+    def __new__(cls, strandset, *args, **kwargs):
+        if cls is Strand:
+            cls = ForwardStrand if strandset.isForward() else ReverseStrand
+        return super(Strand, cls).__new__(cls)
+    # end def
+
     def __init__(self, strandset, base_idx_low, base_idx_high, oligo=None):
         self._document = strandset.document()
         super(Strand, self).__init__(strandset)
         self._strandset = strandset
         self._id_num = strandset.idNum()
 
-        """Keep track of its own segments.  Updated on creation and resizing
-        """
-
         self._base_idx_low = base_idx_low  # base index of the strand's left bound
         self._base_idx_high = base_idx_high  # base index of the right bound
         self._oligo = oligo
@@ -54,27 +66,10 @@ class Strand(CNObject):
         self._strand3p = None  # 3' connection to another strand
         self._sequence = None
 
+        # Keep track of its own segments.  Updated on creation and resizing
         self.segments = []
-        self.abstract_sequence = []
-
-        # dynamic methods for mapping high/low connection /indices
-        # to corresponding 3Prime 5Prime
-        is_forward = strandset.isForward()
-        if is_forward:
-            self.idx5Prime = self.lowIdx
-            self.idx3Prime = self.highIdx
-            self.connectionLow = self.connection5p
-            self.connectionHigh = self.connection3p
-            self.setConnectionLow = self.setConnection5p
-            self.setConnectionHigh = self.setConnection3p
-        else:
-            self.idx5Prime = self.highIdx
-            self.idx3Prime = self.lowIdx
-            self.connectionLow = self.connection3p
-            self.connectionHigh = self.connection5p
-            self.setConnectionLow = self.setConnection3p
-            self.setConnectionHigh = self.setConnection5p
-        self._is_forward = is_forward
+        # abstract base numbers 5' to 3', a view of the numbers of the part
+        self._abstract_seq = None
     # end def
 
     def __repr__(self):
@@ -178,16 +173,31 @@ class Strand(CNObject):
         return self._document
     # end def
 
+    def undoStack(self):
+        return self._strandset.undoStack()
+    # end def
+
     def oligo(self):
-        return self._oligo
+        """
+        Returns:
+            Oligo: the oligo at the root of the membership tree of the oligo
+            this strand was last assigned with `setOligo`
+        """
+        oligo = self._oligo
+        if oligo is None:
+            return None
+        node = oligo._node
+        while node.parent is not None:
+            node = node.parent
+        return node.oligo
     # end def
 
     def getColor(self):
-        return self._oligo.getColor()
+        return self.oligo().getColor()
     # end def
 
     def sequence(self, for_export=False):
-        seq = self._sequence
+        seq = self._sequenceString()
         if seq:
             return util.markwhite(seq) if for_export else seq
         elif for_export:
@@ -195,8 +205,29 @@ class Strand(CNObject):
         return ''
     # end def
 
+    @property
+    def abstract_sequence(self):
+        """
+        Returns:
+            list: of :obj:`int` abstract base numbers from 5' to 3', empty if
+            none were set with `setAbstractSequence`
+        """
+        return self.abstractSequenceArray().tolist()
+    # end def
+
+    def abstractSequenceArray(self):
+        """
+        Returns:
+            ndarray: `int32` abstract base numbers from 5' to 3'
+        """
+        abstract_seq = self._abstract_seq
+        if abstract_seq is None:
+            return np.empty(0, dtype=np.int32)
+        return abstract_seq
+    # end def
+
     def abstractSeq(self):
-        return ','.join([str(i) for i in self.abstract_sequence])
+        return ','.join(map(str, self.abstractSequenceArray().tolist()))
 
     def strandSet(self):
         return self._strandset
@@ -221,14 +252,14 @@ class Strand(CNObject):
                 (used, unused)
         """
         if sequence_string is None:
-            self._sequence = None
+            self._setSequenceBases(None)
             return None, None
         length = self.totalLength()
         if len(sequence_string) < length:
             bonus = length - len(sequence_string)
             sequence_string += ''.join([' ' for x in range(bonus)])
         temp = sequence_string[0:length]
-        self._sequence = temp
+        self._setSequenceBases(encodeSequence(temp))
         return temp, sequence_string[length:]
     # end def
 
@@ -241,13 +272,11 @@ class Strand(CNObject):
         # as there are no guarantees about the entirety of the strand moving
         # i.e. both endpoints thanks to multiple selections so just redo the
         # whole thing
-        self._sequence = None
+        self._setSequenceBases(None)
 
         for comp_strand in comp_ss.getOverlappingStrands(self._base_idx_low,
                                                          self._base_idx_high):
-            comp_seq = comp_strand.sequence()
-            used_seq = util.comp(comp_seq) if comp_seq else None
-            used_seq = self.setComplementSequence(used_seq, comp_strand)
+            self.setComplementBases(comp_strand)
         # end for
     # end def
 
@@ -263,105 +292,220 @@ class Strand(CNObject):
         """This version takes anothers strand and only sets the indices that
         align with the given complimentary strand.
 
-        As it depends which direction this is going, and strings are stored in
-        memory left to right, we need to test for is_forward to map the
-        reverse compliment appropriately, as we traverse overlapping strands.
+        `sequence_string` runs 5' to 3' along `strand`, so against the
+        direction of this strand, and is reversed to the low to high index
+        order of the :class:`SequenceBuffer` when this strand is forward.
+        `setComplementBases` derives the complement from the bases of `strand`
+        directly instead
 
-        We reverse the sequence ahead of time if we are applying it 5' to 3',
-        otherwise we reverse the sequence post parsing if it's 3' to 5'
+        Args:
+            sequence_string (str): the complement of the sequence of `strand`
+                or None to blank the bases
+            strand (Strand):
+
+        Returns:
+            str: the sequence of this strand
+        """
+        start, end = self._overlapSpan(strand)
+        if sequence_string is None:
+            bases = None
+        else:
+            bases = encodeSequence(sequence_string)
+            if self._is_forward:
+                bases = bases[::-1]
+            strand_start = strand.sequenceSpan()[0]
+            bases = bases[start - strand_start:end - strand_start]
+        self._setOverlapBases(start, end, bases)
+        return self._sequenceString()
+    # end def
 
-        Again, sequences are stored as strings in memory 5' to 3' so we need
-        to jump through these hoops to iterate 5' to 3' through them correctly
+    def setComplementBases(self, strand):
+        """Set the bases of this strand paired with `strand` to the complement
+        of its bases, or blank them if it has no sequence.  A vectorized
+        lookup of the same span of the buffers of both StrandSets
 
-        Perhaps it's wiser to merely store them left to right and reverse them
-        at draw time, or export time
+        Args:
+            strand (Strand): a strand of the complement StrandSet
+        """
+        start, end = self._overlapSpan(strand)
+        seq = strand._sequence
+        if seq is IN_BUFFER:
+            bases = COMPLEMENT[strand._strandset.sequenceBuffer().get(start, end)]
+        elif seq is None:
+            bases = None
+        else:
+            strand_start = strand.sequenceSpan()[0]
+            bases = COMPLEMENT[strand._sequenceBases()[start - strand_start:end - strand_start]]
+        self._setOverlapBases(start, end, bases)
+    # end def
 
+    def _overlapSpan(self, strand):
+        """
         Args:
-            sequence_string (str):
-            strand (Strand):
+            strand (Strand): an overlapping strand of the complement StrandSet
 
         Returns:
-            str: the used portion of the sequence_string
+            tuple: (start, end) of the bases of the overlap in the
+            :class:`SequenceBuffer`
         """
-        s_low_idx, s_high_idx = self._base_idx_low, self._base_idx_high
-        c_low_idx, c_high_idx = strand.idxs()
-        is_forward = self._is_forward
-        self_seq = self._sequence
-        # get the ovelap
-        low_idx, high_idx = util.overlap(s_low_idx, s_high_idx, c_low_idx, c_high_idx)
-
-        # only get the characters we're using, while we're at it, make it the
-        # reverse compliment
+        low_idx, high_idx = util.overlap(self._base_idx_low, self._base_idx_high,
+                                         *strand.idxs())
+        return self._strandset.sequenceBuffer().span(low_idx, high_idx)
+    # end def
 
-        total_length = self.totalLength()
+    def _setOverlapBases(self, start, end, bases):
+        """Set the bases of this strand in a span overlapping a strand of the
+        complement StrandSet.  A strand without a sequence gets one of blanks
+        first, as its bases outside of the overlap are unknown
 
-        # see if we are applying
-        if sequence_string is None:
-            # clear out string for in case of not total overlap
-            use_seq = ''.join([' ' for x in range(total_length)])
-        else:  # use the string as is
-            use_seq = sequence_string[::-1] if is_forward else sequence_string
-
-        temp = array(ARRAY_TYPE, sixb(use_seq))
-        if self_seq is None:
-            temp_self = array(ARRAY_TYPE, sixb(''.join([' ' for x in range(total_length)])))
+        Args:
+            start (int): buffer position, inclusive
+            end (int): buffer position, exclusive
+            bases (ndarray): `uint8` bases of the span from low to high index,
+                or None to blank it
+        """
+        if self._sequence is None and bases is not None and \
+                self._strandset.isStrandInSet(self):
+            self._strandset.sequenceBuffer().fill(*self.sequenceSpan())
+            self._sequence = IN_BUFFER
+        if self._sequence is IN_BUFFER:
+            buffer = self._strandset.sequenceBuffer()
+            if bases is None:
+                buffer.fill(start, end)
+            else:
+                buffer.set(start, bases)
+            self._setModified(helix=False)
         else:
-            temp_self = array(ARRAY_TYPE, sixb(self_seq) if is_forward else sixb(self_seq[::-1]))
-
-        # generate the index into the compliment string
-        a = self.insertionLengthBetweenIdxs(s_low_idx, low_idx - 1)
-        b = self.insertionLengthBetweenIdxs(low_idx, high_idx)
-        c = strand.insertionLengthBetweenIdxs(c_low_idx, low_idx - 1)
-        start = low_idx - c_low_idx + c
-        end = start + b + high_idx - low_idx + 1
-        temp_self[low_idx - s_low_idx + a:high_idx - s_low_idx + 1 + a + b] = temp[start:end]
-        # print("old sequence", self_seq)
-        self._sequence = tostring(temp_self)
-
-        # if we need to reverse it do it now
-        if not is_forward:
-            self._sequence = self._sequence[::-1]
+            self_start, self_end = self.sequenceSpan()
+            self_bases = self._sequenceBases()
+            if self_bases is None:
+                self_bases = np.full(self_end - self_start, BLANK, dtype=np.uint8)
+            else:
+                self_bases = self_bases.copy()
+            self_bases[start - self_start:end - self_start] = BLANK if bases is None else bases
+            self._setSequenceBases(self_bases if self._is_forward else self_bases[::-1])
+    # end def
+
+    def sequenceSpan(self):
+        """
+        Returns:
+            tuple: (start, end) of the bases of this strand in the
+            :class:`SequenceBuffer` of its StrandSet
+        """
+        return self._strandset.sequenceBuffer().span(self._base_idx_low,
+                                                     self._base_idx_high)
+    # end def
+
+    def _sequenceBases(self):
+        """
+        Returns:
+            ndarray: `uint8` bases of this strand from low to high index or
+            None if it has no sequence
+        """
+        seq = self._sequence
+        if seq is IN_BUFFER:
+            return self._strandset.sequenceBuffer().get(*self.sequenceSpan())
+        elif seq is None:
+            return None
+        return encodeSequence(seq if self._is_forward else seq[::-1])
+    # end def
 
-        # test to see if the string is empty(), annoyingly expensive
-        # if len(self._sequence.strip()) == 0:
-        if not self._sequence:
+    def _sequenceString(self):
+        """
+        Returns:
+            str: the sequence of this strand 5' to 3' or None
+        """
+        seq = self._sequence
+        if seq is IN_BUFFER:
+            seq = decodeSequence(self._strandset.sequenceBuffer().get(*self.sequenceSpan()))
+            if not self._is_forward:
+                seq = seq[::-1]
+        return seq
+    # end def
+
+    def _setSequenceBases(self, bases):
+        """Set the sequence of this strand, into the :class:`SequenceBuffer`
+        of its StrandSet if it is in it
+
+        Args:
+            bases (ndarray): `uint8` bases 5' to 3' of the total length of
+                this strand, or None to clear the sequence
+        """
+        if bases is None:
+            if self._sequence is IN_BUFFER:
+                self._strandset.sequenceBuffer().fill(*self.sequenceSpan())
             self._sequence = None
+        elif self._strandset.isStrandInSet(self):
+            start = self.sequenceSpan()[0]
+            self._strandset.sequenceBuffer().set(start, bases if self._is_forward else bases[::-1])
+            self._sequence = IN_BUFFER
+        else:
+            self._sequence = decodeSequence(bases)
+        self._setModified(helix=False)
+    # end def
 
-        # print("new sequence", self._sequence)
-        return self._sequence
+    def _moveSequenceToBuffer(self):
+        """Move the sequence of this strand into the :class:`SequenceBuffer`
+        of its StrandSet, once it was added to it
+        """
+        seq = self._sequence
+        if seq is not None and seq is not IN_BUFFER:
+            bases = encodeSequence(seq)
+            start = self.sequenceSpan()[0]
+            self._strandset.sequenceBuffer().set(start, bases if self._is_forward else bases[::-1])
+            self._sequence = IN_BUFFER
     # end def
 
-    def clearAbstractSequence(self):
-        self.abstract_sequence = []
+    def _moveSequenceFromBuffer(self):
+        """Keep the sequence of this strand with it, and blank its bases in
+        the :class:`SequenceBuffer`, as it is removed from its StrandSet
+        """
+        if self._sequence is IN_BUFFER:
+            self._sequence = self._sequenceString()
+            self._strandset.sequenceBuffer().fill(*self.sequenceSpan())
     # end def
 
-    def applyAbstractSequence(self):
-        """Assigns virtual index from 5' to 3' on strand and it's complement
-        location.
+    def _blankResizedSequence(self, old_span):
+        """Blank the bases of the :class:`SequenceBuffer` this strand gave
+        up or newly covers after its indices changed, so that no stale bases
+        of other strands become part of it
+
+        Args:
+            old_span (tuple): (start, end) of the bases of this strand before
+                the indices changed, see `sequenceSpan`
         """
-        abstract_seq = []
-        part = self.part()
-        segment_dict = part.segment_dict[self._id_num]
+        buffer = self._strandset.sequenceBuffer()
+        old_start, old_end = old_span
+        start, end = self.sequenceSpan()
+        if max(start, old_start) < min(end, old_end):
+            # the spans overlap, blank their differences at both ends
+            spans = (sorted((start, old_start)), sorted((end, old_end)))
+        else:
+            spans = (old_span, (start, end))
+        for fill_start, fill_end in spans:
+            if fill_start < fill_end:
+                buffer.fill(fill_start, fill_end)
+    # end def
 
-        # make sure we apply numbers from 5' to 3'
-        strand_order = 1 if self._is_forward else -1
+    def clearAbstractSequence(self):
+        self._abstract_seq = None
+    # end def
 
-        for segment in self.segments[::strand_order]:
-            if segment in segment_dict:
-                seg_id, offset, length = segment_dict[segment]
-            else:
-                seg_id, offset, length = part.getNewAbstractSegmentId(segment)
-                segment_dict[segment] = (seg_id, offset, length)
+    def setAbstractSequence(self, abstract_seq):
+        """Set the abstract base numbers of this strand, assigned by
+        :meth:`NucleicAcidPart.setAbstractSequences`
 
-            for i in range(length)[::strand_order]:
-                abstract_seq.append(offset + i)
-        self.abstract_sequence = abstract_seq
+        Args:
+            abstract_seq (ndarray): `int32` numbers from 5' to 3'
+        """
+        self._abstract_seq = abstract_seq
     # end def
 
     def copyAbstractSequenceToSequence(self):
-        abstract_seq = self.abstract_sequence
+        # every base, insertions included, is shown as '|'
+        length = 0 if self._abstract_seq is None else self.totalLength()
         # self._sequence = ''.join([ascii_letters[i % 52] for i in abstract_seq])
-        self._sequence = ''.join(['|' for i in abstract_seq])
+        self._setSequenceBases(np.full(length, ord('|'), dtype=np.uint8))
     # end def
 
     ### PUBLIC METHODS FOR QUERYING THE MODEL ###
@@ -387,17 +531,15 @@ class Strand(CNObject):
 
     def idx3Prime(self):
         """Returns the absolute base_idx of the 3' end of the strand.
-        overloaded in __init__
+        overridden by :class:`ForwardStrand` and :class:`ReverseStrand`
         """
-        pass
-        # return self.idx3Prime
+        raise NotImplementedError
 
     def idx5Prime(self):
         """Returns the absolute base_idx of the 5' end of the strand.
-        overloaded in __init__
+        overridden by :class:`ForwardStrand` and :class:`ReverseStrand`
         """
-        pass
-        # return self.idx5Prime
+        raise NotImplementedError
 
     def dump5p(self):
         return self._id_num, self._is_forward, self.idx5Prime()
@@ -408,13 +550,12 @@ class Strand(CNObject):
         inserts as a tuple with the index of the insertion
         [(idx, (strandItemString, insertionItemString), ...]
 
-        This takes advantage of the fact the python iterates a dictionary
-        by keys in order so if keys are indices, the insertions will iterate
-        out from low index to high index
+        This takes advantage of `insertionsOnStrand` returning the
+        insertions from low index to high index
         """
         seqList = []
         is_forward = self._is_forward
-        seq = self._sequence if is_forward else self._sequence[::-1]
+        seq = decodeSequence(self._sequenceBases())
         # assumes a sequence has been applied correctly and is up to date
         tL = self.totalLength()
 
@@ -566,28 +707,18 @@ class Strand(CNObject):
     def insertionLengthBetweenIdxs(self, idxL, idxH):
         """includes the length of insertions in addition to the bases
         """
-        tL = 0
-        insertions = self.insertionsOnStrand(idxL, idxH)
-        for insertion in insertions:
-            tL += insertion.length()
-        return tL
+        return self.part().insertions()[self._id_num].lengthBetween(idxL, idxH)
     # end def
 
     def insertionsOnStrand(self, idxL=None, idxH=None):
         """if passed indices it will use those as a bounds
+
+        Returns:
+            list: of :class:`Insertion` sorted by index
         """
-        insertions = []
-        insertionsDict = self.part().insertions()[self._id_num]
-        sortedIndices = sorted(insertionsDict.keys())
         if idxL is None:
             idxL, idxH = self.idxs()
-        for index in sortedIndices:
-            insertion = insertionsDict[index]
-            if idxL <= insertion.idx() <= idxH:
-                insertions.append(insertion)
-            # end if
-        # end for
-        return insertions
+        return self.part().insertions()[self._id_num].between(idxL, idxH)
     # end def
 
     def modifersOnStrand(self):
@@ -614,12 +745,7 @@ class Strand(CNObject):
     def totalLength(self):
         """includes the length of insertions in addition to the bases
         """
-        tL = 0
-        insertions = self.insertionsOnStrand()
-
-        for insertion in insertions:
-            tL += insertion.length()
-        return tL + self.length()
+        return self.insertionLengthBetweenIdxs(*self.idxs()) + self.length()
     # end def
 
     ### PUBLIC METHODS FOR EDITING THE MODEL ###
@@ -675,9 +801,7 @@ class Strand(CNObject):
                 if length < 0:
                     length = -1
                 if use_undostack:   # on import no need to blank sequences
-                    cmds.append(self.oligo().applySequenceCMD(None))
-                    for strand in self.getComplementStrands():
-                        cmds.append(strand.oligo().applySequenceCMD(None))
+                    cmds += self._blankSequenceCommands()
                 cmds.append(AddInsertionCommand(self, idx, length))
                 util.execCommandList(self, cmds, desc="Add Insertion",
                                      use_undostack=use_undostack)
@@ -702,9 +826,7 @@ class Strand(CNObject):
                     # make sure length is -1 if a skip
                     if length < 0:
                         length = -1
-                    cmds.append(self.oligo().applySequenceCMD(None))
-                    for strand in self.getComplementStrands():
-                        cmds.append(strand.oligo().applySequenceCMD(None))
+                    cmds += self._blankSequenceCommands()
                     cmds.append(ChangeInsertionCommand(self, idx, length))
                     util.execCommandList(self, cmds, desc="Change Insertion",
                                          use_undostack=use_undostack)
@@ -723,9 +845,7 @@ class Strand(CNObject):
         if idx_low <= idx <= idx_high:
             if self.hasInsertionAt(idx):
                 if use_undostack:
-                    cmds.append(self.oligo().applySequenceCMD(None))
-                    for strand in self.getComplementStrands():
-                        cmds.append(strand.oligo().applySequenceCMD(None))
+                    cmds += self._blankSequenceCommands()
                 cmds.append(RemoveInsertionCommand(self, idx))
                 util.execCommandList(self, cmds, desc="Remove Insertion",
                                      use_undostack=use_undostack)
@@ -733,6 +853,23 @@ class Strand(CNObject):
         # end if
     # end def
 
+    def _blankSequenceCommands(self):
+        """Commands blanking the sequences of the oligos of this strand and
+        of its complement strands, which an insertion change invalidates.
+        In a :meth:`NucleicAcidPart.transaction` the strands are recorded
+        instead and each oligo is blanked once when it commits
+
+        Returns:
+            list: of :class:`ApplySequenceCommand`
+        """
+        strands = [self] + self.getComplementStrands()
+        transaction = self.part().activeTransaction()
+        if transaction is not None:
+            transaction.blankSequences(strands)
+            return []
+        return [strand.oligo().applySequenceCMD(None) for strand in strands]
+    # end def
+
     def destroy(self):
         self.setParent(None)
         self.deleteLater()  # QObject also emits a destroyed() Signal
@@ -769,25 +906,58 @@ class Strand(CNObject):
                              use_undostack=use_undostack)
     # end def
 
+    def _setModified(self, helix=True):
+        """Stamp the oligo and virtual helix of this strand as changed, see
+        :meth:`NucleicAcidPart.setVirtualHelixModified`
+
+        Args:
+            helix (bool): optional, False for changes like the sequence that
+                are only stored with the oligo
+        """
+        if helix:
+            self.part().setVirtualHelixModified(self._id_num)
+        oligo = self.oligo()
+        if oligo is not None:
+            oligo._setModified()
+    # end def
+
     def setConnection3p(self, strand):
         self._strand3p = strand
+        self._setModified()
     # end def
 
     def setConnection5p(self, strand):
         self._strand5p = strand
+        self._setModified()
     # end def
 
     def setIdxs(self, idxs):
         self._base_idx_low = idxs[0]
         self._base_idx_high = idxs[1]
+        self._setModified()
+        # crossovers into this strand are encoded with its 5' index
+        if self._strand5p is not None:
+            self._strand5p._setModified()
     # end def
 
     def setOligo(self, new_oligo, emit_signals=False):
         self._oligo = new_oligo
+        self._setModified()
         if emit_signals:
             self.strandHasNewOligoSignal.emit(self)
     # end def
 
+    def emitHasNewOligo(self):
+        """Emit `strandHasNewOligoSignal` for this strand and every strand
+        3' of it, after their oligo changed through
+        :func:`cadnano.oligo.oligonode.linkOligos` rather than `setOligo`.
+        Skips the walk when nothing is connected to the signal
+        """
+        if hasReceivers(Strand.strandHasNewOligoSignal):
+            for strand in self.generator3pStrand():
+                strand.strandHasNewOligoSignal.emit(strand)
+    # end def
+
     def split(self, idx, update_sequence=True):
         """Called by view items to split this strand at idx."""
         self._strandset.splitStrand(self, idx, update_sequence)
@@ -881,7 +1051,39 @@ class Strand(CNObject):
         """
         new_s = Strand(strandset, *self.idxs())
         new_s._oligo = oligo
-        new_s._sequence = self._sequence
+        new_s._sequence = self._sequenceString()
         return new_s
     # end def
 # end class
+
+
+class ForwardStrand(Strand):
+    """A :class:`Strand` of a forward StrandSet, running 5' to 3' from its
+    low to its high index
+    """
+    __slots__ = ()
+    _is_forward = True
+
+    idx5Prime = Strand.lowIdx
+    idx3Prime = Strand.highIdx
+    connectionLow = Strand.connection5p
+    connectionHigh = Strand.connection3p
+    setConnectionLow = Strand.setConnection5p
+    setConnectionHigh = Strand.setConnection3p
+# end class
+
+
+class ReverseStrand(Strand):
+    """A :class:`Strand` of a reverse StrandSet, running 5' to 3' from its
+    high to its low index
+    """
+    __slots__ = ()
+    _is_forward = False
+
+    idx5Prime = Strand.highIdx
+    idx3Prime = Strand.lowIdx
+    connectionLow = Strand.connection3p
+    connectionHigh = Strand.connection5p
+    setConnectionLow = Strand.setConnection3p
+    setConnectionHigh = Strand.setConnection5p
+# end class
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+from cadnano.cnproxy import UndoCommand
+from cadnano.oligo import Oligo
+from cadnano.strand import Strand
+
+class LoadStrandsCommand(UndoCommand):
+    """Add many `Strand` at once to a strandset, each with a new placeholder
+    `Oligo`, as read in from a file or pasted.
+
+    Unlike a `CreateStrandCommand` per strand the strands are merged into the
+    strandset in one pass and the views get a single
+    `strandsetStrandsAddedSignal`.  Without `emit_oligo_signals` the
+    placeholder oligos are added to the part silently, for callers that
+    rebuild the oligos once the crossovers are in, e.g. with a
+    `RefreshOligosCommand`, and then announce the oligos that are left
+    """
+    def __init__(self, strandset, index_pairs, colors,
+                 update_segments=True, emit_oligo_signals=True):
+        """
+        Args:
+            strandset (StrandSet):
+            index_pairs (list): of (low, high) :obj:`int` sorted by low index
+                and not overlapping each other or the strands in `strandset`
+            colors (list): of :obj:`str` color per pair
+            update_segments (:obj:`bool`, optional): default=True
+            emit_oligo_signals (:obj:`bool`, optional): default=True
+        """
+        super(LoadStrandsCommand, self).__init__("load strands")
+        self._strandset = strandset
+        insertions = strandset.part().insertions()[strandset.idNum()]
+        self._strands = [Strand(strandset, low_idx, high_idx)
+                         for low_idx, high_idx in index_pairs]
+        self._new_oligos = [Oligo(None, color, length=high_idx - low_idx + 1 +
+                                  insertions.lengthBetween(low_idx, high_idx))
+                            for (low_idx, high_idx), color in zip(index_pairs, colors)]
+        self.update_segments = update_segments
+        self.emit_oligo_signals = emit_oligo_signals
+    # end def
+
+    def strands(self):
+        return self._strands
+    # end def
+
+    def redo(self):
+        strandset = self._strandset
+        part = strandset.part()
+        strands = self._strands
+        strandset._addStrandsToList(strands, self.update_segments)
+        emit_signals = self.emit_oligo_signals
+        for strand, oligo in zip(strands, self._new_oligos):
+            oligo.setStrand5p(strand)
+            # the helix is already stamped as modified
+            strand._oligo = oligo
+            oligo.addToPart(part, emit_signals=emit_signals)
+        strandset.strandsetStrandsAddedSignal.emit(strandset, list(strands))
+        # for updating the Slice View displayed helices
+        part.partStrandChangedSignal.emit(part, strandset.idNum())
+    # end def
+
+    def undo(self):
+        strandset = self._strandset
+        part = strandset.part()
+        strands = self._strands
+        strandset._removeStrandsFromList(strands, self.update_segments)
+        for strand, oligo in zip(strands, self._new_oligos):
+            oligo.setStrand5p(None)
+            oligo.removeFromPart(emit_signals=self.emit_oligo_signals)
+            strand.strandRemovedSignal.emit(strand)
+            strand.setOligo(None)
+        part.partStrandChangedSignal.emit(part, strandset.idNum())
+    # end def
+# end class
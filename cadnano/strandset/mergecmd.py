@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 from cadnano.cnproxy import UndoCommand
-from cadnano.strand import Strand
+from cadnano.oligo.oligonode import linkOligos, unlinkOligos
 
 class MergeCommand(UndoCommand):
     """
@@ -17,6 +17,10 @@ class MergeCommand(UndoCommand):
     has a lower range than strand_high
 
     low_strandset_idx should be known ahead of time as a result of selection
+
+    The new oligo is applied by linking the oligo membership trees of the
+    two strands, so it costs O(log n) rather than a `Strand.setOligo` per
+    strand of the merged oligo
     """
     # def __init__(self, strand_low, strand_high, low_strandset_idx, priority_strand):
     def __init__(self, strand_low, strand_high, priority_strand):
@@ -46,15 +50,18 @@ class MergeCommand(UndoCommand):
         new_strand.setConnectionHigh(strand_high.connectionHigh())
 
         self._new_strand = new_strand
+        self._links = []
         # Update the oligo for things like its 5prime end and isLoop
         self._new_oligo._strandMergeUpdate(strand_low, strand_high, new_strand)
 
         # set the new sequence by concatenating the sequence properly
-        if strand_low._sequence or strand_high._sequence:
+        seq_low = strand_low._sequenceString()
+        seq_high = strand_high._sequenceString()
+        if seq_low or seq_high:
             tL = strand_low.totalLength()
             tH = strand_high.totalLength()
-            seqL = strand_low._sequence if strand_low._sequence else "".join([" " for i in range(tL)])
-            seqH = strand_high._sequence if strand_high._sequence else "".join([" " for i in range(tH)])
+            seqL = seq_low if seq_low else "".join([" " for i in range(tL)])
+            seqH = seq_high if seq_high else "".join([" " for i in range(tH)])
             if new_strand.isForward():
                 new_strand._sequence = seqL + seqH
             else:
@@ -72,8 +79,6 @@ class MergeCommand(UndoCommand):
         l_olg = s_low.oligo()
         h_olg = s_high.oligo()
 
-        fSetOligo = Strand.setOligo
-
         # Remove old strands from the s_set (reusing idx, so order matters)
         ss._removeFromStrandList(s_low, update_segments=False)
         ss._removeFromStrandList(s_high, update_segments=False)
@@ -96,9 +101,12 @@ class MergeCommand(UndoCommand):
             else:
                 nScH.setConnectionHigh(new_strand)
 
-        # Traverse the strands via 3'conns to assign the new oligo
-        for strand in olg.strand5p().generator3pStrand():
-            fSetOligo(strand, olg, emit_signals=True)  # emits strandHasNewOligoSignal
+        # Assign the new oligo to the strands of both old oligos
+        self._links.append(linkOligos(olg, l_olg))
+        if h_olg != l_olg:
+            self._links.append(linkOligos(olg, h_olg))
+        new_strand.setOligo(olg)
+        olg.strand5p().emitHasNewOligo()
 
         # Add new oligo and remove old oligos
         olg.addToPart(ss.part(), emit_signals=True)
@@ -119,8 +127,6 @@ class MergeCommand(UndoCommand):
         s_high = self._strand_high
         new_strand = self._new_strand
 
-        fSetOligo = Strand.setOligo
-
         olg = self._new_oligo
         l_olg = self._s_low_oligo
         h_olg = self._s_high_oligo
@@ -146,11 +152,13 @@ class MergeCommand(UndoCommand):
             else:
                 sHcH.setConnectionHigh(s_high)
 
-        # Traverse the strands via 3'conns to assign the old oligo
-        for strand in l_olg.strand5p().generator3pStrand():
-            fSetOligo(strand, l_olg, emit_signals=True)  # emits strandHasNewOligoSignal
-        for strand in h_olg.strand5p().generator3pStrand():
-            fSetOligo(strand, h_olg, emit_signals=True)  # emits strandHasNewOligoSignal
+        # Restore the old oligos of the strands
+        links = self._links
+        while links:
+            unlinkOligos(links.pop())
+        l_olg.strand5p().emitHasNewOligo()
+        if h_olg != l_olg:
+            h_olg.strand5p().emitHasNewOligo()
 
         # Remove new oligo and add old oligos
         olg.removeFromPart(emit_signals=True)
@@ -3,6 +3,7 @@ import random
 
 from cadnano import preferences as prefs
 from cadnano.cnproxy import UndoCommand
+from cadnano.oligo.oligonode import linkOligos, unlinkOligos
 from cadnano.strand import Strand
 
 class SplitCommand(UndoCommand):
@@ -15,12 +16,17 @@ class SplitCommand(UndoCommand):
     On redo, this command actually is creates two new copies of the
     original strand, resizes each and modifies their connections.
     On undo, the new copies are removed and the original is restored.
+
+    The 5' oligo takes over the oligo membership tree of the original oligo,
+    while the 3' strands are walked to assign the 3' oligo.  Undo gives each
+    of them back the oligo it was assigned before, so the membership trees
+    are exactly as they were for undoing earlier commands
     """
     def __init__(self, strand, base_idx, update_sequence=True):
         super(SplitCommand, self).__init__("split strand")
         # Store inputs
         self._old_strand = strand
-        old_sequence  = strand._sequence
+        old_sequence  = strand._sequenceString()
         is5to3 = strand.isForward()
 
         self._s_set = s_set = strand.strandSet()
@@ -55,6 +61,10 @@ class SplitCommand(UndoCommand):
         # there is only ever one xover a strand is in charge of
         self._strand3p = std3p
         self._strand5p = std5p
+        self._olg5p = olg5p
+        self._olg3p = olg3p
+        self._link5p = None
+        self._old_oligos = []
 
         # Update strand connectivity
         strand_low.setConnectionHigh(None)
@@ -127,14 +137,18 @@ class SplitCommand(UndoCommand):
             else:
                 sHcH.setConnectionHigh(s_high)
 
-        # Traverse the strands via 3'conns to assign the new oligos
-        fSetOligo = Strand.setOligo
-        for strand in l_olg.strand5p().generator3pStrand():
-            fSetOligo(strand, l_olg)  # emits strandHasNewOligoSignal
-        if was_not_loop:  # do the second oligo which is different
-            for strand in h_olg.strand5p().generator3pStrand():
-                # emits strandHasNewOligoSignal
-                fSetOligo(strand, h_olg)
+        # Assign the new oligos, the 3' strands get the second oligo
+        olg5p = self._olg5p
+        if was_not_loop:
+            fSetOligo = Strand.setOligo
+            old_oligos = self._old_oligos = []
+            for strand in self._strand3p.generator3pStrand():
+                old_oligos.append((strand, strand._oligo))
+                fSetOligo(strand, self._olg3p)
+        self._link5p = linkOligos(olg5p, olg)
+        olg5p.strand5p().emitHasNewOligo()
+        if was_not_loop:
+            self._strand3p.emitHasNewOligo()
 
         # Add new oligo and remove old oligos from the part
         olg.removeFromPart(emit_signals=True)
@@ -182,10 +196,16 @@ class SplitCommand(UndoCommand):
             else:
                 oScH.setConnectionHigh(o_strand)
 
-        # Traverse the strands via 3'conns to assign the old oligo
-        fSetOligo = Strand.setOligo
-        for strand in olg.strand5p().generator3pStrand():
-            fSetOligo(strand, olg)
+        # Assign the old oligo
+        unlinkOligos(self._link5p)
+        self._link5p = None
+        if was_not_loop:
+            fSetOligo = Strand.setOligo
+            for strand, oligo in self._old_oligos:
+                fSetOligo(strand, oligo)
+            self._old_oligos = []
+            self._olg3p._setStrandsModified()
+        olg.strand5p().emitHasNewOligo()
         # Add old oligo and remove new oligos from the part
         olg.addToPart(ss.part(), emit_signals=True)
         l_olg.removeFromPart(emit_signals=True)
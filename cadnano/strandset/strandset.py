@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
-from bisect import bisect_left, insort_left
+from bisect import bisect_left, bisect_right
 import cadnano.util as util
 from cadnano.cnproxy import ProxySignal
 from cadnano.cnobject import CNObject
 from cadnano.cnenum import StrandType
+from cadnano.strand.sequencebuffer import SequenceBuffer
 from .createstrandcmd import CreateStrandCommand
+from .loadstrandscmd import LoadStrandsCommand
 from .removestrandcmd import RemoveStrandCommand
 from .mergecmd import MergeCommand
 from .splitcmd import SplitCommand
@@ -19,17 +21,20 @@ class StrandSet(CNObject):
     determining if edits can be made, such as the bounds of empty space in
     which a strand can be created or resized.
 
-    Internally :class:`StrandSet` uses redundant heap and a list data structures
-    to track :class:`Strands` objects, with the list of length of a virtual
-    helix looking like::
-
-        strand_array = [strandA, strandA, strandA, ..., None, strandB, strandB, ...]
-
-    Where every index strandA spans has a reference to strandA and strand_heap::
+    Internally :class:`StrandSet` stores the strands as sorted, non
+    overlapping intervals::
 
         strand_heap = [strandA, strandB, strandC, ...]
+        _strand_lows = [strandA.lowIdx(), strandB.lowIdx(), ...]
+
+    `strand_heap` is a sorted list from low index to high index of strand
+    objects and `_strand_lows` mirrors their low indices for bisection, so
+    finding the strand at a base index is O(log n) in the number of strands
+    and memory does not depend on the length of the virtual helix
 
-    is merely a sorted list from low index to high index of strand objects
+    The sequences of the strands in the set are kept in a
+    :class:`SequenceBuffer`, a strand takes its sequence with it when it is
+    removed
 
     Args:
         is_fwd (bool):  is this a forward or reverse StrandSet?
@@ -60,7 +65,7 @@ class StrandSet(CNObject):
             part (Part): part to copy this into
         """
         return StrandSet(self._is_fwd, self._id_num,
-                         part, len(self.strand_array))
+                         part, self._length)
     # end def
 
     def __iter__(self):
@@ -85,6 +90,10 @@ class StrandSet(CNObject):
     strandsetStrandAddedSignal = ProxySignal(CNObject, CNObject, name='strandsetStrandAddedSignal')
     """pyqtSignal(QObject, QObject): strandset, strand"""
 
+    strandsetStrandsAddedSignal = ProxySignal(CNObject, object, name='strandsetStrandsAddedSignal')
+    """pyqtSignal(QObject, object): strandset, list of strands.  Sent once by
+    `loadStrands`"""
+
     ### SLOTS ###
 
     ### ACCESSORS ###
@@ -106,6 +115,13 @@ class StrandSet(CNObject):
         return self._document
     # end def
 
+    def undoStack(self):
+        """The undo stack of the part, so edits are journaled by an open
+        `NucleicAcidPart.transaction`
+        """
+        return self._part.undoStack()
+    # end def
+
     def strands(self):
         """Get raw reference to the strand_heap of this :class:`StrandSet`
 
@@ -114,6 +130,14 @@ class StrandSet(CNObject):
         """
         return self.strand_heap
 
+    def sequenceBuffer(self):
+        """
+        Returns:
+            SequenceBuffer: the bases of the strands in this set
+        """
+        return self._sequence_buffer
+    # end def
+
     def _reset(self, initial_size):
         """Reset this object clearing out references to all :class:`Strand`
         objects.  Exceptional private method to be only used by Parts
@@ -121,23 +145,20 @@ class StrandSet(CNObject):
         Args:
             initial_size (int): size to revert to
         """
-        self.strand_array = [None]*(initial_size)
+        self._length = initial_size
         self.strand_heap = []
+        self._strand_lows = []
+        self._sequence_buffer = SequenceBuffer(self._part.insertions()[self._id_num])
     # end def
 
     def resize(self, delta_low, delta_high):
-        """Resize this StrandSet.  Pad each end when growing otherwise
-        don't do anything
+        """Resize this StrandSet.  Strand indices are left as they are
 
         Args:
             delta_low (int):  amount to resize the low index end
             delta_high (int):  amount to resize the high index end
         """
-        if delta_low < 0:
-            self.strand_array = self.strand_array[delta_low:]
-        if delta_high < 0:
-            self.strand_array = self.strand_array[:delta_high]
-        self.strand_array = [None]*delta_low + self.strand_array + [None]*delta_high
+        self._length += delta_low + delta_high
     # end def
 
     ### PUBLIC METHODS FOR QUERYING THE MODEL ###
@@ -169,7 +190,7 @@ class StrandSet(CNObject):
         Returns:
             int: length of the set
         """
-        return len(self.strand_array)
+        return self._length
 
     def idNum(self):
         """Get the associated virtual helix ID number
@@ -227,30 +248,23 @@ class StrandSet(CNObject):
 
                 (low_idx, high_idx)
         """
-        class DummyStrand(object):
-            _base_idx_low = base_idx
-
-            def __lt__(self, other):
-                return self._base_idx_low < other._base_idx_low
-
-        ds = DummyStrand()
         sh = self.strand_heap
         lsh = len(sh)
         if lsh == 0:
-            return 0, len(self.strand_array) - 1
+            return 0, self._length - 1
 
         # the i-th index is the high-side strand and the i-1 index
         # is the low-side strand since bisect_left gives the index
-        # to insert the dummy strand at
-        i = bisect_left(sh, ds)
+        # to insert a strand starting at base_idx at
+        i = bisect_left(self._strand_lows, base_idx)
         if i == 0:
             low_idx = 0
         else:
             low_idx = sh[i - 1].highIdx() + 1
 
-        # would be an append to the list effectively if inserting the dummy strand
+        # would be an append to the list effectively if inserting the strand
         if i == lsh:
-            high_idx = len(self.strand_array) - 1
+            high_idx = self._length - 1
         else:
             high_idx = sh[i].lowIdx() - 1
         return (low_idx, high_idx)
@@ -327,12 +341,63 @@ class StrandSet(CNObject):
         return 0
     # end def
 
+    def loadStrands(self, index_pairs, colors=None, use_undostack=False):
+        """Bulk version of :meth:`createDeserializedStrand` for decoders and
+        pasting.  The strands are checked against each other and the strands
+        already in the set in one sorted pass, then added with one command
+        that gives each strand a placeholder :class:`Oligo`, updates the
+        segments once and sends one `strandsetStrandsAddedSignal`.
+
+        Without the undo stack the placeholder oligos are added silently and
+        segments aren't updated, like :meth:`createDeserializedStrand`, so
+        call `part.refreshSegments` for the virtual helix and rebuild the
+        oligos, e.g. with a `RefreshOligosCommand`, afterwards
+
+        Args:
+            index_pairs (list): of (low, high) :obj:`int` indices, inclusive
+            colors (:obj:`list`, optional): of :obj:`str` color per pair,
+                default is the color of the part
+            use_undostack (:obj:`bool`, optional): default=False
+
+        Returns:
+            list: of the new :class:`Strand` objects from low to high index
+
+        Raises:
+            IndexError: a pair runs outside the virtual helix
+            ValueError: a pair is reversed or overlaps another strand
+        """
+        index_pairs = [(int(low_idx), int(high_idx)) for low_idx, high_idx in index_pairs]
+        if colors is None:
+            colors = [self._part.getProperty('color')]*len(index_pairs)
+        elif len(colors) != len(index_pairs):
+            raise ValueError("{} colors for {} strands".format(len(colors), len(index_pairs)))
+        order = sorted(range(len(index_pairs)), key=index_pairs.__getitem__)
+        index_pairs = [index_pairs[i] for i in order]
+        colors = [colors[i] for i in order]
+
+        if index_pairs and not (0 <= index_pairs[0][0] and
+                                max(high for _, high in index_pairs) < self._length):
+            raise IndexError("strand indices out of range for {}".format(self))
+        pairs = sorted(index_pairs + [strand.idxs() for strand in self.strand_heap])
+        prev_high = -1
+        for low_idx, high_idx in pairs:
+            if low_idx > high_idx:
+                raise ValueError("strand ({}, {}) is reversed".format(low_idx, high_idx))
+            if low_idx <= prev_high:
+                raise ValueError("strand ({}, {}) overlaps in {}".format(low_idx, high_idx, self))
+            prev_high = high_idx
+
+        c = LoadStrandsCommand(self, index_pairs, colors,
+                               update_segments=use_undostack,
+                               emit_oligo_signals=use_undostack)
+        x, y = self._part.getVirtualHelixOrigin(self._id_num)
+        d = "(%0.2f,%0.2f).%d^%d strands" % (x, y, self._is_fwd, len(index_pairs))
+        util.execCommandList(self, [c], desc=d, use_undostack=use_undostack)
+        return c.strands()
+    # end def
+
     def isStrandInSet(self, strand):
-        sl = self.strand_array
-        if sl[strand.lowIdx()] == strand and sl[strand.highIdx()] == strand:
-            return True
-        else:
-            return False
+        return self._heapIndex(strand) is not None
     # end def
 
     def removeStrand(self, strand, use_undostack=True, solo=True):
@@ -508,32 +573,10 @@ class StrandSet(CNObject):
             bool: True if strandset has a strand in the region between idx_low
             and idx_high (both included). False otherwise
         """
-        sa = self.strand_array
-        sh = self.strand_heap
-        lsh = len(sh)
-        strand = sa[idx_low]
-
-        if strand is None:
-            class DummyStrand(object):
-                _base_idx_low = idx_low
-
-                def __lt__(self, other):
-                    return self._base_idx_low < other._base_idx_low
-
-            ds = DummyStrand()
-            i = bisect_left(sh, ds)
-
-            while i < lsh:
-                strand = sh[i]
-                if strand.lowIdx() > idx_high:
-                    return False
-                elif idx_low <= strand.highIdx():
-                    return True
-                else:
-                    i += 1
-            return False
-        else:
-            return True
+        # strands don't overlap so the high indices are sorted too, and only
+        # the last strand starting at or before idx_high can reach idx_low
+        i = bisect_right(self._strand_lows, idx_high) - 1
+        return i >= 0 and self.strand_heap[i].highIdx() >= idx_low
     # end def
 
     def getOverlappingStrands(self, idx_low, idx_high):
@@ -546,35 +589,12 @@ class StrandSet(CNObject):
         Returns:
             :obj:`list` of :class:`Strand`: all :class:`Strand` objects in range
         """
-        sa = self.strand_array
         sh = self.strand_heap
-        lsh = len(sh)
-
-        strand = sa[idx_low]
-        out = []
-        if strand is None:
-            class DummyStrand(object):
-                _base_idx_low = idx_low
-
-                def __lt__(self, other):
-                    return self._base_idx_low < other._base_idx_low
-
-            ds = DummyStrand()
-            i = bisect_left(sh, ds)
-        else:
-            out.append(strand)
-            i = bisect_left(sh, strand) + 1
-
-        while i < lsh:
-            strand = sh[i]
-            if strand.lowIdx() > idx_high:
-                break
-            elif idx_low <= strand.highIdx():
-                out.append(strand)
-                i += 1
-            else:
-                i += 1
-        return out
+        lows = self._strand_lows
+        i = bisect_right(lows, idx_low) - 1
+        if i < 0 or sh[i].highIdx() < idx_low:
+            i += 1
+        return sh[i:bisect_right(lows, idx_high)]
     # end def
 
     # def hasStrandAtAndNoXover(self, idx):
@@ -586,8 +606,7 @@ class StrandSet(CNObject):
     #     Returns:
     #         bool: True if hasStrandAtAndNoXover, False otherwise
     #     """
-    #     sl = self.strand_array
-    #     strand = sl[idx]
+    #     strand = self.getStrand(idx)
     #     if strand is None:
     #         return False
     #     elif strand.hasXoverAt(idx):
@@ -605,8 +624,7 @@ class StrandSet(CNObject):
     #     Returns:
     #         bool: True if hasNoStrandAtOrNoXover, False otherwise
     #     """
-    #     sl = self.strand_array
-    #     strand = sl[idx]
+    #     strand = self.getStrand(idx)
     #     if strand is None:
     #         return True
     #     elif strand.hasXoverAt(idx):
@@ -624,11 +642,17 @@ class StrandSet(CNObject):
         Returns:
             Strand: :class:`Strand` at `base_idx` if it exists
         """
-        try:
-            return self.strand_array[base_idx]
-        except:
-            print(self.strand_array)
-            raise
+        if not 0 <= base_idx < self._length:
+            # same indexing as a list of the bases
+            if not -self._length <= base_idx < 0:
+                raise IndexError("base_idx {} out of range for {}".format(base_idx, self))
+            base_idx += self._length
+        i = bisect_right(self._strand_lows, base_idx) - 1
+        if i >= 0:
+            strand = self.strand_heap[i]
+            if strand._base_idx_high >= base_idx:
+                return strand
+        return None
     # end def
 
     def dump(self, xover_list):
@@ -656,49 +680,134 @@ class StrandSet(CNObject):
     # end def
 
     ### PRIVATE SUPPORT METHODS ###
+    def _heapIndex(self, strand):
+        """
+        Args:
+            strand (Strand): the strand
+
+        Returns:
+            int: index of `strand` in `strand_heap` or None if it isn't in it
+        """
+        i = bisect_left(self._strand_lows, strand.lowIdx())
+        if i < len(self.strand_heap) and self.strand_heap[i] is strand:
+            return i
+        return None
+    # end def
+
     def _addToStrandList(self, strand, update_segments=True):
-        """Inserts strand into the strand_array at idx
+        """Inserts strand into the strand_heap in order of its low index
 
         Args:
             strand (Strand): the strand to add
             update_segments (:obj:`bool`, optional): whether to signal default=True
         """
-        # print("Adding to strandlist")
-        idx_low, idx_high = strand.idxs()
-        for i in range(idx_low, idx_high+1):
-            self.strand_array[i] = strand
-        insort_left(self.strand_heap, strand)
+        idx_low = strand.lowIdx()
+        i = bisect_left(self._strand_lows, idx_low)
+        self._strand_lows.insert(i, idx_low)
+        self.strand_heap.insert(i, strand)
+        if strand._sequence is not None:
+            strand._moveSequenceToBuffer()
+        part = self._part
+        part.setVirtualHelixModified(self._id_num)
+        part.segmentEndpoints(self._id_num).add(idx_low, strand.highIdx())
         if update_segments:
-            self._part.refreshSegments(self._id_num)
+            part.updateSegments(self._id_num)
+
+    def _addStrandsToList(self, strands, update_segments=True):
+        """Merge strands sorted by low index into the strand_heap at once
+
+        Args:
+            strands (list): of :class:`Strand` not overlapping each other or
+                the strands in the set
+            update_segments (:obj:`bool`, optional): whether to signal default=True
+        """
+        if not strands:
+            return
+        if self.strand_heap:
+            self.strand_heap = sorted(self.strand_heap + strands, key=lambda x: x.lowIdx())
+        else:
+            self.strand_heap = list(strands)
+        self._strand_lows = [strand.lowIdx() for strand in self.strand_heap]
+        part = self._part
+        part.setVirtualHelixModified(self._id_num)
+        endpoints = part.segmentEndpoints(self._id_num)
+        for strand in strands:
+            if strand._sequence is not None:
+                strand._moveSequenceToBuffer()
+            endpoints.add(*strand.idxs())
+        if update_segments:
+            part.updateSegments(self._id_num)
+    # end def
 
     def _updateStrandIdxs(self, strand, old_idxs, new_idxs):
-        """update indices in the strand array/list of an existing strand
+        """update the low index kept for an existing strand after it was
+        resized.  Resizing can't move a strand past its neighbors so its place
+        in `strand_heap` stays the same
 
         Args:
             strand (Strand): the strand
-            old_idxs (tuple): range (:obj:`int`) to clear
-            new_idxs (tuple): range (:obj:`int`) to set to `strand`
+            old_idxs (tuple): range (:obj:`int`) the strand had
+            new_idxs (tuple): range (:obj:`int`) the strand has now
+
+        Raises:
+            IndexError: `strand` isn't in the set
         """
-        for i in range(old_idxs[0], old_idxs[1] + 1):
-            self.strand_array[i] = None
-        for i in range(new_idxs[0], new_idxs[1] + 1):
-            self.strand_array[i] = strand
+        lows = self._strand_lows
+        i = bisect_left(lows, old_idxs[0])
+        if i == len(lows) or self.strand_heap[i] is not strand:
+            raise IndexError("Strandset._updateStrandIdxs: strand not in set")
+        lows[i] = new_idxs[0]
+        part = self._part
+        part.setVirtualHelixModified(self._id_num)
+        endpoints = part.segmentEndpoints(self._id_num)
+        endpoints.remove(*old_idxs)
+        endpoints.add(*new_idxs)
 
     def _removeFromStrandList(self, strand, update_segments=True):
-        """Remove strand from strand_array.
+        """Remove strand from strand_heap.
 
         Args:
             strand (Strand): the strand
             update_segments (:obj:`bool`, optional): whether to signal default=True
+
+        Raises:
+            IndexError: `strand` isn't in the set
         """
         self._document.removeStrandFromSelection(strand)  # make sure the strand is no longer selected
-        idx_low, idx_high = strand.idxs()
-        for i in range(idx_low, idx_high + 1):
-            self.strand_array[i] = None
-        i = bisect_left(self.strand_heap, strand)
+        i = self._heapIndex(strand)
+        if i is None:
+            raise IndexError("Strandset._removeFromStrandList: strand not in set")
         self.strand_heap.pop(i)
+        self._strand_lows.pop(i)
+        strand._moveSequenceFromBuffer()
+        part = self._part
+        part.setVirtualHelixModified(self._id_num)
+        part.segmentEndpoints(self._id_num).remove(*strand.idxs())
         if update_segments:
-            self._part.refreshSegments(self._id_num)
+            part.updateSegments(self._id_num)
+
+    def _removeStrandsFromList(self, strands, update_segments=True):
+        """Remove strands added with `_addStrandsToList` in one pass
+
+        Args:
+            strands (list): of :class:`Strand` in the set
+            update_segments (:obj:`bool`, optional): whether to signal default=True
+        """
+        document = self._document
+        for strand in strands:
+            document.removeStrandFromSelection(strand)
+            strand._moveSequenceFromBuffer()
+        removed = set(map(id, strands))
+        self.strand_heap = [strand for strand in self.strand_heap if id(strand) not in removed]
+        self._strand_lows = [strand.lowIdx() for strand in self.strand_heap]
+        part = self._part
+        part.setVirtualHelixModified(self._id_num)
+        endpoints = part.segmentEndpoints(self._id_num)
+        for strand in strands:
+            endpoints.remove(*strand.idxs())
+        if update_segments:
+            part.updateSegments(self._id_num)
+    # end def
 
     def getStrandIndex(self, strand):
         """Get the 5' end index of strand if it exists for forward strands
@@ -707,11 +816,9 @@ class StrandSet(CNObject):
         Returns:
             tuple: (:obj:`bool`, :obj:`int`)
         """
-        try:
-            ind = self.strand_array.index(strand)
-            return (True, ind)
-        except ValueError:
+        if self._heapIndex(strand) is None:
             return (False, 0)
+        return (True, strand.lowIdx())
     # end def
 
     def _deepCopy(self, virtual_helix):
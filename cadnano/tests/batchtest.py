@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+
+from pathsetup import TEST_PATH
+from cadnano.bin import batch
+
+DESIGNS = ['simple42legacy.json', 'skip.json']
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def testBatchConvert(tmpdir, capsys, jobs):
+    """Every good file is converted and exported, a bad file fails alone"""
+    bad_path = str(tmpdir.join('broken.json'))
+    with open(bad_path, 'w') as fd:
+        fd.write('{"vstrands": [')
+    out_dir = str(tmpdir.join('out'))
+    inputs = [os.path.join(TEST_PATH, 'data', name) for name in DESIGNS] + [bad_path]
+    status = batch.main(inputs + ['-o', out_dir, '-f', 'cn5', '--staples', '-j', str(jobs)])
+    assert status == 1
+    out = capsys.readouterr().out
+    assert 'FAILED %s' % bad_path in out
+    assert '3 files, 1 failed' in out
+    for name in DESIGNS:
+        stem = os.path.join(out_dir, os.path.splitext(name)[0])
+        assert os.path.exists(stem + '.cn5')
+        with open(stem + '.csv') as fd:
+            assert fd.readline().startswith('Start,End,Color')
+
+def testCollectInputs(tmpdir):
+    tmpdir.ensure('a', 'x.json')
+    tmpdir.ensure('a', 'b', 'y.c25')
+    tmpdir.ensure('a', 'notes.txt')
+    inputs = batch.collectInputs([str(tmpdir.join('a'))])
+    assert [stem for path, stem in inputs] == ['x', os.path.join('b', 'y')]
+
+CRASHING = ('skip.json', 'simple.json')
+
+def _convertOrCrash(path, stem, out_dir, out_format=None, staples=False):
+    """`batch.convertFile` killing its worker process on the CRASHING files"""
+    if os.path.basename(path) in CRASHING:
+        os._exit(1)
+    return _convertFile(path, stem, out_dir, out_format, staples)
+
+_convertFile = batch.convertFile
+
+def testBatchWorkerCrash(tmpdir, monkeypatch):
+    """Only the files whose worker died fail, the others are converted in
+    a fresh pool rather than one by one"""
+    pool_sizes = []
+
+    class CountingExecutor(batch.ProcessPoolExecutor):
+        def __init__(self, max_workers=None):
+            pool_sizes.append(max_workers)
+            super(CountingExecutor, self).__init__(max_workers=max_workers)
+
+    monkeypatch.setattr(batch, 'convertFile', _convertOrCrash)
+    monkeypatch.setattr(batch, 'ProcessPoolExecutor', CountingExecutor)
+    data_dir = os.path.join(TEST_PATH, 'data')
+    inputs = batch.collectInputs([data_dir])
+    jobs = 2
+    assert len(inputs) > 4*jobs
+    results = batch.runBatch(inputs, str(tmpdir), staples=True, jobs=jobs)
+    assert sorted(result.path for result in results) == sorted(path for path, stem in inputs)
+    failed = [result for result in results if not result.ok]
+    assert sorted(result.path for result in failed) == \
+        sorted(os.path.join(data_dir, name) for name in CRASHING)
+    assert all(result.error == "worker process terminated abruptly" for result in failed)
+    # only the crashing files and those converted alongside them twice are
+    # isolated
+    assert pool_sizes.count(1) <= 2*len(CRASHING)
+    assert pool_sizes.count(jobs) > 1
+
+def testBatchJobs():
+    with pytest.raises(SystemExit):
+        batch.parseArgs(['x.json', '--staples', '-j', '0'])
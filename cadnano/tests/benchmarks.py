@@ -0,0 +1,1038 @@
+# -*- coding: utf-8 -*-
+"""Timing scripts for the model.  Not collected by pytest, run with::
+
+    python benchmarks.py [name ...]
+
+from the tests directory.  With no arguments every benchmark is run.
+"""
+import contextlib
+import io
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from ast import literal_eval
+from bisect import bisect_left, insort_left
+
+import pathsetup  # noqa
+
+from cadnano.document import Document
+from cadnano.fileio.nnodecode import decodeFile
+from cadnano.fileio.nnoencode import encode, encodeToFile, IncrementalEncoder
+from cadnano.fileio.v3decode import decode as v3decode
+from cadnano.fileio.v3encode import encodeDocument
+from cadnano.strand import Strand
+
+from nucleicacidparttest import (queryBasePointLinear, queryIdNumNeighborLoop,
+                                 queryVirtualHelixOriginLinear)
+
+
+def timeIt(func, repeat=5):
+    """Best of `repeat` wall clock times of calling `func`
+
+    Returns:
+        float: seconds
+    """
+    best = float('inf')
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+# end def
+
+
+def bundleOrigins(num_helices, radius):
+    """Origins of `num_helices` touching helices on a square-ish
+    honeycomb-like grid
+
+    Returns:
+        list: of :obj:`tuple` x, y
+    """
+    columns = max(int(math.sqrt(num_helices)), 1)
+    origins = []
+    for id_num in range(num_helices):
+        row, column = divmod(id_num, columns)
+        x = column*radius*math.sqrt(3)
+        y = row*3*radius + (radius if column % 2 else 0)
+        origins.append((x, y))
+    return origins
+# end def
+
+
+def createBundle(num_helices, length, bulk=False):
+    """Create a part with `num_helices` virtual helices of `length` bases on
+    a square-ish honeycomb-like grid of touching helices
+
+    Args:
+        bulk (bool): use `createVirtualHelices` instead of one
+            `createVirtualHelix` call per helix
+
+    Returns:
+        NucleicAcidPart:
+    """
+    doc = Document()
+    part = doc.createNucleicAcidPart(use_undostack=False)
+    origins = bundleOrigins(num_helices, part.radius())
+    if bulk:
+        part.createVirtualHelices(origins, sizes=length, id_nums=list(range(num_helices)),
+                                  use_undostack=False)
+    else:
+        for id_num, (x, y) in enumerate(origins):
+            part.createVirtualHelix(x, y, length=length, id_num=id_num, use_undostack=False)
+    return part
+# end def
+
+
+def benchSpatialQueries():
+    """Compare the grid indexed point and origin queries against the brute
+    force scans on designs of 1k to 500k bases
+    """
+    print("bases   helices  base_pt_linear  base_pt_index  origin_linear  origin_index  (ms/query)")
+    for num_helices, length in ((10, 100), (100, 100), (100, 1000), (250, 1000), (500, 1000)):
+        part = createBundle(num_helices, length)
+        radius = part.radius()
+        id_nums = sorted(part.getIdNums())
+        points = [tuple(part.getCoordinate(id_num, length // 2)) for id_num in id_nums[::max(len(id_nums) // 20, 1)]]
+        origins = [tuple(part.getVirtualHelixOrigin(id_num)) for id_num in id_nums[::max(len(id_nums) // 20, 1)]]
+        r = 2.1*radius
+        n = len(points)
+        t_pl = timeIt(lambda: [queryBasePointLinear(part, r, p) for p in points]) / n
+        t_pi = timeIt(lambda: [part._queryBasePoint(r, p) for p in points]) / n
+        t_ol = timeIt(lambda: [queryVirtualHelixOriginLinear(part, r, p) for p in origins]) / n
+        t_oi = timeIt(lambda: [part._queryVirtualHelixOrigin(r, p) for p in origins]) / n
+        print("%-7d %-8d %-15.3f %-14.3f %-14.3f %-13.3f" %
+              (num_helices*length, num_helices, t_pl*1e3, t_pi*1e3, t_ol*1e3, t_oi*1e3))
+# end def
+
+
+def benchNeighborQuery():
+    """Compare the batched crossover candidate search against the per
+    phosphate loop for a whole helix and for a hover sized window
+    """
+    print("length  loop_full  batched_full  loop_window  batched_window  (ms)")
+    for length in (1000, 5000, 10000):
+        part = createBundle(9, length)
+        id_num = 4
+        neighbors = literal_eval(part.getVirtualHelixProperties(id_num, 'neighbors'))
+        index = length // 2
+        t_lf = timeIt(lambda: queryIdNumNeighborLoop(part, id_num, neighbors), repeat=1)
+        t_bf = timeIt(lambda: part.queryIdNumNeighbor(id_num, neighbors))
+        t_lw = timeIt(lambda: queryIdNumNeighborLoop(part, id_num, neighbors, index=index))
+        t_bw = timeIt(lambda: part.queryIdNumNeighbor(id_num, neighbors, index=index))
+        print("%-7d %-10.1f %-13.1f %-12.2f %-15.2f" %
+              (length, t_lf*1e3, t_bf*1e3, t_lw*1e3, t_bw*1e3))
+# end def
+
+
+def benchResize():
+    """Repeatedly grow and trim the lowest numbered helix at both ends.  With
+    per helix slabs the cost should not depend on the size of the design
+    """
+    print("bases   helices  append  prepend  trim_right  trim_left  (us/op)")
+    for num_helices, length in ((10, 1000), (100, 1000), (500, 1000)):
+        part = createBundle(num_helices, length)
+        id_num = 0
+        direction = part.directions[id_num]
+        origin = tuple(part.getVirtualHelixOrigin(id_num)) + (0.,)
+        delta = 21
+        num_ops = 200
+        _, size = part.getOffsetAndSize(id_num)
+        right_points = [part._pointsFromDirection(id_num, origin, direction, delta, size + i*delta)
+                        for i in range(num_ops)]
+        left_points = [part._pointsFromDirection(id_num, origin, direction, delta, -delta)
+                       for i in range(num_ops)]
+
+        def append():
+            for points in right_points:
+                part._addCoordinates(id_num, points, is_right=True)
+
+        def prepend():
+            for points in left_points:
+                part._addCoordinates(id_num, points, is_right=False)
+
+        def trimRight():
+            for i in range(num_ops):
+                part._removeCoordinates(id_num, delta, is_right=True)
+
+        def trimLeft():
+            for i in range(num_ops):
+                part._removeCoordinates(id_num, delta, is_right=False)
+        t_a = timeIt(append, repeat=1) / num_ops
+        t_tr = timeIt(trimRight, repeat=1) / num_ops
+        t_p = timeIt(prepend, repeat=1) / num_ops
+        t_tl = timeIt(trimLeft, repeat=1) / num_ops
+        print("%-7d %-8d %-7.1f %-8.1f %-11.1f %-10.1f" %
+              (num_helices*length, num_helices, t_a*1e6, t_p*1e6, t_tr*1e6, t_tl*1e6))
+# end def
+
+
+def benchProperties():
+    """Time loading designs and the property reads done while hovering over
+    a virtual helix, i.e. `potentialCrossoverMap` with a warm crossover cache
+    """
+    print("design                     load(ms)  get_prop(us)  get_all(us)  hover(us)")
+    for design in ('simple.json', 'Nature09_squarenut.json', 'super_barcode_hex.json'):
+        path = os.path.join(pathsetup.TEST_PATH, 'data', design)
+
+        def load():
+            doc = Document()
+            decodeFile(path, document=doc)
+            return doc
+        t_load = timeIt(load, repeat=3)
+        part = load().activePart()
+        id_nums = sorted(part.getIdNums())
+        part.precomputeCrossoverMap()
+        num_ops = 20*len(id_nums)
+
+        def getProperty():
+            for id_num in id_nums*20:
+                part.getVirtualHelixProperties(id_num, ['bases_per_repeat', 'turns_per_repeat'])
+
+        def getAll():
+            for id_num in id_nums*20:
+                part.getAllVirtualHelixProperties(id_num)
+
+        def hover():
+            for id_num in id_nums:
+                for idx in range(0, 200, 10):
+                    part.potentialCrossoverMap(id_num, idx)
+        t_get = timeIt(getProperty) / num_ops
+        t_all = timeIt(getAll) / num_ops
+        t_hover = timeIt(hover) / num_ops
+        print("%-26s %-9.1f %-13.2f %-12.2f %-9.1f" %
+              (design, t_load*1e3, t_get*1e6, t_all*1e6, t_hover*1e6))
+# end def
+
+
+def benchBulkCreate():
+    """Compare one `createVirtualHelix` call per helix against a single
+    `createVirtualHelices` call, directly and when decoding a v3 file
+    """
+    print("helices  length  single(ms)  bulk(ms)  decode_file(ms)")
+    for num_helices, length in ((100, 1000), (1000, 1000), (1000, 5000)):
+        t_single = timeIt(lambda: createBundle(num_helices, length), repeat=1)
+        t_bulk = timeIt(lambda: createBundle(num_helices, length, bulk=True), repeat=3)
+        doc_dict = encodeDocument(createBundle(num_helices, length, bulk=True).document())
+        t_decode = timeIt(lambda: v3decode(Document(), doc_dict), repeat=3)
+        print("%-8d %-7d %-11.1f %-9.1f %-15.1f" %
+              (num_helices, length, t_single*1e3, t_bulk*1e3, t_decode*1e3))
+# end def
+
+
+def writeLegacyDesign(filename, num_helices, length):
+    """Write a synthetic cadnano 2 (v2) honeycomb design of `num_helices`
+    helices of `length` bases.  Each helix has a scaffold strand spanning the
+    whole helix and staples broken every 42 bases.  Helices are written one
+    at a time so files of hundreds of MB can be generated
+
+    Returns:
+        int: file size in bytes
+    """
+    columns = max(int(math.sqrt(num_helices)), 1)
+    even_positions, odd_positions = [], []
+    row = 0
+    while len(even_positions) < num_helices or len(odd_positions) < num_helices:
+        for col in range(columns):
+            (odd_positions if (row + col) % 2 else even_positions).append((row, col))
+        row += 1
+    with open(filename, 'w') as fd:
+        fd.write('{"name": "%s", "vstrands": [' % os.path.basename(filename))
+        for num in range(num_helices):
+            # helix parity must match the lattice position parity
+            row, col = (odd_positions if num % 2 else even_positions)[num // 2]
+            step = -1 if num % 2 else 1  # scaffold 5' to 3' direction
+            scaf = [[num, i - step, num, i + step] for i in range(length)]
+            scaf[0 if step == 1 else -1][:2] = [-1, -1]
+            scaf[-1 if step == 1 else 0][2:] = [-1, -1]
+            stap = [[num, i + step, num, i - step] for i in range(length)]
+            for lo in range(0, length, 42):
+                hi = min(lo + 42, length) - 1
+                stap[hi if step == 1 else lo][:2] = [-1, -1]
+                stap[lo if step == 1 else hi][2:] = [-1, -1]
+            helix = {'num': num, 'row': row, 'col': col,
+                     'scaf': scaf, 'stap': stap,
+                     'loop': [0]*length, 'skip': [0]*length,
+                     'scafLoop': [], 'stapLoop': [], 'stap_colors': []}
+            if num:
+                fd.write(', ')
+            json.dump(helix, fd)
+        fd.write(']}')
+        return fd.tell()
+# end def
+
+
+def benchLegacyDecode():
+    """Time decoding synthetic v2 designs, excluding reading the JSON file
+    """
+    from cadnano.fileio import v2decode
+    print("helices  length  decode(s)")
+    for num_helices, length in ((50, 4200), (200, 4200), (200, 10080)):
+        fd, path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        try:
+            writeLegacyDesign(path, num_helices, length)
+            with open(path) as fd:
+                obj = json.load(fd)
+        finally:
+            os.remove(path)
+        t0 = time.perf_counter()
+        v2decode.decode(Document(), obj)
+        print("%-8d %-7d %-9.2f" % (num_helices, length, time.perf_counter() - t0))
+# end def
+
+_DECODE_SCRIPT = """
+import resource, sys, time
+import pathsetup
+from cadnano.fileio.nnodecode import decodeFile
+t0 = time.perf_counter()
+decodeFile(sys.argv[1], streaming=sys.argv[2] == '1')
+dt = time.perf_counter() - t0
+print(dt, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def benchStreamingDecode():
+    """Compare time and peak resident memory of decoding synthetic v2 files
+    with and without streaming.  Each decode runs in a fresh interpreter so
+    the peak is not shared.  Set CN_BENCH_STREAM_MB to a comma separated list
+    of approximate file sizes to change the default 25,100,300
+    """
+    sizes_mb = [int(x) for x in os.environ.get('CN_BENCH_STREAM_MB', '25,100,300').split(',')]
+    length = 4200
+    bytes_per_helix = 42*length  # approximate
+    print("file(MB)  helices  load(s)  load_rss(MB)  stream(s)  stream_rss(MB)")
+    baseline_kb = int(subprocess.check_output(
+        [sys.executable, '-c', 'import resource, pathsetup, cadnano.fileio.nnodecode;'
+         'print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)'],
+        cwd=pathsetup.TEST_PATH))
+    print("(interpreter and imports alone: %.0f MB)" % (baseline_kb / 1024.))
+    for size_mb in sizes_mb:
+        num_helices = max(size_mb*(1 << 20) // bytes_per_helix, 2)
+        fd, path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        try:
+            file_size = writeLegacyDesign(path, num_helices, length)
+            results = []
+            for streaming in ('0', '1'):
+                out = subprocess.check_output(
+                    [sys.executable, '-c', _DECODE_SCRIPT, path, streaming],
+                    cwd=pathsetup.TEST_PATH)
+                dt, rss_kb = out.split()[-2:]
+                results += [float(dt), int(rss_kb) / 1024.]
+        finally:
+            os.remove(path)
+        print("%-9.0f %-8d %-8.1f %-13.0f %-10.1f %-14.0f" %
+              ((file_size / float(1 << 20), num_helices) + tuple(results)))
+# end def
+
+
+def benchBinaryFormat():
+    """Compare saving and loading the v3 JSON format with the binary .cn5
+    format on decoded synthetic v2 designs
+    """
+    print("helices  bases    json_save(ms)  cn5_save(ms)  json_load(ms)  cn5_load(ms)  json(MB)  cn5(MB)")
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for num_helices, length in ((50, 2100), (200, 4200)):
+            legacy_path = os.path.join(tmp_dir, 'legacy.json')
+            writeLegacyDesign(legacy_path, num_helices, length)
+            doc = decodeFile(legacy_path)
+            row = [num_helices, num_helices*length]
+            paths = [os.path.join(tmp_dir, 'design' + ext) for ext in ('.json', '.cn5')]
+            for path in paths:
+                row.append(timeIt(lambda: encodeToFile(path, doc), repeat=3)*1e3)
+            for path in paths:
+                row.append(timeIt(lambda: decodeFile(path), repeat=3)*1e3)
+            row += [os.path.getsize(path) / float(1 << 20) for path in paths]
+            print("%-8d %-8d %-14.1f %-13.1f %-14.1f %-13.1f %-9.2f %-7.2f" % tuple(row))
+    finally:
+        shutil.rmtree(tmp_dir)
+# end def
+
+
+def benchLazyDecode():
+    """Compare the time to first interaction, reading a multi-part file and
+    getting its active part, with every part decoded up front and with
+    `lazy` decoding, and the time to save it again without further edits
+    """
+    print("format  parts  eager_open(ms)  lazy_open(ms)  eager_save(ms)  lazy_save(ms)")
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        legacy_path = os.path.join(tmp_dir, 'legacy.json')
+        writeLegacyDesign(legacy_path, 100, 2100)
+        for num_parts in (2, 8):
+            doc = None
+            for _ in range(num_parts):
+                doc = decodeFile(legacy_path, document=doc)
+            for ext in ('.json', '.cn5'):
+                path = os.path.join(tmp_dir, 'design' + ext)
+                encodeToFile(path, doc)
+                out_path = os.path.join(tmp_dir, 'out' + ext)
+                row = [ext[1:], num_parts]
+                docs = []
+                for lazy in (False, True):
+                    def firstInteraction():
+                        del docs[:]
+                        docs.append(decodeFile(path, lazy=lazy))
+                        docs[0].activePart()
+                    row.append(timeIt(firstInteraction, repeat=3)*1e3)
+                for lazy in (False, True):
+                    loaded = decodeFile(path, lazy=lazy)
+                    loaded.activePart()
+                    row.append(timeIt(lambda: encodeToFile(out_path, loaded), repeat=3)*1e3)
+                print("%-7s %-6d %-15.1f %-14.1f %-15.1f %-13.1f" % tuple(row))
+    finally:
+        shutil.rmtree(tmp_dir)
+# end def
+
+def benchIncrementalSave():
+    """Time re-encoding a decoded synthetic v2 design after a small edit,
+    in full and with an :class:`IncrementalEncoder` primed by a previous save
+    """
+    print("helices  bases    edit        full(ms)  incremental(ms)")
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for num_helices, length in ((200, 4200), (1000, 4200)):
+            legacy_path = os.path.join(tmp_dir, 'legacy.json')
+            writeLegacyDesign(legacy_path, num_helices, length)
+            doc = decodeFile(legacy_path)
+            part = doc.activePart()
+            encoder = IncrementalEncoder()
+            encoder.encode(doc)
+            staples = max(part.getStrandSets(num_helices // 2), key=lambda ss: len(ss.strand_heap))
+            strand = staples.strand_heap[10]
+            edits = (('color', lambda: strand.oligo().applyColor('#123456')),
+                     ('split', lambda: strand.split(strand.lowIdx() + 20)),
+                     ('insertion', lambda: part.getStrandSets(0)[0].strand_heap[0].addInsertion(100, 3)),
+                     ('undo', lambda: doc.undoStack().undo()))
+            for name, edit in edits:
+                edit()
+                t0 = time.perf_counter()
+                encoder.encode(doc)
+                incremental = time.perf_counter() - t0
+                full = timeIt(lambda: encode(doc), repeat=3)
+                print("%-8d %-8d %-11s %-9.1f %-15.1f" %
+                      (num_helices, num_helices*length, name, full*1e3, incremental*1e3))
+    finally:
+        shutil.rmtree(tmp_dir)
+# end def
+
+class PerBaseStrandList(object):
+    """The per base `strand_array` list StrandSet used to keep, for comparing
+    against its interval storage in `benchStrandSet`
+    """
+    def __init__(self, length):
+        self.strand_array = [None]*length
+        self.strand_heap = []
+
+    def add(self, strand):
+        idx_low, idx_high = strand.idxs()
+        for i in range(idx_low, idx_high + 1):
+            self.strand_array[i] = strand
+        insort_left(self.strand_heap, strand)
+
+    def update(self, strand, old_idxs, new_idxs):
+        for i in range(old_idxs[0], old_idxs[1] + 1):
+            self.strand_array[i] = None
+        for i in range(new_idxs[0], new_idxs[1] + 1):
+            self.strand_array[i] = strand
+
+    def remove(self, strand):
+        idx_low, idx_high = strand.idxs()
+        for i in range(idx_low, idx_high + 1):
+            self.strand_array[i] = None
+        self.strand_heap.pop(bisect_left(self.strand_heap, strand))
+
+    def getStrand(self, base_idx):
+        return self.strand_array[base_idx]
+
+    def getStrandIndex(self, strand):
+        return (True, self.strand_array.index(strand))
+
+    def resize(self, delta_low, delta_high):
+        self.strand_array = [None]*delta_low + self.strand_array + [None]*delta_high
+# end class
+
+
+def benchStrandSet():
+    """Compare the StrandSet strand storage with the per base list it
+    replaced on long helices tiled with 42 base strands
+    """
+    print("bases   strands  structure  add(us)  resize(us)  remove(us)  "
+          "getStrand(us)  getStrandIndex(us)  grow_helix(us)  memory(KB)")
+    for length in (2100, 21000):
+        part = createBundle(1, length)
+        strandset = part.getStrandSets(0)[0]
+        num_strands = length // 42
+        for name in ('list', 'intervals'):
+            strandset._reset(length)
+            strands = [Strand(strandset, i*42, i*42 + 40) for i in range(num_strands)]
+            if name == 'list':
+                store = PerBaseStrandList(length)
+                add, update, remove = store.add, store.update, store.remove
+                get_strand, get_index, resize = store.getStrand, store.getStrandIndex, store.resize
+            else:
+                store = strandset
+                add = lambda strand: strandset._addToStrandList(strand, update_segments=False)
+                update = strandset._updateStrandIdxs
+                remove = lambda strand: strandset._removeFromStrandList(strand, update_segments=False)
+                get_strand, get_index, resize = (strandset.getStrand, strandset.getStrandIndex,
+                                                 strandset.resize)
+            row = [length, num_strands, name]
+            row.append(timeIt(lambda: [add(strand) for strand in strands], repeat=1) / num_strands)
+
+            def resizeStrands():
+                for strand in strands:
+                    low, high = strand.idxs()
+                    strand._base_idx_high = high + 1
+                    update(strand, (low, high), (low, high + 1))
+            row.append(timeIt(resizeStrands, repeat=1) / num_strands)
+            probes = list(range(0, length, 7))
+            t_get = timeIt(lambda: [get_strand(idx) for idx in probes], repeat=3) / len(probes)
+            t_index = timeIt(lambda: [get_index(strand) for strand in strands], repeat=3) / num_strands
+            t_grow = timeIt(lambda: [resize(0, 21) for i in range(20)], repeat=1) / 20
+            if name == 'list':
+                memory = sys.getsizeof(store.strand_array) + sys.getsizeof(store.strand_heap)
+            else:
+                memory = sys.getsizeof(store._strand_lows) + sys.getsizeof(store.strand_heap)
+            row.append(timeIt(lambda: [remove(strand) for strand in strands], repeat=1) / num_strands)
+            row += [t_get, t_index, t_grow]
+            print("%-7d %-8d %-10s %-8.2f %-11.2f %-11.2f %-14.3f %-19.2f %-15.2f %-10.1f" %
+                  tuple(row[:3] + [x*1e6 for x in row[3:]] + [memory / 1024.]))
+# end def
+
+
+def benchLoadStrands():
+    """Time filling the strandsets of a bundle tiled with 42 base strands as
+    a decoder does, one `createDeserializedStrand` per strand or one
+    `loadStrands` per strandset, then refreshing the segments
+    """
+    print("helices  bases   strands  per_strand(s)  load(s)")
+    for num_helices, length in ((50, 4200), (200, 4200)):
+        pairs = [(i, i + 40) for i in range(0, length - 41, 42)]
+        row = [num_helices, length, 2*num_helices*len(pairs)]
+        for bulk in (False, True):
+            part = createBundle(num_helices, length, bulk=True)
+
+            def load():
+                for id_num in range(num_helices):
+                    for strandset in part.getStrandSets(id_num):
+                        if bulk:
+                            strandset.loadStrands(pairs)
+                        else:
+                            for low_idx, high_idx in pairs:
+                                strandset.createDeserializedStrand(low_idx, high_idx, '#0066cc')
+                    part.refreshSegments(id_num)
+            row.append(timeIt(load, repeat=1))
+        print("%-8d %-7d %-8d %-14.2f %-7.2f" % tuple(row))
+# end def
+
+
+def benchPaste():
+    """Compare duplicating virtual helices through `encodePartList` and
+    `importToPart` with `copyVirtualHelices` and `pasteVirtualHelices`, and
+    time undoing and redoing the paste
+    """
+    from cadnano.fileio.v3decode import importToPart
+    from cadnano.fileio.v3encode import encodePartList
+
+    class PartInstance(object):
+        def __init__(self, part):
+            self._part = part
+
+        def reference(self):
+            return self._part
+
+        def properties(self):
+            return {}
+
+    print("design             helices  import(s)  paste(s)  undo(s)  redo(s)")
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        legacy_path = os.path.join(tmp_dir, 'legacy.json')
+        writeLegacyDesign(legacy_path, 100, 2100)
+        for label, path in (('synthetic', legacy_path),
+                            ('Science09', os.path.join(pathsetup.TEST_PATH, 'data',
+                                                       'Science09_prot120_98_v3.json'))):
+            part = decodeFile(path).activePart()
+            id_nums = sorted(part.getIdNums())
+            t0 = time.perf_counter()
+            importToPart(PartInstance(part), encodePartList(PartInstance(part), list(id_nums)))
+            row = [label, len(id_nums), time.perf_counter() - t0]
+
+            part = decodeFile(path).activePart()
+            undostack = part.document().undoStack()
+            t0 = time.perf_counter()
+            part.pasteVirtualHelices(part.copyVirtualHelices(id_nums))
+            row.append(time.perf_counter() - t0)
+            row.append(timeIt(undostack.undo, repeat=1))
+            row.append(timeIt(undostack.redo, repeat=1))
+            print("%-18s %-8d %-10.2f %-9.2f %-8.2f %-7.2f" % tuple(row))
+    finally:
+        shutil.rmtree(tmp_dir)
+# end def
+
+
+def benchSegments():
+    """Time strand edits on a long helix tiled with 42 base strands, with
+    the segments refreshed for the whole helix or updated incrementally
+    """
+    print("bases   strands  segments     resize(us)  create+remove(us)")
+    for length in (2100, 21000):
+        part = createBundle(1, length)
+        fwd_ss, rev_ss = part.getStrandSets(0)
+        rev_ss.createStrand(0, length - 1, use_undostack=False)
+        strands = [fwd_ss.createStrand(i*42, i*42 + 40, use_undostack=False)
+                   for i in range(length // 42)]
+        num_strands = len(strands) + 1
+        for name in ('full', 'incremental'):
+            if name == 'full':
+                part.updateSegments = part.refreshSegments
+            else:
+                del part.updateSegments
+            part.refreshSegments(0)
+
+            def resizeStrands():
+                for strand in strands:
+                    low, high = strand.idxs()
+                    strand.resize((low, high + 1), use_undostack=False)
+                    strand.resize((low, high), use_undostack=False)
+
+            def createRemove():
+                for strand in strands:
+                    new_strand = fwd_ss.createStrand(strand.highIdx() + 1, strand.highIdx() + 1,
+                                                     use_undostack=False)
+                    fwd_ss.removeStrand(new_strand, use_undostack=False)
+            t_resize = timeIt(resizeStrands, repeat=1) / (2*len(strands))
+            t_create = timeIt(createRemove, repeat=1) / len(strands)
+            print("%-7d %-8d %-12s %-11.1f %-10.1f" %
+                  (length, num_strands, name, t_resize*1e6, t_create*1e6))
+# end def
+
+
+def scanInsertionsOnStrand(self, idxL=None, idxH=None):
+    """`Strand.insertionsOnStrand` before the InsertionIndex: sorts and
+    scans every insertion of the helix
+    """
+    insertions = []
+    insertions_dict = self.part().insertions()[self._id_num]
+    if idxL is None:
+        idxL, idxH = self.idxs()
+    for index in sorted(insertions_dict.keys()):
+        insertion = insertions_dict[index]
+        if idxL <= insertion.idx() <= idxH:
+            insertions.append(insertion)
+    return insertions
+# end def
+
+
+def scanInsertionLengthBetweenIdxs(self, idxL, idxH):
+    return sum(insertion.length() for insertion in self.insertionsOnStrand(idxL, idxH))
+# end def
+
+
+def scanTotalLength(self):
+    return sum(insertion.length() for insertion in self.insertionsOnStrand()) + self.length()
+# end def
+
+
+def benchInsertions():
+    """Time strand length queries and sequence application on a helix with
+    an insertion or skip every 10 bases, scanning the insertions like the
+    dict based store did or using the InsertionIndex
+    """
+    from cadnano.part.refresholigoscmd import RefreshOligosCommand
+    print("bases   insertions  store    totalLength(us)  getSequenceList(us)  applySequence(ms)")
+    for length in (2100, 21000):
+        part = createBundle(1, length)
+        fwd_ss, rev_ss = part.getStrandSets(0)
+        scaffold = fwd_ss.createStrand(0, length - 1, use_undostack=False)
+        staples = [rev_ss.createStrand(i*42, i*42 + 41, use_undostack=False)
+                   for i in range(length // 42)]
+        for i, idx in enumerate(range(5, length, 10)):
+            scaffold.addInsertion(idx, -1 if i % 3 == 0 else 1, use_undostack=False)
+        RefreshOligosCommand(part).redo()
+        oligo = scaffold.oligo()
+        sequence = ('ACGT'*(oligo.length() // 4 + 1))[:oligo.length()]
+        num_insertions = len(part.insertions()[0])
+        for name in ('scan', 'indexed'):
+            saved = {}
+            if name == 'scan':
+                for attr, func in (('insertionsOnStrand', scanInsertionsOnStrand),
+                                   ('insertionLengthBetweenIdxs', scanInsertionLengthBetweenIdxs),
+                                   ('totalLength', scanTotalLength)):
+                    saved[attr] = getattr(Strand, attr)
+                    setattr(Strand, attr, func)
+            try:
+                t_length = timeIt(lambda: [x.totalLength() for x in staples], repeat=3) / len(staples)
+                t_apply = timeIt(lambda: oligo.applySequence(sequence, use_undostack=False), repeat=1)
+                t_list = timeIt(lambda: [x.getSequenceList() for x in staples], repeat=3) / len(staples)
+            finally:
+                for attr, func in saved.items():
+                    setattr(Strand, attr, func)
+            print("%-7d %-11d %-8s %-16.1f %-20.1f %-10.1f" %
+                  (length, num_insertions, name, t_length*1e6, t_list*1e6, t_apply*1e3))
+# end def
+
+
+def benchOligos():
+    """Time joining two long oligos with a crossover and splitting the 5'
+    most strand of an oligo, each followed by an undo and a redo
+    """
+    print("strands  create(us)  undo(us)  redo(us)  split(us)  undo(us)  redo(us)")
+    for num_strands in (1000, 10000):
+        part = createBundle(1, num_strands*10)
+        fwd_ss = part.getStrandSets(0)[0]
+        strands = [fwd_ss.createStrand(i*10, i*10 + 8, use_undostack=False)
+                   for i in range(num_strands)]
+        half = num_strands // 2
+        for i, (strand5p, strand3p) in enumerate(zip(strands, strands[1:])):
+            if i != half - 1:
+                part.createXover(strand5p, strand5p.idx3Prime(),
+                                 strand3p, strand3p.idx5Prime(), use_undostack=False)
+        us = part.undoStack()
+        strand5p, strand3p = strands[half - 1], strands[half]
+        row = []
+        row.append(timeIt(lambda: part.createXover(strand5p, strand5p.idx3Prime(),
+                                                   strand3p, strand3p.idx5Prime()), repeat=1))
+        row.append(timeIt(us.undo, repeat=1))
+        row.append(timeIt(us.redo, repeat=1))
+        strand = strands[0]
+        row.append(timeIt(lambda: fwd_ss.splitStrand(strand, strand.lowIdx() + 3), repeat=1))
+        row.append(timeIt(us.undo, repeat=1))
+        row.append(timeIt(us.redo, repeat=1))
+        print("%-8d " % num_strands + " ".join("%-9.1f" % (t*1e6) for t in row))
+# end def
+
+
+def walkRefreshOligos(self):
+    """RefreshOligosCommand.redo before the single pass rewrite"""
+    visited = {}
+    part = self._part
+    for id_num in part.getIdNums():
+        fwd_ss, rev_ss = part.getStrandSets(id_num)
+        for strand in rev_ss:
+            visited[strand] = False
+        for strand in fwd_ss:
+            visited[strand] = False
+    fSetOligo = Strand.setOligo
+    for strand in list(visited.keys()):
+        if visited[strand]:
+            continue
+        visited[strand] = True
+        start_oligo = strand.oligo()
+        strand5gen = strand.generator5pStrand()
+        strand5 = next(strand5gen)
+        for strand5 in strand5gen:
+            oligo5 = strand5.oligo()
+            if oligo5 != start_oligo:
+                oligo5.removeFromPart(emit_signals=True)
+                fSetOligo(strand5, start_oligo, emit_signals=True)
+            visited[strand5] = True
+        start_oligo.setStrand5p(strand5)
+        if strand.connection3p() == strand5:
+            start_oligo._setLoop(True)
+        else:
+            strand3gen = strand.generator3pStrand()
+            strand3 = next(strand3gen)
+            for strand3 in strand3gen:
+                oligo3 = strand3.oligo()
+                if oligo3 != start_oligo:
+                    oligo3.removeFromPart(emit_signals=True)
+                    fSetOligo(strand3, start_oligo, emit_signals=True)
+                visited[strand3] = True
+        start_oligo.refreshLength(emit_signals=True)
+    for strand in visited.keys():
+        strand.strandUpdateSignal.emit(strand)
+# end def
+
+
+def benchRefreshOligos():
+    """Time RefreshOligosCommand on freshly decoded super_barcode_hex.json
+    and on synthetic designs with 20 base strands crossed over into one
+    chain per helix, using the walking implementation or the single pass
+    """
+    from cadnano.part.refresholigoscmd import RefreshOligosCommand
+
+    def decodeUnrefreshed():
+        parts = []
+        redo = RefreshOligosCommand.redo
+        RefreshOligosCommand.redo = lambda self: parts.append(self._part)
+        try:
+            decodeFile(os.path.join(pathsetup.TEST_PATH, 'data', 'super_barcode_hex.json'))
+        finally:
+            RefreshOligosCommand.redo = redo
+        return parts[-1]
+
+    def createChains(num_helices, length):
+        part = createBundle(num_helices, length)
+        for id_num in range(num_helices):
+            fwd_ss, rev_ss = part.getStrandSets(id_num)
+            strands = [fwd_ss.createStrand(i, i + 19, use_undostack=False)
+                       for i in range(0, length - 19, 20)]
+            for strand5p, strand3p in zip(strands, strands[1:]):
+                part.createXover(strand5p, strand5p.idx3Prime(), strand3p, strand3p.idx5Prime(),
+                                 update_oligo=False, use_undostack=False)
+            for i in range(0, length - 41, 42):
+                rev_ss.createStrand(i, i + 41, use_undostack=False)
+        return part
+
+    designs = [('super_barcode_hex', decodeUnrefreshed),
+               ('100 x 1000', lambda: createChains(100, 1000)),
+               ('100 x 5000', lambda: createChains(100, 5000))]
+    print("design             strands  oligos  walk(ms)  single_pass(ms)")
+    for name, create in designs:
+        times = []
+        for refresh in (walkRefreshOligos, RefreshOligosCommand.redo):
+            part = create()
+            t0 = time.perf_counter()
+            refresh(RefreshOligosCommand(part))
+            times.append(time.perf_counter() - t0)
+        num_strands = sum(len(ss.strand_heap) for id_num in part.getIdNums()
+                          for ss in part.getStrandSets(id_num))
+        print("%-18s %-8d %-7d %-9.1f %-10.1f" %
+              (name, num_strands, len(part.oligos()), times[0]*1e3, times[1]*1e3))
+# end def
+
+
+def benchSignals():
+    """Count the signal emissions made and delivered by batchSignals while
+    decoding designs and deleting all of their strands
+    """
+    from cadnano.cnproxy import batchSignals
+    print("design                        operation  emitted  delivered  most saved")
+    for design in ('super_barcode_hex.json', 'Science09_prot120_98_v3.json'):
+        with batchSignals() as batch:
+            doc = decodeFile(os.path.join(pathsetup.TEST_PATH, 'data', design))
+        rows = [('decode', batch)]
+        part = doc.activePart()
+        for id_num in part.getIdNums():
+            for strandset in part.getStrandSets(id_num):
+                for strand in list(strandset.strand_heap):
+                    doc.addStrandToSelection(strand, (True, True))
+        with batchSignals() as batch:
+            doc.deleteStrandSelection()
+        rows.append(('delete', batch))
+        for operation, batch in rows:
+            saved = sorted(batch.saved().items(), key=lambda item: -item[1])[:2]
+            print("%-29s %-10s %-8d %-10d %s" %
+                  (design, operation, sum(batch.emitted.values()), sum(batch.delivered.values()),
+                   ", ".join("%s %d" % item for item in saved)))
+# end def
+
+
+def generateDesign(part, num_helices, length):
+    """Script a design through the default, undoable API: a scaffold strand
+    per helix crossed over into one oligo, 42 base staples crossed over in
+    pairs and a skip every 50 bases of the scaffold
+    """
+    for id_num, (x, y) in enumerate(bundleOrigins(num_helices, part.radius())):
+        part.createVirtualHelix(x, y, length=length, id_num=id_num)
+    scaffolds = []
+    for id_num in range(num_helices):
+        fwd_ss, rev_ss = part.getStrandSets(id_num)
+        scaffolds.append(fwd_ss.createStrand(0, length - 1))
+        staples = [rev_ss.createStrand(i*42, i*42 + 41) for i in range(length // 42)]
+        for strand5p, strand3p in zip(staples[2::2], staples[1::2]):
+            part.createXover(strand5p, strand5p.idx3Prime(), strand3p, strand3p.idx5Prime())
+    for strand5p, strand3p in zip(scaffolds, scaffolds[1:]):
+        part.createXover(strand5p, strand5p.idx3Prime(), strand3p, strand3p.idx5Prime())
+    for scaffold in scaffolds:
+        for idx in range(25, length - 25, 50):
+            scaffold.addInsertion(idx, -1)
+# end def
+
+
+def benchTransaction():
+    """Time scripting a design edit by edit and in a part transaction
+    """
+    print("helices  bases   per_edit(ms)  transaction(ms)")
+    for num_helices, length in ((5, 2100), (10, 2100), (50, 2100)):
+        times = []
+        for mode in ('per_edit', 'transaction'):
+            if mode == 'per_edit' and num_helices > 10:
+                times.append(float('nan'))
+                continue
+            part = Document().createNucleicAcidPart(use_undostack=False)
+            t0 = time.perf_counter()
+            if mode == 'transaction':
+                with part.transaction():
+                    generateDesign(part, num_helices, length)
+            else:
+                generateDesign(part, num_helices, length)
+            times.append(time.perf_counter() - t0)
+        print("%-8d %-7d %-13.1f %-10.1f" %
+              (num_helices, num_helices*length, times[0]*1e3, times[1]*1e3))
+# end def
+
+
+def benchMemory():
+    """Report the memory allocated per strand, with its oligo, by creating
+    20 base strands, and their segments, on every helix of a bundle, and per
+    strand by assigning abstract sequences to them, measured with
+    tracemalloc
+    """
+    print("helices  strands  bytes/strand  abstract_seq bytes/strand")
+    for num_helices in (10, 100):
+        length = 2000
+        part = createBundle(num_helices, length)
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for id_num in range(num_helices):
+            for strandset in part.getStrandSets(id_num):
+                for i in range(0, length - 19, 20):
+                    strandset.createStrand(i, i + 19, use_undostack=False)
+            part.refreshSegments(id_num)
+        created = tracemalloc.get_traced_memory()[0]
+        part.setAbstractSequences()
+        applied = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        num_strands = 2*num_helices*(length//20)
+        print("%-8d %-8d %-13.0f %-10.0f" % (num_helices, num_strands,
+              (created - before)/num_strands, (applied - created)/num_strands))
+# end def
+
+
+def benchApplySequence():
+    """Time applying a scaffold sequence to a bundle with a scaffold of
+    strands crossed over into one oligo and 21 base staples overlapping
+    them, its undo, and reading back the staple sequences
+    """
+    import random
+    from cadnano.oligo.applysequencecmd import ApplySequenceCommand
+    rng = random.Random(0)
+    length = 2100
+    print("helices  bases   scaffold strand  apply(ms)  undo(ms)  staples(ms)")
+    for num_helices, strand_length in ((10, 42), (50, 42), (50, 1050)):
+        part = createBundle(num_helices, length)
+        with part.transaction():
+            scaffold_strands = []
+            for id_num in range(num_helices):
+                fwd_ss, rev_ss = part.getStrandSets(id_num)
+                scaffold_strands += [fwd_ss.createStrand(i, i + strand_length - 1)
+                                     for i in range(0, length - strand_length + 1, strand_length)]
+                for i in range(0, length - 21, 21):
+                    rev_ss.createStrand(i, i + 20)
+            for strand5p, strand3p in zip(scaffold_strands, scaffold_strands[1:]):
+                part.createXover(strand5p, strand5p.idx3Prime(), strand3p, strand3p.idx5Prime())
+            for strand in scaffold_strands:
+                for i in range(strand.lowIdx() + 10, strand.highIdx(), 126):
+                    strand.addInsertion(i, 2)
+                    strand.addInsertion(i + 20, -1)
+        scaffold = scaffold_strands[0].oligo()
+        scaffold_length = sum(strand.totalLength() for strand in scaffold_strands)
+        sequence = ''.join(rng.choice('ACGT') for i in range(scaffold_length))
+        command = ApplySequenceCommand(scaffold, sequence)
+        t0 = time.perf_counter()
+        command.redo()
+        t1 = time.perf_counter()
+        staples = [oligo.sequence() for oligo in part.oligos()]
+        t2 = time.perf_counter()
+        assert scaffold.sequence() == sequence
+        command.undo()
+        t3 = time.perf_counter()
+        print("%-8d %-7d %-16d %-10.1f %-9.1f %-10.1f" % (num_helices, num_helices*length,
+              strand_length, (t1 - t0)*1e3, (t3 - t2)*1e3, (t2 - t1)*1e3))
+# end def
+
+
+def benchAbstractSequences():
+    """Time assigning abstract sequences to a bundle with a scaffold strand
+    and 21 base staples on every helix, and rendering them for export
+    """
+    print("helices  bases    assign(ms)  render(ms)  getSequences(ms)")
+    for num_helices in (10, 50):
+        length = 2100
+        part = createBundle(num_helices, length)
+        with part.transaction():
+            for id_num in range(num_helices):
+                fwd_ss, rev_ss = part.getStrandSets(id_num)
+                fwd_ss.createStrand(0, length - 1)
+                for i in range(0, length - 21, 21):
+                    rev_ss.createStrand(i, i + 20)
+        strands = [strand for id_num in range(num_helices)
+                   for strandset in part.getStrandSets(id_num) for strand in strandset]
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            part.setAbstractSequences()
+            t1 = time.perf_counter()
+        for strand in strands:
+            strand.abstractSeq()
+        t2 = time.perf_counter()
+        part.getSequences()
+        t3 = time.perf_counter()
+        print("%-8d %-8d %-11.1f %-11.1f %-10.1f" % (num_helices, num_helices*length,
+              (t1 - t0)*1e3, (t2 - t1)*1e3, (t3 - t2)*1e3))
+# end def
+
+
+def benchUndoHistory():
+    """Report the estimated size of the undo history after pasting copies of
+    a bundle and undoing every paste, with and without spilling old commands
+    to disk, and time the undos
+    """
+    print("helices  pastes  spill  history(MB)  memory(MB)  spill file(MB)  undo(s)")
+    for num_helices in (10, 50):
+        for spill_limit in (None, 0):
+            part = createBundle(num_helices, 2100)
+            with part.transaction():
+                for id_num in range(num_helices):
+                    fwd_ss, rev_ss = part.getStrandSets(id_num)
+                    fwd_ss.createStrand(0, 2099)
+                    for i in range(0, 2079, 21):
+                        rev_ss.createStrand(i, i + 20)
+            undostack = part.document().undoStack()
+            undostack.setSpillLimit(spill_limit)
+            clipboard = part.copyVirtualHelices(range(num_helices))
+            num_pastes = 5
+            for _ in range(num_pastes):
+                part.pasteVirtualHelices(clipboard)
+            stats = undostack.memoryStats()
+            history = stats['memory_bytes'] + stats['spilled_bytes']
+            t0 = time.perf_counter()
+            while undostack.canUndo():
+                undostack.undo()
+            print("%-8d %-7d %-6s %-12.1f %-11.1f %-15.1f %-7.2f" %
+                  (num_helices, num_pastes, 'off' if spill_limit is None else 'on',
+                   history/1e6, stats['memory_bytes']/1e6,
+                   stats['spill_file_bytes']/1e6, time.perf_counter() - t0))
+# end def
+
+
+BENCHMARKS = {
+    'spatial': benchSpatialQueries,
+    'neighbor': benchNeighborQuery,
+    'resize': benchResize,
+    'properties': benchProperties,
+    'bulkcreate': benchBulkCreate,
+    'streaming': benchStreamingDecode,
+    'legacy': benchLegacyDecode,
+    'binary': benchBinaryFormat,
+    'lazy': benchLazyDecode,
+    'save': benchIncrementalSave,
+    'strandset': benchStrandSet,
+    'segments': benchSegments,
+    'loadstrands': benchLoadStrands,
+    'paste': benchPaste,
+    'insertions': benchInsertions,
+    'oligos': benchOligos,
+    'refresholigos': benchRefreshOligos,
+    'signals': benchSignals,
+    'transaction': benchTransaction,
+    'memory': benchMemory,
+    'sequence': benchApplySequence,
+    'abstract': benchAbstractSequences,
+    'undo': benchUndoHistory,
+}
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or list(BENCHMARKS.keys())
+    for name in names:
+        print("== %s" % name)
+        BENCHMARKS[name]()
@@ -1,5 +1,10 @@
 # -*- coding: utf-8 -*-
 import sys, os, io, time
+import json
+import random
+import re
+
+import numpy as np
 
 import pytest
 
@@ -95,3 +100,433 @@ def testStapleOutput_Science09_prot120_98_v3(cnapp):
 #     # cnapp.writeRefSequences("gap_vs_skip.csv_2.csv", test_set)
 #     ref_set = cnapp.getRefSequences(refname)
 #     assert test_set == ref_set
+
+
+####################### File Decoding Tests ########################
+from pathsetup import TEST_PATH
+from cadnano.fileio.nnodecode import decodeFile
+from cadnano.fileio.cn5decode import CN5File
+from cadnano.fileio.v3encode import encodeDocument
+from cadnano.fileio.nnoencode import encode, IncrementalEncoder
+
+def comparableEncoding(doc):
+    """v3 JSON encoding of `doc` without the fields that differ per load"""
+    doc_dict = encodeDocument(doc)
+    doc_dict.pop('date')
+    for part_dict in doc_dict['parts']:
+        for key in ('name', 'uuid'):
+            part_dict.pop(key)
+        part_dict['insertions'] = sorted(part_dict['insertions'])
+        # oligo names come from object ids and the order from a set
+        oligos = [sorted((k, v) for k, v in oligo.items() if k != 'name')
+                  for oligo in part_dict['oligos']]
+        part_dict['oligos'] = sorted(oligos, key=repr)
+    return json.dumps(doc_dict, sort_keys=True,
+                      default=lambda x: x.tolist() if hasattr(x, 'tolist') else str(x))
+
+@pytest.mark.parametrize('designname', ['simple42legacy.json',
+                                        'Science09_prot120_98_v3.json',
+                                        'nanorobot.v2.json',
+                                        'octa.13.c25',
+                                        'simple.json'])
+def testStreamingDecode(designname):
+    """Streaming decode builds the same model as loading the whole file"""
+    path = os.path.join(TEST_PATH, 'data', designname)
+    assert (comparableEncoding(decodeFile(path, streaming=True)) ==
+            comparableEncoding(decodeFile(path)))
+
+@pytest.mark.parametrize('designname', ['Science09_prot120_98_v3.json',
+                                        'loops_and_skips.json',
+                                        'octa.13.c25',
+                                        'super_barcode_hex.json'])
+def testCN5RoundTrip(tmpdir, designname):
+    """A .cn5 file decodes to the same model that was written, sequences
+    included, and its sections match the v3 JSON encoding"""
+    doc = decodeFile(os.path.join(TEST_PATH, 'data', designname))
+    part = doc.activePart()
+    scaffold = max(part.oligos(), key=lambda oligo: oligo.length())
+    scaffold.applySequence(('ACGT'*scaffold.length())[:scaffold.length()], use_undostack=False)
+    path = str(tmpdir.join('design.cn5'))
+    doc.writeToFile(path)
+    doc2 = decodeFile(path)
+    assert comparableEncoding(doc2) == comparableEncoding(doc)
+    assert sorted(doc2.activePart().getSequences().splitlines()) == \
+        sorted(part.getSequences().splitlines())
+
+    cn5_file = CN5File(path)
+    part_dict = encodeDocument(doc)['parts'][0]
+    strands = cn5_file.section(0, 'strands')
+    assert len(strands) == sum(len(fwd) + len(rev) for fwd, rev in
+                               filter(None, part_dict['strands']['indices']))
+    assert sorted(map(tuple, part_dict['xovers'])) == sorted(cn5_file.section(0, 'xovers').tolist())
+    assert sorted(map(tuple, part_dict['insertions'])) == sorted(cn5_file.section(0, 'insertions').tolist())
+    origins = cn5_file.section(0, 'origins')
+    assert not origins.flags.writeable
+    assert np.array_equal(origins, part_dict['origins'][cn5_file.section(0, 'vh_ids')])
+
+def testIncrementalEncoder(designname='Science09_prot120_98_v3.json'):
+    """Reusing cached fragments gives the same file as a full encode after
+    each edit and after undoing them"""
+    doc = decodeFile(os.path.join(TEST_PATH, 'data', designname))
+    part = doc.activePart()
+    encoder = IncrementalEncoder()
+    undate = lambda text: re.sub(r'"date":"[^"]*"', '', text, count=1)
+
+    def check():
+        assert undate(encoder.encode(doc)) == undate(encode(doc))
+
+    check()
+    scaffold = max(part.oligos(), key=lambda oligo: oligo.length())
+    strands = list(scaffold.strand5p().generator3pStrand())
+    staples = sorted((oligo for oligo in part.oligos() if oligo is not scaffold),
+                     key=lambda oligo: (oligo.strand5p().length(), oligo.locString()))
+    staple, split_strand, removed_strand = staples[-1], staples[-2].strand5p(), staples[-3].strand5p()
+    new_id_num = max(part.getIdNums()) + 1
+    edits = [
+        lambda: scaffold.applySequence(('ACGT'*scaffold.length())[:scaffold.length()]),
+        lambda: staple.applyColor('#123456'),
+        lambda: staple.setProperty('name', 'renamed'),
+        lambda: strands[1].addInsertion((strands[1].lowIdx() + strands[1].highIdx()) // 2, 2),
+        lambda: part.removeXover(strands[0], strands[1]),
+        lambda: split_strand.split(split_strand.idx5Prime() + (3 if split_strand.isForward() else -3)),
+        lambda: removed_strand.strandSet().removeStrand(removed_strand),
+        lambda: part.setVirtualHelixProperties(0, 'name', 'vh-renamed'),
+        lambda: part.createVirtualHelix(1000., 1000., id_num=new_id_num, length=42),
+        lambda: part.getStrandSets(new_id_num)[0].createStrand(0, 20),
+        lambda: part.createVirtualHelix(1000., 1010., id_num=new_id_num + 1, length=42),
+        lambda: part.removeVirtualHelix(new_id_num + 1),
+    ]
+    for edit in edits:
+        edit()
+        check()
+    us = doc.undoStack()
+    for edit in edits:
+        us.undo()
+        check()
+    for edit in edits:
+        us.redo()
+        check()
+
+def checkOligoMembership(part):
+    """Every strand resolves to the oligo whose 5' to 3' walk visits it"""
+    strands = set()
+    for id_num in part.getIdNums():
+        for strandset in part.getStrandSets(id_num):
+            strands.update(strandset.strand_heap)
+    visited = set()
+    for oligo in part.oligos():
+        oligo_strands = list(oligo.strand5p().generator3pStrand())
+        assert all(strand.oligo() is oligo for strand in oligo_strands)
+        assert oligo.length() == sum(strand.totalLength() for strand in oligo_strands)
+        assert oligo.isLoop() == (oligo.strand5p().connection5p() is not None)
+        visited.update(oligo_strands)
+    assert visited == strands
+
+def testOligoMembership(designname='Science09_prot120_98_v3.json'):
+    """Oligos stay consistent through random crossover, split and merge edits
+    and through undoing and redoing them"""
+    import random
+    doc = decodeFile(os.path.join(TEST_PATH, 'data', designname))
+    part = doc.activePart()
+    rng = random.Random(3)
+    checkOligoMembership(part)
+
+    def strands():
+        return [strand for id_num in sorted(part.getIdNums())
+                for strandset in part.getStrandSets(id_num) for strand in strandset.strand_heap]
+
+    removed = []
+    num_edits = 0
+    for _ in range(120):
+        action = rng.randrange(4)
+        if action == 0:
+            xovers = [strand for strand in strands() if strand.connection3p() is not None]
+            if not xovers:
+                continue
+            strand5p = rng.choice(xovers)
+            strand3p = strand5p.connection3p()
+            part.removeXover(strand5p, strand3p)
+            removed.append((strand5p, strand3p))
+        elif action == 1 and removed:
+            strand5p, strand3p = removed.pop(rng.randrange(len(removed)))
+            if (strand5p.strandSet().isStrandInSet(strand5p) and
+                    strand3p.strandSet().isStrandInSet(strand3p) and
+                    strand5p.connection3p() is None and strand3p.connection5p() is None):
+                part.createXover(strand5p, strand5p.idx3Prime(), strand3p, strand3p.idx5Prime())
+            else:
+                continue
+        elif action == 2:
+            splittable = [strand for strand in strands() if strand.length() > 4]
+            if not splittable:
+                continue
+            strand = rng.choice(splittable)
+            if not strand.strandSet().splitStrand(strand, strand.lowIdx() + 2):
+                continue
+        else:
+            candidates = [strand for strand in strands()
+                          if strand.connectionHigh() is None and
+                          strand.strandSet().getNeighbors(strand)[1] is not None]
+            mergeable = [(strand, strand.strandSet().getNeighbors(strand)[1]) for strand in candidates]
+            mergeable = [(a, b) for a, b in mergeable
+                         if b.lowIdx() == a.highIdx() + 1 and b.connectionLow() is None]
+            if not mergeable:
+                continue
+            strand_low, strand_high = rng.choice(mergeable)
+            strand_low.strandSet().mergeStrands(strand_low, strand_high)
+        num_edits += 1
+        checkOligoMembership(part)
+    assert num_edits > 60
+    undostack = doc.undoStack()
+    num_undone = 0
+    while undostack.canUndo():
+        undostack.undo()
+        num_undone += 1
+        checkOligoMembership(part)
+    for _ in range(num_undone):
+        undostack.redo()
+        checkOligoMembership(part)
+
+def testJSONStreamReader():
+    """Values split across chunks are decoded whole"""
+    from cadnano.fileio.jsonstream import JSONStreamReader
+    text = '{"a": 12345678, "b": [1.5, {"c": [1, 2]}, "x y"], "d": []}'
+    reader = JSONStreamReader(io.StringIO(text), chunk_size=3)
+    out = {}
+    for key in reader.iterObjectKeys():
+        if key == 'b':
+            out[key] = list(reader.iterArray())
+        elif key == 'd':
+            reader.skipValue()
+        else:
+            out[key] = reader.readValue()
+    assert out == {'a': 12345678, 'b': [1.5, {'c': [1, 2]}, 'x y']}
+
+def testBatchSignals():
+    """Batched emissions keep their order, refresh signals are coalesced to
+    their last emission and everything is delivered when the batch exits"""
+    from cadnano.cnproxy import DummySignal, batchSignals
+    update = DummySignal(object, name='strandUpdateSignal')
+    changed = DummySignal(object, object, object, name='oligoPropertyChangedSignal')
+    removed = DummySignal(object, name='strandRemovedSignal')
+    received = []
+    update.connect(lambda strand: received.append(('update', strand)))
+    changed.connect(lambda oligo, key, value: received.append(('changed', oligo, key, value)))
+    removed.connect(lambda strand: received.append(('removed', strand)))
+    with batchSignals() as batch:
+        update.emit('a')
+        removed.emit('b')
+        update.emit('b')
+        changed.emit('o', 'color', 1)
+        with batchSignals() as inner:
+            assert inner is batch
+            update.emit('a')
+            changed.emit('o', 'length', 5)
+            changed.emit('o', 'color', 2)
+            removed.emit('b')
+        assert received == []
+    assert received == [('removed', 'b'), ('update', 'b'), ('update', 'a'),
+                        ('changed', 'o', 'length', 5), ('changed', 'o', 'color', 2),
+                        ('removed', 'b')]
+    assert batch.saved() == {'strandUpdateSignal': 1, 'oligoPropertyChangedSignal': 1}
+    del received[:]
+    update.emit('c')
+    assert received == [('update', 'c')]
+
+def referenceAbstractSequences(part):
+    """The AbstractSequence column of `part` numbered base by base: each
+    segment gets the next numbers the first time a strand reaches it, in the
+    order of the oligos and of their strands 5' to 3'"""
+    offsets = {}
+    total = 0
+    column = []
+    for oligo in part.oligos():
+        numbers = []
+        for strand in oligo.strand5p().generator3pStrand():
+            segments = strand.segments if strand.isForward() else strand.segments[::-1]
+            for segment in segments:
+                key = (strand.idNum(), segment)
+                length = segment[1] - segment[0] + 1
+                if key not in offsets:
+                    offsets[key] = total
+                    total += length
+                run = list(range(offsets[key], offsets[key] + length))
+                numbers += run if strand.isForward() else run[::-1]
+        column.append('(%s)' % ','.join(str(i) for i in numbers))
+    return column
+
+@pytest.mark.parametrize('designname', ['Science09_prot120_98_v3.json',
+                                        'loops_and_skips.json',
+                                        'octa.13.c25',
+                                        'super_barcode_hex.json'])
+def testAbstractSequences(capsys, designname):
+    """Vectorized abstract sequences export as numbered base by base"""
+    import pandas as pd
+    doc = decodeFile(os.path.join(TEST_PATH, 'data', designname))
+    part = doc.activePart()
+    expected = referenceAbstractSequences(part)
+    for _ in range(2):  # numbering again starts over
+        part.setAbstractSequences()
+        column = pd.read_csv(io.StringIO(part.getSequences()))['AbstractSequence']
+        assert column.tolist() == expected
+    for oligo in part.oligos():
+        for strand in oligo.strand5p().generator3pStrand():
+            assert strand.sequence() == '|'*strand.totalLength()
+
+def referenceStrands(records, vh_num, scaffold):
+    """Strand ends and 3' crossovers of one strand type of a legacy helix
+    tested base by base"""
+    offset = 1 if scaffold else -1
+    if vh_num % 2 == 1:
+        offset = -offset
+    ends, xovers = [], []
+    for i, (five_vh, five_idx, three_vh, three_idx) in enumerate(records):
+        if five_vh == -1 and three_vh == -1:
+            continue
+        if ((five_vh == vh_num) != (three_vh == vh_num) or
+                (five_vh == vh_num and five_idx != i - offset) or
+                (three_vh == vh_num and three_idx != i + offset) or
+                (five_vh == -1) != (three_vh == -1)):
+            ends.append(i)
+        if five_vh != vh_num and three_vh != vh_num:
+            ends.append(i)
+        if three_vh != -1 and (three_vh != vh_num or three_idx != i + offset):
+            xovers.append(i)
+    return [ends[i:i + 2] for i in range(0, len(ends), 2)], xovers
+
+@pytest.mark.parametrize('designname', ['Science09_prot120_98_v3.json',
+                                        'loops_and_skips.json',
+                                        'nanorobot.v2.json',
+                                        'super_barcode_hex.json'])
+def testLegacyStrandArrays(designname):
+    """Masks over the bases of legacy helices match reading them base by base"""
+    from cadnano.cnenum import StrandType
+    from cadnano.fileio.legacystrands import baseArray, readStrands, readInsertions
+    with open(os.path.join(TEST_PATH, 'data', designname)) as fd:
+        vstrands = json.load(fd)['vstrands']
+    for helix in vstrands:
+        vh_num = helix['num']
+        for key, strand_type in (('scaf', StrandType.SCAFFOLD),
+                                 ('stap', StrandType.STAPLE)):
+            segments, xovers = readStrands(baseArray(helix[key]), vh_num, strand_type)
+            assert ((segments.tolist(), xovers.tolist()) ==
+                    referenceStrands(helix[key], vh_num, key == 'scaf'))
+        assert readInsertions(helix['loop'], helix['skip']) == [
+            (i, loop + skip) for i, (loop, skip) in
+            enumerate(zip(helix['loop'], helix['skip'])) if loop + skip != 0]
+
+def comparablePartEncodings(doc):
+    """Per part `comparableEncoding` of `doc`, in an order that doesn't
+    depend on the order of the parts"""
+    return sorted(json.dumps(part_dict, sort_keys=True)
+                  for part_dict in json.loads(comparableEncoding(doc))['parts'])
+
+@pytest.mark.parametrize('ext', ['.json', '.cn5'])
+def testLazyPartDecode(tmpdir, ext):
+    """Parts of a lazily read file are decoded one at a time on access and
+    the ones never decoded are saved as they were read"""
+    doc = None
+    for designname in ('Science09_prot120_98_v3.json', 'loops_and_skips.json', 'octa.13.c25'):
+        doc = decodeFile(os.path.join(TEST_PATH, 'data', designname), document=doc)
+    path = str(tmpdir.join('multi' + ext))
+    doc.writeToFile(path)
+    expected = comparablePartEncodings(decodeFile(path))
+
+    lazy_doc = decodeFile(path, lazy=True)
+    assert len(lazy_doc.lazyParts()) == 3
+    assert list(lazy_doc.getParts(decode_lazy=False)) == []
+    part = lazy_doc.activePart()
+    assert part is not None and part.uuid in {p.uuid for p in doc.getParts()}
+    assert len(lazy_doc.lazyParts()) == 2
+    assert lazy_doc.activePart() is part
+
+    resaved = str(tmpdir.join('resaved' + ext))
+    lazy_doc.writeToFile(resaved)
+    assert len(lazy_doc.lazyParts()) == 2
+    assert comparablePartEncodings(decodeFile(resaved)) == expected
+    if ext == '.cn5':
+        # the undecoded parts are still read from the file being replaced
+        lazy_doc.writeToFile(path)
+        assert comparablePartEncodings(decodeFile(path)) == expected
+    else:
+        with open(path) as fd:
+            saved = {p['uuid']: p for p in json.load(fd)['parts']}
+        with open(resaved) as fd:
+            for part_dict in json.load(fd)['parts']:
+                if part_dict['uuid'] != part.uuid:
+                    assert part_dict == saved[part_dict['uuid']]
+
+    uuid = lazy_doc.lazyParts()[0].uuid
+    assert lazy_doc.getPartUUID(uuid).uuid == uuid
+    assert len(lazy_doc.lazyParts()) == 1
+    assert len(list(lazy_doc.getParts())) == 3
+    assert lazy_doc.lazyParts() == []
+    assert comparablePartEncodings(lazy_doc) == expected
+
+def testUndoStackSpill(designname='Science09_prot120_98_v3.json'):
+    """Undoing and redoing commands spilled to disk gives the same designs
+    as keeping them in memory, and the byte budget evicts the oldest"""
+    docs = [decodeFile(os.path.join(TEST_PATH, 'data', designname)) for _ in range(2)]
+    stacks = [doc.undoStack() for doc in docs]
+    stacks[1].setSpillLimit(0)
+
+    def makeEdits(part):
+        scaffold = max(part.oligos(), key=lambda oligo: (oligo.length(), oligo.locString()))
+        # the 5' strand of a loop depends on the load, so pick by position
+        strand5p = min((strand for strand in scaffold.strand5p().generator3pStrand()
+                        if strand.connection3p() is not None),
+                       key=lambda strand: (strand.idNum(), strand.lowIdx()))
+        strand3p = strand5p.connection3p()
+        staples = sorted((oligo for oligo in part.oligos() if oligo is not scaffold),
+                         key=lambda oligo: (oligo.strand5p().length(), oligo.locString()))
+        staple, split_strand = staples[-1], staples[-2].strand5p()
+        removed_strand = staples[-3].strand5p()
+        new_id_num = max(part.getIdNums()) + 1
+        return [
+            lambda: staple.applySequence(('ACGT'*staple.length())[:staple.length()]),
+            lambda: staple.applyColor('#123456'),
+            lambda: strand3p.addInsertion((strand3p.lowIdx() + strand3p.highIdx()) // 2, 2),
+            lambda: part.removeXover(strand5p, strand3p),
+            lambda: split_strand.split(split_strand.idx5Prime() + (3 if split_strand.isForward() else -3)),
+            lambda: removed_strand.strandSet().removeStrand(removed_strand),
+            lambda: part.setVirtualHelixProperties(0, 'name', 'vh-renamed'),
+            lambda: part.createVirtualHelix(1000., 1000., id_num=new_id_num, length=42),
+            lambda: part.getStrandSets(new_id_num)[0].createStrand(0, 20),
+            lambda: part.pasteVirtualHelices(part.copyVirtualHelices([0, 1, 2])),
+        ]
+
+    def check():
+        assert comparableEncoding(docs[0]) == comparableEncoding(docs[1])
+
+    edits = [makeEdits(doc.activePart()) for doc in docs]
+    for i, edit_pair in enumerate(zip(*edits)):
+        for edit in edit_pair:
+            random.seed(i)  # new oligos get random colors
+            edit()
+        check()
+    stats = stacks[1].memoryStats()
+    assert stats['undo_commands'] == len(edits[1])
+    assert stats['spilled_commands'] == len(edits[1]) - 1
+    assert stats['spill_file_bytes'] > 0
+    assert stats['memory_bytes'] < stacks[0].memoryStats()['memory_bytes']
+    for _ in range(len(edits[1])):
+        for undostack in stacks:
+            undostack.undo()
+        check()
+    assert stacks[1].memoryStats()['spill_file_bytes'] == 0
+    for _ in range(len(edits[1])):
+        for undostack in stacks:
+            undostack.redo()
+        check()
+
+    # a new command drops the undone ones
+    stacks[1].undo()
+    docs[1].activePart().setVirtualHelixProperties(0, 'name', 'vh-again')
+    assert not stacks[1].canRedo()
+
+    undostack = stacks[0]
+    sizes = undostack.memoryStats()['memory_bytes']
+    undostack.setByteLimit(sizes // 2)
+    stats = undostack.memoryStats()
+    assert 0 < stats['undo_commands'] < len(edits[0])
+    assert stats['evicted_commands'] == len(edits[0]) - stats['undo_commands']
+    assert stats['memory_bytes'] <= sizes // 2 or stats['undo_commands'] == 1
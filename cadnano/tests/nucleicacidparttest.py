@@ -1,8 +1,14 @@
 # -*- coding: utf-8 -*-
+import os
 import pytest
 import math
 
+import numpy as np
+from numpy.core.umath_tests import inner1d
+from ast import literal_eval
+
 from cntestcase import cnapp
+from pathsetup import TEST_PATH
 
 from cadnano.part.nucleicacidpart import NucleicAcidPart
 
@@ -50,5 +56,681 @@ def testRemove(cnapp):
     assert len(doc.children()) == 1
 
 
+def testVirtualHelixProperties(cnapp):
+    doc = cnapp.document
+    part = create3Helix(doc, (0, 0, 1), 42)
+    # neighbors are kept as integers but still read and written as strings
+    assert part.getVirtualHelixNeighbors(0) == [1, 2]
+    assert literal_eval(part.getVirtualHelixProperties(0, 'neighbors')) == [1, 2]
+    bpr, z, is_visible = part.getVirtualHelixProperties(1, ['bases_per_repeat', 'z', 'is_visible'])
+    assert (type(bpr), type(z), type(is_visible)) == (int, float, bool)
+    part.setVirtualHelixProperties(1, ['name', 'scamZ'], ['foo', 3.5], use_undostack=False)
+    props = part.getAllVirtualHelixProperties(1)
+    assert props['name'] == 'foo' and props['scamZ'] == 3.5
+    vh_props, origins = part.helixPropertiesAndOrigins([2, 1])
+    assert vh_props['name'] == ['vh2', 'foo']
+    assert vh_props['neighbors'][1] == part.getVirtualHelixProperties(1, 'neighbors')
+    assert origins.shape == (2, 2)
+    # a fractional value upcasts an integer column instead of being truncated
+    part.setVirtualHelixProperties(0, 'bases_per_repeat', 10.5, use_undostack=False)
+    assert part.getVirtualHelixProperties(0, 'bases_per_repeat') == 10.5
+    assert part.getVirtualHelixProperties(1, 'bases_per_repeat') == bpr
+    part.vh_properties.setRows([1, 2], 'turns_per_repeat', [1.5, 2])
+    assert part.getVirtualHelixProperties(1, ['turns_per_repeat', 'repeat_hint']) == [1.5, 2]
+    part.removeVirtualHelix(2)
+    assert 2 not in part.getVirtualHelixNeighbors(0)
+    part.undoStack().undo()
+    assert part.getVirtualHelixNeighbors(0) == [1, 2]
+
+
+def testCreateVirtualHelices(cnapp):
+    doc = cnapp.document
+    single_part = create3Helix(doc, (0, 0, 1), 42)
+    single_part.createVirtualHelix(20., 0., 1., id_num=5, length=63,
+                                   properties={'eulerZ': 40., 'bases_per_repeat': 32, 'turns_per_repeat': 3})
+    id_nums = [0, 1, 2, 5]
+    origins = [tuple(single_part.getCoordinate(id_num, 0)) for id_num in id_nums]
+    bulk_part = doc.createNucleicAcidPart()
+    properties = {'eulerZ': [0., 0., 0., 40.],
+                  'bases_per_repeat': [21, 21, 21, 32],
+                  'turns_per_repeat': [2, 2, 2, 3]}
+    assert bulk_part.createVirtualHelices(origins, sizes=[42, 42, 42, 63], properties=properties,
+                                          id_nums=id_nums) == id_nums
+    for id_num in id_nums:
+        for single_pts, bulk_pts in zip(single_part.getCoordinates(id_num),
+                                        bulk_part.getCoordinates(id_num)):
+            assert np.array_equal(single_pts, bulk_pts)
+        assert (bulk_part.getVirtualHelixNeighbors(id_num) ==
+                sorted(single_part.getVirtualHelixNeighbors(id_num)))
+    point = tuple(bulk_part.getCoordinate(1, 10))
+    assert (sorted(zip(*bulk_part.queryBasePoint(1., point))) ==
+            sorted(zip(*single_part.queryBasePoint(1., point))))
+
+    # new ID numbers are picked when none are given and neighbors are linked
+    # both ways
+    new_ids = bulk_part.createVirtualHelices([(0., -2*bulk_part.radius())])
+    assert new_ids == [6]
+    assert 6 in bulk_part.getVirtualHelixNeighbors(0)
+    us = bulk_part.undoStack()
+    us.undo()
+    assert 6 not in bulk_part.getVirtualHelixNeighbors(0)
+    us.undo()
+    assert len(bulk_part.getIdNums()) == 0
+    us.redo()
+    assert sorted(bulk_part.getIdNums()) == id_nums
+    assert bulk_part.getVirtualHelixProperties(5, 'bases_per_repeat') == 32
+
+
+def queryBasePointLinear(part, radius, point):
+    """Brute force version of `NucleicAcidPart._queryBasePoint` that checks
+    every point in the part, for testing and benchmarking
+
+    Args:
+        part (NucleicAcidPart):
+        radius (float): distance to consider
+        point (array-like): of :obj:`float` of length 3
+
+    Returns:
+        tuple: of :obj:`ndarray`
+    """
+    difference = part.axis_pts - point
+    # compute square of distance to point
+    delta = inner1d(difference, difference)
+    close_points, = np.where(delta < radius*radius)
+    return (np.take(part.id_nums, close_points),
+            np.take(part.indices, close_points))
+# end def
+
+def queryVirtualHelixOriginLinear(part, radius, point):
+    """Brute force version of `NucleicAcidPart._queryVirtualHelixOrigin` that
+    checks every origin in the part, for testing and benchmarking
+
+    Args:
+        part (NucleicAcidPart):
+        radius (float): distance to consider
+        point (array-like): of :obj:`float` of length 2
+
+    Returns:
+        ndarray: close origin points to `point`
+    """
+    difference = part._origin_pts - point
+    # compute square of distance to point
+    delta = inner1d(difference, difference)
+    close_points, = np.where(delta <= radius*radius)
+    # take then sort the indices of the points in range
+    sorted_idxs = np.argsort(np.take(delta, close_points))
+    return close_points[sorted_idxs]
+# end def
+
+def testSpatialIndexQueries(cnapp):
+    doc = cnapp.document
+    part = create3Helix(doc, (0, 0, 1), 42)
+    radius = part.radius()
+    part.createVirtualHelix(4*radius, 0, id_num=3, length=42)
+    part.setVirtualHelixSize(0, 84)
+    part.translateVirtualHelices({2}, 0.5, 0.25, 0, True, use_undostack=True)
+    part.removeVirtualHelix(1)
+
+    points = [(0, 0, 0), (0, 2*radius, 5.), (4*radius, 0, 10.), (radius, radius, 20.)]
+    for point in points:
+        for r in (0.5, 2*radius, 10.):
+            id_nums, indices = part._queryBasePoint(r, point)
+            lin_id_nums, lin_indices = queryBasePointLinear(part, r, point)
+            assert id_nums.tolist() == lin_id_nums.tolist()
+            assert indices.tolist() == lin_indices.tolist()
+            origins = part._queryVirtualHelixOrigin(r, point[:2])
+            lin_origins = queryVirtualHelixOriginLinear(part, r, point[:2])
+            assert origins.tolist() == lin_origins.tolist()
+    neighbors = part.getNeighbors(0, 3*radius, idx=10)
+    assert neighbors
+    assert all(id_num != 0 for id_num, idx in neighbors)
+
+def queryIdNumNeighborLoop(part, id_num, neighbors, index=None):
+    """Get indices of all virtual helices phosphates within a bond
+    length of each phosphate for the id_num Virtual Helix.
+
+    Reference version of `NucleicAcidPart.queryIdNumNeighbor` that loops
+    over every phosphate in Python, for testing and benchmarking
+
+    Args:
+        part (NucleicAcidPart):
+        id_num (int): virtual helix ID number
+        neighbors (array-like): neighbors of id_num
+        index_slice (tuple):  optional, of :obj:`int` (start_index, length) into a virtual
+            helix
+
+    Returns:
+        dict: of :obj:`tuple` of form::
+
+            neighbor_id_num: (fwd_hit_list, rev_hit_list)
+
+        where each list has the form:
+
+            [(id_num_index, forward_neighbor_idxs, reverse_neighbor_idxs), ...]]
+
+    Raises:
+        ValueError:
+    """
+    offset_and_size = part.getOffsetAndSize(id_num)
+    if offset_and_size is None:
+        raise ValueError("offset_and_size is None for {}".format(id_num))
+    else:
+        offset, size = offset_and_size
+    bpr, tpr = part.vh_properties.get(id_num,
+                                      ('bases_per_repeat', 'turns_per_repeat'))
+    bases_per_turn = bpr / tpr
+    if index is None:
+        start, length = 0, size
+    else:
+        half_period = bpr // 2
+        if size - index < bpr:
+            start, length = size - bpr, bpr
+        else:
+            start, length = max(index - half_period, 0), bpr
+    # norm = np.linalg.norm
+    # cross = np.cross
+    # dot = np.dot
+    # normalize = part.normalize
+    PI = math.pi
+    # TWOPI = 2*PI
+    RADIUS = part._radius
+    BW = part._BASE_WIDTH
+
+    # theta, radius = part.radiusForAngle(alpha, RADIUS, bases_per_turn, BW)
+    # convert to a list since we can't speed this loop up without cython or something
+    # axis_pts = part.axis_pts
+    fwd_pts = part.fwd_pts
+    rev_pts = part.rev_pts
+    # this_axis_pts = axis_pts[offset + start:offset + start + length].tolist()
+    this_fwd_pts = fwd_pts[offset + start:offset + start + length].tolist()
+    this_rev_pts = rev_pts[offset + start:offset + start + length].tolist()
+
+    """TODO: decide how we want to handle maintaining bond length
+    ideal adjacent ANTI-PARALLEL xover strands project to a plane normal
+    to the helical axis and point in the SAME direction
+
+    ideal adjacent PARALLEL xover strands  project to a plane normal
+    to the helical axis and point in the OPPOSITE directions
+
+    NOTE:
+    For now we use zdelta to get the right results for this 2.5 release
+    for PARALLEL and ANTI-PARALLEL.
+    """
+    # 1. compute generallized r squared values for an ideal crossover of
+    # both types
+    half_twist_per_base = PI/bases_per_turn
+    # r2_radial = (2.*RADIUS*(1. - math.cos(half_twist_per_base)))**2
+    # r2_tangent = (2.*RADIUS*math.sin(half_twist_per_base))**2
+    # r2_axial = BW*BW
+
+    # MISALIGNED by 27.5% twist per base so that's 1.55*half_twist_per_base
+    # ma_f = 1.55 # NC should be this if we wanted to be strict
+    ma_f = 2.55  # NC changed to this to show all xovers in legacy Honeycomb
+    r2_radial = (RADIUS*((1. - math.cos(half_twist_per_base)) +
+                         (1. - math.cos(ma_f*half_twist_per_base))))**2
+    r2_tangent = (RADIUS*(math.sin(half_twist_per_base) +
+                          math.sin(ma_f*half_twist_per_base)))**2
+    r2_axial = BW*BW
+
+    # print("r2:", r2_radial, r2_tangent, r2_axial)
+    # 2. ANTI-PARALLEL
+    rsquared_ap = r2_tangent + r2_radial
+    rsquared_ap_min = 0
+    rsquared_ap_max = rsquared_ap
+
+    # 3. PARALLEL
+    rsquared_p = r2_tangent + r2_radial + r2_axial
+    rsquared_p_min = r2_axial
+    rsquared_p_max = rsquared_p + 0.25*r2_axial
+    per_neighbor_hits = {}
+
+    fwd_axis_pairs = {}
+    rev_axis_pairs = {}
+
+    for neighbor_id in neighbors:
+        offset, size = part.getOffsetAndSize(neighbor_id)
+
+        # 1. Finds points that point at neighbors axis point
+        nfwd_pts = fwd_pts[offset:offset + size]
+        nrev_pts = rev_pts[offset:offset + size]
+
+        # direction = part.directions[neighbor_id]
+        len_neighbor_pts = len(nfwd_pts)
+        delta = np.empty((len_neighbor_pts,), dtype=float)
+
+        fwd_axis_hits = []
+        for i, point in enumerate(this_fwd_pts):
+            difference = nfwd_pts - point
+            inner1d(difference, difference, out=delta)
+            zdelta = np.square(difference[:, 2])
+            # assume there is only one possible index of intersection with the neighbor
+            f_idxs = np.where((delta > rsquared_p_min) &
+                              (delta < rsquared_p_max) &
+                              (zdelta > 0.3*r2_axial) &
+                              (zdelta < 1.1*r2_axial)
+                              )[0].tolist()
+            difference = nrev_pts - point
+            inner1d(difference, difference, out=delta)
+            zdelta = np.square(difference[:, 2])
+            # assume there is only one possible index of intersection with the neighbor
+            r_idxs = np.where((delta > rsquared_ap_min) &
+                              (delta < rsquared_ap_max) &
+                              (zdelta < 0.3*r2_axial))[0].tolist()
+            if f_idxs or r_idxs:
+                fwd_axis_hits.append((start + i, f_idxs, r_idxs))
+        # end for
+
+        # Scan for pairs of bases in AP xovers
+        idx_last = -2
+        fwd_axis_pairs = {}
+        isAGreaterThanB_Z = part.isAGreaterThanB_Z
+        for i, f_idxs, r_idxs in fwd_axis_hits:
+            if r_idxs:
+                if idx_last + 1 == i:
+                    # print("pair", idx_last, i)
+                    fwd_axis_pairs[idx_last] = (True, neighbor_id)  # 5 prime  most strand
+                    fwd_axis_pairs[i] = (False, neighbor_id)        # 3 prime most strand
+                idx_last = i
+            if f_idxs:
+                for idxB in f_idxs:
+                    if isAGreaterThanB_Z(id_num, i, neighbor_id, idxB):
+                        fwd_axis_pairs[i] = (False, neighbor_id)
+                    else:
+                        fwd_axis_pairs[i] = (True, neighbor_id)
+
+        rev_axis_hits = []
+        for i, point in enumerate(this_rev_pts):
+            difference = nfwd_pts - point
+            inner1d(difference, difference, out=delta)
+            zdelta = np.square(difference[:, 2])
+            # assume there is only one possible index of intersection with the neighbor
+            f_idxs = np.where((delta > rsquared_ap_min) &
+                              (delta < rsquared_ap_max) &
+                              (zdelta < 0.3*r2_axial))[0].tolist()
+
+            difference = nrev_pts - point
+            inner1d(difference, difference, out=delta)
+            zdelta = np.square(difference[:, 2])
+            # assume there is only one possible index of intersection with the neighbor
+            r_idxs = np.where((delta > rsquared_p_min) &
+                              (delta < rsquared_p_max) &
+                              (zdelta > 0.3*r2_axial) &
+                              (zdelta < 1.1*r2_axial)
+                              )[0].tolist()
+            if f_idxs or r_idxs:
+                rev_axis_hits.append((start + i, f_idxs, r_idxs))
+        # end for
+
+        # Scan for pairs of bases in AP xovers
+        idx_last = -2
+        for i, f_idxs, r_idxs in rev_axis_hits:
+            if f_idxs:
+                if idx_last + 1 == i:
+                    # print("pair", idx_last, i)
+                    rev_axis_pairs[idx_last] = (False, neighbor_id)    # 3 prime  most strand
+                    rev_axis_pairs[i] = (True, neighbor_id)            # 5 prime most strand
+                idx_last = i
+            if r_idxs:
+                for idxB in r_idxs:
+                    if isAGreaterThanB_Z(id_num, i, neighbor_id, idxB):
+                        rev_axis_pairs[i] = (True, neighbor_id)
+                    else:
+                        rev_axis_pairs[i] = (False, neighbor_id)
 
+        per_neighbor_hits[neighbor_id] = (fwd_axis_hits, rev_axis_hits)
+    # end for
+    return per_neighbor_hits, (fwd_axis_pairs, rev_axis_pairs)
+# end def
 
+@pytest.mark.parametrize('designname', ['Nature09_squarenut.json', 'super_barcode_hex.json'])
+def testQueryIdNumNeighborRegression(cnapp, designname):
+    """The batched neighbor query must match the per phosphate loop"""
+    doc = cnapp.document
+    doc.readFile(os.path.join(TEST_PATH, 'data', designname))
+    part = doc.activePart()
+    for id_num in sorted(part.getIdNums()):
+        neighbors = literal_eval(part.getVirtualHelixProperties(id_num, 'neighbors'))
+        _, size = part.getOffsetAndSize(id_num)
+        for index in (None, 0, size // 2, size - 1):
+            expected = queryIdNumNeighborLoop(part, id_num, neighbors, index=index)
+            assert part.queryIdNumNeighbor(id_num, neighbors, index=index) == expected
+
+def testPotentialCrossoverMapCache(cnapp):
+    doc = cnapp.document
+    part = create3Helix(doc, (0, 0, 1), 84)
+
+    def checkAll():
+        for id_num in part.getIdNums():
+            neighbors = literal_eval(part.getVirtualHelixProperties(id_num, 'neighbors'))
+            for idx in (None, 0, 30, 83):
+                expected = part.queryIdNumNeighbor(id_num, neighbors, index=idx)
+                assert part.potentialCrossoverMap(id_num, idx) == expected
+
+    checkAll()
+    assert part._xover_cache
+    # moving and resizing helices must drop the affected cache entries
+    part.translateVirtualHelices({1}, 0.1, 0.0, 0.34, True, use_undostack=True)
+    assert all(1 not in key for key in part._xover_cache)
+    checkAll()
+    part.setVirtualHelixSize(0, 126)
+    assert all(0 not in key for key in part._xover_cache)
+    checkAll()
+    part.setVirtualHelixProperties(2, 'eulerZ', 40., use_undostack=False)
+    part.resetCoordinates(2)
+    assert all(2 not in key for key in part._xover_cache)
+    checkAll()
+    part.undoStack().undo()
+    part.undoStack().undo()
+    checkAll()
+
+def testSlabStorage(cnapp):
+    """Helices grow and shrink in place or move to a new slab without
+    disturbing each other, and compact packs them back together"""
+    doc = cnapp.document
+    part = create3Helix(doc, (0, 0, 1), 42)
+    radius = part.radius()
+    part.createVirtualHelix(4*radius, 0, id_num=3, length=42)
+    before = {id_num: [a.copy() for a in part.getCoordinates(id_num)] for id_num in (1, 2, 3)}
+
+    def checkHelix(id_num, size):
+        offset, length = part.getOffsetAndSize(id_num)
+        assert length == size
+        assert part.id_nums[offset:offset + size].tolist() == [id_num]*size
+        assert part.getIndices(id_num).tolist() == list(range(size))
+        slab_start, capacity = part._slabs[id_num]
+        assert slab_start <= offset and offset + size <= slab_start + capacity
+
+    # grow past the initial padding at both ends, then trim
+    for i in range(10):
+        part._resizeHelix(0, True, 21)
+        part._resizeHelix(0, False, 21)
+    checkHelix(0, 42 + 20*21)
+    grown = [a.copy() for a in part.getCoordinates(0)]
+    part._resizeHelix(0, True, -100)
+    part._resizeHelix(0, False, -100)
+    size = 42 + 20*21 - 200
+    checkHelix(0, size)
+    trimmed = part.getCoordinates(0)
+    assert np.shares_memory(trimmed[0], part.axis_pts)
+    for a, b in zip(grown, trimmed):
+        assert np.array_equal(a[100:-100], b)
+
+    for id_num, pts in before.items():
+        checkHelix(id_num, 42)
+        for a, b in zip(pts, part.getCoordinates(id_num)):
+            assert np.array_equal(a, b)
+
+    part.removeVirtualHelix(1)
+    coords0 = [a.copy() for a in part.getCoordinates(0)]
+    part.compact()
+    assert part.total_points == size + 2*42
+    assert part._arena_end == part.total_points
+    checkHelix(0, size)
+    for a, b in zip(coords0, part.getCoordinates(0)):
+        assert np.array_equal(a, b)
+    for id_num in (2, 3):
+        checkHelix(id_num, 42)
+        for a, b in zip(before[id_num], part.getCoordinates(id_num)):
+            assert np.array_equal(a, b)
+    point = tuple(part.getCoordinate(0, 50))
+    for r in (0.5, 3.):
+        id_nums, indices = part._queryBasePoint(r, point)
+        lin_id_nums, lin_indices = queryBasePointLinear(part, r, point)
+        assert id_nums.tolist() == lin_id_nums.tolist()
+        assert indices.tolist() == lin_indices.tolist()
+    # growing again after compacting relocates the helix
+    part._resizeHelix(2, True, 21)
+    checkHelix(2, 63)
+
+
+def testInsertionIndex(cnapp):
+    """Indexed insertion queries match a scan over the insertions"""
+    import random
+    doc = cnapp.document
+    HELIX_LENGTH = 420
+    part = create3Helix(doc, (0, 0, 1), HELIX_LENGTH)
+    fwd_ss, rev_ss = part.getStrandSets(0)
+    scaffold = fwd_ss.createStrand(0, HELIX_LENGTH - 1)
+    staple = rev_ss.createStrand(100, 300)
+    insertion_index = part.insertions()[0]
+    rng = random.Random(5)
+    for _ in range(200):
+        idx = rng.randrange(HELIX_LENGTH)
+        if insertion_index.get(idx) is None:
+            scaffold.addInsertion(idx, rng.choice((-1, 1, 2, 5)))
+        elif rng.random() < 0.5:
+            scaffold.changeInsertion(idx, rng.choice((-1, 3)))
+        else:
+            scaffold.removeInsertion(idx)
+    assert len(insertion_index) > 50
+
+    def check():
+        lengths = {idx: insertion.length() for idx, insertion in insertion_index.items()}
+        assert list(insertion_index) == sorted(lengths)
+        for idx_low, idx_high in ((0, HELIX_LENGTH - 1), (100, 300), (5, 5), (37, 211), (300, 100)):
+            expected = [idx for idx in sorted(lengths) if idx_low <= idx <= idx_high]
+            assert [x.idx() for x in staple.insertionsOnStrand(idx_low, idx_high)] == expected
+            assert (scaffold.insertionLengthBetweenIdxs(idx_low, idx_high) ==
+                    sum(lengths[idx] for idx in expected))
+        assert scaffold.totalLength() == HELIX_LENGTH + sum(lengths.values())
+        assert sorted(part.dumpInsertions()) == sorted((0, idx, length) for idx, length in lengths.items())
+        return lengths
+
+    final = check()
+    undostack = doc.undoStack()
+    for _ in range(100):
+        undostack.undo()
+    check()
+    for _ in range(100):
+        undostack.redo()
+    assert check() == final
+# end def
+
+
+def testRefreshOligos(cnapp):
+    """Chains joined without oligo updates get one oligo each, reported by a
+    single partOligosRebuiltSignal"""
+    from cadnano.part.refresholigoscmd import RefreshOligosCommand
+    from cadnano.strand import Strand
+    doc = cnapp.document
+    part = create3Helix(doc, (0, 0, 1), 420)
+    fwd_ss = part.getStrandSets(0)[0]
+    strands = [fwd_ss.createStrand(i*20, i*20 + 15, use_undostack=False) for i in range(20)]
+    chain, loop = strands[:12], strands[12:]
+    for strand5p, strand3p in list(zip(chain, chain[1:])) + list(zip(loop, loop[1:] + loop[:1])):
+        part.createXover(strand5p, strand5p.idx3Prime(), strand3p, strand3p.idx5Prime(),
+                         update_oligo=False, use_undostack=False)
+    assert len(part.oligos()) == 20
+
+    old_oligos = [strand.oligo() for strand in strands]
+    rebuilt, has_new_oligo = [], []
+    on_rebuilt = lambda part, strands: rebuilt.append(list(strands))
+    on_new_oligo = lambda strand: has_new_oligo.append(strand)
+    part.partOligosRebuiltSignal.connect(on_rebuilt)
+    Strand.strandHasNewOligoSignal.connect(on_new_oligo)
+    try:
+        RefreshOligosCommand(part).redo()
+    finally:
+        part.partOligosRebuiltSignal.disconnect(on_rebuilt)
+        Strand.strandHasNewOligoSignal.disconnect(on_new_oligo)
+    # every strand of a chain is sent, the first ones kept their oligo
+    kept = [strand for strand, oligo in zip(strands, old_oligos) if strand.oligo() is oligo]
+    assert len(kept) == 2
+    assert len(rebuilt) == 1 and set(rebuilt[0]) == set(strands)
+    assert has_new_oligo == []
+
+    assert len(part.oligos()) == 2
+    chain_oligo, loop_oligo = chain[5].oligo(), loop[3].oligo()
+    assert all(strand.oligo() is chain_oligo for strand in chain)
+    assert all(strand.oligo() is loop_oligo for strand in loop)
+    assert chain_oligo.strand5p() is chain[0] and not chain_oligo.isLoop()
+    assert loop_oligo.isLoop()
+    assert chain_oligo.length() == 12*16 and loop_oligo.length() == 8*16
+# end def
+
+
+def testRefreshOligosDecode(cnapp):
+    """Decoding creates xovers without oligo updates, so every connected
+    strand, including the 5' strand of each oligo and the strands that keep
+    their oligo, is sent to be redrawn"""
+    from cadnano.fileio.nnodecode import decodeFile
+    rebuilt = []
+    on_rebuilt = lambda part, strands: rebuilt.extend(strands)
+    NucleicAcidPart.partOligosRebuiltSignal.connect(on_rebuilt)
+    try:
+        part = decodeFile(os.path.join(TEST_PATH, 'data', 'simple.json')).activePart()
+    finally:
+        NucleicAcidPart.partOligosRebuiltSignal.disconnect(on_rebuilt)
+    rebuilt = set(rebuilt)
+    connected = set(strand for id_num in part.getIdNums()
+                    for strandset in part.getStrandSets(id_num) for strand in strandset
+                    if strand.connection5p() is not None or strand.connection3p() is not None)
+    assert connected and connected <= rebuilt
+    assert all(oligo.strand5p() in rebuilt for oligo in part.oligos()
+               if oligo.strand5p() in connected)
+# end def
+
+
+def testTransaction(cnapp):
+    """A transaction gives the same design as the same edits made one by one,
+    and is rolled back on error or undone in one step"""
+    from cadnano.document import Document
+    HELIX_LENGTH = 210
+
+    def design(part):
+        strands = {}
+        for id_num in range(3):
+            fwd_ss, rev_ss = part.getStrandSets(id_num)
+            strands[id_num] = fwd_ss.createStrand(0, HELIX_LENGTH - 1)
+            staples = [rev_ss.createStrand(i*42, i*42 + 41) for i in range(HELIX_LENGTH // 42)]
+            part.createXover(staples[2], staples[2].idx3Prime(), staples[1], staples[1].idx5Prime())
+            staples[4].split(180)
+        for id_num in range(2):
+            strand5p, strand3p = strands[id_num], strands[id_num + 1]
+            part.createXover(strand5p, strand5p.idx3Prime(), strand3p, strand3p.idx5Prime())
+        scaffold = strands[0].oligo()
+        scaffold.applySequence('ACGT'*(scaffold.length() // 4 + 1))
+        for idx in range(10, HELIX_LENGTH - 10, 25):
+            strands[1].addInsertion(idx, -1 if idx % 2 else 2)
+
+    def state(part):
+        out = []
+        for id_num in part.getIdNums():
+            for strandset in part.getStrandSets(id_num):
+                for strand in strandset.strand_heap:
+                    oligo = strand.oligo()
+                    out.append((id_num, strandset.isForward(), strand.idxs(), strand.segments,
+                                oligo.locString(), oligo.length(), oligo.sequence(),
+                                strand.totalLength()))
+        return sorted(out), sorted(part.dumpInsertions())
+
+    expected_part = create3Helix(Document(), (0, 0, 1), HELIX_LENGTH)
+    design(expected_part)
+    for id_num in expected_part.getIdNums():
+        expected_part.refreshSegments(id_num)
+    expected = state(expected_part)
+    # the insertions blanked the scaffold sequence
+    assert expected_part.getStrand(True, 1, 0).oligo().sequence() is None
+
+    doc = cnapp.document
+    part = create3Helix(doc, (0, 0, 1), HELIX_LENGTH)
+    undostack = doc.undoStack()
+    empty = state(part)
+    num_undo = len(undostack.undostack)
+    with pytest.raises(ZeroDivisionError):
+        with part.transaction():
+            design(part)
+            1/0
+    assert state(part) == empty
+    assert len(undostack.undostack) == num_undo
+
+    with part.transaction():
+        design(part)
+    assert state(part) == expected
+    assert len(undostack.undostack) == num_undo
+
+    part = create3Helix(doc, (0, 0, 1), HELIX_LENGTH)
+    num_undo = len(undostack.undostack)
+    with part.transaction(undo=True):
+        design(part)
+    assert state(part) == expected
+    assert len(undostack.undostack) == num_undo + 1
+    undostack.undo()
+    assert state(part) == empty
+    undostack.redo()
+    assert state(part) == expected
+
+    # edits of another part are pushed as usual and not rolled back
+    other_part = create3Helix(doc, (0, 0, 1), HELIX_LENGTH)
+    part = create3Helix(doc, (0, 0, 1), HELIX_LENGTH)
+    num_undo = len(undostack.undostack)
+    with pytest.raises(ZeroDivisionError):
+        with part.transaction():
+            design(part)
+            other_part.getStrandSets(0)[0].createStrand(0, 41)
+            1/0
+    assert state(part) == empty
+    assert len(undostack.undostack) == num_undo + 1
+    assert other_part.getStrand(True, 0, 0) is not None
+# end def
+
+
+def testPasteVirtualHelices(cnapp):
+    """Pasting a clipboard of virtual helices builds the same helices as
+    `importToPart` of `encodePartList`, and is undone in one step"""
+    from cadnano.document import Document
+    from cadnano.fileio.nnodecode import decodeFile
+    from cadnano.fileio.v3decode import importToPart
+    from cadnano.fileio.v3encode import encodePartList
+    path = os.path.join(TEST_PATH, 'data', 'super_barcode_hex.json')
+
+    class PartInstance(object):
+        def __init__(self, part):
+            self._part = part
+
+        def reference(self):
+            return self._part
+
+        def properties(self):
+            return {}
+
+    def state(part, id_nums):
+        out = []
+        for id_num in id_nums:
+            for strandset in part.getStrandSets(id_num):
+                for strand in strandset.strand_heap:
+                    strand3p = strand.connection3p()
+                    out.append((id_num, strandset.isForward(), strand.idxs(), strand.segments,
+                                strand.getColor(), strand.oligo().length(),
+                                strand3p.dump5p() if strand3p is not None else None))
+            out.append(sorted((idx, insertion.length())
+                              for idx, insertion in part.insertions()[id_num].items()))
+            out.append(part.getVirtualHelixProperties(id_num, ['name', 'eulerZ', 'z', 'length']))
+            out.append(tuple(part.getVirtualHelixOrigin(id_num)))
+        return out
+
+    expected_part = decodeFile(path, document=Document()).activePart()
+    id_nums = sorted(expected_part.getIdNums())[2:9]
+    copy_dict = encodePartList(PartInstance(expected_part), list(id_nums))
+    new_id_nums = sorted(importToPart(PartInstance(expected_part), copy_dict))
+    expected = state(expected_part, new_id_nums)
+
+    doc = cnapp.document
+    part = decodeFile(path, document=doc).activePart()
+    num_oligos = len(part.oligos())
+    clipboard = part.copyVirtualHelices(id_nums)
+    assert len(clipboard) == len(id_nums) and len(clipboard.xovers) > 0
+    undostack = doc.undoStack()
+    num_undo = len(undostack.undostack)
+    assert part.pasteVirtualHelices(clipboard) == new_id_nums
+    assert len(undostack.undostack) == num_undo + 1
+    assert state(part, new_id_nums) == expected
+    for oligo in part.oligos():
+        strands = list(oligo.strand5p().generator3pStrand())
+        assert oligo.length() == sum(strand.totalLength() for strand in strands)
+    undostack.undo()
+    assert not set(new_id_nums) & set(part.getIdNums())
+    assert len(part.oligos()) == num_oligos
+    undostack.redo()
+    assert state(part, new_id_nums) == expected
+# end def
@@ -4,6 +4,8 @@ import math
 from cntestcase import cnapp
 
 from nucleicacidparttest import create3Helix
+from cadnano import util
+from cadnano.strand import Strand
 
 def testStrandset(cnapp):
     doc = cnapp.document
@@ -79,4 +81,262 @@ def testStrandset(cnapp):
 
 
     # resize --> resize Part???
-# end def
\ No newline at end of file
+# end def
+def testStrandsetQueries(cnapp):
+    """Interval queries match a scan over every base"""
+    doc = cnapp.document
+    HELIX_LENGTH = 210
+    part = create3Helix(doc, [0, 0, 1], HELIX_LENGTH)
+    fwd_ss, rev_ss = part.getStrandSets(1)
+    strands = [fwd_ss.createStrand(low, high) for low, high in
+               ((0, 9), (10, 30), (45, 45), (60, 100), (150, 209))]
+    strands[3].resize((55, 110))
+    fwd_ss.removeStrand(strands[1])
+    assert fwd_ss.getStrandIndex(strands[3]) == (True, 55)
+    assert fwd_ss.getStrandIndex(strands[1]) == (False, 0)
+
+    def strandAt(idx):
+        for strand in (strands[0], strands[2], strands[3], strands[4]):
+            if strand.lowIdx() <= idx <= strand.highIdx():
+                return strand
+        return None
+
+    by_base = [strandAt(idx) for idx in range(HELIX_LENGTH)]
+    for idx in range(HELIX_LENGTH):
+        assert fwd_ss.getStrand(idx) is by_base[idx]
+        if by_base[idx] is None:
+            low, high = fwd_ss.getBoundsOfEmptyRegionContaining(idx)
+            assert all(x is None for x in by_base[low:high + 1])
+            assert low == 0 or by_base[low - 1] is not None
+            assert high == HELIX_LENGTH - 1 or by_base[high + 1] is not None
+    assert fwd_ss.getStrand(-1) is strands[4]
+    with pytest.raises(IndexError):
+        fwd_ss.getStrand(HELIX_LENGTH)
+    for idx_low, idx_high in ((0, 0), (10, 44), (10, 45), (31, 54), (46, 160), (111, 149), (0, 209)):
+        expected = []
+        for strand in by_base[idx_low:idx_high + 1]:
+            if strand is not None and strand not in expected:
+                expected.append(strand)
+        assert fwd_ss.getOverlappingStrands(idx_low, idx_high) == expected
+        assert fwd_ss.hasStrandAt(idx_low, idx_high) == bool(expected)
+# end def
+
+
+def testIncrementalSegments(cnapp):
+    """Segments updated locally after every edit match a full refresh"""
+    import random
+    doc = cnapp.document
+    HELIX_LENGTH = 210
+    part = create3Helix(doc, [0, 0, 1], HELIX_LENGTH)
+    fwd_ss, rev_ss = part.getStrandSets(2)
+    rng = random.Random(12)
+
+    def randomStrand():
+        strands = fwd_ss.strand_heap + rev_ss.strand_heap
+        return rng.choice(strands) if strands else None
+
+    for _ in range(300):
+        action = rng.randrange(7)
+        strand = randomStrand()
+        if action >= 4 or strand is None:
+            strandset = rng.choice((fwd_ss, rev_ss))
+            low = rng.randrange(HELIX_LENGTH)
+            strandset.createStrand(low, min(low + rng.randrange(1, 30), HELIX_LENGTH - 1))
+        elif action == 1:
+            strand.strandSet().removeStrand(strand)
+        elif action == 2:
+            low, high = strand.idxs()
+            strand.strandSet().splitStrand(strand, rng.randint(low, high))
+        elif action == 3:
+            strandset = strand.strandSet()
+            low_neighbor, high_neighbor = strandset.getNeighbors(strand)
+            if high_neighbor is not None and high_neighbor.lowIdx() == strand.highIdx() + 1:
+                strandset.mergeStrands(strand, high_neighbor)
+        else:
+            strandset = strand.strandSet()
+            low_neighbor, high_neighbor = strandset.getNeighbors(strand)
+            low_bound = 0 if low_neighbor is None else low_neighbor.highIdx() + 1
+            high_bound = HELIX_LENGTH - 1 if high_neighbor is None else high_neighbor.lowIdx() - 1
+            new_low = rng.randint(low_bound, strand.highIdx())
+            strand.resize((new_low, rng.randint(new_low, high_bound)))
+        # split and merge leave the update to a RefreshSegmentsCommand
+        part.updateSegments(2)
+        segments = ([x.segments for x in fwd_ss.strand_heap],
+                    [x.segments for x in rev_ss.strand_heap])
+        assert part._refreshSegments(fwd_ss, rev_ss) == segments
+    assert fwd_ss.strandCount() + rev_ss.strandCount() > 5
+# end def
+
+
+def testCompactStrands(cnapp):
+    doc = cnapp.document
+    HELIX_LENGTH = 42
+    part = create3Helix(doc, [0, 0, 1], HELIX_LENGTH)
+    fwd_ss, rev_ss = part.getStrandSets(0)
+    fwd_strand = fwd_ss.createStrand(0, 9)
+    rev_strand = rev_ss.createStrand(5, 14)
+    for strand in (fwd_strand, rev_strand):
+        assert not hasattr(strand, '__dict__')
+        assert not hasattr(strand.oligo(), '__dict__')
+        assert isinstance(strand, Strand)
+
+    # direction specific methods
+    assert fwd_strand.idx5Prime() == 0 and fwd_strand.idx3Prime() == 9
+    assert rev_strand.idx5Prime() == 14 and rev_strand.idx3Prime() == 5
+    rev_neighbor = rev_ss.createStrand(15, 20)
+    assert rev_strand.connectionHigh() is None
+    rev_neighbor.setConnectionLow(rev_strand)
+    assert rev_neighbor.connection3p() is rev_strand
+
+    # abstract sequences are numbered 5' to 3' by segment
+    part.refreshSegments(0)
+    assert fwd_strand.abstract_sequence == []
+    part.setAbstractSequences()
+    fwd_seq = fwd_strand.abstract_sequence
+    rev_seq = rev_strand.abstract_sequence
+    for run in (fwd_seq[:5], fwd_seq[5:]):
+        assert run == list(range(run[0], run[0] + 5))
+    assert rev_seq[:5] == list(range(rev_seq[0], rev_seq[0] - 5, -1))
+    # the segment both strands span has the same numbers
+    assert rev_seq[5:] == fwd_seq[:4:-1]
+    assert fwd_strand.abstractSeq() == ','.join(str(i) for i in fwd_seq)
+    assert fwd_strand.sequence() == '|'*10
+    fwd_strand.clearAbstractSequence()
+    assert fwd_strand.abstract_sequence == []
+
+    # oligo properties
+    oligo = fwd_strand.oligo()
+    name = oligo.getName()
+    assert oligo.getModelProperties() == {'name': name, 'color': oligo.getColor(),
+                                          'length': oligo.length(), 'is_visible': True}
+    oligo.setProperty('name', 'foo', use_undostack=False)
+    assert oligo.getProperty('name') == 'foo'
+    assert oligo.getOutlineProperties() == ('foo', oligo.getColor(), True)
+    assert oligo.shallowCopy().getModelProperties() == oligo.getModelProperties()
+# end def
+
+
+def testSequenceBuffer(cnapp):
+    doc = cnapp.document
+    HELIX_LENGTH = 42
+    part = create3Helix(doc, [0, 0, 1], HELIX_LENGTH)
+    fwd_ss, rev_ss = part.getStrandSets(0)
+    fwd_strand = fwd_ss.createStrand(0, 19)
+    rev_strand = rev_ss.createStrand(10, 29)
+    fwd_strand.addInsertion(4, 2)
+    rev_strand.addInsertion(14, -1)
+    fwd_strand.addInsertion(14, -1)
+    assert fwd_strand.totalLength() == 21
+
+    seq = 'ACGTACGTACGTACGTACGTA'
+    fwd_strand.oligo().applySequence(seq)
+    assert fwd_strand.sequence() == seq
+    # the complement reads 5' to 3' down the reverse strand, blank past the overlap
+    overlap = seq[-9:]
+    assert rev_strand.sequence() == ' '*10 + util.rcomp(overlap)
+    start, end = fwd_strand.sequenceSpan()
+    assert (start, end) == (0, 21)
+    assert rev_strand.sequenceSpan() == (12, 31)
+
+    # an insertion shifts the bases at higher indices
+    fwd_strand.addInsertion(2, 1)
+    assert fwd_strand.sequence(for_export=True) == '?'*22
+    doc.undoStack().undo()
+    assert fwd_strand.sequence() == seq
+    assert rev_strand.sequence() == ' '*10 + util.rcomp(overlap)
+
+    # split strands keep their part of the sequence, the buffer blanks removed ones
+    fwd_ss.splitStrand(fwd_strand, 9)
+    low_strand, high_strand = fwd_ss.getStrand(0), fwd_ss.getStrand(10)
+    assert low_strand.sequence() + high_strand.sequence() == seq
+    fwd_ss.removeStrand(high_strand)
+    assert rev_strand.sequence(for_export=True) == '?'*19
+    doc.undoStack().undo()
+    assert rev_strand.sequence() == ' '*10 + util.rcomp(overlap)
+    doc.undoStack().undo()
+    assert fwd_ss.getStrand(0).sequence() == seq
+# end def
+
+
+def testLoadStrands(cnapp):
+    """Bulk loaded strands are checked for overlaps in one pass, and added
+    with one signal and one undo step"""
+    doc = cnapp.document
+    HELIX_LENGTH = 84
+    part = create3Helix(doc, [0, 0, 1], HELIX_LENGTH)
+    fwd_ss, rev_ss = part.getStrandSets(0)
+    existing = fwd_ss.createStrand(30, 39)
+    num_oligos = len(part.oligos())
+    added = []
+    fwd_ss.strandsetStrandsAddedSignal.connect(lambda ss, strands: added.append(strands))
+
+    for pairs, error in (([(0, 9), (35, 45)], ValueError),    # overlaps the existing strand
+                         ([(50, 60), (0, 9), (55, 58)], ValueError),
+                         ([(9, 0)], ValueError),
+                         ([(70, 84)], IndexError)):
+        with pytest.raises(error):
+            fwd_ss.loadStrands(pairs)
+    assert fwd_ss.strands() == [existing] and not added
+
+    strands = fwd_ss.loadStrands([(50, 60), (0, 9), (40, 40)],
+                                 ['#000001', '#000002', '#000003'])
+    assert [strand.idxs() for strand in strands] == [(0, 9), (40, 40), (50, 60)]
+    assert [strand.getColor() for strand in strands] == ['#000002', '#000003', '#000001']
+    assert fwd_ss.strands() == [strands[0], existing] + strands[1:]
+    assert added == [strands]
+    assert fwd_ss.getStrand(55) is strands[2] and fwd_ss.getStrand(45) is None
+    assert len(part.oligos()) == num_oligos + 3
+    part.refreshSegments(0)
+    assert [strand.segments for strand in fwd_ss] == [[(0, 9)], [(30, 39)], [(40, 40)], [(50, 60)]]
+
+    # undoable, with the segments updated as the strands go in and out
+    rev_strand = rev_ss.createStrand(0, 20)
+    strands = rev_ss.loadStrands([(21, 24), (60, 83)], use_undostack=True)
+    assert [strand.segments for strand in rev_ss] == [[(0, 9), (10, 20)], [(21, 24)],
+                                                      [(60, 60), (61, 83)]]
+    doc.undoStack().undo()
+    assert rev_ss.strands() == [rev_strand] and strands[0].oligo() is None
+    assert rev_strand.segments == [(0, 9), (10, 20)]
+    doc.undoStack().redo()
+    assert rev_ss.strands() == [rev_strand] + strands
+    assert strands[1].segments == [(60, 60), (61, 83)]
+    assert part._refreshSegments(fwd_ss, rev_ss) == ([x.segments for x in fwd_ss],
+                                                     [x.segments for x in rev_ss])
+# end def
+
+
+def testResizeSequence(cnapp):
+    doc = cnapp.document
+    HELIX_LENGTH = 42
+    part = create3Helix(doc, [0, 0, 1], HELIX_LENGTH)
+    fwd_ss, rev_ss = part.getStrandSets(0)
+
+    # bases of a removed strand don't reappear in a strand extended over them
+    strand_a = fwd_ss.createStrand(0, 10)
+    strand_b = fwd_ss.createStrand(11, 20)
+    strand_a.oligo().applySequence('A'*11)
+    strand_b.oligo().applySequence('G'*10)
+    fwd_ss.removeStrand(strand_b)
+    strand_a.resize((0, 20))
+    assert strand_a.sequence() == 'A'*11 + ' '*10
+    doc.undoStack().undo()
+    doc.undoStack().undo()
+    assert strand_a.sequence() == 'A'*11
+    assert strand_b.sequence() == 'G'*10
+
+    # undoing a shrink restores the bases it dropped
+    seq = 'ACGTACGTACGTACGTACGTA'
+    strand_c = rev_ss.createStrand(0, 20)
+    strand_c.oligo().applySequence(seq)
+    strand_c.resize((10, 20))
+    assert strand_c.sequence() == seq[:11]
+    strand_d = rev_ss.createStrand(0, 9)
+    strand_d.oligo().applySequence('G'*10)
+    for _ in range(3):
+        doc.undoStack().undo()
+    assert strand_c.sequence() == seq
+    for _ in range(3):
+        doc.undoStack().redo()
+    assert strand_c.sequence() == seq[:11]
+    assert strand_d.sequence() == 'G'*10
+# end def
@@ -14,7 +14,9 @@ class UndoCommand(object):
     # end def
 
     def undo(self):
-        for cmd in self.commands:
+        # in reverse, like QUndoCommand, so each child undoes onto the state
+        # its redo left
+        for cmd in reversed(self.commands):
             cmd.undo()
     # end def
 
@@ -1,19 +1,147 @@
 # -*- coding: utf-8 -*-
+"""Undo stack of the model when it runs without Qt.  The GUI uses a
+QUndoStack instead, which has none of the size accounting below.
+
+Besides a limit on the number of commands, like `QUndoStack.setUndoLimit`,
+the history can be limited by its estimated size in bytes, see
+:func:`estimateSize`, evicting the oldest commands first.  A command removing
+a virtual helix or a macro deleting many strands can hold far more than a
+tiny edit, so counting commands alone either pins a lot of memory or keeps
+too little history.
+
+Optionally the oldest commands are spilled: pickled to a temporary file and
+loaded back when they are undone.  Only plain data is written, i.e. the
+commands themselves, builtin containers, strings, numbers and NumPy arrays.
+Everything else a command refers to, e.g. a Part, Strand or Oligo, is kept in
+memory and the reloaded command refers to the same object, so spilling saves
+the data a command owns without ever copying part of the model.
+"""
+import pickle
+import sys
+import tempfile
 from collections import deque
 
+import numpy as np
+
 from cadnano.undocommand import UndoCommand
 
+_VALUE_TYPES = (type(None), bool, int, float, complex, str, bytes, bytearray,
+                list, tuple, dict, set, frozenset, deque,
+                np.ndarray, np.generic, np.dtype, UndoCommand)
+"""types of the objects spilled by value"""
+
+
+def estimateSize(command):
+    """Estimate the bytes held by an undo command: its attributes, the
+    commands of a macro, and the containers and arrays in them, each counted
+    once.  Other objects are counted by their own size, without what they
+    refer to, as they are usually shared with the model
+
+    Args:
+        command (UndoCommand):
+
+    Returns:
+        int: bytes
+    """
+    seen = set()
+    total = 0
+    stack = [command]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, np.ndarray):
+            if obj.base is not None:    # a view pins the array it looks into
+                stack.append(obj.base)
+        elif isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        elif isinstance(obj, UndoCommand):
+            attributes = obj.__dict__
+            total += sys.getsizeof(attributes)
+            stack.extend(attributes.values())
+    return total
+# end def
+
+
+class _CommandPickler(pickle.Pickler):
+    """Pickle plain data by value and everything else by reference to a
+    list of objects kept in memory"""
+    def __init__(self, fd, refs):
+        super(_CommandPickler, self).__init__(fd, protocol=pickle.HIGHEST_PROTOCOL)
+        self._refs = refs
+        self._ref_ids = {}
+    # end def
+
+    def persistent_id(self, obj):
+        if isinstance(obj, _VALUE_TYPES):
+            return None
+        key = self._ref_ids.get(id(obj))
+        if key is None:
+            key = self._ref_ids[id(obj)] = len(self._refs)
+            self._refs.append(obj)
+        return key
+    # end def
+# end class
+
+
+class _CommandUnpickler(pickle.Unpickler):
+    def __init__(self, fd, refs):
+        super(_CommandUnpickler, self).__init__(fd)
+        self._refs = refs
+    # end def
+
+    def persistent_load(self, key):
+        return self._refs[key]
+    # end def
+# end class
+
+
+class _SpilledCommand(object):
+    """Stands in the undo stack for a command written to the spill file"""
+    __slots__ = 'offset', 'length', 'refs'
+
+    def __init__(self, offset, length, refs):
+        self.offset = offset
+        self.length = length
+        self.refs = refs    # objects the command refers to by reference
+    # end def
+# end class
+
 
 class UndoStack(object):
+    """
+    Args:
+        limit (int): optional, maximum number of commands, 0 for no limit.
+            Default 10
+    """
     def __init__(self, limit=10):
         self.undostack = deque()    # not using deque maxlen because pattern is awkward
         self.redostack = []
         self.limit = limit
+        self.byte_limit = 0
+        self.spill_limit = None
 
         self.top_macro = None
         self.current_macro = None
         self.macro_stack = []
         self.macro_count = 0
+
+        # estimated bytes of each command, parallel to the stacks
+        self._undo_sizes = deque()
+        self._redo_sizes = []
+        self._undo_bytes = 0
+        self._redo_bytes = 0
+        # the spilled commands are always the oldest, the first
+        # `_num_spilled` of `undostack`
+        self._num_spilled = 0
+        self._spilled_bytes = 0
+        self._spill_file = None
+        self._num_evicted = 0
     # end def
 
     def push(self, undocommand):
@@ -24,11 +152,102 @@ class UndoStack(object):
     # end def
 
     def appendUndoStack(self, undocommand):
-        stack = self.undostack
-        stack.append(undocommand)
+        # like QUndoStack, a new command makes the undone ones unreachable
+        self.redostack = []
+        self._redo_sizes = []
+        self._redo_bytes = 0
         undocommand.redo()
-        if len(stack) > self.limit:
+        self._append(undocommand, estimateSize(undocommand))
+    # end def
+
+    def _append(self, undocommand, size):
+        self.undostack.append(undocommand)
+        self._undo_sizes.append(size)
+        self._undo_bytes += size
+        self._trim()
+        self._spill()
+    # end def
+
+    def _trim(self):
+        """Evict the oldest commands beyond the limits, always keeping the
+        newest one
+        """
+        stack = self.undostack
+        limit = self.limit
+        byte_limit = self.byte_limit
+        while len(stack) > 1 and ((limit and len(stack) > limit) or
+                                  (byte_limit and self._undo_bytes > byte_limit)):
             stack.popleft()
+            size = self._undo_sizes.popleft()
+            self._undo_bytes -= size
+            if self._num_spilled:
+                self._num_spilled -= 1
+                self._spilled_bytes -= size
+                if self._num_spilled == 0:
+                    self._resetSpillFile()
+            self._num_evicted += 1
+    # end def
+
+    def _spill(self):
+        """Spill the oldest commands in memory until the rest fit in
+        `spill_limit`, always keeping the newest one in memory
+        """
+        spill_limit = self.spill_limit
+        if spill_limit is None:
+            return
+        stack = self.undostack
+        sizes = self._undo_sizes
+        while (self._num_spilled < len(stack) - 1 and
+               self._undo_bytes - self._spilled_bytes + self._redo_bytes > spill_limit):
+            i = self._num_spilled
+            spilled = self._dumpCommand(stack[i])
+            if spilled is None:
+                return
+            stack[i] = spilled
+            self._num_spilled += 1
+            self._spilled_bytes += sizes[i]
+    # end def
+
+    def _dumpCommand(self, undocommand):
+        """
+        Returns:
+            _SpilledCommand: or None if the command can't be pickled, e.g. it
+            is of a class that can't be imported
+        """
+        fd = self._spill_file
+        if fd is None:
+            self._spill_file = fd = tempfile.TemporaryFile(prefix='cadnano-undo-')
+        fd.seek(0, 2)
+        offset = fd.tell()
+        refs = []
+        try:
+            _CommandPickler(fd, refs).dump(undocommand)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            fd.truncate(offset)
+            return None
+        return _SpilledCommand(offset, fd.tell() - offset, refs)
+    # end def
+
+    def _loadCommand(self, spilled):
+        """
+        Args:
+            spilled (_SpilledCommand):
+
+        Returns:
+            UndoCommand:
+        """
+        fd = self._spill_file
+        fd.seek(spilled.offset)
+        undocommand = _CommandUnpickler(fd, spilled.refs).load()
+        assert fd.tell() == spilled.offset + spilled.length
+        return undocommand
+    # end def
+
+    def _resetSpillFile(self):
+        """Drop the contents of the spill file once no command is in it"""
+        if self._spill_file is not None:
+            self._spill_file.seek(0)
+            self._spill_file.truncate()
     # end def
 
     def beginMacro(self, message):
@@ -56,15 +275,27 @@ class UndoStack(object):
     def undo(self):
         if self.canUndo():
             undo_cmd = self.undostack.pop()
+            size = self._undo_sizes.pop()
+            self._undo_bytes -= size
+            if len(self.undostack) < self._num_spilled:
+                self._num_spilled -= 1
+                self._spilled_bytes -= size
+                undo_cmd = self._loadCommand(undo_cmd)
+                if self._num_spilled == 0:
+                    self._resetSpillFile()
             undo_cmd.undo()
             self.redostack.append(undo_cmd)
+            self._redo_sizes.append(size)
+            self._redo_bytes += size
     # end def
 
     def redo(self):
         if self.canRedo():
             redo_cmd = self.redostack.pop()
+            size = self._redo_sizes.pop()
+            self._redo_bytes -= size
             redo_cmd.redo()
-            self.undostack.append(redo_cmd)
+            self._append(redo_cmd, size)
     # end def
 
     def canUndo(self):
@@ -75,6 +306,77 @@ class UndoStack(object):
         return True if len(self.redostack) > 0 else False
     # end def
 
+    def clear(self):
+        """Drop all commands"""
+        self.undostack = deque()
+        self.redostack = []
+        self._undo_sizes = deque()
+        self._redo_sizes = []
+        self._undo_bytes = self._redo_bytes = 0
+        self._num_spilled = 0
+        self._spilled_bytes = 0
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+    # end def
+
     def setUndoLimit(self, lim):
+        """
+        Args:
+            lim (int): maximum number of commands, 0 for no limit
+        """
         self.limit = lim
-    # end def
\ No newline at end of file
+        self._trim()
+    # end def
+
+    def setByteLimit(self, nbytes):
+        """Limit the estimated size of the undo history, see
+        :func:`estimateSize`, evicting the oldest commands first.  The newest
+        command is kept whatever its size.
+
+        Only the headless stack has a byte limit.  Under PyQt the document
+        uses a QUndoStack, which can't evict its oldest commands, so the GUI
+        keeps a count limit, see `Document`
+
+        Args:
+            nbytes (int): maximum bytes, 0 for no limit
+        """
+        self.byte_limit = nbytes
+        self._trim()
+    # end def
+
+    def setSpillLimit(self, nbytes):
+        """Spill the oldest commands to a temporary file when the commands
+        in memory are estimated to hold more than `nbytes`.  They are loaded
+        back when undone.  Spilled commands still count toward the
+        `setByteLimit`
+
+        Args:
+            nbytes (int): maximum bytes in memory, None to not spill
+        """
+        self.spill_limit = nbytes
+        self._spill()
+    # end def
+
+    def memoryStats(self):
+        """
+        Returns:
+            dict: of the number of 'undo_commands' and 'redo_commands', the
+            estimated 'memory_bytes' of the commands in memory, the number
+            of 'spilled_commands', their estimated 'spilled_bytes' and the
+            'spill_file_bytes', and the number of 'evicted_commands' so far
+        """
+        spill_file = self._spill_file
+        if spill_file is not None:
+            spill_file.seek(0, 2)
+        return {
+            'undo_commands': len(self.undostack),
+            'redo_commands': len(self.redostack),
+            'memory_bytes': self._undo_bytes - self._spilled_bytes + self._redo_bytes,
+            'spilled_commands': self._num_spilled,
+            'spilled_bytes': self._spilled_bytes,
+            'spill_file_bytes': spill_file.tell() if spill_file is not None else 0,
+            'evicted_commands': self._num_evicted
+        }
+    # end def
+# end class
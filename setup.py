@@ -79,6 +79,7 @@ cn_files += test_files + test_data_files
 
 entry_points = {'console_scripts': [
         'cadnano = cadnano.bin.main:main',
+        'cadnano-batch = cadnano.bin.batch:main',
         'cadnanoinstall = cadnano.install_exe.cadnanoinstall:post_install'
         ]}
 